@@ -2,7 +2,8 @@
 """Add new functionality to allow logger to exit."""
 
 import logging
-import sys
+import os
+import time
 from datetime import datetime
 
 CRITICAL = logging.CRITICAL
@@ -13,9 +14,11 @@ WARN = logging.WARN
 INFO = logging.INFO
 DEBUG = logging.DEBUG
 NOTSET = logging.NOTSET
+# Messages of enabled trace categories, see CmnLogger.trace
+TRACE = 15
 
 # Override standard level display names to be fixed width
-LEVEL_NAMES = {'INFO': '%I', 'DEBUG': '%D', 'ERROR': '%E', 'WARNING': '%W', 'CRITICAL': '%F'}
+LEVEL_NAMES = {'INFO': '%I', 'TRACE': '%T', 'DEBUG': '%D', 'ERROR': '%E', 'WARNING': '%W', 'CRITICAL': '%F'}
 
 COLOR_RED = '\033[0;31m'
 COLOR_NC = '\033[0m'
@@ -23,6 +26,7 @@ COLOR_NC = '\033[0m'
 # pylint: disable=bad-whitespace
 LEVEL_TO_COLOR = {
     'INFO': ("", ""),
+    'TRACE': ("", ""),
     'DEBUG': ("", ""),
     'ERROR': (COLOR_RED, COLOR_NC),
     'WARNING': (COLOR_RED, COLOR_NC),
@@ -31,9 +35,61 @@ LEVEL_TO_COLOR = {
 # pylint: enable=bad-whitespace
 
 
+class CriticalError(SystemExit):
+    """Raised by CmnLogger.critical.
+
+    A SystemExit, so a script still exits with bad status, but callers handling several independent jobs can catch
+    it and carry on with the next one.
+    """
+
+    def __init__(self, message):
+        super(CriticalError, self).__init__(1)
+        self.message = message
+
+
+class _NullSpan:
+    """What CmnLogger.span returns while not profiling, does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A with block timed by CmnLogger.span while profiling."""
+
+    __slots__ = ("log", "category", "name", "args", "start")
+
+    def __init__(self, log, category, name, args):
+        self.log = log
+        self.category = category
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.log._enter_span(self) # pylint: disable=protected-access
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.log._exit_span(self, time.perf_counter()) # pylint: disable=protected-access
+        return False
+
+
 class CmnLogger(logging.getLoggerClass()):
     """Extended logger that tracks error counts."""
 
+    # Set by start_profiling, guard anything expensive done only to describe a span with it
+    profiling = False
+    # Trace categories enabled by set_trace_categories
+    traced = frozenset()
+
     def __init__(self, *args, **kwargs):
         self.warn_count = 0
         self.error_count = 0
@@ -50,6 +106,24 @@ class CmnLogger(logging.getLoggerClass()):
         self._last_message_was_summary = False
         super(CmnLogger, self).debug(*args, **kwargs)
 
+    def set_trace_categories(self, categories):
+        """Log the trace messages of these categories from now on, and only these.
+
+        The messages are logged at TRACE level, the logger and its handlers need to let that through.
+        """
+        self.traced = frozenset(categories)
+
+    def trace(self, category, msg, *args, **kwargs):
+        """Log msg % args at TRACE level, tagged with category, if that category is enabled.
+
+        Like any log call the message is only formatted when it's logged, a disabled call costs the call and a set
+        lookup. Calls made for every node or link test `category in log.traced` first, then the arguments aren't even
+        evaluated, calls made once per file or pkg don't bother.
+        """
+        if category in self.traced:
+            self._last_message_was_summary = False
+            self._log(TRACE, "[%s] " + msg, (category, ) + args, **kwargs)
+
     def info(self, *args, **kwargs): # pylint: disable=missing-docstring
         self._last_message_was_summary = False
         super(CmnLogger, self).info(*args, **kwargs)
@@ -64,11 +138,11 @@ class CmnLogger(logging.getLoggerClass()):
         self._last_message_was_summary = False
         super(CmnLogger, self).error(*args, **kwargs)
 
-    def critical(self, *args, **kwargs):
-        """Script will exit with bad status if called."""
+    def critical(self, msg, *args, **kwargs):
+        """Script will exit with bad status if called, unless the CriticalError raised is caught."""
         self._last_message_was_summary = False
-        super(CmnLogger, self).critical(*args, **kwargs)
-        sys.exit(1)
+        super(CmnLogger, self).critical(msg, *args, **kwargs)
+        raise CriticalError(str(msg) % args if args else str(msg))
 
     def summary(self, *args, **kwargs):
         """Add some decoration to make a line pop a bit more."""
@@ -80,6 +154,82 @@ class CmnLogger(logging.getLoggerClass()):
 
     def reset_stopwatch(self):
         self._start_time = datetime.now()
+        self._start_counter = time.perf_counter()
+
+    def start_profiling(self, cprofile_category=None):
+        """Restart the stopwatch and record every span from now on, until stop_profiling.
+
+        With a cprofile_category, cProfile also runs inside the spans of that category (and only there).
+        """
+        self.reset_stopwatch()
+        self._spans = []
+        self._cprofile_category = cprofile_category
+        self._cprofile_depth = 0
+        self._cprofile = None
+        if cprofile_category:
+            import cProfile # pylint: disable=import-outside-toplevel
+            self._cprofile = cProfile.Profile()
+        self.profiling = True
+
+    def span(self, category, name, **args):
+        """Return a context manager timing its block as a span of category, shown as name with args.
+
+        Does nothing unless profiling, but the arguments are still evaluated, so guard calls that are expensive to
+        make with the profiling attribute.
+        """
+        if not self.profiling:
+            return _NULL_SPAN
+        return _Span(self, category, name, args)
+
+    def _enter_span(self, span):
+        if span.category == self._cprofile_category:
+            if not self._cprofile_depth:
+                self._cprofile.enable()
+            self._cprofile_depth += 1
+
+    def _exit_span(self, span, end):
+        self._spans.append((span, end))
+        if span.category == self._cprofile_category:
+            self._cprofile_depth -= 1
+            if not self._cprofile_depth:
+                self._cprofile.disable()
+
+    def stop_profiling(self, trace_file=None, cprofile_file=None):
+        """Stop recording spans, write them to trace_file as Chrome trace event JSON (for chrome://tracing or
+        Perfetto) and the cProfile stats of the chosen category to cprofile_file."""
+        if not self.profiling:
+            return
+        self.profiling = False
+        if trace_file:
+            import json # pylint: disable=import-outside-toplevel
+            pid = os.getpid()
+            events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}}]
+            for span, end in sorted(self._spans, key=lambda span_end: span_end[0].start):
+                event = {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round((span.start - self._start_counter) * 1e6, 3),
+                    "dur": round((end - span.start) * 1e6, 3),
+                    "pid": pid,
+                    "tid": 0,
+                }
+                if span.args:
+                    event["args"] = {key: str(value) for key, value in span.args.items()}
+                events.append(event)
+            trace = {
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {
+                    "start_time": self._start_time.isoformat()
+                },
+            }
+            with open(trace_file, "w") as fileh:
+                json.dump(trace, fileh)
+        if cprofile_file and self._cprofile:
+            self._cprofile.dump_stats(cprofile_file)
+        self._spans = []
+        self._cprofile = None
 
     @property
     def start_time(self):
@@ -124,6 +274,7 @@ def build_logger(name, level=logging.INFO, use_color=False, filehandler=None):
 
     # Override standard level display names to be fixed width
     logging.addLevelName(INFO, "%I") # pylint: disable=bad-whitespace
+    logging.addLevelName(TRACE, "%T") # pylint: disable=bad-whitespace
     logging.addLevelName(DEBUG, "%D") # pylint: disable=bad-whitespace
     logging.addLevelName(ERROR, "%E") # pylint: disable=bad-whitespace
     logging.addLevelName(WARNING, "%W") # pylint: disable=bad-whitespace
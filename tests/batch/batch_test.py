@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Build the golden inputs with yis_gen.py --batch and check the outputs against the golden outputs.
+
+Run from the repo root (or through bazel). A target that fails to build must only fail itself and the targets that
+depend on it, the others are still rendered, and the run exits nonzero.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# Relative to ROOT, as the golden outputs name the files they're generated from
+GOLDEN_INPUTS = os.path.join("tests", "golden_inputs")
+GOLDEN_OUTPUTS = os.path.join(ROOT, "tests", "golden_outputs")
+
+# Output suffix of each generator, as the golden outputs are named
+PKG_OUTPUTS = {"rtl": "_rypkg.svh", "c-hdr": ".h", "html": "_rypkg.html", "rdl": "_yis.rdl", "py": "_yis.py"}
+INTF_OUTPUTS = {"html": "_rtl_intf.html"}
+
+# Target -> (kind, the targets it depends on), in dependency order
+TARGETS = {
+    "test_pkg_a": ("pkg", []),
+    "test_pkg_b": ("pkg", ["test_pkg_a"]),
+    "test_pkg_c": ("pkg", []),
+    "test_pkg_d": ("pkg", []),
+    "test_pkg_e": ("pkg", ["test_pkg_d"]),
+    "test_intf_a": ("intf", ["test_pkg_a", "test_pkg_b"]),
+}
+
+# Breaks test_pkg_a, and so test_pkg_b and test_intf_a, with a localparam linking to a name nothing defines
+BROKEN_LOCALPARAM = """localparams:
+  - name: BROKEN_PARAM
+    value: NO_SUCH_PARAM.value
+    doc_summary: Links to nothing.
+
+"""
+
+# The golden outputs are checked in with the year they were generated
+COPYRIGHT = re.compile(r"Copyright \(c\) \d{4}")
+
+
+def write_manifest(input_dir, output_dir):
+    """Write a --batch manifest building every target of TARGETS from input_dir to output_dir, return its path and
+    the {output file: golden output file} it renders."""
+    targets = []
+    outputs = {}
+    for name, (kind, deps) in TARGETS.items():
+        target = {"src": os.path.join(input_dir, f"{name}.yis"), "kind": kind, "outputs": {}}
+        target["deps"] = [os.path.join(input_dir, f"{dep}.yis") for dep in deps]
+        for generator, suffix in (INTF_OUTPUTS if kind == "intf" else PKG_OUTPUTS).items():
+            output_file = os.path.join(output_dir, f"{name}{suffix}")
+            target["outputs"][generator] = output_file
+            outputs[output_file] = os.path.join(GOLDEN_OUTPUTS, f"{name}{suffix}")
+        targets.append(target)
+    manifest = os.path.join(output_dir, "manifest.json")
+    with open(manifest, "w") as mfile:
+        json.dump({"targets": targets}, mfile, indent=1)
+    return manifest, outputs
+
+
+def run_batch(manifest):
+    """Run yis_gen.py --batch on manifest, return the completed process."""
+    return subprocess.run([sys.executable, "yis_gen.py", "--batch", manifest, "--jobs", "2"],
+                          cwd=ROOT,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT,
+                          universal_newlines=True,
+                          check=False)
+
+
+def read_output(path, input_dir=GOLDEN_INPUTS):
+    """Read a generated or golden output, with the year of its copyright notice dropped and the files it was generated
+    from named as if they were in GOLDEN_INPUTS."""
+    with open(path) as ofile:
+        text = ofile.read().replace(input_dir + os.sep, GOLDEN_INPUTS + os.sep)
+    return COPYRIGHT.sub("Copyright (c)", text)
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_golden(self):
+        """--batch renders the same outputs as the golden ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest, outputs = write_manifest(GOLDEN_INPUTS, tmpdir)
+            result = run_batch(manifest)
+            self.assertEqual(result.returncode, 0, result.stdout)
+            for output_file, golden_file in outputs.items():
+                with self.subTest(output=os.path.basename(output_file)):
+                    self.assertEqual(read_output(output_file), read_output(golden_file))
+
+    def test_broken_target(self):
+        """A target that fails only fails itself and its dependents, and the run exits nonzero."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_dir = os.path.join(tmpdir, "inputs")
+            output_dir = os.path.join(tmpdir, "outputs")
+            shutil.copytree(os.path.join(ROOT, GOLDEN_INPUTS), input_dir)
+            os.mkdir(output_dir)
+            broken = os.path.join(input_dir, "test_pkg_a.yis")
+            with open(broken) as yfile:
+                text = yfile.read()
+            with open(broken, "w") as yfile:
+                yfile.write(text.replace("localparams:\n", BROKEN_LOCALPARAM, 1))
+            manifest, outputs = write_manifest(input_dir, output_dir)
+            result = run_batch(manifest)
+            self.assertNotEqual(result.returncode, 0, result.stdout)
+            failed = {"test_pkg_a", "test_pkg_b", "test_intf_a"}
+            for name in TARGETS:
+                self.assertEqual(f"{name}.yis failed" in result.stdout, name in failed, result.stdout)
+            for output_file, golden_file in outputs.items():
+                name = os.path.basename(golden_file)
+                with self.subTest(output=name):
+                    if any(name.startswith(target) for target in failed):
+                        self.assertFalse(os.path.exists(output_file))
+                    else:
+                        self.assertEqual(read_output(output_file, input_dir), read_output(golden_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
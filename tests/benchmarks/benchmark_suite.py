@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Time every phase of yis_gen on synthetic pkgs of growing size, to see how each one scales.
+
+Run from the repo root:
+
+    python3 tests/benchmarks/benchmark_suite.py [--cases NAME ...] [--scales N ...] [--repeat N]
+                                                [--implicit-localparams POLICY] [--output FILE] [--compare FILE]
+
+Each case multiplies one group of parameters of the synthetic generator (see synthetic.py) by every scale, leaving the
+others at their defaults, the baseline case runs everything at the defaults. The files are generated, then loaded and
+built the way yis_gen does it, timing each phase separately: YAML load, yamale validation, Pkg/Intf construction,
+elaboration and each generator of render_output (rendering the last pkg of the chain and the intf). The best of --repeat
+runs is reported for each phase, the peak memory of each phase is measured in one more run under tracemalloc, the
+large_outputs case shows what rendering big HTML and RTL documents takes. That run also measures the memory the model
+holds once built, per node, and the size of the nodes themselves by class.
+
+--implicit-localparams builds the pkgs with that yis_gen policy, compare a referenced run against an all one to see
+what leaving the unreferenced implicit localparams out saves. --output writes the results as JSON, --compare prints
+each phase's time and peak memory against a previous --output.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cmn_logging # pylint: disable=wrong-import-position
+import synthetic # pylint: disable=wrong-import-position
+import yis_gen # pylint: disable=wrong-import-position
+
+RESULTS_VERSION = 3
+
+# Case -> the synthetic parameters it scales
+CASES = OrderedDict([
+    ("baseline", []),
+    ("localparams", ["localparams"]),
+    ("enums", ["enum_values", "range_values"]),
+    ("structs", ["struct_fields"]),
+    ("nesting", ["nesting_depth"]),
+    ("unions", ["union_fanout"]),
+    ("addr_macros", ["addr_macros"]),
+    ("chain", ["chain"]),
+    ("intf", ["intf_components", "intf_connections"]),
+    # Large HTML and RTL documents, for the memory rendering them takes
+    ("large_outputs", ["structs", "struct_fields", "enums", "enum_values"]),
+])
+
+# Generators rendered for the target pkg and for the intf
+PKG_GENERATORS = ["rtl", "rdl", "html", "c-hdr"]
+INTF_GENERATORS = ["html"]
+
+
+class PhaseTimer:
+    """Accumulate the time (and optionally the peak traced memory) spent in each phase.
+
+    The peak memory of a phase is how far above the memory in use when it started it went, what it took on top of
+    the model already built.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.seconds = OrderedDict()
+        self.peak_bytes = OrderedDict()
+
+    def run(self, phase, function, *args, **kwargs):
+        """Call function, accounting its time to phase, and return its result."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            in_use = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + time.perf_counter() - start
+        if self.trace_memory:
+            self.peak_bytes[phase] = max(self.peak_bytes.get(phase, 0), tracemalloc.get_traced_memory()[1] - in_use)
+        return result
+
+
+def build_and_render(paths, output_dir, log, timer, yis_args=()):
+    """Load, build and elaborate paths (pkgs in dependency order, then maybe the intf) like yis_gen, then render.
+
+    yis_args are extra yis_gen command line arguments.
+    """
+    options = yis_gen.parse_args(["--pkgs"] + list(yis_args))
+    yis = yis_gen.Yis([], log, options=options)
+    nodes = []
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        data = timer.run("yaml_load", yis._load_yaml, path) # pylint: disable=protected-access
+        intf = "components" in data
+        schema = "rtl_intf.yaml" if intf else "rtl_pkg.yaml"
+        timer.run("validate", yis._validate, schema, data, path) # pylint: disable=protected-access
+        node_class = yis_gen.Intf if intf else yis_gen.Pkg
+        node = timer.run("construct", node_class, log=log, name=name, parent=yis, source_file=path, **data)
+        yis._add_pkg(node) # pylint: disable=protected-access
+        nodes.append(node)
+    log.exit_if_warnings_or_errors("Errors building the synthetic files")
+    timer.run("elaborate", yis._elaborate) # pylint: disable=protected-access
+
+    pkgs = [node for node in nodes if isinstance(node, yis_gen.Pkg)]
+    intfs = [node for node in nodes if isinstance(node, yis_gen.Intf)]
+    for target, generators, phase_suffix in [(pkgs[-1], PKG_GENERATORS, "")] + [(intf, INTF_GENERATORS, "_intf")
+                                                                                for intf in intfs]:
+        for generator in generators:
+            output_file = os.path.join(output_dir, f"{target.name}.{generator}")
+            timer.run(f"render_{generator}{phase_suffix}", yis.render_output, [(generator, output_file)], target=target)
+    return yis
+
+
+def node_sizes(yis):
+    """Return class name -> {"count", "bytes"} of the nodes in the model.
+
+    A node's bytes are those of the object and of its own containers (__dict__, children and local_links), not of the
+    values they hold, containers shared between nodes are only counted once.
+    """
+    sizes = OrderedDict()
+    seen = set()
+    stack = list(yis._pkgs.values()) # pylint: disable=protected-access
+    while stack:
+        node = stack.pop()
+        size = sys.getsizeof(node)
+        for container in (getattr(node, "__dict__", None), node.children, node.local_links):
+            if container is not None and id(container) not in seen:
+                seen.add(id(container))
+                size += sys.getsizeof(container)
+        entry = sizes.setdefault(type(node).__name__, {"count": 0, "bytes": 0})
+        entry["count"] += 1
+        entry["bytes"] += size
+        stack.extend(node.children.values())
+    return sizes
+
+
+def run_case(name, params, repeat, log, yis_args=()):
+    """Return the results for one case."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = synthetic.write(os.path.join(tmpdir, "yis"), params)
+        input_bytes = sum(os.path.getsize(path) for path in paths)
+        best = OrderedDict()
+        for _ in range(repeat):
+            timer = PhaseTimer()
+            yis = build_and_render(paths, tmpdir, log, timer, yis_args)
+            for phase, seconds in timer.seconds.items():
+                best[phase] = min(best.get(phase, seconds), seconds)
+        sizes = node_sizes(yis)
+        outputs = [os.path.join(tmpdir, entry) for entry in os.listdir(tmpdir)]
+        outputs = [output for output in outputs if os.path.isfile(output)]
+        output_bytes = sum(os.path.getsize(output) for output in outputs)
+        output_lines = 0
+        for output in outputs:
+            with open(output, "rb") as fileh:
+                output_lines += sum(1 for _ in fileh)
+
+        timer = PhaseTimer(trace_memory=True)
+        tracemalloc.start()
+        try:
+            yis = build_and_render(paths, tmpdir, log, timer, yis_args)
+            # Everything this run allocated that's still alive, which is mostly the model
+            model_bytes = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    return OrderedDict([
+        ("name", name),
+        ("params", params),
+        ("files", len(paths)),
+        ("input_bytes", input_bytes),
+        ("output_bytes", output_bytes),
+        ("output_lines", output_lines),
+        ("nodes", sum(entry["count"] for entry in sizes.values())),
+        ("model_bytes", model_bytes),
+        ("node_bytes", sizes),
+        ("phases",
+         OrderedDict((phase, {
+             "seconds": seconds,
+             "peak_bytes": timer.peak_bytes.get(phase)
+         }) for phase, seconds in best.items())),
+        ("total_seconds", sum(best.values())),
+    ])
+
+
+def case_params(case, scale):
+    """Synthetic parameters for case at scale."""
+    params = OrderedDict(synthetic.DEFAULTS)
+    for param in CASES[case]:
+        params[param] *= scale
+    return params
+
+
+def git_revision():
+    """The checked out commit, if this is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              cwd=ROOT,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL,
+                              universal_newlines=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _phase_value(case, phase, metric):
+    """The metric of one phase of a case, None if it's not there."""
+    if case is None:
+        return None
+    if phase == "total":
+        return case["total_seconds"] if metric == "seconds" else None
+    return case["phases"].get(phase, {}).get(metric)
+
+
+def print_table(results, baseline_cases, metric, unit, scale):
+    """Print a table of metric for every phase of every case, against baseline_cases' when they have it."""
+    phases = []
+    for case in results["cases"]:
+        phases.extend(phase for phase in case["phases"] if phase not in phases)
+    if metric == "seconds":
+        phases.append("total")
+    print(f"{'case':18} {'nodes':>7} " + " ".join(f"{phase:>14}" for phase in phases) + f"   ({unit})")
+    for case in results["cases"]:
+        cells = []
+        for phase in phases:
+            new = _phase_value(case, phase, metric)
+            old = _phase_value(baseline_cases.get(case["name"]), phase, metric)
+            if new is None:
+                cells.append(f"{'-':>14}")
+            elif old:
+                cells.append(f"{new * scale:8.1f} {new / old:4.2f}x")
+            else:
+                cells.append(f"{new * scale:14.1f}")
+        print(f"{case['name']:18} {case['nodes']:7} " + " ".join(cells))
+
+
+def print_memory_table(results, baseline_cases):
+    """Print the memory the model holds per node and the size of the nodes of each class, for every case."""
+    classes = []
+    for case in results["cases"]:
+        classes.extend(name for name in case["node_bytes"] if name not in classes)
+    columns = ["model"] + classes
+    print(f"{'case':18} {'nodes':>7} " + " ".join(f"{column:>14}" for column in columns) + "   (bytes per node)")
+    for case in results["cases"]:
+        old_case = baseline_cases.get(case["name"], {})
+        values = [(case["model_bytes"], case["nodes"], old_case.get("model_bytes"), old_case.get("nodes"))]
+        for name in classes:
+            entry = case["node_bytes"].get(name, {})
+            old_entry = old_case.get("node_bytes", {}).get(name, {})
+            values.append((entry.get("bytes"), entry.get("count"), old_entry.get("bytes"), old_entry.get("count")))
+        cells = []
+        for size, count, old_size, old_count in values:
+            if not count:
+                cells.append(f"{'-':>14}")
+            elif old_count:
+                cells.append(f"{size / count:8.0f} {size / count / (old_size / old_count):4.2f}x")
+            else:
+                cells.append(f"{size / count:14.0f}")
+        print(f"{case['name']:18} {case['nodes']:7} " + " ".join(cells))
+
+
+def print_output_table(results, baseline_cases):
+    """Print the size of the rendered outputs of every case."""
+    print(f"{'case':18} {'nodes':>7} {'lines':>14} {'KiB':>14}   (rendered outputs)")
+    for case in results["cases"]:
+        old_case = baseline_cases.get(case["name"], {})
+        cells = []
+        for key, scale in [("output_lines", 1), ("output_bytes", 1 / 1024)]:
+            new, old = case.get(key), old_case.get(key)
+            if old:
+                cells.append(f"{new * scale:8.0f} {new / old:4.2f}x")
+            else:
+                cells.append(f"{new * scale:14.0f}")
+        print(f"{case['name']:18} {case['nodes']:7} " + " ".join(cells))
+
+
+def print_results(results, baseline=None):
+    """Print tables of the phase times, peak memory, model memory and output size of every case, against baseline's
+    when given."""
+    baseline_cases = {case["name"]: case for case in (baseline or {}).get("cases", [])}
+    print_table(results, baseline_cases, "seconds", "ms", 1000)
+    print()
+    print_table(results, baseline_cases, "peak_bytes", "peak traced MiB", 1 / (1 << 20))
+    print()
+    print_memory_table(results, baseline_cases)
+    print()
+    print_output_table(results, baseline_cases)
+    if baseline:
+        print(f"Ratios are against {baseline['environment'].get('revision')}, below 1 is faster or smaller.")
+    print(f"Peak RSS {results['environment']['max_rss_kb'] / 1024:.0f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="Cases to run")
+    parser.add_argument("--scales", nargs="+", type=int, default=[2, 8], help="Multipliers for each case")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs is reported")
+    parser.add_argument("--implicit-localparams",
+                        choices=yis_gen.IMPLICIT_LOCALPARAMS_POLICIES,
+                        default="all",
+                        help="yis_gen's --implicit-localparams policy")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    options = parser.parse_args()
+
+    os.chdir(ROOT) # yis_gen finds its schemas relative to the working directory
+    log = cmn_logging.build_logger("yis", level=cmn_logging.WARNING)
+    # Compile the schemas and templates once, outside of any measurement
+    run_case("warmup", case_params("baseline", 1), 1, log)
+    cases = []
+    for case in options.cases:
+        for scale in [1] if case == "baseline" else [scale for scale in options.scales if scale != 1]:
+            name = case if case == "baseline" else f"{case}_x{scale}"
+            print(f"Running {name}", file=sys.stderr)
+            cases.append(
+                run_case(name, case_params(case, scale), options.repeat, log,
+                         ["--implicit-localparams", options.implicit_localparams]))
+
+    results = OrderedDict([
+        ("version", RESULTS_VERSION),
+        ("environment",
+         OrderedDict([
+             ("revision", git_revision()),
+             ("date", datetime.datetime.now().isoformat(timespec="seconds")),
+             ("python", platform.python_version()),
+             ("platform", platform.platform()),
+             ("repeat", options.repeat),
+             ("implicit_localparams", options.implicit_localparams),
+             ("max_rss_kb", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+         ])),
+        ("cases", cases),
+    ])
+    baseline = None
+    if options.compare:
+        with open(options.compare) as fileh:
+            baseline = json.load(fileh)
+        if baseline.get("version") != RESULTS_VERSION:
+            sys.exit(f"{options.compare} has results version {baseline.get('version')}, expected {RESULTS_VERSION}")
+    print_results(results, baseline)
+    if options.output:
+        with open(options.output, "w") as fileh:
+            json.dump(results, fileh, indent=2)
+            fileh.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Measure the pack, unpack, get and set functions of the C headers (yis_gen.py --gen-c-hdr), compiled.
+
+Run from the repo root (needs a C compiler):
+
+    python3 tests/benchmarks/c_hdr_benchmark.py [--records N] [--iterations N] [--cc CC] [--cflags FLAGS]
+                                                 [--types NAME ...]
+
+The headers of the golden pkgs are generated into a temporary directory with a C driver timing every struct of them
+(or just --types) on --records random packed records, the best of --iterations passes over them is reported in ns
+per record. unpack and pack convert all of them to and from the C struct, get reads every field with its getter and
+set writes every field with its setter. For comparison, generic get and set read and write the same fields through
+a table of their offsets and widths with a loop shifting and masking one word at a time, the way it's usually done
+by hand. Before timing, every record is checked: packing it back after unpacking it gives the bits of the fields the
+C struct holds, setting every field with what its getter returns gives the bits of every field.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import golden_pkgs # pylint: disable=wrong-import-position
+import yis_gen # pylint: disable=wrong-import-position,wrong-import-order
+
+DRIVER_PROLOGUE = r"""
+#define _POSIX_C_SOURCE 199309L
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+static uint64_t state = 0x9e3779b97f4a7c15ULL;
+static volatile uint64_t sink;
+
+static uint64_t next_random(void) {
+    state ^= state << 13;
+    state ^= state >> 7;
+    state ^= state << 17;
+    return state;
+}
+
+static double now(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+/* Field bits read and written a word at a time through a table, not knowing the offsets at compile time */
+typedef struct { unsigned offset; unsigned width; } field_t;
+
+static uint64_t generic_get(const uint64_t *bits, unsigned offset, unsigned width) {
+    uint64_t value = 0;
+    unsigned done = 0;
+    while (done < width) {
+        unsigned bit = offset + done, shift = bit % 64, chunk = 64 - shift;
+        if (chunk > width - done) chunk = width - done;
+        uint64_t mask = chunk == 64 ? ~0ULL : (1ULL << chunk) - 1;
+        value |= ((bits[bit / 64] >> shift) & mask) << done;
+        done += chunk;
+    }
+    return value;
+}
+
+static void generic_set(uint64_t *bits, unsigned offset, unsigned width, uint64_t value) {
+    unsigned done = 0;
+    while (done < width) {
+        unsigned bit = offset + done, shift = bit % 64, chunk = 64 - shift;
+        if (chunk > width - done) chunk = width - done;
+        uint64_t mask = chunk == 64 ? ~0ULL : (1ULL << chunk) - 1;
+        bits[bit / 64] = (bits[bit / 64] & ~(mask << shift)) | (((value >> done) & mask) << shift);
+        done += chunk;
+    }
+}
+
+#define TIME(seconds, ...)                                         \
+    do {                                                           \
+        for (int pass = 0; pass < iterations; pass++) {            \
+            double start = now();                                  \
+            for (long r = 0; r < records; r++) { __VA_ARGS__; }    \
+            double elapsed = now() - start;                        \
+            if (pass == 0 || elapsed < seconds) seconds = elapsed; \
+        }                                                          \
+    } while (0)
+"""
+
+DRIVER_TYPE = r"""
+static int bench_{name}(long records, int iterations) {{
+    const uint64_t pack_mask[{words}] = {{{pack_mask}}};
+    const uint64_t field_mask[{words}] = {{{field_mask}}};
+    static const field_t fields[] = {{{table}}};
+    const int field_count = sizeof(fields) / sizeof(fields[0]);
+    uint64_t (*bits)[{words}] = calloc(records, sizeof(*bits));
+    uint64_t (*packed)[{words}] = calloc(records, sizeof(*packed));
+    {name} *structs = calloc(records, sizeof(*structs));
+    uint64_t wide[{words}];
+    uint64_t sum = 0;
+    double unpack = 0, pack = 0, get = 0, set = 0, generic_get_time = 0, generic_set_time = 0;
+    (void)wide;
+    for (long r = 0; r < records; r++) {{
+        for (int w = 0; w < {words}; w++) bits[r][w] = next_random();
+    }}
+    for (long r = 0; r < records; r++) {{
+        {name} s;
+        uint64_t check[{words}] = {{0}};
+        {name}_unpack(bits[r], &s);
+        {name}_pack(&s, packed[r]);
+{set_all}
+        for (int w = 0; w < {words}; w++) {{
+            if (packed[r][w] != (bits[r][w] & pack_mask[w]) || check[w] != (bits[r][w] & field_mask[w])) {{
+                fprintf(stderr, "{name}: record %ld word %d doesn't round trip\n", r, w);
+                return 1;
+            }}
+        }}
+    }}
+    TIME(unpack, {name}_unpack(bits[r], &structs[r]));
+    TIME(pack, {name}_pack(&structs[r], packed[r]));
+    TIME(get, {get_all});
+    TIME(set, {{
+        uint64_t *check = packed[r];
+        uint64_t *from = bits[r];
+{set_from}
+    }});
+    TIME(generic_get_time, for (int f = 0; f < field_count; f++) sum += generic_get(bits[r], fields[f].offset,
+                                                                                  fields[f].width));
+    TIME(generic_set_time, for (int f = 0; f < field_count; f++) generic_set(packed[r], fields[f].offset,
+                                                                             fields[f].width, bits[r][0]));
+    sink = sum;
+    printf("{name} %d %d %.2f %.2f %.2f %.2f %.2f %.2f\n", {width}, field_count, unpack / records * 1e9,
+           pack / records * 1e9, get / records * 1e9, set / records * 1e9, generic_get_time / records * 1e9,
+           generic_set_time / records * 1e9);
+    free(bits);
+    free(packed);
+    free(structs);
+    return 0;
+}}
+"""
+
+
+def generate_headers(output_dir, log):
+    """Generate the C header of each golden pkg into output_dir, return the structs of every pkg, in order."""
+    structs = []
+    for pkg in golden_pkgs.generate("c-hdr", output_dir, ".h", log):
+        structs.extend(item for item in pkg.children.values() if isinstance(item, yis_gen.PkgStruct))
+    return structs
+
+
+def mask_words(fields, words):
+    """Return the C initializer of the words of a record with the bits of fields ((offset, width) pairs) set."""
+    mask = 0
+    for offset, width in fields:
+        mask |= ((1 << width) - 1) << offset
+    return ", ".join(f"0x{(mask >> (64 * word)) & ((1 << 64) - 1):x}ULL" for word in range(words))
+
+
+def packed_fields(item, header, base=0):
+    """Return the (offset, width) of the fields pack() of item in header converts, nested structs' ones included.
+
+    The fields pack() leaves to the getters and setters say so in a comment.
+    """
+    layout = item.bit_layout
+    offsets = layout.record_offsets(item.record_cycles())
+    pack_body = re.search(rf"void {item.name}_pack\(.*?\n}}", header, re.S).group(0)
+    skipped = set(re.findall(r"// (\w+) (?:is a union|\(\d+ bits\) doesn't fit)", pack_body))
+    fields = []
+    for row in layout.top_level_rows():
+        node = layout.nodes[row]
+        if node.name in skipped or not node.computed_width:
+            continue
+        if isinstance(node.sv_type, yis_gen.PkgStruct):
+            fields.extend(packed_fields(node.sv_type, header, base + offsets[row]))
+        else:
+            fields.append((base + offsets[row], node.computed_width))
+    return fields
+
+
+def render_type(item, header):
+    """Render the bench_<item> function of the driver, timing item's functions in header (all the headers)."""
+    layout = item.bit_layout
+    words = layout.record_words(item.record_cycles())
+    offsets = layout.record_offsets(item.record_cycles())
+    fields = [(layout.nodes[row].name, offsets[row], layout.msbs[row] - layout.lsbs[row] + 1)
+              for row in layout.top_level_rows() if layout.msbs[row] >= layout.lsbs[row]]
+
+    get_all = []
+    set_all = []
+    set_from = []
+    for name, _, width in fields:
+        if width > 64:
+            get_all.append(f"{item.name}_get_{name}(bits[r], wide)")
+            set_all.extend(
+                [f"        {item.name}_get_{name}(bits[r], wide);", f"        {item.name}_set_{name}(check, wide);"])
+            set_from.extend(
+                [f"        {item.name}_get_{name}(from, wide);", f"        {item.name}_set_{name}(check, wide);"])
+        else:
+            get_all.append(f"(sum += {item.name}_get_{name}(bits[r]))")
+            set_all.append(f"        {item.name}_set_{name}(check, {item.name}_get_{name}(bits[r]));")
+            set_from.append(f"        {item.name}_set_{name}(check, from[0] ^ r);")
+    return DRIVER_TYPE.format(name=item.name,
+                              words=words,
+                              width=layout.width,
+                              pack_mask=mask_words(packed_fields(item, header), words),
+                              field_mask=mask_words([(lsb, width) for _, lsb, width in fields], words),
+                              table=", ".join(f"{{{lsb}, {min(width, 64)}}}" for _, lsb, width in fields),
+                              get_all="; ".join(get_all),
+                              set_all="\n".join(set_all),
+                              set_from="\n".join(set_from))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1 << 16, help="Random records each type is timed on")
+    parser.add_argument("--iterations", type=int, default=20, help="Best of this many passes is reported")
+    parser.add_argument("--cc", default=os.environ.get("CC", "cc"), help="C compiler")
+    parser.add_argument("--cflags", default="-std=c99 -O2 -Wall -Wextra", help="C compiler flags")
+    parser.add_argument("--types", nargs="+", help="Only time these structs (default: all of them)")
+    options = parser.parse_args()
+
+    log = golden_pkgs.setup()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        structs = generate_headers(tmpdir, log)
+        header = ""
+        for pkg, _ in golden_pkgs.PKGS:
+            with open(os.path.join(tmpdir, f"{pkg}.h")) as hfile:
+                header += hfile.read()
+        driver = [DRIVER_PROLOGUE] + [f'#include "{pkg}.h"' for pkg, _ in golden_pkgs.PKGS]
+        timed = [item for item in structs if not options.types or item.name in options.types]
+        for item in timed:
+            driver.append(render_type(item, header))
+        driver.append("int main(int argc, char **argv) {")
+        driver.append("    long records = atol(argv[1]);")
+        driver.append("    int iterations = atoi(argv[2]);")
+        driver.append("    (void)argc;")
+        for item in timed:
+            driver.append(f"    if (bench_{item.name}(records, iterations)) return 1;")
+        driver.append("    return 0;")
+        driver.append("}")
+        source = os.path.join(tmpdir, "driver.c")
+        with open(source, "w") as cfile:
+            cfile.write("\n".join(driver) + "\n")
+        binary = os.path.join(tmpdir, "driver")
+        subprocess.run([options.cc] + options.cflags.split() + ["-I", tmpdir, source, "-o", binary], check=True)
+        result = subprocess.run([binary, str(options.records), str(options.iterations)],
+                                check=True,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True)
+
+    print(f"{'struct':22} {'bits':>5} {'fields':>6} {'unpack':>8} {'pack':>8} {'get':>8} {'set':>8} "
+          f"{'generic get':>12} {'generic set':>12}   (ns/record)")
+    for line in result.stdout.splitlines():
+        name, width, fields, *times = line.split()
+        print(f"{name:22} {width:>5} {fields:>6} " + " ".join(f"{float(time):8.2f}" for time in times[:4]) + " " +
+              " ".join(f"{float(time):12.2f}" for time in times[4:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Measure the throughput of the python codecs (yis_gen.py --gen-py) on large arrays of records.
+
+Run from the repo root (needs NumPy):
+
+    python3 tests/benchmarks/codec_benchmark.py [--records N] [--repeat N] [--python-records N] [--codecs NAME ...]
+
+The codecs of the golden pkgs are generated into a temporary directory and imported. Each one decodes --records
+random records (10M by default), decodes them again with the enum names and encodes the decoded fields back, the best
+of --repeat runs is reported in millions of records and MB of records per second. The records encoded back are
+checked against the ones decoded, with the bits no field covers cleared. For comparison, --python-records of them are
+also decoded one by one with python integer shifts and masks, the way it's done by hand, and checked against the
+codec.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import golden_pkgs # pylint: disable=wrong-import-position
+
+
+def generate_modules(output_dir, log):
+    """Generate the codec module of each golden pkg into output_dir and import them."""
+    pkgs = golden_pkgs.generate("py", output_dir, "_yis.py", log)
+    sys.path.insert(0, output_dir)
+    return [importlib.import_module(f"{pkg.name}_yis") for pkg in pkgs]
+
+
+def random_records(codec, count, rng):
+    """Return count random records of codec."""
+    return rng.integers(0, 1 << 64, size=(count, ) + codec.record_shape, dtype=np.uint64)
+
+
+def python_decode(codec, records):
+    """Decode records one at a time with python integers, like hand written bit slicing."""
+    decoded = {path: [] for path in codec.fields}
+    for record in records.reshape(len(records), -1).tolist():
+        value = 0
+        for word in reversed(record):
+            value = (value << 64) | word
+        for path, (offset, width, _) in codec.fields.items():
+            decoded[path].append((value >> offset) & ((1 << width) - 1))
+    return decoded
+
+
+def coverage(codec):
+    """Return the words of a record with the bits of every field set."""
+    mask = 0
+    for offset, width, _ in codec.fields.values():
+        mask |= ((1 << width) - 1) << offset
+    return np.array([(mask >> (64 * word)) & ((1 << 64) - 1) for word in range(codec.words)], dtype=np.uint64)
+
+
+def best_of(repeat, function, *args, **kwargs):
+    """Return the best time of repeat calls of function, in seconds, and the result of the last one."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def check(codec, records, decoded, encoded, python_count):
+    """Check encoded against records, and the first python_count decoded records against python_decode."""
+    words = records.reshape(len(records), -1)
+    if not np.array_equal(encoded.reshape(len(records), -1), words & coverage(codec)):
+        raise AssertionError(f"{codec.name}: the records encoded back differ from the ones decoded")
+    expected = python_decode(codec, records[:python_count])
+    for path, values in expected.items():
+        value = decoded[path][:python_count]
+        if value.ndim > 1:
+            value = [sum(int(word) << (64 * index) for index, word in enumerate(row)) for row in value]
+        if list(value) != values:
+            raise AssertionError(f"{codec.name}: {path} decodes differently with python integers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10000000, help="Records each codec decodes and encodes")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs is reported")
+    parser.add_argument("--python-records",
+                        type=int,
+                        default=100000,
+                        help="Records decoded one by one with python integers")
+    parser.add_argument("--codecs", nargs="+", help="Only run these codecs (default: all of them)")
+    options = parser.parse_args()
+
+    log = golden_pkgs.setup()
+    rng = np.random.default_rng(0)
+    print(f"{'codec':22} {'fields':>6} {'bits':>5} {'decode':>15} {'decode names':>15} {'encode':>15} "
+          f"{'python decode':>15}   (M records/s, MB/s)")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for module in generate_modules(tmpdir, log):
+            for name, codec in module.CODECS.items():
+                if options.codecs and name not in options.codecs:
+                    continue
+                records = random_records(codec, options.records, rng)
+                decode, decoded = best_of(options.repeat, codec.decode, records)
+                names, _ = best_of(options.repeat, codec.decode, records, enum_names=True)
+                encode, encoded = best_of(options.repeat, codec.encode, decoded)
+                python_count = min(options.python_records, options.records)
+                python, _ = best_of(1, python_decode, codec, records[:python_count])
+                check(codec, records, decoded, encoded, python_count)
+
+                megabytes = records.nbytes / 1e6
+                columns = [
+                    f"{options.records / seconds / 1e6:6.1f} {megabytes / seconds:8.0f}"
+                    for seconds in (decode, names, encode)
+                ]
+                columns.append(
+                    f"{python_count / python / 1e6:6.2f} {megabytes / options.records * python_count / python:8.1f}")
+                print(f"{name:22} {len(codec.fields):6} {codec.cycles * codec.cycle_width:5} " + " ".join(columns))
+                del records, decoded, encoded
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Measure the throughput of yis_decode.py on dumps of random records of the golden pkgs' types.
+
+Run from the repo root (needs NumPy):
+
+    python3 tests/benchmarks/decode_benchmark.py [--records N] [--jobs N ...] [--chunk-bytes N]
+                                                 [--python-records N] [--types PKG::NAME ...]
+
+The pkgs are elaborated once, then for each type a binary dump and a hex dump of --records random records (1M by
+default) are written to a temporary directory and decoded to CSV and to JSON lines with every --jobs, reporting
+thousands of records and MB of input per second. Every run's output is checked to be the same as the one of the
+first. For comparison, --python-records of them are decoded to CSV one by one with python integer shifts and masks,
+the way an ad-hoc script would, and checked against the decoder.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import golden_pkgs # pylint: disable=wrong-import-position
+import yis_decode # pylint: disable=wrong-import-position,wrong-import-order
+
+TYPES = [
+    "test_pkg_b::write_cmd_t", "test_pkg_b::several_things_t", "test_pkg_b::pipelined_write_t", "test_pkg_c::addr_t"
+]
+
+
+def write_dumps(decoder, count, directory, rng):
+    """Write count random records of decoder as a binary and a hex dump in directory, return their paths and the
+    records."""
+    records = rng.integers(0, 1 << 64, size=(count, decoder.words), dtype=np.uint64)
+    binary = os.path.join(directory, "records.bin")
+    records.astype("<u8").tofile(binary)
+    hex_dump = os.path.join(directory, "records.hex")
+    with open(hex_dump, "w") as hfile:
+        cycles = records.reshape(count * decoder.cycles, decoder.cycle_words)
+        for words in cycles.tolist():
+            value = 0
+            for word in reversed(words):
+                value = (value << 64) | word
+            hfile.write(f"{value:x}\n")
+    return binary, hex_dump, records
+
+
+def python_decode(decoder, records):
+    """Decode records to CSV one at a time with python integers, like a hand written script."""
+    lines = [decoder.header]
+    for record in records.tolist():
+        value = 0
+        for word in reversed(record):
+            value = (value << 64) | word
+        cells = []
+        for _, offset, width, names in decoder.fields:
+            field = (value >> offset) & ((1 << width) - 1)
+            cells.append(names.get(field, str(field)) if names else str(field))
+        lines.append(",".join(cells) + "\n")
+    return "".join(lines)
+
+
+def time_decode(decoder, path, input_format, jobs, chunk_bytes, log):
+    """Return the time decoding path takes and its output."""
+    output = io.StringIO()
+    start = time.perf_counter()
+    yis_decode.decode(decoder, path, input_format, output, jobs, chunk_bytes, log)
+    return time.perf_counter() - start, output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000000, help="Records of each dump")
+    parser.add_argument("--jobs",
+                        type=int,
+                        nargs="+",
+                        default=sorted({1, os.cpu_count() or 1}),
+                        help="Decode with each of these numbers of processes (default: 1 and one per CPU)")
+    parser.add_argument("--chunk-bytes", type=int, default=yis_decode.DEFAULT_CHUNK_BYTES, help="yis_decode chunks")
+    parser.add_argument("--python-records",
+                        type=int,
+                        default=100000,
+                        help="Records decoded one by one with python integers")
+    parser.add_argument("--types", nargs="+", default=TYPES, help="Types to decode")
+    options = parser.parse_args()
+
+    log = golden_pkgs.setup()
+    yis = golden_pkgs.elaborate(log)
+    rng = np.random.default_rng(0)
+    print(f"{'type':30} {'input':6} {'output':6} {'jobs':>4} {'k records/s':>12} {'MB/s':>8}")
+    for type_name in options.types:
+        item = yis_decode.find_type(yis, type_name, log)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            decoders = {output: yis_decode.RecordDecoder(item, output) for output in ("csv", "jsonl")}
+            binary, hex_dump, records = write_dumps(decoders["csv"], options.records, tmpdir, rng)
+            for input_format, path in (("binary", binary), ("hex", hex_dump)):
+                megabytes = os.path.getsize(path) / 1e6
+                for output, decoder in decoders.items():
+                    expected = None
+                    for jobs in options.jobs:
+                        seconds, text = time_decode(decoder, path, input_format, jobs, options.chunk_bytes, log)
+                        if expected is None:
+                            expected = text
+                        elif text != expected:
+                            raise AssertionError(f"{type_name}: {jobs} jobs decode {path} differently")
+                        print(f"{type_name:30} {input_format:6} {output:6} {jobs:4} "
+                              f"{options.records / seconds / 1e3:12.0f} {megabytes / seconds:8.1f}")
+                    if output == "csv" and input_format == "binary":
+                        csv_text = expected
+
+            count = min(options.python_records, options.records)
+            start = time.perf_counter()
+            text = python_decode(decoders["csv"], records[:count])
+            seconds = time.perf_counter() - start
+            if not csv_text.startswith(text):
+                raise AssertionError(f"{type_name}: decodes differently with python integers")
+            print(f"{type_name:30} {'binary':6} {'python':6} {1:4} {count / seconds / 1e3:12.0f} "
+                  f"{records[:count].nbytes / 1e6 / seconds:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
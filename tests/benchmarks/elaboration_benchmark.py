@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Time elaboration and computed attribute reads on a large synthetic pkg.
+
+Run from the repo root:
+
+    python3 tests/benchmarks/elaboration_benchmark.py [--items N] [--reads N] [--repeat N] [--baseline DIR]
+
+--baseline points at another checkout of yis (e.g. a git worktree of an older commit), its yis_gen is timed on the
+same pkg and both are reported side by side.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+import cmn_logging # pylint: disable=wrong-import-position
+
+
+def load_yis_gen(repo, name):
+    """Import yis_gen.py from repo under a unique module name."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(repo, "yis_gen.py"))
+    module = importlib.util.module_from_spec(spec)
+    # yis_gen looks its own classes up in sys.modules
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_pkg(items):
+    """Return a pkg with items of each kind, linked to each other, some of them by forward references."""
+    params = []
+    for i in range(items):
+        # Even localparams refer forward to the next one, odd ones back to the previous odd one
+        if i % 2 == 0:
+            value = f"P_{i + 1}.value % 13 + 1" if i + 1 < items else 5
+        else:
+            value = f"P_{i - 2}.value % 13 + 1" if i > 1 else 5
+        params.append({"name": f"P_{i}", "value": value, "doc_summary": "synthetic localparam"})
+    enums = [{
+        "name": f"STATE_{i}_E",
+        "width": f"P_{i}_WIDTH.value + 2",
+        "doc_summary": "synthetic enum",
+        "values": [{
+            "name": f"STATE_{i}_{j}",
+            "doc_summary": "synthetic enum value"
+        } for j in range(4)],
+    } for i in range(items)]
+    structs = []
+    for i in range(items):
+        fields = [{
+            "name": f"f_{j}",
+            "type": "logic",
+            "width": f"P_{(i + j) % items}.value",
+            "doc_summary": "synthetic field",
+        } for j in range(4)]
+        fields.append({"name": f"state_{i}", "type": f"STATE_{i}_E", "doc_summary": "type.doc_summary"})
+        if i:
+            fields.append({"name": f"prev_{i}", "type": f"arr_{i - 1}_t", "doc_summary": "synthetic nested type"})
+        structs.append({"name": f"s_{i}_t", "doc_summary": "synthetic struct", "fields": fields})
+    typedefs = [{
+        "name": f"arr_{i}_t",
+        "base_type": f"STATE_{i}_E",
+        "width": f"P_{i}.value",
+        "doc_summary": "synthetic typedef",
+    } for i in range(items)]
+    return {
+        "doc_summary": "elaboration benchmark",
+        "localparams": params,
+        "enums": enums,
+        "structs": structs,
+        "typedefs": typedefs
+    }
+
+
+def model_nodes(yis):
+    """Return every pkg item and its children."""
+    nodes = []
+    for pkg in yis._pkgs.values(): # pylint: disable=protected-access
+        for item in pkg.children.values():
+            nodes.append(item)
+            nodes.extend(item.children.values())
+    return nodes
+
+
+def time_it(function, repeat):
+    """Return the best of repeat runs, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(yis_gen, pkg_file, options, log):
+    """Return (elaboration seconds, computed attribute read seconds, number of reads) for one yis_gen module."""
+
+    def elaborate():
+        args = yis_gen.parse_args(["--pkgs", pkg_file])
+        return yis_gen.Yis(args.pkgs, log, options=args)
+
+    elaboration = time_it(elaborate, options.repeat)
+
+    # Reads of the computed attributes as the templates do them, once the model is elaborated
+    attributes = []
+    for node in model_nodes(elaborate()):
+        for attr in ("computed_width", "computed_value"):
+            if hasattr(node, attr):
+                attributes.append((node, attr))
+
+    def read():
+        for _ in range(options.reads):
+            for node, attr in attributes:
+                getattr(node, attr)
+
+    return elaboration, time_it(read, options.repeat), len(attributes) * options.reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=400, help="Number of localparams, enums, typedefs and structs")
+    parser.add_argument("--reads", type=int, default=20, help="Times every computed attribute is read")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs is reported")
+    parser.add_argument("--baseline", help="Another yis checkout to compare against")
+    options = parser.parse_args()
+
+    log = cmn_logging.build_logger("yis", level=cmn_logging.WARNING)
+    implementations = [("current", load_yis_gen(ROOT, "yis_gen"))]
+    if options.baseline:
+        implementations.insert(0, ("baseline", load_yis_gen(os.path.abspath(options.baseline), "baseline_yis_gen")))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pkg_file = os.path.join(tmpdir, "elab_bench.yis")
+        with open(pkg_file, "w") as fileh:
+            yaml.safe_dump(synthetic_pkg(options.items), fileh)
+        for name, yis_gen in implementations:
+            results.append((name, ) + benchmark(yis_gen, pkg_file, options, log))
+
+    print(f"{'':10} {'elaborate (s)':>14} {'reads':>10} {'ns/read':>8}")
+    for name, elaboration, read, reads in results:
+        print(f"{name:10} {elaboration:14.3f} {reads:10} {read / reads * 1e9:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
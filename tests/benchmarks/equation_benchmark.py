@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Compare the compiled Equation engine against the previous ast/astor/eval implementation.
+
+Run from the repo root:
+
+    python3 tests/benchmarks/equation_benchmark.py [--localparams N] [--repeat N]
+
+A synthetic pkg with chained localparam equations is elaborated once. Every equation in the model is then
+re-evaluated (and rendered to HTML) with both implementations, checking they agree, and the full elaboration is
+timed with each implementation swapped in.
+"""
+
+import argparse
+import ast
+import os
+import re
+import sys
+import tempfile
+import time
+
+import astor
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+import cmn_logging # pylint: disable=wrong-import-position
+import yis_gen # pylint: disable=wrong-import-position
+
+
+class LegacyEquation(ast.NodeTransformer):
+    """The previous Equation: ast.parse, a NodeTransformer pass, astor regeneration and eval, per instance."""
+
+    class LinkNode(ast.Num): # pylint: disable=too-few-public-methods
+        """Custom node to store information to another YisNode"""
+
+        def __init__(self, value, link, attribute):
+            self.link = link
+            self.attribute = attribute
+            super().__init__(value)
+
+    astor.op_util.precedence_data[LinkNode] = astor.op_util.precedence_data[ast.Num]
+
+    class TextSourceGenerator(astor.SourceGenerator): # pylint: disable=too-few-public-methods
+        """Support of LinkNode rendering"""
+
+        def visit_LinkNode(self, node): # pylint: disable=invalid-name
+            """For text generation, just give the computed numerical value."""
+            self.visit_Num(node)
+
+    class HtmlSourceGenerator(astor.SourceGenerator): # pylint: disable=too-few-public-methods
+        """Rerender the equation, but replace node references with html links to the objects."""
+        link_map = {}
+
+        def visit_LinkNode(self, node): # pylint: disable=invalid-name
+            """Return the precalculated link."""
+            self.write(self.link_map[node])
+
+    def __init__(self, yisnode, equation):
+        super().__init__()
+        self.yisnode = yisnode
+        self.equation = equation
+        self.simple_eq = False
+        if isinstance(equation, int):
+            self._result = equation
+            self.simple_eq = True
+            return
+        self.linked_nodes = []
+        equation = equation.replace("::", ".")
+        self.tree_root = ast.parse(equation)
+        self.visit(self.tree_root)
+        new_eq = astor.to_source(self.tree_root, source_generator_class=self.TextSourceGenerator)
+        try:
+            self._result = eval(new_eq, vars(yis_gen)) # pylint: disable=eval-used
+        except NameError as exc:
+            name = re.search("name '(.*)' is not defined", exc.args[0]).group(1)
+            raise yis_gen.EquationError(f"Can't find '.width' or '.value' on the end of '{name}' referenced symbols")
+
+    computed_value = yis_gen.Equation.computed_value
+    computed_width = yis_gen.Equation.computed_width
+    get_doc_link = yis_gen.Equation.get_doc_link
+    render_rtl = yis_gen.Equation.render_rtl
+
+    def visit_Attribute(self, node): # pylint: disable=invalid-name
+        """Convert symbol references to LinkNodes holding their value."""
+        if isinstance(node.value, ast.Name):
+            symbol = node.value.id
+            pkg = self.yisnode.get_nonyis_root().name
+        else:
+            symbol = node.value.attr
+            pkg = node.value.value.id
+        if "math" in [symbol, pkg]:
+            return super().generic_visit(node)
+        link = self.yisnode.resolve_link_from_str(
+            f"{pkg}::{symbol}",
+            allowed_symbols=[yis_gen.Pkg.LOCALPARAMS, yis_gen.Pkg.ENUMS, yis_gen.Pkg.TYPEDEFS, yis_gen.Pkg.STRUCTS])
+        if link is None:
+            raise yis_gen.EquationError
+        replacement_node = self.LinkNode(getattr(link, f"computed_{node.attr}"), link, node.attr)
+        self.linked_nodes.append(replacement_node)
+        return replacement_node
+
+    def visit_Expr(self, node): # pylint: disable=invalid-name
+        """Find the top expression which makes eval easier."""
+        if not isinstance(self.tree_root, ast.Expr):
+            self.tree_root = node
+        return super().generic_visit(node)
+
+    def render_html(self, reference_yisnode):
+        """Walk the AST and generate links for all the yis nodes."""
+        if self.simple_eq:
+            return self.equation
+        html_map = {}
+        for node in self.linked_nodes:
+            html_map[node] = reference_yisnode.html_link_attribute_from_link(node.link, extra_text=f".{node.attribute}")
+
+        class LocalHtmlSourceGenerator(self.HtmlSourceGenerator): # pylint: disable=too-few-public-methods
+            """A derived class to have access to set link_map."""
+            link_map = html_map
+
+        return astor.to_source(self.tree_root, source_generator_class=LocalHtmlSourceGenerator)
+
+
+def synthetic_pkg(localparams):
+    """Return a pkg with chained localparam equations, plus structs whose field widths are equations."""
+    params = [{"name": "P_0", "value": 7, "doc_summary": "seed"}]
+    for i in range(1, localparams):
+        params.append({
+            "name": f"P_{i}",
+            "value": f"P_{i - 1}.value % 97 + clog2(P_{i // 2}.value + 1) * 3 + math.ceil(P_{i // 3}.value / 5)",
+            "doc_summary": "chained",
+        })
+    structs = []
+    for i in range(localparams // 10):
+        fields = [{
+            "name": f"f_{j}",
+            "type": "logic",
+            "width": f"P_{(i * 8 + j) % localparams}_WIDTH.value + 1",
+            "doc_summary": "field",
+        } for j in range(8)]
+        structs.append({"name": f"s_{i}_t", "doc_summary": "fields with equation widths", "fields": fields})
+    return {"doc_summary": "equation benchmark", "localparams": params, "structs": structs}
+
+
+def elaborate(pkg_file, log):
+    """Parse and elaborate pkg_file, returns the Yis instance."""
+    options = yis_gen.parse_args(["--pkgs", pkg_file])
+    return yis_gen.Yis(options.pkgs, log, options=options)
+
+
+def model_equations(yis):
+    """Yield (node, equation text) for every non-trivial equation in the elaborated model."""
+    for pkg in yis._pkgs.values(): # pylint: disable=protected-access
+        nodes = list(pkg.localparams.values())
+        for struct in pkg.structs.values():
+            nodes.extend(struct.children.values())
+        for node in nodes:
+            for attr in ("width", "value"):
+                equation = getattr(node, attr, None)
+                if isinstance(equation, yis_gen.Equation) and not equation.simple_eq:
+                    yield node, equation.equation
+
+
+def time_it(function, repeat):
+    """Return the best of repeat runs, in seconds. Each run starts with a cold equation cache."""
+    best = None
+    for _ in range(repeat):
+        yis_gen.CompiledEquation._cache.clear() # pylint: disable=protected-access
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--localparams", type=int, default=1000, help="Number of explicit localparams")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs is reported")
+    options = parser.parse_args()
+
+    log = cmn_logging.build_logger("yis", level=cmn_logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pkg_file = os.path.join(tmpdir, "eq_bench.yis")
+        with open(pkg_file, "w") as fileh:
+            yaml.safe_dump(synthetic_pkg(options.localparams), fileh)
+
+        yis = elaborate(pkg_file, log)
+        equations = list(model_equations(yis))
+        for node, text in equations:
+            new, legacy = yis_gen.Equation(node, text), LegacyEquation(node, text)
+            if new.computed_value != legacy.computed_value or new.render_html(node) != legacy.render_html(node):
+                sys.exit(f"Mismatch for {node.name}: {text}")
+        print(f"{len(equations)} equations in the model, both implementations agree")
+
+        def evaluate(equation_class):
+            for node, text in equations:
+                equation_class(node, text)
+
+        def render_html(equation_class):
+            for node, text in equations:
+                equation_class(node, text).render_html(node)
+
+        def full_elaboration(equation_class):
+            new_equation = yis_gen.Equation
+            try:
+                yis_gen.Equation = equation_class
+                elaborate(pkg_file, log)
+            finally:
+                yis_gen.Equation = new_equation
+
+        results = []
+        for name, function in [("evaluate", evaluate), ("evaluate + render_html", render_html),
+                               ("full elaboration", full_elaboration)]:
+            legacy = time_it(lambda: function(LegacyEquation), options.repeat) # pylint: disable=cell-var-from-loop
+            new = time_it(lambda: function(yis_gen.Equation), options.repeat) # pylint: disable=cell-var-from-loop
+            results.append((name, legacy, new))
+
+    print(f"{'':24} {'legacy':>10} {'compiled':>10} {'speedup':>8}")
+    for name, legacy, new in results:
+        print(f"{name:24} {legacy:10.3f} {new:10.3f} {legacy / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
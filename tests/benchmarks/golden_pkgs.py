@@ -0,0 +1,46 @@
+"""The golden pkgs the benchmarks of the generated code (python codecs, C headers, yis_decode) run on.
+
+Importing this puts the repo root on sys.path, for yis_gen and cmn_logging.
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+import cmn_logging # pylint: disable=wrong-import-position
+import yis_gen # pylint: disable=wrong-import-position
+
+GOLDEN_INPUTS = os.path.join("tests", "golden_inputs")
+
+# Pkg -> the pkgs it's parsed after, the outputs of the pkgs depend on each other in this order
+PKGS = [
+    ("test_pkg_a", []),
+    ("test_pkg_b", ["test_pkg_a"]),
+    ("test_pkg_c", []),
+]
+
+
+def setup():
+    """Change to the repo root, yis_gen finds its schemas relative to the working directory, and return the log."""
+    os.chdir(ROOT)
+    return cmn_logging.build_logger("yis", level=cmn_logging.WARNING)
+
+
+def elaborate(log):
+    """Parse and elaborate all the pkgs of PKGS together, return the Yis."""
+    options = yis_gen.parse_args(["--pkgs"] + [os.path.join(GOLDEN_INPUTS, f"{pkg}.yis") for pkg, _ in PKGS])
+    return yis_gen.Yis(options.pkgs, log, options=options)
+
+
+def generate(generator, output_dir, suffix, log):
+    """Render generator for each pkg of PKGS to output_dir/<pkg><suffix>, return the pkgs, in order."""
+    pkgs = []
+    for pkg, deps in PKGS:
+        paths = [os.path.join(GOLDEN_INPUTS, f"{name}.yis") for name in deps + [pkg]]
+        output_file = os.path.join(output_dir, f"{pkg}{suffix}")
+        options = yis_gen.parse_args(["--pkgs"] + paths + ["--gen", f"{generator}={output_file}"])
+        yis = yis_gen.Yis(options.pkgs, log, options=options)
+        yis.render_output(options.outputs)
+        pkgs.append(yis._pkgs[pkg]) # pylint: disable=protected-access
+    return pkgs
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Generate synthetic pkgs and an intf to benchmark yis_gen with, at any size.
+
+Run from the repo root to write the files somewhere:
+
+    python3 tests/benchmarks/synthetic.py OUTPUT_DIR [--param NAME=VALUE ...]
+
+A chain of pkgs (syn_0, syn_1, ...) is generated, each one referencing the previous one's localparams and structs, plus
+syn_intf using the last pkg. Every pkg has the same content, sized by the parameters in DEFAULTS.
+"""
+
+import argparse
+import os
+from collections import OrderedDict
+
+import yaml
+
+# Parameter -> default value
+DEFAULTS = OrderedDict([
+    ("localparams", 40), # Localparams per pkg, chained equations
+    ("enums", 8), # Enums per pkg
+    ("enum_values", 8), # Explicit values per enum
+    ("range_values", 16), # Values added to each enum by a single range() value
+    ("structs", 16), # Structs per pkg
+    ("struct_fields", 8), # Fields per struct, plus an enum field and a field of the previous pkg's struct
+    ("nesting_depth", 3), # Structs nested inside each other
+    ("unions", 4), # Unions per pkg
+    ("union_fanout", 4), # Fields per union, also the selector fan-out of the addr_macro structs
+    ("addr_macros", 2), # Structs with an addr_macro, per pkg
+    ("addr_depth", 2), # Nested selector/union levels in each addr_macro struct
+    ("chain", 3), # Pkgs in the dependency chain
+    ("intf_components", 4), # Components in the intf
+    ("intf_connections", 4), # Connections per intf component
+])
+
+
+def pkg_name(index):
+    """Name of the index'th pkg in the chain."""
+    return f"syn_{index}"
+
+
+def _letters(index):
+    """A, B, ..., Z, AA, AB, ... addr_macro names can only use letters."""
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord("A") + remainder) + name
+    return name
+
+
+def _width(values):
+    """Bits needed to encode values different values."""
+    return max(1, (values - 1).bit_length())
+
+
+def _localparams(params, prev):
+    localparams = []
+    for i in range(params["localparams"]):
+        if i == 0:
+            value = f"{prev}::P_0.value % 16 + 1" if prev else 8
+        elif prev and i % 4 == 0:
+            value = f"{prev}::P_{i}.value % 16 + 1"
+        else:
+            value = f"P_{i - 1}.value % 16 + 1"
+        localparams.append({"name": f"P_{i}", "value": value, "doc_summary": "synthetic localparam"})
+    return localparams
+
+
+def _enums(params):
+    enums = []
+    explicit, ranged = params["enum_values"], params["range_values"]
+    for i in range(params["enums"]):
+        values = [{"name": f"V{j}", "value": j, "doc_summary": "synthetic enum value"} for j in range(explicit)]
+        if ranged:
+            values.append({"name": "RV", "value": f"range({explicit}, {explicit + ranged})", "doc_summary": "ranged"})
+        enums.append({
+            "name": f"E_{i}_E",
+            "width": _width(explicit + ranged),
+            "doc_summary": "synthetic enum",
+            "values": values
+        })
+    return enums
+
+
+def _structs(params, prev):
+    structs = []
+    localparams = max(1, params["localparams"])
+    for i in range(params["structs"]):
+        fields = [{
+            "name": f"f_{j}",
+            "type": "logic",
+            "width": f"P_{(i + j) % localparams}.value" if params["localparams"] else 4,
+            "doc_summary": "synthetic field",
+        } for j in range(params["struct_fields"])]
+        if params["enums"]:
+            fields.append({"name": "state", "type": f"E_{i % params['enums']}_E", "doc_summary": "type.doc_summary"})
+        if prev:
+            fields.append({"name": "prev", "type": f"{prev}::s_{i}_t", "doc_summary": "type.doc_summary"})
+        if not fields:
+            fields.append({"name": "pad", "type": "logic", "width": 1, "doc_summary": "synthetic field"})
+        structs.append({"name": f"s_{i}_t", "doc_summary": "synthetic struct", "fields": fields})
+
+    # Structs nested inside each other
+    for depth in range(params["nesting_depth"]):
+        inner = {"type": f"n_{depth - 1}_t"} if depth else {"type": "logic", "width": 4}
+        structs.append({
+            "name":
+            f"n_{depth}_t",
+            "doc_summary":
+            "synthetic nested struct",
+            "fields": [{
+                "name": "inner",
+                "doc_summary": "nested",
+                **inner
+            }, {
+                "name": "pad",
+                "type": "logic",
+                "width": 2,
+                "doc_summary": "padding"
+            }],
+        })
+    return structs
+
+
+def _unions(params):
+    if not params["unions"]:
+        return [], []
+    # Every field of a union must be as wide, alternate between a logic and a struct of the same width
+    structs = [{
+        "name":
+        "u_branch_t",
+        "doc_summary":
+        "union branch",
+        "fields": [{
+            "name": name,
+            "type": "logic",
+            "width": 8,
+            "doc_summary": "half a branch"
+        } for name in ("lo", "hi")],
+    }]
+    unions = [{
+        "name":
+        f"u_{i}_t",
+        "doc_summary":
+        "synthetic union",
+        "fields": [{
+            "name": f"br_{j}",
+            "doc_summary": "synthetic branch",
+            **({
+                "type": "logic",
+                "width": 16
+            } if j % 2 == 0 else {
+                   "type": "u_branch_t"
+               })
+        } for j in range(max(1, params["union_fanout"]))],
+    } for i in range(params["unions"])]
+    return structs, unions
+
+
+def _addr_macros(params):
+    """Structs with an addr_macro, each level selects one of union_fanout branches of the next level down."""
+    if not params["addr_macros"]:
+        return [], [], []
+    fanout = max(2, params["union_fanout"])
+    enums = []
+    structs = [{
+        "name": "addr_leaf_t",
+        "doc_summary": "synthetic address leaf",
+        "fields": [{
+            "name": "offset",
+            "type": "logic",
+            "width": 12,
+            "doc_summary": "address offset"
+        }],
+    }]
+    unions = []
+    below = "addr_leaf_t"
+    selected = []
+    for depth in range(1, params["addr_depth"] + 1):
+        values = [f"S{depth}_{i}" for i in range(fanout)]
+        enums.append({
+            "name": f"ADDR_SEL_{depth}_E",
+            "width": _width(fanout),
+            "doc_summary": "synthetic address selector",
+            "values": [{
+                "name": value,
+                "doc_summary": "selects a branch"
+            } for value in values],
+        })
+        unions.append({
+            "name":
+            f"addr_u_{depth}_t",
+            "doc_summary":
+            "synthetic address union",
+            "fields": [{
+                "name": f"br_{i}",
+                "type": below,
+                "doc_summary": "type.doc_summary"
+            } for i in range(fanout)],
+        })
+        selected = [{
+            "name": "sel",
+            "type": f"ADDR_SEL_{depth}_E",
+            "selectors": [{
+                "name": "sub",
+                "select_with": values
+            }],
+            "doc_summary": "type.doc_summary",
+        }, {
+            "name": "sub",
+            "type": f"addr_u_{depth}_t",
+            "doc_summary": "type.doc_summary"
+        }]
+        if depth < params["addr_depth"]:
+            structs.append({"name": f"addr_l_{depth}_t", "doc_summary": "synthetic address level", "fields": selected})
+            below = f"addr_l_{depth}_t"
+    if not selected:
+        selected = [{"name": "offset", "type": "logic", "width": 12, "doc_summary": "address offset"}]
+    for i in range(params["addr_macros"]):
+        structs.append({
+            "name":
+            f"addr_top_{i}_t",
+            "addr_macro":
+            f"ADDR_{_letters(i)}",
+            "doc_summary":
+            "synthetic address",
+            "fields": [{
+                "name": "region",
+                "type": "logic",
+                "width": 4,
+                "doc_summary": "address region"
+            }] + selected,
+        })
+    return enums, structs, unions
+
+
+def generate_pkg(params, index):
+    """Return the data of the index'th pkg in the chain."""
+    prev = pkg_name(index - 1) if index else None
+    union_structs, unions = _unions(params)
+    addr_enums, addr_structs, addr_unions = _addr_macros(params)
+    data = {
+        "doc_summary": f"synthetic pkg {index}",
+        "localparams": _localparams(params, prev),
+        "enums": _enums(params) + addr_enums,
+        "structs": _structs(params, prev) + union_structs + addr_structs,
+        "unions": unions + addr_unions,
+    }
+    return {key: value for key, value in data.items() if value}
+
+
+def generate_intf(params):
+    """Return the data of an intf using the last pkg in the chain."""
+    last = pkg_name(params["chain"] - 1)
+    components = []
+    for i in range(params["intf_components"]):
+        ports = [{"name": "valid", "type": "logic", "width": 1, "direction": "output", "doc_summary": "data is valid"}]
+        if params["structs"]:
+            ports.append({
+                "name": "dat",
+                "type": f"{last}::s_{i % params['structs']}_t",
+                "direction": "output",
+                "doc_summary": "type.doc_summary"
+            })
+        if params["enums"]:
+            ports.append({"name": "state", "type": f"{last}::E_0_E", "direction": "input", "doc_summary": "the state"})
+        components.append({
+            "name": f"comp_{i}",
+            "doc_summary": "synthetic component",
+            "connections": [{
+                "name": f"blk{j}"
+            } for j in range(max(1, params["intf_connections"]))],
+            "ports": ports,
+        })
+    return {"doc_summary": "synthetic intf", "components": components}
+
+
+def generate(params=None):
+    """Return an OrderedDict of file name -> data, pkgs in dependency order then the intf (if it has components)."""
+    params = dict(DEFAULTS, **(params or {}))
+    files = OrderedDict()
+    for index in range(max(1, params["chain"])):
+        files[f"{pkg_name(index)}.yis"] = generate_pkg(params, index)
+    if params["intf_components"]:
+        files["syn_intf.yis"] = generate_intf(dict(params, chain=max(1, params["chain"])))
+    return files
+
+
+def write(output_dir, params=None):
+    """Write the generated files to output_dir, returns their paths in dependency order."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, data in generate(params).items():
+        path = os.path.join(output_dir, name)
+        with open(path, "w") as fileh:
+            yaml.safe_dump(data, fileh, sort_keys=False)
+        paths.append(path)
+    return paths
+
+
+def param_override(value):
+    """NAME=VALUE, for argparse."""
+    try:
+        name, number = value.split("=")
+        if name not in DEFAULTS:
+            raise ValueError
+        return name, int(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE with NAME one of {', '.join(DEFAULTS)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", help="Directory to write the .yis files to")
+    parser.add_argument("--param", type=param_override, action="append", default=[], help="Override a parameter")
+    options = parser.parse_args()
+    for path in write(options.output_dir, dict(options.param)):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare loading the jinja templates from source against loading them precompiled (see compile_templates).
+
+Run from the repo root:
+
+    python3 tests/benchmarks/template_benchmark.py [--repeat N]
+
+Every run starts from a fresh Environment, like a new yis_gen process, so the source loader has to lex and compile
+each template while the precompiled loader only imports it.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from jinja2 import FileSystemLoader, ModuleLoader
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+import yis_gen # pylint: disable=wrong-import-position
+
+
+def time_it(function, repeat):
+    """Return the best of repeat runs, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load(loader_factory, name):
+    """Load template name with a fresh Environment."""
+    c_style = yis_gen._is_c_style_template(name) # pylint: disable=protected-access
+    yis_gen._create_template_env(c_style, loader_factory()).get_template(name) # pylint: disable=protected-access
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Best of this many runs is reported")
+    options = parser.parse_args()
+
+    template_dir = yis_gen._get_template_dir() # pylint: disable=protected-access
+    names = FileSystemLoader(template_dir).list_templates()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        compiled = os.path.join(tmpdir, yis_gen.COMPILED_TEMPLATES)
+        start = time.perf_counter()
+        yis_gen.compile_templates(compiled)
+        print(f"compile_templates: {time.perf_counter() - start:.3f}s for {len(names)} templates")
+
+        results = []
+        for name in names:
+            source = time_it(lambda: load(lambda: FileSystemLoader(template_dir), name), options.repeat) # pylint: disable=cell-var-from-loop
+            precompiled = time_it(lambda: load(lambda: ModuleLoader(compiled), name), options.repeat) # pylint: disable=cell-var-from-loop
+            results.append((name, source, precompiled))
+
+    print(f"{'':12} {'source (ms)':>12} {'precompiled (ms)':>17} {'speedup':>8}")
+    for name, source, precompiled in results + [("total", sum(r[1] for r in results), sum(r[2] for r in results))]:
+        print(f"{name:12} {source * 1000:12.2f} {precompiled * 1000:17.2f} {source / precompiled:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
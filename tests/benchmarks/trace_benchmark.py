@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Measure what the trace messages cost a normal run, where no trace category is enabled.
+
+Run from the repo root:
+
+    python3 tests/benchmarks/trace_benchmark.py [--repeat N] [--param NAME=VALUE ...]
+
+First the cost of one disabled message is measured for each way of writing it: the eager log.debug(F"...") yis_gen
+used to have on its hot paths, log.debug with lazy arguments, log.trace, and log.trace guarded by a test of
+log.traced. Then the synthetic pkgs (see synthetic.py) are built and rendered once with every category enabled, to
+count the messages of a run, and the savings of a normal run are bounded from both. Finally the run is timed with
+no category enabled and with all of them, logged to a stream that discards them.
+"""
+
+import argparse
+import collections
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import benchmark_suite # pylint: disable=wrong-import-position
+import synthetic # pylint: disable=wrong-import-position
+import cmn_logging # pylint: disable=wrong-import-position,wrong-import-order
+import yis_gen # pylint: disable=wrong-import-position,wrong-import-order
+
+
+class _CountingHandler(logging.Handler):
+    """Count the trace messages of each category."""
+
+    def __init__(self):
+        super().__init__(level=cmn_logging.TRACE)
+        self.counts = collections.Counter()
+
+    def emit(self, record):
+        if record.levelno == cmn_logging.TRACE:
+            self.counts[record.args[0]] += 1
+
+
+def per_call_ns(log, repeat):
+    """Return the nanoseconds a disabled message costs, for each way of writing it."""
+    doc_type, name = "doc_summary", "some_field"
+    statements = collections.OrderedDict([
+        ("eager log.debug", lambda: log.debug(F"Looking for {doc_type} on {name}")),
+        ("lazy log.debug", lambda: log.debug("Looking for %s on %s", doc_type, name)),
+        ("log.trace", lambda: log.trace("link", "Looking for %s on %s", doc_type, name)),
+        ("guarded log.trace",
+         lambda: "link" in log.traced and log.trace("link", "Looking for %s on %s", doc_type, name)),
+    ])
+    number = 200000
+    results = collections.OrderedDict()
+    for label, statement in statements.items():
+        results[label] = min(timeit.repeat(statement, number=number, repeat=repeat)) / number * 1e9
+    return results
+
+
+def time_run(paths, output_dir, log, categories, repeat):
+    """Return the best time to build and render paths with categories enabled, in seconds."""
+    log.set_trace_categories(categories)
+    best = None
+    for _ in range(repeat):
+        timer = benchmark_suite.PhaseTimer()
+        benchmark_suite.build_and_render(paths, output_dir, log, timer)
+        seconds = sum(timer.seconds.values())
+        best = seconds if best is None else min(best, seconds)
+    log.set_trace_categories([])
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Best of this many runs is reported")
+    parser.add_argument("--param",
+                        type=synthetic.param_override,
+                        action="append",
+                        default=[],
+                        help="Override a synthetic parameter")
+    options = parser.parse_args()
+
+    os.chdir(benchmark_suite.ROOT)
+    log = cmn_logging.build_logger("yis_trace_benchmark", level=cmn_logging.INFO)
+    devnull = open(os.devnull, "w") # pylint: disable=consider-using-with
+    for handler in log.handlers:
+        # Enabled messages are formatted and written, just not anywhere
+        handler.setStream(devnull)
+        handler.setLevel(cmn_logging.TRACE)
+
+    costs = per_call_ns(log, options.repeat)
+    log.setLevel(cmn_logging.TRACE)
+    print(f"{'disabled message':20} {'ns/call':>8}")
+    for label, nanoseconds in costs.items():
+        print(f"{label:20} {nanoseconds:8.0f}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = synthetic.write(os.path.join(tmpdir, "yis"), dict(options.param))
+        counter = _CountingHandler()
+        log.addHandler(counter)
+        time_run(paths, tmpdir, log, yis_gen.TRACE_CATEGORIES, 1)
+        log.removeHandler(counter)
+        messages = sum(counter.counts.values())
+        print(f"\nA run of {len(paths)} synthetic files logs {messages} trace messages when enabled: " +
+              ", ".join(f"{category} {count}" for category, count in counter.counts.most_common()))
+        saved = messages * (costs["eager log.debug"] - costs["guarded log.trace"]) / 1e6
+        print(f"Saving of a normal run, at most (if they all were eager log.debug calls): {saved:.1f}ms")
+
+        disabled = time_run(paths, tmpdir, log, [], options.repeat)
+        enabled = time_run(paths, tmpdir, log, yis_gen.TRACE_CATEGORIES, options.repeat)
+        print(f"Build and render: {disabled * 1000:.1f}ms with no category enabled, "
+              f"{enabled * 1000:.1f}ms with all of them")
+
+
+if __name__ == "__main__":
+    main()
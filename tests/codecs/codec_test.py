@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Check the generated codecs against records whose fields are known, not just against each other.
+
+The python codecs and the C headers are the golden outputs of test_pkg_a, test_pkg_b and test_pkg_c (the gold tests
+keep them the same as what yis_gen generates). Run from the repo root (or through bazel), the C tests need a C compiler
+($CC or cc) and are skipped without one.
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+GOLDEN_INPUTS = os.path.join(ROOT, "tests", "golden_inputs")
+GOLDEN_OUTPUTS = os.path.join(ROOT, "tests", "golden_outputs")
+
+# A pipelined_write_t (an xaction, a word per cycle): a MULTI_WDONE command of 3 cycles, then VALID data 0xaa, 0xbb
+# and 0xcc and DONE data 0xdd
+PIPELINED_WRITE = [0x21b, 0x1aa, 0x1bb, 0x1cc, 0x2dd]
+
+# An idle STD pipelined_write_t, with every other field 0
+IDLE_WRITE = [0x1, 0, 0, 0, 0]
+
+PIPELINED_WRITE_FIELDS = {
+    "cmd_cycle.vld": 1,
+    "cmd_cycle.rsvd": 0,
+    "cmd_cycle.num_cycles": 3,
+    "cmd_cycle.write_type": 3,
+    "dat0.cycle_type": 1,
+    "dat0.dat": 0xaa,
+    "dat1.cycle_type": 1,
+    "dat1.dat": 0xbb,
+    "dat2.cycle_type": 1,
+    "dat2.dat": 0xcc,
+    "dat3.cycle_type": 2,
+    "dat3.dat": 0xdd,
+}
+
+PIPELINED_WRITE_NAMES = {
+    "cmd_cycle.write_type": "MULTI_WDONE",
+    "dat0.cycle_type": "VALID",
+    "dat1.cycle_type": "VALID",
+    "dat2.cycle_type": "VALID",
+    "dat3.cycle_type": "DONE",
+}
+
+# A sub_def_t of test_pkg_a, subfields a to d from the MSB
+SUB_DEF = 0x67
+
+SUB_DEF_FIELDS = {"subfield_a": 1, "subfield_b": 2, "subfield_c": 1, "subfield_d": 3}
+
+DRIVER = r"""
+#include <stdio.h>
+#include "test_pkg_a.h"
+#include "test_pkg_b.h"
+
+#define CHECK(condition)                                          \
+    do {                                                          \
+        if (!(condition)) {                                       \
+            fprintf(stderr, "line %d: %s\n", __LINE__, #condition); \
+            return 1;                                             \
+        }                                                         \
+    } while (0)
+
+int main(void) {
+    const uint64_t record[PIPELINED_WRITE_T_WORDS] = {0x21b, 0x1aa, 0x1bb, 0x1cc, 0x2dd};
+    uint64_t packed[PIPELINED_WRITE_T_WORDS] = {0};
+    pipelined_write_t write;
+    pipelined_write_t_unpack(record, &write);
+    CHECK(write.cmd_cycle.vld == 1 && write.cmd_cycle.rsvd == 0 && write.cmd_cycle.num_cycles == 3);
+    CHECK(write.cmd_cycle.write_type == MULTI_WDONE);
+    CHECK(write.dat0.cycle_type == VALID && write.dat0.dat == 0xaa);
+    CHECK(write.dat3.cycle_type == DONE && write.dat3.dat == 0xdd);
+    pipelined_write_t_pack(&write, packed);
+    for (int word = 0; word < PIPELINED_WRITE_T_WORDS; word++) CHECK(packed[word] == record[word]);
+    CHECK(pipelined_write_t_get_dat2(record) == 0x1cc);
+
+    uint64_t sub_def = 0;
+    sub_def_t_set_subfield_a(&sub_def, 1);
+    sub_def_t_set_subfield_b(&sub_def, 2);
+    sub_def_t_set_subfield_c(&sub_def, 1);
+    sub_def_t_set_subfield_d(&sub_def, 3);
+    CHECK(sub_def == 0x67);
+    CHECK(sub_def_t_get_subfield_b(&sub_def) == 2);
+    return 0;
+}
+"""
+
+# The addresses of test_pkg_c's ADDRESS addr_macro for a few combinations of its selectors, with the full macros and
+# with the compact style's composers. Both print the same lines.
+ADDRESS_DRIVER = r"""
+#include <inttypes.h>
+#include <stdio.h>
+#ifdef COMPACT
+#include "test_pkg_c_compact.h"
+#define ZAP_MEM(rack_id, zap_id, offset) \
+    address_addr_t(ZAP, address_zap_addr_t(MEM, address_zap_id_t(rack_id, zap_id), address_job_addr_t(offset)))
+#define ZAP_CSR(rack_id, zap_id, block_id, offset)                                    \
+    address_addr_t(ZAP, address_zap_addr_t(CSR, address_zap_id_t(rack_id, zap_id), \
+                                           address_zap_csr_addr_t(block_id, offset)))
+#define NON_ZAP_LEG(offset) address_addr_t(NON_ZAP, address_non_zap_addr_t(LEG_ID, offset))
+#define NON_ZAP_RACK(rack_id, block_id, inst_id, offset) \
+    address_addr_t(NON_ZAP, address_non_zap_addr_t(RACK_ID, address_rack_addr_t(rack_id, block_id, inst_id, offset)))
+#else
+#include "test_pkg_c.h"
+#define ZAP_MEM ADDRESS_ZAP_MEM
+#define ZAP_CSR ADDRESS_ZAP_CSR
+#define NON_ZAP_LEG ADDRESS_NON_ZAP_LEG_ID
+#define NON_ZAP_RACK ADDRESS_NON_ZAP_RACK_ID
+#endif
+
+int main(void) {
+    printf("%" PRIx64 "\n", (uint64_t)ZAP_MEM(3ULL, 5ULL, 0x1234ULL));
+    printf("%" PRIx64 "\n", (uint64_t)ZAP_CSR(7ULL, 1ULL, 9ULL, 0x123ULL));
+    printf("%" PRIx64 "\n", (uint64_t)NON_ZAP_LEG(0x4321ULL));
+    printf("%" PRIx64 "\n", (uint64_t)NON_ZAP_RACK(2ULL, 1ULL, 3ULL, 0x55ULL));
+    return 0;
+}
+"""
+
+
+def compile_and_run(source_text, tmpdir, flags=()):
+    """Compile source_text against the golden headers, run it and return its output, None without a C compiler."""
+    compiler = shutil.which(os.environ.get("CC", "cc"))
+    if compiler is None:
+        return None
+    source = os.path.join(tmpdir, "driver.c")
+    with open(source, "w") as cfile:
+        cfile.write(source_text)
+    binary = os.path.join(tmpdir, "driver")
+    subprocess.run([compiler, "-std=c99", "-Wall", "-Werror"] + list(flags) +
+                   ["-I", GOLDEN_OUTPUTS, source, "-o", binary],
+                   check=True)
+    result = subprocess.run([binary],
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=False)
+    if result.returncode:
+        raise AssertionError(f"driver failed:\n{result.stderr}")
+    return result.stdout
+
+
+def load_codecs(pkg):
+    """Import the golden python codecs of pkg."""
+    spec = importlib.util.spec_from_file_location(f"{pkg}_yis", os.path.join(GOLDEN_OUTPUTS, f"{pkg}_yis.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_decode(args):
+    """Run yis_decode.py on the golden pkgs, return its output."""
+    pkgs = [os.path.join(GOLDEN_INPUTS, f"{pkg}.yis") for pkg in ("test_pkg_a", "test_pkg_b")]
+    result = subprocess.run([sys.executable, "yis_decode.py", "--pkgs"] + pkgs + args,
+                            cwd=ROOT,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=False)
+    if result.returncode:
+        raise AssertionError(f"yis_decode.py {args} failed:\n{result.stderr}")
+    return result.stdout
+
+
+class CodecTest(unittest.TestCase):
+
+    def test_python_codec(self):
+        """The python codecs decode known records into their fields and encode the fields back."""
+        codec = load_codecs("test_pkg_b").CODECS["pipelined_write_t"]
+        records = np.array([PIPELINED_WRITE, IDLE_WRITE], dtype=np.uint64)
+        decoded = codec.decode(records)
+        self.assertEqual({path: values[0] for path, values in decoded.items()}, PIPELINED_WRITE_FIELDS)
+        self.assertEqual(set(decoded["cmd_cycle.num_cycles"]), {0, 3})
+        names = codec.decode(records, enum_names=True)
+        for path, name in PIPELINED_WRITE_NAMES.items():
+            self.assertEqual(list(names[path]), [name, "IDLE" if "cycle_type" in path else "STD"])
+        self.assertTrue(np.array_equal(codec.encode(decoded), records))
+        self.assertTrue(np.array_equal(codec.encode(names), records))
+
+        codec = load_codecs("test_pkg_a").CODECS["sub_def_t"]
+        encoded = codec.encode({path: [value] for path, value in SUB_DEF_FIELDS.items()})
+        self.assertEqual(encoded.tolist(), [SUB_DEF])
+
+    def test_c_round_trip(self):
+        """The C headers unpack, pack, get and set the fields of known records."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if compile_and_run(DRIVER, tmpdir) is None:
+                self.skipTest("No C compiler")
+
+    def test_compact_addr_macros(self):
+        """The compact style's composers build the same addresses as the full address macros."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            full = compile_and_run(ADDRESS_DRIVER, tmpdir)
+            if full is None:
+                self.skipTest("No C compiler")
+            compact = compile_and_run(ADDRESS_DRIVER, tmpdir, ["-DCOMPACT"])
+        self.assertEqual(compact, full)
+        self.assertEqual(len(set(full.split())), 4)
+
+    def test_decode(self):
+        """yis_decode.py decodes binary and hex dumps of known records into the same CSV."""
+        expected = ",".join(PIPELINED_WRITE_FIELDS) + "\n" + ",".join(
+            PIPELINED_WRITE_NAMES.get(path, str(value)) for path, value in PIPELINED_WRITE_FIELDS.items()) + "\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            binary = os.path.join(tmpdir, "records.bin")
+            np.array(PIPELINED_WRITE, dtype="<u8").tofile(binary)
+            hex_dump = os.path.join(tmpdir, "records.hex")
+            with open(hex_dump, "w") as hfile:
+                hfile.write("".join(f"{word:x}\n" for word in PIPELINED_WRITE))
+            args = ["--type", "test_pkg_b::pipelined_write_t"]
+            self.assertEqual(run_decode(args + [binary]), expected)
+            self.assertEqual(run_decode(args + ["--input-format", "hex", hex_dump]), expected)
+
+    def test_decode_closed_pipe(self):
+        """yis_decode.py exits quietly when its reader stops reading, like yis_decode.py ... | head does."""
+        pkgs = [os.path.join(GOLDEN_INPUTS, f"{pkg}.yis") for pkg in ("test_pkg_a", "test_pkg_b")]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            binary = os.path.join(tmpdir, "records.bin")
+            # Far more CSV than a pipe buffers, so yis_decode.py is still writing when the pipe is closed
+            np.array(PIPELINED_WRITE * 50000, dtype="<u8").tofile(binary)
+            process = subprocess.Popen([sys.executable, "yis_decode.py", "--pkgs"] + pkgs +
+                                       ["--type", "test_pkg_b::pipelined_write_t", binary],
+                                       cwd=ROOT,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE,
+                                       universal_newlines=True)
+            self.assertEqual(process.stdout.readline(), ",".join(PIPELINED_WRITE_FIELDS) + "\n")
+            process.stdout.close()
+            errors = process.stderr.read()
+            process.stderr.close()
+            process.wait()
+        self.assertNotIn("Traceback", errors)
+        self.assertNotIn("BrokenPipeError", errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,12 @@
 """Test helpers for yis."""
 
-load("@yis//:yis.bzl", "yis_c_hdr", "yis_html_intf", "yis_html_pkg", "yis_rdl_pkg", "yis_rtl_pkg", "yis_pkg_deps")
+load("@yis//:yis.bzl", "yis_c_hdr", "yis_html_intf", "yis_pkg_deps", "yis_pkg_gen")
 
 golden_out_location = "@yis//tests/golden_outputs:"
 
-def golden_rtl_pkg_test(name, pkg_deps):
+def golden_rtl_pkg_test(name):
     """Compares a generated file to a statically checked in file."""
 
-    yis_rtl_pkg(
-        name = "{}".format(name),
-        pkg_deps = pkg_deps,
-        pkg = ":{}.yis".format(name),
-    )
-
     native.sh_test(
         name = "{}_rtl_pkg_gold_test".format(name),
         size = "small",
@@ -25,15 +19,9 @@ def golden_rtl_pkg_test(name, pkg_deps):
         tags = ["gold"],
     )
 
-def golden_hdr_test(name, pkg_deps):
+def golden_hdr_test(name):
     """Compares a generated file to a statically checked in file."""
 
-    yis_c_hdr(
-        name = "{}".format(name),
-        pkg_deps = pkg_deps,
-        pkg = ":{}.yis".format(name),
-    )
-
     native.sh_test(
         name = "{}_hdr_gold_test".format(name),
         size = "small",
@@ -46,15 +34,24 @@ def golden_hdr_test(name, pkg_deps):
         tags = ["gold"],
     )
 
-def golden_rdl_test(name, pkg_deps):
+def golden_py_test(name):
     """Compares a generated file to a statically checked in file."""
 
-    yis_rdl_pkg(
-        name = "{}".format(name),
-        pkg_deps = pkg_deps,
-        pkg = ":{}.yis".format(name),
+    native.sh_test(
+        name = "{}_py_gold_test".format(name),
+        size = "small",
+        srcs = ["@yis//tests:passthrough.sh"],
+        data = [
+            ":{}_yis_py".format(name),
+            "{}{}_yis.py".format(golden_out_location, name),
+        ],
+        args = ["diff $(location :{name}_yis_py) $(location {gout}{name}_yis.py)".format(gout = golden_out_location, name = name)],
+        tags = ["gold"],
     )
 
+def golden_rdl_test(name):
+    """Compares a generated file to a statically checked in file."""
+
     native.sh_test(
         name = "{}_rdl_pkg_gold_test".format(name),
         size = "small",
@@ -67,15 +64,9 @@ def golden_rdl_test(name, pkg_deps):
         tags = ["gold"],
     )
 
-def golden_html_pkg_test(name, pkg_deps):
+def golden_html_pkg_test(name):
     """Compares a generated file to a statically checked in file."""
 
-    yis_html_pkg(
-        name = "{}".format(name),
-        pkg_deps = pkg_deps,
-        pkg = ":{}.yis".format(name),
-    )
-
     native.sh_test(
         name = "{}_html_pkg_gold_test".format(name),
         size = "small",
@@ -113,10 +104,19 @@ def golden_pkg_tests(deps):  # buildifier: disable=unnamed-macro
     """Run all golden pkg tests, allow pkg dependencies."""
     for key, row in deps.items():
         yis_pkg_deps(key, row, ":{}.yis".format(key))
-        golden_rtl_pkg_test(key, row)
-        golden_hdr_test(key, row)
-        golden_html_pkg_test(key, row)
-        golden_rdl_test(key, row)
+        yis_pkg_gen(key, row, ":{}.yis".format(key), gen_c_hdr = True, gen_py = True)
+        golden_rtl_pkg_test(key)
+        golden_hdr_test(key)
+        golden_py_test(key)
+        golden_html_pkg_test(key)
+        golden_rdl_test(key)
+
+def golden_compact_hdr_tests(deps):  # buildifier: disable=unnamed-macro
+    """Run the golden C header tests of addr_macro_style = "compact", allow pkg dependencies."""
+    for key, row in deps.items():
+        name = "{}_compact".format(key)
+        yis_c_hdr(name, row, ":{}.yis".format(key), addr_macro_style = "compact")
+        golden_hdr_test(name)
 
 def golden_intf_tests(deps):  # buildifier: disable=unnamed-macro
     """Run all golden intf tests, allow pkg dependencies."""
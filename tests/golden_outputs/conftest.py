@@ -0,0 +1,2 @@
+# The python codecs here are golden outputs to diff against, not tests
+collect_ignore_glob = ["*_yis.py"]
@@ -77,6 +77,50 @@ typedef struct _sub_def_t {
     uint8_t subfield_d;    // 2 bits : This is a different parameter than the first.
 } sub_def_t;
 
+#define SUB_DEF_T_WORDS 1
+// subfield_a: 1 bits from bit 6
+static inline uint64_t sub_def_t_get_subfield_a(const uint64_t *bits) {
+    return ((bits[0] >> 6) & 0x1ULL);
+}
+static inline void sub_def_t_set_subfield_a(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x40ULL) | ((value & 0x1ULL) << 6);
+}
+// subfield_b: 2 bits from bit 4
+static inline uint64_t sub_def_t_get_subfield_b(const uint64_t *bits) {
+    return ((bits[0] >> 4) & 0x3ULL);
+}
+static inline void sub_def_t_set_subfield_b(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x30ULL) | ((value & 0x3ULL) << 4);
+}
+// subfield_c: 2 bits from bit 2
+static inline uint64_t sub_def_t_get_subfield_c(const uint64_t *bits) {
+    return ((bits[0] >> 2) & 0x3ULL);
+}
+static inline void sub_def_t_set_subfield_c(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xcULL) | ((value & 0x3ULL) << 2);
+}
+// subfield_d: 2 bits from bit 0
+static inline uint64_t sub_def_t_get_subfield_d(const uint64_t *bits) {
+    return (bits[0] & 0x3ULL);
+}
+static inline void sub_def_t_set_subfield_d(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ULL) | (value & 0x3ULL);
+}
+// Pack a sub_def_t into bits
+static inline void sub_def_t_pack(const sub_def_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->subfield_a & 0x1ULL) << 6) |
+              (((uint64_t)s->subfield_b & 0x3ULL) << 4) |
+              (((uint64_t)s->subfield_c & 0x3ULL) << 2) |
+              ((uint64_t)s->subfield_d & 0x3ULL);
+}
+// Unpack bits into a sub_def_t
+static inline void sub_def_t_unpack(const uint64_t *bits, sub_def_t *s) {
+    s->subfield_a = (uint8_t)((bits[0] >> 6) & 0x1ULL);
+    s->subfield_b = (uint8_t)((bits[0] >> 4) & 0x3ULL);
+    s->subfield_c = (uint8_t)((bits[0] >> 2) & 0x3ULL);
+    s->subfield_d = (uint8_t)(bits[0] & 0x3ULL);
+}
+
 // A struct that wraps all fields needed for a single hero write.
 typedef struct _hero_write_t {
     CYCLE_TYPE_E cycle_type;    // 2 bits : Indicates a command type of IDLE, VALID, or DONE.
@@ -85,6 +129,50 @@ typedef struct _hero_write_t {
     uint8_t clk_en;    // 1 bits : Clock enable for the bus
 } hero_write_t;
 
+#define HERO_WRITE_T_WORDS 1
+// cycle_type: 2 bits from bit 58
+static inline uint64_t hero_write_t_get_cycle_type(const uint64_t *bits) {
+    return ((bits[0] >> 58) & 0x3ULL);
+}
+static inline void hero_write_t_set_cycle_type(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xc00000000000000ULL) | ((value & 0x3ULL) << 58);
+}
+// wdat: 36 bits from bit 22
+static inline uint64_t hero_write_t_get_wdat(const uint64_t *bits) {
+    return ((bits[0] >> 22) & 0xfffffffffULL);
+}
+static inline void hero_write_t_set_wdat(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffffc00000ULL) | ((value & 0xfffffffffULL) << 22);
+}
+// another_type_reference: 21 bits from bit 1
+static inline uint64_t hero_write_t_get_another_type_reference(const uint64_t *bits) {
+    return ((bits[0] >> 1) & 0x1fffffULL);
+}
+static inline void hero_write_t_set_another_type_reference(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffeULL) | ((value & 0x1fffffULL) << 1);
+}
+// clk_en: 1 bits from bit 0
+static inline uint64_t hero_write_t_get_clk_en(const uint64_t *bits) {
+    return (bits[0] & 0x1ULL);
+}
+static inline void hero_write_t_set_clk_en(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x1ULL) | (value & 0x1ULL);
+}
+// Pack a hero_write_t into bits
+static inline void hero_write_t_pack(const hero_write_t *s, uint64_t *bits) {
+    // another_type_reference (21 bits) doesn't fit its C member, use the getter and setter
+    bits[0] = (((uint64_t)s->cycle_type & 0x3ULL) << 58) |
+              (((uint64_t)s->wdat & 0xfffffffffULL) << 22) |
+              ((uint64_t)s->clk_en & 0x1ULL);
+}
+// Unpack bits into a hero_write_t
+static inline void hero_write_t_unpack(const uint64_t *bits, hero_write_t *s) {
+    s->cycle_type = (CYCLE_TYPE_E)((bits[0] >> 58) & 0x3ULL);
+    s->wdat = (uint64_t)((bits[0] >> 22) & 0xfffffffffULL);
+    // another_type_reference (21 bits) doesn't fit its C member, use the getter and setter
+    s->clk_en = (uint8_t)(bits[0] & 0x1ULL);
+}
+
 
 
 #endif // __TEST_PKG_A_YIS_H__
\ No newline at end of file
@@ -83,6 +83,58 @@ typedef struct _several_things_t {
     uint8_t fieldd;    // 3 bits : This summary is different than its base definition
 } several_things_t;
 
+#define SEVERAL_THINGS_T_WORDS 2
+// fielda: 36 bits from bit 65
+static inline uint64_t several_things_t_get_fielda(const uint64_t *bits) {
+    return ((bits[1] >> 1) & 0xfffffffffULL);
+}
+static inline void several_things_t_set_fielda(uint64_t *bits, uint64_t value) {
+    bits[1] = (bits[1] & ~0x1ffffffffeULL) | ((value & 0xfffffffffULL) << 1);
+}
+// fieldb: 60 bits from bit 5
+static inline uint64_t several_things_t_get_fieldb(const uint64_t *bits) {
+    return (((bits[0] >> 5) | (bits[1] << 59)) & 0xfffffffffffffffULL);
+}
+static inline void several_things_t_set_fieldb(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xffffffffffffffe0ULL) | ((value & 0xfffffffffffffffULL) << 5);
+    bits[1] = (bits[1] & ~0x1ULL) | ((value & 0xfffffffffffffffULL) >> 59);
+}
+// fieldc: 2 bits from bit 3
+static inline uint64_t several_things_t_get_fieldc(const uint64_t *bits) {
+    return ((bits[0] >> 3) & 0x3ULL);
+}
+static inline void several_things_t_set_fieldc(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x18ULL) | ((value & 0x3ULL) << 3);
+}
+// fieldd: 3 bits from bit 0
+static inline uint64_t several_things_t_get_fieldd(const uint64_t *bits) {
+    return (bits[0] & 0x7ULL);
+}
+static inline void several_things_t_set_fieldd(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ULL) | (value & 0x7ULL);
+}
+// Pack a several_things_t into bits
+static inline void several_things_t_pack(const several_things_t *s, uint64_t *bits) {
+    uint64_t fieldb_bits[1];
+    hero_write_t_pack(&s->fieldb, fieldb_bits);
+    bits[0] = ((fieldb_bits[0] & 0xfffffffffffffffULL) << 5) |
+              (((uint64_t)s->fieldc & 0x3ULL) << 3) |
+              ((uint64_t)s->fieldd & 0x7ULL);
+    bits[1] = (((uint64_t)s->fielda & 0xfffffffffULL) << 1) |
+              ((fieldb_bits[0] & 0xfffffffffffffffULL) >> 59);
+}
+// Unpack bits into a several_things_t
+static inline void several_things_t_unpack(const uint64_t *bits, several_things_t *s) {
+    s->fielda = (uint64_t)((bits[1] >> 1) & 0xfffffffffULL);
+    {
+        uint64_t fieldb_bits[1];
+        fieldb_bits[0] = (((bits[0] >> 5) | (bits[1] << 59)) & 0xfffffffffffffffULL);
+        hero_write_t_unpack(fieldb_bits, &s->fieldb);
+    }
+    s->fieldc = (CYCLE_TYPE_E)((bits[0] >> 3) & 0x3ULL);
+    s->fieldd = (uint8_t)(bits[0] & 0x7ULL);
+}
+
 // Link in a local typedef, a scoped typdef, and a scoped enum
 typedef struct _type_links_t {
     first_defined_type_t first_field;    // 6 bits : Use another package's enum as the type and a local localparam as width
@@ -90,6 +142,44 @@ typedef struct _type_links_t {
     CYCLE_TYPE_E third_field;    // 2 bits : This is a custom doc summary, not inherited from the type
 } type_links_t;
 
+#define TYPE_LINKS_T_WORDS 2
+// first_field: 6 bits from bit 122
+static inline uint64_t type_links_t_get_first_field(const uint64_t *bits) {
+    return ((bits[1] >> 58) & 0x3fULL);
+}
+static inline void type_links_t_set_first_field(uint64_t *bits, uint64_t value) {
+    bits[1] = (bits[1] & ~0xfc00000000000000ULL) | ((value & 0x3fULL) << 58);
+}
+// second_field: 120 bits from bit 2, in 2 words least significant first
+static inline void type_links_t_get_second_field(const uint64_t *bits, uint64_t *value) {
+    value[0] = ((bits[0] >> 2) | (bits[1] << 62));
+    value[1] = ((bits[1] >> 2) & 0xffffffffffffffULL);
+}
+static inline void type_links_t_set_second_field(uint64_t *bits, const uint64_t *value) {
+    bits[0] = (bits[0] & ~0xfffffffffffffffcULL) | (value[0] << 2);
+    bits[1] = (bits[1] & ~0x3ULL) | (value[0] >> 62);
+    bits[1] = (bits[1] & ~0x3fffffffffffffcULL) | ((value[1] & 0xffffffffffffffULL) << 2);
+}
+// third_field: 2 bits from bit 0
+static inline uint64_t type_links_t_get_third_field(const uint64_t *bits) {
+    return (bits[0] & 0x3ULL);
+}
+static inline void type_links_t_set_third_field(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ULL) | (value & 0x3ULL);
+}
+// Pack a type_links_t into bits
+static inline void type_links_t_pack(const type_links_t *s, uint64_t *bits) {
+    // second_field (120 bits) doesn't fit its C member, use the getter and setter
+    bits[0] = ((uint64_t)s->third_field & 0x3ULL);
+    bits[1] = (((uint64_t)s->first_field & 0x3fULL) << 58);
+}
+// Unpack bits into a type_links_t
+static inline void type_links_t_unpack(const uint64_t *bits, type_links_t *s) {
+    s->first_field = (first_defined_type_t)((bits[1] >> 58) & 0x3fULL);
+    // second_field (120 bits) doesn't fit its C member, use the getter and setter
+    s->third_field = (CYCLE_TYPE_E)(bits[0] & 0x3ULL);
+}
+
 // The command cycle of a pipelined write
 typedef struct _write_cmd_t {
     uint8_t vld;    // 1 bits : This cmd is valid, this is the start of a new pipelined write
@@ -98,12 +188,82 @@ typedef struct _write_cmd_t {
     WRITE_TYPE_E write_type;    // 3 bits : Specifies how the write should be handled
 } write_cmd_t;
 
+#define WRITE_CMD_T_WORDS 1
+// vld: 1 bits from bit 9
+static inline uint64_t write_cmd_t_get_vld(const uint64_t *bits) {
+    return ((bits[0] >> 9) & 0x1ULL);
+}
+static inline void write_cmd_t_set_vld(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x200ULL) | ((value & 0x1ULL) << 9);
+}
+// rsvd: 4 bits from bit 5
+static inline uint64_t write_cmd_t_get_rsvd(const uint64_t *bits) {
+    return ((bits[0] >> 5) & 0xfULL);
+}
+static inline void write_cmd_t_set_rsvd(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x1e0ULL) | ((value & 0xfULL) << 5);
+}
+// num_cycles: 2 bits from bit 3
+static inline uint64_t write_cmd_t_get_num_cycles(const uint64_t *bits) {
+    return ((bits[0] >> 3) & 0x3ULL);
+}
+static inline void write_cmd_t_set_num_cycles(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x18ULL) | ((value & 0x3ULL) << 3);
+}
+// write_type: 3 bits from bit 0
+static inline uint64_t write_cmd_t_get_write_type(const uint64_t *bits) {
+    return (bits[0] & 0x7ULL);
+}
+static inline void write_cmd_t_set_write_type(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ULL) | (value & 0x7ULL);
+}
+// Pack a write_cmd_t into bits
+static inline void write_cmd_t_pack(const write_cmd_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->vld & 0x1ULL) << 9) |
+              (((uint64_t)s->rsvd & 0xfULL) << 5) |
+              (((uint64_t)s->num_cycles & 0x3ULL) << 3) |
+              ((uint64_t)s->write_type & 0x7ULL);
+}
+// Unpack bits into a write_cmd_t
+static inline void write_cmd_t_unpack(const uint64_t *bits, write_cmd_t *s) {
+    s->vld = (uint8_t)((bits[0] >> 9) & 0x1ULL);
+    s->rsvd = (uint8_t)((bits[0] >> 5) & 0xfULL);
+    s->num_cycles = (uint8_t)((bits[0] >> 3) & 0x3ULL);
+    s->write_type = (WRITE_TYPE_E)(bits[0] & 0x7ULL);
+}
+
 // Data cycle of a pipelined write
 typedef struct _write_dat_t {
     CYCLE_TYPE_E cycle_type;    // 2 bits : Indicates a command type of IDLE, VALID, or DONE.
     uint8_t dat;    // 8 bits : One data cycle
 } write_dat_t;
 
+#define WRITE_DAT_T_WORDS 1
+// cycle_type: 2 bits from bit 8
+static inline uint64_t write_dat_t_get_cycle_type(const uint64_t *bits) {
+    return ((bits[0] >> 8) & 0x3ULL);
+}
+static inline void write_dat_t_set_cycle_type(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x300ULL) | ((value & 0x3ULL) << 8);
+}
+// dat: 8 bits from bit 0
+static inline uint64_t write_dat_t_get_dat(const uint64_t *bits) {
+    return (bits[0] & 0xffULL);
+}
+static inline void write_dat_t_set_dat(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xffULL) | (value & 0xffULL);
+}
+// Pack a write_dat_t into bits
+static inline void write_dat_t_pack(const write_dat_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->cycle_type & 0x3ULL) << 8) |
+              ((uint64_t)s->dat & 0xffULL);
+}
+// Unpack bits into a write_dat_t
+static inline void write_dat_t_unpack(const uint64_t *bits, write_dat_t *s) {
+    s->cycle_type = (CYCLE_TYPE_E)((bits[0] >> 8) & 0x3ULL);
+    s->dat = (uint8_t)(bits[0] & 0xffULL);
+}
+
 // Struct to hold 1-bit bit fields to make sure the 1-bit rendering is correct
 typedef struct _one_bit_field_t {
     uint8_t vld;    // 1 bits : This field should be rendered as bare logic without anything else
@@ -111,6 +271,41 @@ typedef struct _one_bit_field_t {
     uint8_t simple_bit_field;    // 1 bits : This field should be rendered to just a bare logic with the equation in comments
 } one_bit_field_t;
 
+#define ONE_BIT_FIELD_T_WORDS 1
+// vld: 1 bits from bit 2
+static inline uint64_t one_bit_field_t_get_vld(const uint64_t *bits) {
+    return ((bits[0] >> 2) & 0x1ULL);
+}
+static inline void one_bit_field_t_set_vld(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x4ULL) | ((value & 0x1ULL) << 2);
+}
+// new_bit_field: 1 bits from bit 1
+static inline uint64_t one_bit_field_t_get_new_bit_field(const uint64_t *bits) {
+    return ((bits[0] >> 1) & 0x1ULL);
+}
+static inline void one_bit_field_t_set_new_bit_field(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x2ULL) | ((value & 0x1ULL) << 1);
+}
+// simple_bit_field: 1 bits from bit 0
+static inline uint64_t one_bit_field_t_get_simple_bit_field(const uint64_t *bits) {
+    return (bits[0] & 0x1ULL);
+}
+static inline void one_bit_field_t_set_simple_bit_field(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x1ULL) | (value & 0x1ULL);
+}
+// Pack a one_bit_field_t into bits
+static inline void one_bit_field_t_pack(const one_bit_field_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->vld & 0x1ULL) << 2) |
+              (((uint64_t)s->new_bit_field & 0x1ULL) << 1) |
+              ((uint64_t)s->simple_bit_field & 0x1ULL);
+}
+// Unpack bits into a one_bit_field_t
+static inline void one_bit_field_t_unpack(const uint64_t *bits, one_bit_field_t *s) {
+    s->vld = (uint8_t)((bits[0] >> 2) & 0x1ULL);
+    s->new_bit_field = (uint8_t)((bits[0] >> 1) & 0x1ULL);
+    s->simple_bit_field = (uint8_t)(bits[0] & 0x1ULL);
+}
+
 // Defines a pipelined write transaction
 typedef struct _pipelined_write_t {
     write_cmd_t cmd_cycle;    // 10 bits : The command cycle of a pipelined write
@@ -120,6 +315,89 @@ typedef struct _pipelined_write_t {
     write_dat_t dat3;    // 10 bits : Data cycle of a pipelined write
 } pipelined_write_t;
 
+#define PIPELINED_WRITE_T_WORDS 5
+// cmd_cycle: 10 bits from bit 0
+static inline uint64_t pipelined_write_t_get_cmd_cycle(const uint64_t *bits) {
+    return (bits[0] & 0x3ffULL);
+}
+static inline void pipelined_write_t_set_cmd_cycle(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffULL) | (value & 0x3ffULL);
+}
+// dat0: 10 bits from bit 64
+static inline uint64_t pipelined_write_t_get_dat0(const uint64_t *bits) {
+    return (bits[1] & 0x3ffULL);
+}
+static inline void pipelined_write_t_set_dat0(uint64_t *bits, uint64_t value) {
+    bits[1] = (bits[1] & ~0x3ffULL) | (value & 0x3ffULL);
+}
+// dat1: 10 bits from bit 128
+static inline uint64_t pipelined_write_t_get_dat1(const uint64_t *bits) {
+    return (bits[2] & 0x3ffULL);
+}
+static inline void pipelined_write_t_set_dat1(uint64_t *bits, uint64_t value) {
+    bits[2] = (bits[2] & ~0x3ffULL) | (value & 0x3ffULL);
+}
+// dat2: 10 bits from bit 192
+static inline uint64_t pipelined_write_t_get_dat2(const uint64_t *bits) {
+    return (bits[3] & 0x3ffULL);
+}
+static inline void pipelined_write_t_set_dat2(uint64_t *bits, uint64_t value) {
+    bits[3] = (bits[3] & ~0x3ffULL) | (value & 0x3ffULL);
+}
+// dat3: 10 bits from bit 256
+static inline uint64_t pipelined_write_t_get_dat3(const uint64_t *bits) {
+    return (bits[4] & 0x3ffULL);
+}
+static inline void pipelined_write_t_set_dat3(uint64_t *bits, uint64_t value) {
+    bits[4] = (bits[4] & ~0x3ffULL) | (value & 0x3ffULL);
+}
+// Pack a pipelined_write_t into bits
+static inline void pipelined_write_t_pack(const pipelined_write_t *s, uint64_t *bits) {
+    uint64_t cmd_cycle_bits[1];
+    write_cmd_t_pack(&s->cmd_cycle, cmd_cycle_bits);
+    uint64_t dat0_bits[1];
+    write_dat_t_pack(&s->dat0, dat0_bits);
+    uint64_t dat1_bits[1];
+    write_dat_t_pack(&s->dat1, dat1_bits);
+    uint64_t dat2_bits[1];
+    write_dat_t_pack(&s->dat2, dat2_bits);
+    uint64_t dat3_bits[1];
+    write_dat_t_pack(&s->dat3, dat3_bits);
+    bits[0] = (cmd_cycle_bits[0] & 0x3ffULL);
+    bits[1] = (dat0_bits[0] & 0x3ffULL);
+    bits[2] = (dat1_bits[0] & 0x3ffULL);
+    bits[3] = (dat2_bits[0] & 0x3ffULL);
+    bits[4] = (dat3_bits[0] & 0x3ffULL);
+}
+// Unpack bits into a pipelined_write_t
+static inline void pipelined_write_t_unpack(const uint64_t *bits, pipelined_write_t *s) {
+    {
+        uint64_t cmd_cycle_bits[1];
+        cmd_cycle_bits[0] = (bits[0] & 0x3ffULL);
+        write_cmd_t_unpack(cmd_cycle_bits, &s->cmd_cycle);
+    }
+    {
+        uint64_t dat0_bits[1];
+        dat0_bits[0] = (bits[1] & 0x3ffULL);
+        write_dat_t_unpack(dat0_bits, &s->dat0);
+    }
+    {
+        uint64_t dat1_bits[1];
+        dat1_bits[0] = (bits[2] & 0x3ffULL);
+        write_dat_t_unpack(dat1_bits, &s->dat1);
+    }
+    {
+        uint64_t dat2_bits[1];
+        dat2_bits[0] = (bits[3] & 0x3ffULL);
+        write_dat_t_unpack(dat2_bits, &s->dat2);
+    }
+    {
+        uint64_t dat3_bits[1];
+        dat3_bits[0] = (bits[4] & 0x3ffULL);
+        write_dat_t_unpack(dat3_bits, &s->dat3);
+    }
+}
+
 
 
 #endif // __TEST_PKG_B_YIS_H__
\ No newline at end of file
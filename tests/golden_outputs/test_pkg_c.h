@@ -28,6 +28,8 @@
 #define CUP_ID_E_WIDTH 3           // Width of CUP_ID_E
 #define CRY_ID_E_WIDTH 7           // Width of CRY_ID_E
 #define ICE_ID_E_WIDTH 1           // Width of ICE_ID_E
+#define OPC_E_WIDTH 4           // Width of OPC_E
+#define SPARE_OPC_E_WIDTH 4           // Width of SPARE_OPC_E
 #define ZAP_ID_T_WIDTH 6           // Width of zap_id_t
 #define ADDR_T_WIDTH 27           // Width of addr_t
 #define JOB_ADDR_T_WIDTH 19           // Width of job_addr_t
@@ -247,6 +249,16 @@ typedef enum {
     ICE0 = 0,   // ICE 0
 } ICE_ID_E;
 
+// Opcodes, the empty range next to the explicit value adds no values
+typedef enum {
+    OPC = 7,   // The only opcode
+} OPC_E;
+
+// Spare opcodes, the empty range before the explicit value adds no values
+typedef enum {
+    SPARE = 5,   // The only spare opcode
+} SPARE_OPC_E;
+
 
 // ID of a rack
 typedef uint8_t rack_id_t;    // 3 bits wide
@@ -264,23 +276,136 @@ typedef struct _zap_id_t {
     RACK_ZAP_ID_E zap_id;    // 3 bits : Zap ID (Within a rack)
 } zap_id_t;
 
+#define ZAP_ID_T_WORDS 1
+// rack_id: 3 bits from bit 3
+static inline uint64_t zap_id_t_get_rack_id(const uint64_t *bits) {
+    return ((bits[0] >> 3) & 0x7ULL);
+}
+static inline void zap_id_t_set_rack_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x38ULL) | ((value & 0x7ULL) << 3);
+}
+// zap_id: 3 bits from bit 0
+static inline uint64_t zap_id_t_get_zap_id(const uint64_t *bits) {
+    return (bits[0] & 0x7ULL);
+}
+static inline void zap_id_t_set_zap_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ULL) | (value & 0x7ULL);
+}
+// Pack a zap_id_t into bits
+static inline void zap_id_t_pack(const zap_id_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->rack_id & 0x7ULL) << 3) |
+              ((uint64_t)s->zap_id & 0x7ULL);
+}
+// Unpack bits into a zap_id_t
+static inline void zap_id_t_unpack(const uint64_t *bits, zap_id_t *s) {
+    s->rack_id = (rack_id_t)((bits[0] >> 3) & 0x7ULL);
+    s->zap_id = (RACK_ZAP_ID_E)(bits[0] & 0x7ULL);
+}
+
 // JOB Addr struct
 typedef struct _job_addr_t {
     uint32_t offset;    // 19 bits : JOB Address Offset
 } job_addr_t;
 
+#define JOB_ADDR_T_WORDS 1
+// offset: 19 bits from bit 0
+static inline uint64_t job_addr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void job_addr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// Pack a job_addr_t into bits
+static inline void job_addr_t_pack(const job_addr_t *s, uint64_t *bits) {
+    bits[0] = ((uint64_t)s->offset & 0x7ffffULL);
+}
+// Unpack bits into a job_addr_t
+static inline void job_addr_t_unpack(const uint64_t *bits, job_addr_t *s) {
+    s->offset = (uint32_t)(bits[0] & 0x7ffffULL);
+}
+
 // Zap CSR Addr Struct
 typedef struct _zap_csr_addr_t {
     ZAP_BLOCK_ID_E zap_block_id;    // 4 bits : A subblock ID inside a ZAP.
     uint16_t offset;    // 15 bits : offset into the CSR address space
 } zap_csr_addr_t;
 
+#define ZAP_CSR_ADDR_T_WORDS 1
+// zap_block_id: 4 bits from bit 15
+static inline uint64_t zap_csr_addr_t_get_zap_block_id(const uint64_t *bits) {
+    return ((bits[0] >> 15) & 0xfULL);
+}
+static inline void zap_csr_addr_t_set_zap_block_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x78000ULL) | ((value & 0xfULL) << 15);
+}
+// offset: 15 bits from bit 0
+static inline uint64_t zap_csr_addr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7fffULL);
+}
+static inline void zap_csr_addr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffULL) | (value & 0x7fffULL);
+}
+// Pack a zap_csr_addr_t into bits
+static inline void zap_csr_addr_t_pack(const zap_csr_addr_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->zap_block_id & 0xfULL) << 15) |
+              ((uint64_t)s->offset & 0x7fffULL);
+}
+// Unpack bits into a zap_csr_addr_t
+static inline void zap_csr_addr_t_unpack(const uint64_t *bits, zap_csr_addr_t *s) {
+    s->zap_block_id = (ZAP_BLOCK_ID_E)((bits[0] >> 15) & 0xfULL);
+    s->offset = (uint16_t)(bits[0] & 0x7fffULL);
+}
+
 // Union of the sub_addr field in zap_addr_t
 typedef union _zap_addr_sub_addr_t {
     job_addr_t job_addr;    // 19 bits : JOB Addr struct
     zap_csr_addr_t zap_csr_addr;    // 19 bits : Zap CSR Addr Struct
 } zap_addr_sub_addr_t;
 
+#define ZAP_ADDR_SUB_ADDR_T_WORDS 1
+// job_addr: 19 bits from bit 0
+static inline uint64_t zap_addr_sub_addr_t_get_job_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void zap_addr_sub_addr_t_set_job_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// zap_csr_addr: 19 bits from bit 0
+static inline uint64_t zap_addr_sub_addr_t_get_zap_csr_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void zap_addr_sub_addr_t_set_zap_csr_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// Pack the job_addr of a zap_addr_sub_addr_t into bits
+static inline void zap_addr_sub_addr_t_pack_job_addr(const zap_addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t job_addr_bits[1];
+    job_addr_t_pack(&u->job_addr, job_addr_bits);
+    bits[0] = (job_addr_bits[0] & 0x7ffffULL);
+}
+// Unpack bits into the job_addr of a zap_addr_sub_addr_t
+static inline void zap_addr_sub_addr_t_unpack_job_addr(const uint64_t *bits, zap_addr_sub_addr_t *u) {
+    {
+        uint64_t job_addr_bits[1];
+        job_addr_bits[0] = (bits[0] & 0x7ffffULL);
+        job_addr_t_unpack(job_addr_bits, &u->job_addr);
+    }
+}
+// Pack the zap_csr_addr of a zap_addr_sub_addr_t into bits
+static inline void zap_addr_sub_addr_t_pack_zap_csr_addr(const zap_addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t zap_csr_addr_bits[1];
+    zap_csr_addr_t_pack(&u->zap_csr_addr, zap_csr_addr_bits);
+    bits[0] = (zap_csr_addr_bits[0] & 0x7ffffULL);
+}
+// Unpack bits into the zap_csr_addr of a zap_addr_sub_addr_t
+static inline void zap_addr_sub_addr_t_unpack_zap_csr_addr(const uint64_t *bits, zap_addr_sub_addr_t *u) {
+    {
+        uint64_t zap_csr_addr_bits[1];
+        zap_csr_addr_bits[0] = (bits[0] & 0x7ffffULL);
+        zap_csr_addr_t_unpack(zap_csr_addr_bits, &u->zap_csr_addr);
+    }
+}
+
 // A memory address
 typedef struct _zap_addr_t {
     ADDR_TYPE_E is_csr;    // 1 bits : Indicates top-level address type.
@@ -288,6 +413,47 @@ typedef struct _zap_addr_t {
     zap_addr_sub_addr_t sub_addr;    // 19 bits : Union of the sub_addr field in zap_addr_t
 } zap_addr_t;
 
+#define ZAP_ADDR_T_WORDS 1
+// is_csr: 1 bits from bit 25
+static inline uint64_t zap_addr_t_get_is_csr(const uint64_t *bits) {
+    return ((bits[0] >> 25) & 0x1ULL);
+}
+static inline void zap_addr_t_set_is_csr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x2000000ULL) | ((value & 0x1ULL) << 25);
+}
+// zap_id: 6 bits from bit 19
+static inline uint64_t zap_addr_t_get_zap_id(const uint64_t *bits) {
+    return ((bits[0] >> 19) & 0x3fULL);
+}
+static inline void zap_addr_t_set_zap_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x1f80000ULL) | ((value & 0x3fULL) << 19);
+}
+// sub_addr: 19 bits from bit 0
+static inline uint64_t zap_addr_t_get_sub_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void zap_addr_t_set_sub_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// Pack a zap_addr_t into bits
+static inline void zap_addr_t_pack(const zap_addr_t *s, uint64_t *bits) {
+    uint64_t zap_id_bits[1];
+    zap_id_t_pack(&s->zap_id, zap_id_bits);
+    // sub_addr is a union, pack one of its fields with zap_addr_sub_addr_t_pack_<field>() and use the setter
+    bits[0] = (((uint64_t)s->is_csr & 0x1ULL) << 25) |
+              ((zap_id_bits[0] & 0x3fULL) << 19);
+}
+// Unpack bits into a zap_addr_t
+static inline void zap_addr_t_unpack(const uint64_t *bits, zap_addr_t *s) {
+    s->is_csr = (ADDR_TYPE_E)((bits[0] >> 25) & 0x1ULL);
+    {
+        uint64_t zap_id_bits[1];
+        zap_id_bits[0] = ((bits[0] >> 19) & 0x3fULL);
+        zap_id_t_unpack(zap_id_bits, &s->zap_id);
+    }
+    // sub_addr is a union, pack one of its fields with zap_addr_sub_addr_t_pack_<field>() and use the setter
+}
+
 // Address for blocks within the RACK
 typedef struct _rack_addr_t {
     rack_id_t rack_id;    // 3 bits : ID of a rack
@@ -296,30 +462,208 @@ typedef struct _rack_addr_t {
     uint16_t offset;    // 15 bits : offset within this instance's addr space
 } rack_addr_t;
 
+#define RACK_ADDR_T_WORDS 1
+// rack_id: 3 bits from bit 20
+static inline uint64_t rack_addr_t_get_rack_id(const uint64_t *bits) {
+    return ((bits[0] >> 20) & 0x7ULL);
+}
+static inline void rack_addr_t_set_rack_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x700000ULL) | ((value & 0x7ULL) << 20);
+}
+// rack_block_id: 2 bits from bit 18
+static inline uint64_t rack_addr_t_get_rack_block_id(const uint64_t *bits) {
+    return ((bits[0] >> 18) & 0x3ULL);
+}
+static inline void rack_addr_t_set_rack_block_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xc0000ULL) | ((value & 0x3ULL) << 18);
+}
+// rack_block_inst_id: 3 bits from bit 15
+static inline uint64_t rack_addr_t_get_rack_block_inst_id(const uint64_t *bits) {
+    return ((bits[0] >> 15) & 0x7ULL);
+}
+static inline void rack_addr_t_set_rack_block_inst_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x38000ULL) | ((value & 0x7ULL) << 15);
+}
+// offset: 15 bits from bit 0
+static inline uint64_t rack_addr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7fffULL);
+}
+static inline void rack_addr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffULL) | (value & 0x7fffULL);
+}
+// Pack a rack_addr_t into bits
+static inline void rack_addr_t_pack(const rack_addr_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->rack_id & 0x7ULL) << 20) |
+              (((uint64_t)s->rack_block_id & 0x3ULL) << 18) |
+              (((uint64_t)s->rack_block_inst_id & 0x7ULL) << 15) |
+              ((uint64_t)s->offset & 0x7fffULL);
+}
+// Unpack bits into a rack_addr_t
+static inline void rack_addr_t_unpack(const uint64_t *bits, rack_addr_t *s) {
+    s->rack_id = (rack_id_t)((bits[0] >> 20) & 0x7ULL);
+    s->rack_block_id = (RACK_BLOCK_ID_E)((bits[0] >> 18) & 0x3ULL);
+    s->rack_block_inst_id = (rack_block_inst_id_t)((bits[0] >> 15) & 0x7ULL);
+    s->offset = (uint16_t)(bits[0] & 0x7fffULL);
+}
+
 // Union for sub_addr field in addr_t
 typedef union _non_zap_subaddr_t {
     uint32_t offset;    // 23 bits : offset for cases where this is not a RACK-block
     rack_addr_t rack_addr;    // 23 bits : Address for blocks within the RACK
 } non_zap_subaddr_t;
 
+#define NON_ZAP_SUBADDR_T_WORDS 1
+// offset: 23 bits from bit 0
+static inline uint64_t non_zap_subaddr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7fffffULL);
+}
+static inline void non_zap_subaddr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffffULL) | (value & 0x7fffffULL);
+}
+// rack_addr: 23 bits from bit 0
+static inline uint64_t non_zap_subaddr_t_get_rack_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7fffffULL);
+}
+static inline void non_zap_subaddr_t_set_rack_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffffULL) | (value & 0x7fffffULL);
+}
+// Pack the offset of a non_zap_subaddr_t into bits
+static inline void non_zap_subaddr_t_pack_offset(const non_zap_subaddr_t *u, uint64_t *bits) {
+    bits[0] = ((uint64_t)u->offset & 0x7fffffULL);
+}
+// Unpack bits into the offset of a non_zap_subaddr_t
+static inline void non_zap_subaddr_t_unpack_offset(const uint64_t *bits, non_zap_subaddr_t *u) {
+    u->offset = (uint32_t)(bits[0] & 0x7fffffULL);
+}
+// Pack the rack_addr of a non_zap_subaddr_t into bits
+static inline void non_zap_subaddr_t_pack_rack_addr(const non_zap_subaddr_t *u, uint64_t *bits) {
+    uint64_t rack_addr_bits[1];
+    rack_addr_t_pack(&u->rack_addr, rack_addr_bits);
+    bits[0] = (rack_addr_bits[0] & 0x7fffffULL);
+}
+// Unpack bits into the rack_addr of a non_zap_subaddr_t
+static inline void non_zap_subaddr_t_unpack_rack_addr(const uint64_t *bits, non_zap_subaddr_t *u) {
+    {
+        uint64_t rack_addr_bits[1];
+        rack_addr_bits[0] = (bits[0] & 0x7fffffULL);
+        rack_addr_t_unpack(rack_addr_bits, &u->rack_addr);
+    }
+}
+
 // Non-Zap Addr Struct
 typedef struct _non_zap_addr_t {
     NON_ZAP_BLOCK_ID_E non_zap_block_id;    // 3 bits : The ID of an individual block in the BAG that does not live inside ZAP.
     non_zap_subaddr_t sub_addr;    // 23 bits : Union for sub_addr field in addr_t
 } non_zap_addr_t;
 
+#define NON_ZAP_ADDR_T_WORDS 1
+// non_zap_block_id: 3 bits from bit 23
+static inline uint64_t non_zap_addr_t_get_non_zap_block_id(const uint64_t *bits) {
+    return ((bits[0] >> 23) & 0x7ULL);
+}
+static inline void non_zap_addr_t_set_non_zap_block_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3800000ULL) | ((value & 0x7ULL) << 23);
+}
+// sub_addr: 23 bits from bit 0
+static inline uint64_t non_zap_addr_t_get_sub_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7fffffULL);
+}
+static inline void non_zap_addr_t_set_sub_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffffULL) | (value & 0x7fffffULL);
+}
+// Pack a non_zap_addr_t into bits
+static inline void non_zap_addr_t_pack(const non_zap_addr_t *s, uint64_t *bits) {
+    // sub_addr is a union, pack one of its fields with non_zap_subaddr_t_pack_<field>() and use the setter
+    bits[0] = (((uint64_t)s->non_zap_block_id & 0x7ULL) << 23);
+}
+// Unpack bits into a non_zap_addr_t
+static inline void non_zap_addr_t_unpack(const uint64_t *bits, non_zap_addr_t *s) {
+    s->non_zap_block_id = (NON_ZAP_BLOCK_ID_E)((bits[0] >> 23) & 0x7ULL);
+    // sub_addr is a union, pack one of its fields with non_zap_subaddr_t_pack_<field>() and use the setter
+}
+
 // Union for sub_addr field in addr_t
 typedef union _addr_sub_addr_t {
     zap_addr_t zap_addr;    // 26 bits : A memory address
     non_zap_addr_t non_zap_addr;    // 26 bits : Non-Zap Addr Struct
 } addr_sub_addr_t;
 
+#define ADDR_SUB_ADDR_T_WORDS 1
+// zap_addr: 26 bits from bit 0
+static inline uint64_t addr_sub_addr_t_get_zap_addr(const uint64_t *bits) {
+    return (bits[0] & 0x3ffffffULL);
+}
+static inline void addr_sub_addr_t_set_zap_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffULL) | (value & 0x3ffffffULL);
+}
+// non_zap_addr: 26 bits from bit 0
+static inline uint64_t addr_sub_addr_t_get_non_zap_addr(const uint64_t *bits) {
+    return (bits[0] & 0x3ffffffULL);
+}
+static inline void addr_sub_addr_t_set_non_zap_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffULL) | (value & 0x3ffffffULL);
+}
+// Pack the zap_addr of a addr_sub_addr_t into bits
+static inline void addr_sub_addr_t_pack_zap_addr(const addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t zap_addr_bits[1];
+    zap_addr_t_pack(&u->zap_addr, zap_addr_bits);
+    bits[0] = (zap_addr_bits[0] & 0x3ffffffULL);
+}
+// Unpack bits into the zap_addr of a addr_sub_addr_t
+static inline void addr_sub_addr_t_unpack_zap_addr(const uint64_t *bits, addr_sub_addr_t *u) {
+    {
+        uint64_t zap_addr_bits[1];
+        zap_addr_bits[0] = (bits[0] & 0x3ffffffULL);
+        zap_addr_t_unpack(zap_addr_bits, &u->zap_addr);
+    }
+}
+// Pack the non_zap_addr of a addr_sub_addr_t into bits
+static inline void addr_sub_addr_t_pack_non_zap_addr(const addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t non_zap_addr_bits[1];
+    non_zap_addr_t_pack(&u->non_zap_addr, non_zap_addr_bits);
+    bits[0] = (non_zap_addr_bits[0] & 0x3ffffffULL);
+}
+// Unpack bits into the non_zap_addr of a addr_sub_addr_t
+static inline void addr_sub_addr_t_unpack_non_zap_addr(const uint64_t *bits, addr_sub_addr_t *u) {
+    {
+        uint64_t non_zap_addr_bits[1];
+        non_zap_addr_bits[0] = (bits[0] & 0x3ffffffULL);
+        non_zap_addr_t_unpack(non_zap_addr_bits, &u->non_zap_addr);
+    }
+}
+
 // A generic address
 typedef struct _addr_t {
     IS_ZAP_E is_zap;    // 1 bits : Indicates a zap address or a non-zap address.
     addr_sub_addr_t sub_addr;    // 26 bits : Union for sub_addr field in addr_t
 } addr_t;
 
+#define ADDR_T_WORDS 1
+// is_zap: 1 bits from bit 26
+static inline uint64_t addr_t_get_is_zap(const uint64_t *bits) {
+    return ((bits[0] >> 26) & 0x1ULL);
+}
+static inline void addr_t_set_is_zap(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x4000000ULL) | ((value & 0x1ULL) << 26);
+}
+// sub_addr: 26 bits from bit 0
+static inline uint64_t addr_t_get_sub_addr(const uint64_t *bits) {
+    return (bits[0] & 0x3ffffffULL);
+}
+static inline void addr_t_set_sub_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffULL) | (value & 0x3ffffffULL);
+}
+// Pack a addr_t into bits
+static inline void addr_t_pack(const addr_t *s, uint64_t *bits) {
+    // sub_addr is a union, pack one of its fields with addr_sub_addr_t_pack_<field>() and use the setter
+    bits[0] = (((uint64_t)s->is_zap & 0x1ULL) << 26);
+}
+// Unpack bits into a addr_t
+static inline void addr_t_unpack(const uint64_t *bits, addr_t *s) {
+    s->is_zap = (IS_ZAP_E)((bits[0] >> 26) & 0x1ULL);
+    // sub_addr is a union, pack one of its fields with addr_sub_addr_t_pack_<field>() and use the setter
+}
+
 
 #define ADDRESS_ZAP_MEM(rack_id, zap_id, offset)    (((ZAP) << 26) | ((MEM) << 25) | ((rack_id) << 22) | ((zap_id) << 19) | ((offset) << 0))
 #define ADDRESS_ZAP_CSR(rack_id, zap_id, zap_block_id, offset)    (((ZAP) << 26) | ((CSR) << 25) | ((rack_id) << 22) | ((zap_id) << 19) | ((zap_block_id) << 15) | ((offset) << 0))
@@ -0,0 +1,752 @@
+
+// Autogenerated from tests/golden_inputs/test_pkg_c.yis by yis (https://github.com/Lightelligence/yis)
+//
+// Do Not Edit
+//
+#ifndef __TEST_PKG_C_YIS_H__
+#define __TEST_PKG_C_YIS_H__
+
+#include <stdint.h>
+
+
+#define ADDR_WIDTH 27           // The default address width
+#define ADDR_WIDTH_WIDTH 5           // Width of ADDR_WIDTH
+#define ADDR_WIDTH_COUNT_WIDTH 5           // Width to count ADDR_WIDTH items
+#define ADDR_WIDTH_WIDTH_ONE 1           // ADDR_WIDTH_WIDTH-wide 1 for incrementers and decrementers
+#define ADDR_WIDTH_COUNT_ONE 1           // ADDR_WIDTH_COUNT_WIDTH-wide 1 for incrementers and decrementers
+#define NUM_ZAP 8           // There are reasons why this is 8
+#define NUM_ZAP_WIDTH 3           // Width of NUM_ZAP
+#define NUM_ZAP_COUNT_WIDTH 4           // Width to count NUM_ZAP items
+#define NUM_ZAP_WIDTH_ONE 1           // NUM_ZAP_WIDTH-wide 1 for incrementers and decrementers
+#define NUM_ZAP_COUNT_ONE 1           // NUM_ZAP_COUNT_WIDTH-wide 1 for incrementers and decrementers
+#define RACK_ZAP_ID_E_WIDTH 3           // Width of RACK_ZAP_ID_E
+#define ADDR_TYPE_E_WIDTH 1           // Width of ADDR_TYPE_E
+#define IS_ZAP_E_WIDTH 1           // Width of IS_ZAP_E
+#define NON_ZAP_BLOCK_ID_E_WIDTH 3           // Width of NON_ZAP_BLOCK_ID_E
+#define ZAP_BLOCK_ID_E_WIDTH 4           // Width of ZAP_BLOCK_ID_E
+#define RACK_BLOCK_ID_E_WIDTH 2           // Width of RACK_BLOCK_ID_E
+#define CUP_ID_E_WIDTH 3           // Width of CUP_ID_E
+#define CRY_ID_E_WIDTH 7           // Width of CRY_ID_E
+#define ICE_ID_E_WIDTH 1           // Width of ICE_ID_E
+#define OPC_E_WIDTH 4           // Width of OPC_E
+#define SPARE_OPC_E_WIDTH 4           // Width of SPARE_OPC_E
+#define ZAP_ID_T_WIDTH 6           // Width of zap_id_t
+#define ADDR_T_WIDTH 27           // Width of addr_t
+#define JOB_ADDR_T_WIDTH 19           // Width of job_addr_t
+#define ZAP_CSR_ADDR_T_WIDTH 19           // Width of zap_csr_addr_t
+#define ZAP_ADDR_T_WIDTH 26           // Width of zap_addr_t
+#define NON_ZAP_ADDR_T_WIDTH 26           // Width of non_zap_addr_t
+#define RACK_ADDR_T_WIDTH 23           // Width of rack_addr_t
+#define RACK_ID_T_WIDTH 3           // Width of rack_id_t
+#define RACK_BLOCK_INST_ID_T_WIDTH 3           // Width of rack_block_inst_id_t
+#define QUAD_ID_T_WIDTH 2           // Width of quad_id_t
+
+
+// The zap id within a rack.
+typedef enum {
+    ZAP0 = 0,   // Zap 0 within) a rack
+    ZAP1 = 1,   // Zap 1 within a rack
+    ZAP2 = 2,   // Zap 2 within a rack
+    ZAP3 = 3,   // Zap 3 within a rack
+    ZAP4 = 4,   // Zap 4 within a rack
+    ZAP5 = 5,   // Zap 5 within a rack
+    ZAP6 = 6,   // Zap 6 within a rack
+    ZAP7 = 7,   // Zap 7 within a rack
+} RACK_ZAP_ID_E;
+
+// Indicates top-level address type.
+typedef enum {
+    MEM = 0,   // This is a memory address.
+    CSR = 1,   // This is an CSR address.
+} ADDR_TYPE_E;
+
+// Indicates a zap address or a non-zap address.
+typedef enum {
+    NON_ZAP = 0,   // This address targets something outside a zap.
+    ZAP = 1,   // This address targets something inside a zap.
+} IS_ZAP_E;
+
+// The ID of an individual block in the BAG that does not live inside ZAP.
+typedef enum {
+    LEG_ID = 0,   // LEG
+    TAX_ID = 1,   // LEG controller
+    EGO_ID = 2,   // EGO controller
+    ASH_ID = 4,   // Interrupt Controller
+    SIN_ID = 5,   // Lorem ipsum dolor
+    RACK_ID = 6,   // One of the non-zap blocks within the RACK
+    FOX_ID = 7,   // Sit amet
+} NON_ZAP_BLOCK_ID_E;
+
+// A subblock ID inside a ZAP.
+typedef enum {
+    TRY = 1,   // Consectetur adipiscing
+    HORN = 2,   // Zap Miscellaneous Bus Controller
+    EYE = 3,   // Eye beams
+    PIE_SLICE0 = 4,   // PIE slice 0
+    PIE_SLICE1 = 5,   // PIE slice 1
+    PIE_SLICE2 = 6,   // PIE slice 2
+    PIE_SLICE3 = 7,   // PIE slice 2
+    KID = 8,   // Pellentesque eget
+    JOB = 9,   // Aliquet lorem
+    TIP = 10,   // JOB Bridge
+    GET = 11,   // Nulla pharetra velit. Sed eget justo dolor. Proin egestas nulla vitae tempor fringilla. Sed commodo vulputate enim a pulvinar. Receive
+    GRE = 12,   // Nulla pharetra velit. Sed eget justo dolor. Proin egestas nulla vitae tempor fringilla. Sed commodo vulputate enim a pulvinar. Transmit
+} ZAP_BLOCK_ID_E;
+
+// A block instantiated at RACK-level that is not a zap
+typedef enum {
+    ICE = 0,   // Sed eget
+    CRY = 1,   // Sed lobortis congue Receive
+    CUP = 2,   // Sed lobortis congue Transmit
+} RACK_BLOCK_ID_E;
+
+// CUP numbering for address generation
+typedef enum {
+    CUP0 = 0,   // CUPn
+    CUP1 = 1,   // CUPn
+    CUP2 = 2,   // CUPn
+    CUP3 = 3,   // CUPn
+    CUP4 = 4,   // CUPn
+    CUP5 = 5,   // CUPn
+    CUP6 = 6,   // CUPn
+    CUP7 = 7,   // CUPn
+} CUP_ID_E;
+
+// CRY numbering for address generation
+typedef enum {
+    CRY0 = 0,   // CRYn
+    CRY1 = 1,   // CRYn
+    CRY2 = 2,   // CRYn
+    CRY3 = 3,   // CRYn
+    CRY4 = 4,   // CRYn
+    CRY5 = 5,   // CRYn
+    CRY6 = 6,   // CRYn
+    CRY7 = 7,   // CRYn
+    CRY8 = 8,   // CRYn
+    CRY9 = 9,   // CRYn
+    CRY10 = 10,   // CRYn
+    CRY11 = 11,   // CRYn
+    CRY12 = 12,   // CRYn
+    CRY13 = 13,   // CRYn
+    CRY14 = 14,   // CRYn
+    CRY15 = 15,   // CRYn
+    CRY16 = 16,   // CRYn
+    CRY17 = 17,   // CRYn
+    CRY18 = 18,   // CRYn
+    CRY19 = 19,   // CRYn
+    CRY20 = 20,   // CRYn
+    CRY21 = 21,   // CRYn
+    CRY22 = 22,   // CRYn
+    CRY23 = 23,   // CRYn
+    CRY24 = 24,   // CRYn
+    CRY25 = 25,   // CRYn
+    CRY26 = 26,   // CRYn
+    CRY27 = 27,   // CRYn
+    CRY28 = 28,   // CRYn
+    CRY29 = 29,   // CRYn
+    CRY30 = 30,   // CRYn
+    CRY31 = 31,   // CRYn
+    CRY32 = 32,   // CRYn
+    CRY33 = 33,   // CRYn
+    CRY34 = 34,   // CRYn
+    CRY35 = 35,   // CRYn
+    CRY36 = 36,   // CRYn
+    CRY37 = 37,   // CRYn
+    CRY38 = 38,   // CRYn
+    CRY39 = 39,   // CRYn
+    CRY40 = 40,   // CRYn
+    CRY41 = 41,   // CRYn
+    CRY42 = 42,   // CRYn
+    CRY43 = 43,   // CRYn
+    CRY44 = 44,   // CRYn
+    CRY45 = 45,   // CRYn
+    CRY46 = 46,   // CRYn
+    CRY47 = 47,   // CRYn
+    CRY48 = 48,   // CRYn
+    CRY49 = 49,   // CRYn
+    CRY50 = 50,   // CRYn
+    CRY51 = 51,   // CRYn
+    CRY52 = 52,   // CRYn
+    CRY53 = 53,   // CRYn
+    CRY54 = 54,   // CRYn
+    CRY55 = 55,   // CRYn
+    CRY56 = 56,   // CRYn
+    CRY57 = 57,   // CRYn
+    CRY58 = 58,   // CRYn
+    CRY59 = 59,   // CRYn
+    CRY60 = 60,   // CRYn
+    CRY61 = 61,   // CRYn
+    CRY62 = 62,   // CRYn
+    CRY63 = 63,   // CRYn
+    CRY64 = 64,   // CRYn
+    CRY65 = 65,   // CRYn
+    CRY66 = 66,   // CRYn
+    CRY67 = 67,   // CRYn
+    CRY68 = 68,   // CRYn
+    CRY69 = 69,   // CRYn
+    CRY70 = 70,   // CRYn
+    CRY71 = 71,   // CRYn
+    CRY72 = 72,   // CRYn
+    CRY73 = 73,   // CRYn
+    CRY74 = 74,   // CRYn
+    CRY75 = 75,   // CRYn
+    CRY76 = 76,   // CRYn
+    CRY77 = 77,   // CRYn
+    CRY78 = 78,   // CRYn
+    CRY79 = 79,   // CRYn
+    CRY80 = 80,   // CRYn
+    CRY81 = 81,   // CRYn
+    CRY82 = 82,   // CRYn
+    CRY83 = 83,   // CRYn
+    CRY84 = 84,   // CRYn
+    CRY85 = 85,   // CRYn
+    CRY86 = 86,   // CRYn
+    CRY87 = 87,   // CRYn
+    CRY88 = 88,   // CRYn
+    CRY89 = 89,   // CRYn
+    CRY90 = 90,   // CRYn
+    CRY91 = 91,   // CRYn
+    CRY92 = 92,   // CRYn
+    CRY93 = 93,   // CRYn
+    CRY94 = 94,   // CRYn
+    CRY95 = 95,   // CRYn
+    CRY96 = 96,   // CRYn
+    CRY97 = 97,   // CRYn
+    CRY98 = 98,   // CRYn
+    CRY99 = 99,   // CRYn
+    CRY100 = 100,   // CRYn
+    CRY101 = 101,   // CRYn
+    CRY102 = 102,   // CRYn
+    CRY103 = 103,   // CRYn
+    CRY104 = 104,   // CRYn
+    CRY105 = 105,   // CRYn
+    CRY106 = 106,   // CRYn
+    CRY107 = 107,   // CRYn
+    CRY108 = 108,   // CRYn
+    CRY109 = 109,   // CRYn
+    CRY110 = 110,   // CRYn
+    CRY111 = 111,   // CRYn
+    CRY112 = 112,   // CRYn
+    CRY113 = 113,   // CRYn
+    CRY114 = 114,   // CRYn
+    CRY115 = 115,   // CRYn
+    CRY116 = 116,   // CRYn
+    CRY117 = 117,   // CRYn
+    CRY118 = 118,   // CRYn
+    CRY119 = 119,   // CRYn
+    CRY120 = 120,   // CRYn
+    CRY121 = 121,   // CRYn
+    CRY122 = 122,   // CRYn
+    CRY123 = 123,   // CRYn
+    CRY124 = 124,   // CRYn
+    CRY125 = 125,   // CRYn
+    CRY126 = 126,   // CRYn
+    CRY127 = 127,   // CRYn
+} CRY_ID_E;
+
+// ICE Numbering
+typedef enum {
+    ICE0 = 0,   // ICE 0
+} ICE_ID_E;
+
+// Opcodes, the empty range next to the explicit value adds no values
+typedef enum {
+    OPC = 7,   // The only opcode
+} OPC_E;
+
+// Spare opcodes, the empty range before the explicit value adds no values
+typedef enum {
+    SPARE = 5,   // The only spare opcode
+} SPARE_OPC_E;
+
+
+// ID of a rack
+typedef uint8_t rack_id_t;    // 3 bits wide
+
+// ID number for one of the non-zap blocks instantiated at RACK-level
+typedef uint8_t rack_block_inst_id_t;    // 3 bits wide
+
+// ID of a quad
+typedef uint8_t quad_id_t;    // 2 bits wide
+
+
+// The ID for a given ZAP
+typedef struct _zap_id_t {
+    rack_id_t rack_id;    // 3 bits : ID of a rack
+    RACK_ZAP_ID_E zap_id;    // 3 bits : Zap ID (Within a rack)
+} zap_id_t;
+
+#define ZAP_ID_T_WORDS 1
+// rack_id: 3 bits from bit 3
+static inline uint64_t zap_id_t_get_rack_id(const uint64_t *bits) {
+    return ((bits[0] >> 3) & 0x7ULL);
+}
+static inline void zap_id_t_set_rack_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x38ULL) | ((value & 0x7ULL) << 3);
+}
+// zap_id: 3 bits from bit 0
+static inline uint64_t zap_id_t_get_zap_id(const uint64_t *bits) {
+    return (bits[0] & 0x7ULL);
+}
+static inline void zap_id_t_set_zap_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ULL) | (value & 0x7ULL);
+}
+// Pack a zap_id_t into bits
+static inline void zap_id_t_pack(const zap_id_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->rack_id & 0x7ULL) << 3) |
+              ((uint64_t)s->zap_id & 0x7ULL);
+}
+// Unpack bits into a zap_id_t
+static inline void zap_id_t_unpack(const uint64_t *bits, zap_id_t *s) {
+    s->rack_id = (rack_id_t)((bits[0] >> 3) & 0x7ULL);
+    s->zap_id = (RACK_ZAP_ID_E)(bits[0] & 0x7ULL);
+}
+
+// JOB Addr struct
+typedef struct _job_addr_t {
+    uint32_t offset;    // 19 bits : JOB Address Offset
+} job_addr_t;
+
+#define JOB_ADDR_T_WORDS 1
+// offset: 19 bits from bit 0
+static inline uint64_t job_addr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void job_addr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// Pack a job_addr_t into bits
+static inline void job_addr_t_pack(const job_addr_t *s, uint64_t *bits) {
+    bits[0] = ((uint64_t)s->offset & 0x7ffffULL);
+}
+// Unpack bits into a job_addr_t
+static inline void job_addr_t_unpack(const uint64_t *bits, job_addr_t *s) {
+    s->offset = (uint32_t)(bits[0] & 0x7ffffULL);
+}
+
+// Zap CSR Addr Struct
+typedef struct _zap_csr_addr_t {
+    ZAP_BLOCK_ID_E zap_block_id;    // 4 bits : A subblock ID inside a ZAP.
+    uint16_t offset;    // 15 bits : offset into the CSR address space
+} zap_csr_addr_t;
+
+#define ZAP_CSR_ADDR_T_WORDS 1
+// zap_block_id: 4 bits from bit 15
+static inline uint64_t zap_csr_addr_t_get_zap_block_id(const uint64_t *bits) {
+    return ((bits[0] >> 15) & 0xfULL);
+}
+static inline void zap_csr_addr_t_set_zap_block_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x78000ULL) | ((value & 0xfULL) << 15);
+}
+// offset: 15 bits from bit 0
+static inline uint64_t zap_csr_addr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7fffULL);
+}
+static inline void zap_csr_addr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffULL) | (value & 0x7fffULL);
+}
+// Pack a zap_csr_addr_t into bits
+static inline void zap_csr_addr_t_pack(const zap_csr_addr_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->zap_block_id & 0xfULL) << 15) |
+              ((uint64_t)s->offset & 0x7fffULL);
+}
+// Unpack bits into a zap_csr_addr_t
+static inline void zap_csr_addr_t_unpack(const uint64_t *bits, zap_csr_addr_t *s) {
+    s->zap_block_id = (ZAP_BLOCK_ID_E)((bits[0] >> 15) & 0xfULL);
+    s->offset = (uint16_t)(bits[0] & 0x7fffULL);
+}
+
+// Union of the sub_addr field in zap_addr_t
+typedef union _zap_addr_sub_addr_t {
+    job_addr_t job_addr;    // 19 bits : JOB Addr struct
+    zap_csr_addr_t zap_csr_addr;    // 19 bits : Zap CSR Addr Struct
+} zap_addr_sub_addr_t;
+
+#define ZAP_ADDR_SUB_ADDR_T_WORDS 1
+// job_addr: 19 bits from bit 0
+static inline uint64_t zap_addr_sub_addr_t_get_job_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void zap_addr_sub_addr_t_set_job_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// zap_csr_addr: 19 bits from bit 0
+static inline uint64_t zap_addr_sub_addr_t_get_zap_csr_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void zap_addr_sub_addr_t_set_zap_csr_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// Pack the job_addr of a zap_addr_sub_addr_t into bits
+static inline void zap_addr_sub_addr_t_pack_job_addr(const zap_addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t job_addr_bits[1];
+    job_addr_t_pack(&u->job_addr, job_addr_bits);
+    bits[0] = (job_addr_bits[0] & 0x7ffffULL);
+}
+// Unpack bits into the job_addr of a zap_addr_sub_addr_t
+static inline void zap_addr_sub_addr_t_unpack_job_addr(const uint64_t *bits, zap_addr_sub_addr_t *u) {
+    {
+        uint64_t job_addr_bits[1];
+        job_addr_bits[0] = (bits[0] & 0x7ffffULL);
+        job_addr_t_unpack(job_addr_bits, &u->job_addr);
+    }
+}
+// Pack the zap_csr_addr of a zap_addr_sub_addr_t into bits
+static inline void zap_addr_sub_addr_t_pack_zap_csr_addr(const zap_addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t zap_csr_addr_bits[1];
+    zap_csr_addr_t_pack(&u->zap_csr_addr, zap_csr_addr_bits);
+    bits[0] = (zap_csr_addr_bits[0] & 0x7ffffULL);
+}
+// Unpack bits into the zap_csr_addr of a zap_addr_sub_addr_t
+static inline void zap_addr_sub_addr_t_unpack_zap_csr_addr(const uint64_t *bits, zap_addr_sub_addr_t *u) {
+    {
+        uint64_t zap_csr_addr_bits[1];
+        zap_csr_addr_bits[0] = (bits[0] & 0x7ffffULL);
+        zap_csr_addr_t_unpack(zap_csr_addr_bits, &u->zap_csr_addr);
+    }
+}
+
+// A memory address
+typedef struct _zap_addr_t {
+    ADDR_TYPE_E is_csr;    // 1 bits : Indicates top-level address type.
+    zap_id_t zap_id;    // 6 bits : The ID for a given ZAP
+    zap_addr_sub_addr_t sub_addr;    // 19 bits : Union of the sub_addr field in zap_addr_t
+} zap_addr_t;
+
+#define ZAP_ADDR_T_WORDS 1
+// is_csr: 1 bits from bit 25
+static inline uint64_t zap_addr_t_get_is_csr(const uint64_t *bits) {
+    return ((bits[0] >> 25) & 0x1ULL);
+}
+static inline void zap_addr_t_set_is_csr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x2000000ULL) | ((value & 0x1ULL) << 25);
+}
+// zap_id: 6 bits from bit 19
+static inline uint64_t zap_addr_t_get_zap_id(const uint64_t *bits) {
+    return ((bits[0] >> 19) & 0x3fULL);
+}
+static inline void zap_addr_t_set_zap_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x1f80000ULL) | ((value & 0x3fULL) << 19);
+}
+// sub_addr: 19 bits from bit 0
+static inline uint64_t zap_addr_t_get_sub_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7ffffULL);
+}
+static inline void zap_addr_t_set_sub_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7ffffULL) | (value & 0x7ffffULL);
+}
+// Pack a zap_addr_t into bits
+static inline void zap_addr_t_pack(const zap_addr_t *s, uint64_t *bits) {
+    uint64_t zap_id_bits[1];
+    zap_id_t_pack(&s->zap_id, zap_id_bits);
+    // sub_addr is a union, pack one of its fields with zap_addr_sub_addr_t_pack_<field>() and use the setter
+    bits[0] = (((uint64_t)s->is_csr & 0x1ULL) << 25) |
+              ((zap_id_bits[0] & 0x3fULL) << 19);
+}
+// Unpack bits into a zap_addr_t
+static inline void zap_addr_t_unpack(const uint64_t *bits, zap_addr_t *s) {
+    s->is_csr = (ADDR_TYPE_E)((bits[0] >> 25) & 0x1ULL);
+    {
+        uint64_t zap_id_bits[1];
+        zap_id_bits[0] = ((bits[0] >> 19) & 0x3fULL);
+        zap_id_t_unpack(zap_id_bits, &s->zap_id);
+    }
+    // sub_addr is a union, pack one of its fields with zap_addr_sub_addr_t_pack_<field>() and use the setter
+}
+
+// Address for blocks within the RACK
+typedef struct _rack_addr_t {
+    rack_id_t rack_id;    // 3 bits : ID of a rack
+    RACK_BLOCK_ID_E rack_block_id;    // 2 bits : which type of block
+    rack_block_inst_id_t rack_block_inst_id;    // 3 bits : Which instance of this block-type
+    uint16_t offset;    // 15 bits : offset within this instance's addr space
+} rack_addr_t;
+
+#define RACK_ADDR_T_WORDS 1
+// rack_id: 3 bits from bit 20
+static inline uint64_t rack_addr_t_get_rack_id(const uint64_t *bits) {
+    return ((bits[0] >> 20) & 0x7ULL);
+}
+static inline void rack_addr_t_set_rack_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x700000ULL) | ((value & 0x7ULL) << 20);
+}
+// rack_block_id: 2 bits from bit 18
+static inline uint64_t rack_addr_t_get_rack_block_id(const uint64_t *bits) {
+    return ((bits[0] >> 18) & 0x3ULL);
+}
+static inline void rack_addr_t_set_rack_block_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xc0000ULL) | ((value & 0x3ULL) << 18);
+}
+// rack_block_inst_id: 3 bits from bit 15
+static inline uint64_t rack_addr_t_get_rack_block_inst_id(const uint64_t *bits) {
+    return ((bits[0] >> 15) & 0x7ULL);
+}
+static inline void rack_addr_t_set_rack_block_inst_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x38000ULL) | ((value & 0x7ULL) << 15);
+}
+// offset: 15 bits from bit 0
+static inline uint64_t rack_addr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7fffULL);
+}
+static inline void rack_addr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffULL) | (value & 0x7fffULL);
+}
+// Pack a rack_addr_t into bits
+static inline void rack_addr_t_pack(const rack_addr_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->rack_id & 0x7ULL) << 20) |
+              (((uint64_t)s->rack_block_id & 0x3ULL) << 18) |
+              (((uint64_t)s->rack_block_inst_id & 0x7ULL) << 15) |
+              ((uint64_t)s->offset & 0x7fffULL);
+}
+// Unpack bits into a rack_addr_t
+static inline void rack_addr_t_unpack(const uint64_t *bits, rack_addr_t *s) {
+    s->rack_id = (rack_id_t)((bits[0] >> 20) & 0x7ULL);
+    s->rack_block_id = (RACK_BLOCK_ID_E)((bits[0] >> 18) & 0x3ULL);
+    s->rack_block_inst_id = (rack_block_inst_id_t)((bits[0] >> 15) & 0x7ULL);
+    s->offset = (uint16_t)(bits[0] & 0x7fffULL);
+}
+
+// Union for sub_addr field in addr_t
+typedef union _non_zap_subaddr_t {
+    uint32_t offset;    // 23 bits : offset for cases where this is not a RACK-block
+    rack_addr_t rack_addr;    // 23 bits : Address for blocks within the RACK
+} non_zap_subaddr_t;
+
+#define NON_ZAP_SUBADDR_T_WORDS 1
+// offset: 23 bits from bit 0
+static inline uint64_t non_zap_subaddr_t_get_offset(const uint64_t *bits) {
+    return (bits[0] & 0x7fffffULL);
+}
+static inline void non_zap_subaddr_t_set_offset(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffffULL) | (value & 0x7fffffULL);
+}
+// rack_addr: 23 bits from bit 0
+static inline uint64_t non_zap_subaddr_t_get_rack_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7fffffULL);
+}
+static inline void non_zap_subaddr_t_set_rack_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffffULL) | (value & 0x7fffffULL);
+}
+// Pack the offset of a non_zap_subaddr_t into bits
+static inline void non_zap_subaddr_t_pack_offset(const non_zap_subaddr_t *u, uint64_t *bits) {
+    bits[0] = ((uint64_t)u->offset & 0x7fffffULL);
+}
+// Unpack bits into the offset of a non_zap_subaddr_t
+static inline void non_zap_subaddr_t_unpack_offset(const uint64_t *bits, non_zap_subaddr_t *u) {
+    u->offset = (uint32_t)(bits[0] & 0x7fffffULL);
+}
+// Pack the rack_addr of a non_zap_subaddr_t into bits
+static inline void non_zap_subaddr_t_pack_rack_addr(const non_zap_subaddr_t *u, uint64_t *bits) {
+    uint64_t rack_addr_bits[1];
+    rack_addr_t_pack(&u->rack_addr, rack_addr_bits);
+    bits[0] = (rack_addr_bits[0] & 0x7fffffULL);
+}
+// Unpack bits into the rack_addr of a non_zap_subaddr_t
+static inline void non_zap_subaddr_t_unpack_rack_addr(const uint64_t *bits, non_zap_subaddr_t *u) {
+    {
+        uint64_t rack_addr_bits[1];
+        rack_addr_bits[0] = (bits[0] & 0x7fffffULL);
+        rack_addr_t_unpack(rack_addr_bits, &u->rack_addr);
+    }
+}
+
+// Non-Zap Addr Struct
+typedef struct _non_zap_addr_t {
+    NON_ZAP_BLOCK_ID_E non_zap_block_id;    // 3 bits : The ID of an individual block in the BAG that does not live inside ZAP.
+    non_zap_subaddr_t sub_addr;    // 23 bits : Union for sub_addr field in addr_t
+} non_zap_addr_t;
+
+#define NON_ZAP_ADDR_T_WORDS 1
+// non_zap_block_id: 3 bits from bit 23
+static inline uint64_t non_zap_addr_t_get_non_zap_block_id(const uint64_t *bits) {
+    return ((bits[0] >> 23) & 0x7ULL);
+}
+static inline void non_zap_addr_t_set_non_zap_block_id(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3800000ULL) | ((value & 0x7ULL) << 23);
+}
+// sub_addr: 23 bits from bit 0
+static inline uint64_t non_zap_addr_t_get_sub_addr(const uint64_t *bits) {
+    return (bits[0] & 0x7fffffULL);
+}
+static inline void non_zap_addr_t_set_sub_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x7fffffULL) | (value & 0x7fffffULL);
+}
+// Pack a non_zap_addr_t into bits
+static inline void non_zap_addr_t_pack(const non_zap_addr_t *s, uint64_t *bits) {
+    // sub_addr is a union, pack one of its fields with non_zap_subaddr_t_pack_<field>() and use the setter
+    bits[0] = (((uint64_t)s->non_zap_block_id & 0x7ULL) << 23);
+}
+// Unpack bits into a non_zap_addr_t
+static inline void non_zap_addr_t_unpack(const uint64_t *bits, non_zap_addr_t *s) {
+    s->non_zap_block_id = (NON_ZAP_BLOCK_ID_E)((bits[0] >> 23) & 0x7ULL);
+    // sub_addr is a union, pack one of its fields with non_zap_subaddr_t_pack_<field>() and use the setter
+}
+
+// Union for sub_addr field in addr_t
+typedef union _addr_sub_addr_t {
+    zap_addr_t zap_addr;    // 26 bits : A memory address
+    non_zap_addr_t non_zap_addr;    // 26 bits : Non-Zap Addr Struct
+} addr_sub_addr_t;
+
+#define ADDR_SUB_ADDR_T_WORDS 1
+// zap_addr: 26 bits from bit 0
+static inline uint64_t addr_sub_addr_t_get_zap_addr(const uint64_t *bits) {
+    return (bits[0] & 0x3ffffffULL);
+}
+static inline void addr_sub_addr_t_set_zap_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffULL) | (value & 0x3ffffffULL);
+}
+// non_zap_addr: 26 bits from bit 0
+static inline uint64_t addr_sub_addr_t_get_non_zap_addr(const uint64_t *bits) {
+    return (bits[0] & 0x3ffffffULL);
+}
+static inline void addr_sub_addr_t_set_non_zap_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffULL) | (value & 0x3ffffffULL);
+}
+// Pack the zap_addr of a addr_sub_addr_t into bits
+static inline void addr_sub_addr_t_pack_zap_addr(const addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t zap_addr_bits[1];
+    zap_addr_t_pack(&u->zap_addr, zap_addr_bits);
+    bits[0] = (zap_addr_bits[0] & 0x3ffffffULL);
+}
+// Unpack bits into the zap_addr of a addr_sub_addr_t
+static inline void addr_sub_addr_t_unpack_zap_addr(const uint64_t *bits, addr_sub_addr_t *u) {
+    {
+        uint64_t zap_addr_bits[1];
+        zap_addr_bits[0] = (bits[0] & 0x3ffffffULL);
+        zap_addr_t_unpack(zap_addr_bits, &u->zap_addr);
+    }
+}
+// Pack the non_zap_addr of a addr_sub_addr_t into bits
+static inline void addr_sub_addr_t_pack_non_zap_addr(const addr_sub_addr_t *u, uint64_t *bits) {
+    uint64_t non_zap_addr_bits[1];
+    non_zap_addr_t_pack(&u->non_zap_addr, non_zap_addr_bits);
+    bits[0] = (non_zap_addr_bits[0] & 0x3ffffffULL);
+}
+// Unpack bits into the non_zap_addr of a addr_sub_addr_t
+static inline void addr_sub_addr_t_unpack_non_zap_addr(const uint64_t *bits, addr_sub_addr_t *u) {
+    {
+        uint64_t non_zap_addr_bits[1];
+        non_zap_addr_bits[0] = (bits[0] & 0x3ffffffULL);
+        non_zap_addr_t_unpack(non_zap_addr_bits, &u->non_zap_addr);
+    }
+}
+
+// A generic address
+typedef struct _addr_t {
+    IS_ZAP_E is_zap;    // 1 bits : Indicates a zap address or a non-zap address.
+    addr_sub_addr_t sub_addr;    // 26 bits : Union for sub_addr field in addr_t
+} addr_t;
+
+#define ADDR_T_WORDS 1
+// is_zap: 1 bits from bit 26
+static inline uint64_t addr_t_get_is_zap(const uint64_t *bits) {
+    return ((bits[0] >> 26) & 0x1ULL);
+}
+static inline void addr_t_set_is_zap(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x4000000ULL) | ((value & 0x1ULL) << 26);
+}
+// sub_addr: 26 bits from bit 0
+static inline uint64_t addr_t_get_sub_addr(const uint64_t *bits) {
+    return (bits[0] & 0x3ffffffULL);
+}
+static inline void addr_t_set_sub_addr(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ffffffULL) | (value & 0x3ffffffULL);
+}
+// Pack a addr_t into bits
+static inline void addr_t_pack(const addr_t *s, uint64_t *bits) {
+    // sub_addr is a union, pack one of its fields with addr_sub_addr_t_pack_<field>() and use the setter
+    bits[0] = (((uint64_t)s->is_zap & 0x1ULL) << 26);
+}
+// Unpack bits into a addr_t
+static inline void addr_t_unpack(const uint64_t *bits, addr_t *s) {
+    s->is_zap = (IS_ZAP_E)((bits[0] >> 26) & 0x1ULL);
+    // sub_addr is a union, pack one of its fields with addr_sub_addr_t_pack_<field>() and use the setter
+}
+
+
+// ADDRESS addr_t: 27 bits
+#define ADDRESS_ADDR_T_IS_ZAP_SHIFT 26
+#define ADDRESS_ADDR_T_IS_ZAP_MASK 0x1ULL
+// is_zap selects sub_addr
+#define ADDRESS_ADDR_T_SUB_ADDR_SHIFT 0
+#define ADDRESS_ADDR_T_SUB_ADDR_MASK 0x3ffffffULL
+// sub_addr is one of: address_zap_addr_t(), address_non_zap_addr_t()
+static inline uint64_t address_addr_t(uint64_t is_zap, uint64_t sub_addr) {
+    return ((is_zap & ADDRESS_ADDR_T_IS_ZAP_MASK) << ADDRESS_ADDR_T_IS_ZAP_SHIFT) |
+           ((sub_addr & ADDRESS_ADDR_T_SUB_ADDR_MASK) << ADDRESS_ADDR_T_SUB_ADDR_SHIFT);
+}
+
+// ADDRESS zap_addr_t: 26 bits
+#define ADDRESS_ZAP_ADDR_T_IS_CSR_SHIFT 25
+#define ADDRESS_ZAP_ADDR_T_IS_CSR_MASK 0x1ULL
+// is_csr selects sub_addr
+#define ADDRESS_ZAP_ADDR_T_ZAP_ID_SHIFT 19
+#define ADDRESS_ZAP_ADDR_T_ZAP_ID_MASK 0x3fULL
+// zap_id is composed by address_zap_id_t()
+#define ADDRESS_ZAP_ADDR_T_SUB_ADDR_SHIFT 0
+#define ADDRESS_ZAP_ADDR_T_SUB_ADDR_MASK 0x7ffffULL
+// sub_addr is one of: address_job_addr_t(), address_zap_csr_addr_t()
+static inline uint64_t address_zap_addr_t(uint64_t is_csr, uint64_t zap_id, uint64_t sub_addr) {
+    return ((is_csr & ADDRESS_ZAP_ADDR_T_IS_CSR_MASK) << ADDRESS_ZAP_ADDR_T_IS_CSR_SHIFT) |
+           ((zap_id & ADDRESS_ZAP_ADDR_T_ZAP_ID_MASK) << ADDRESS_ZAP_ADDR_T_ZAP_ID_SHIFT) |
+           ((sub_addr & ADDRESS_ZAP_ADDR_T_SUB_ADDR_MASK) << ADDRESS_ZAP_ADDR_T_SUB_ADDR_SHIFT);
+}
+
+// ADDRESS non_zap_addr_t: 26 bits
+#define ADDRESS_NON_ZAP_ADDR_T_NON_ZAP_BLOCK_ID_SHIFT 23
+#define ADDRESS_NON_ZAP_ADDR_T_NON_ZAP_BLOCK_ID_MASK 0x7ULL
+// non_zap_block_id selects sub_addr
+#define ADDRESS_NON_ZAP_ADDR_T_SUB_ADDR_SHIFT 0
+#define ADDRESS_NON_ZAP_ADDR_T_SUB_ADDR_MASK 0x7fffffULL
+// sub_addr is one of: offset, address_rack_addr_t()
+static inline uint64_t address_non_zap_addr_t(uint64_t non_zap_block_id, uint64_t sub_addr) {
+    return ((non_zap_block_id & ADDRESS_NON_ZAP_ADDR_T_NON_ZAP_BLOCK_ID_MASK) << ADDRESS_NON_ZAP_ADDR_T_NON_ZAP_BLOCK_ID_SHIFT) |
+           ((sub_addr & ADDRESS_NON_ZAP_ADDR_T_SUB_ADDR_MASK) << ADDRESS_NON_ZAP_ADDR_T_SUB_ADDR_SHIFT);
+}
+
+// ADDRESS zap_id_t: 6 bits
+#define ADDRESS_ZAP_ID_T_RACK_ID_SHIFT 3
+#define ADDRESS_ZAP_ID_T_RACK_ID_MASK 0x7ULL
+#define ADDRESS_ZAP_ID_T_ZAP_ID_SHIFT 0
+#define ADDRESS_ZAP_ID_T_ZAP_ID_MASK 0x7ULL
+static inline uint64_t address_zap_id_t(uint64_t rack_id, uint64_t zap_id) {
+    return ((rack_id & ADDRESS_ZAP_ID_T_RACK_ID_MASK) << ADDRESS_ZAP_ID_T_RACK_ID_SHIFT) |
+           ((zap_id & ADDRESS_ZAP_ID_T_ZAP_ID_MASK) << ADDRESS_ZAP_ID_T_ZAP_ID_SHIFT);
+}
+
+// ADDRESS job_addr_t: 19 bits
+#define ADDRESS_JOB_ADDR_T_OFFSET_SHIFT 0
+#define ADDRESS_JOB_ADDR_T_OFFSET_MASK 0x7ffffULL
+static inline uint64_t address_job_addr_t(uint64_t offset) {
+    return ((offset & ADDRESS_JOB_ADDR_T_OFFSET_MASK) << ADDRESS_JOB_ADDR_T_OFFSET_SHIFT);
+}
+
+// ADDRESS zap_csr_addr_t: 19 bits
+#define ADDRESS_ZAP_CSR_ADDR_T_ZAP_BLOCK_ID_SHIFT 15
+#define ADDRESS_ZAP_CSR_ADDR_T_ZAP_BLOCK_ID_MASK 0xfULL
+#define ADDRESS_ZAP_CSR_ADDR_T_OFFSET_SHIFT 0
+#define ADDRESS_ZAP_CSR_ADDR_T_OFFSET_MASK 0x7fffULL
+static inline uint64_t address_zap_csr_addr_t(uint64_t zap_block_id, uint64_t offset) {
+    return ((zap_block_id & ADDRESS_ZAP_CSR_ADDR_T_ZAP_BLOCK_ID_MASK) << ADDRESS_ZAP_CSR_ADDR_T_ZAP_BLOCK_ID_SHIFT) |
+           ((offset & ADDRESS_ZAP_CSR_ADDR_T_OFFSET_MASK) << ADDRESS_ZAP_CSR_ADDR_T_OFFSET_SHIFT);
+}
+
+// ADDRESS rack_addr_t: 23 bits
+#define ADDRESS_RACK_ADDR_T_RACK_ID_SHIFT 20
+#define ADDRESS_RACK_ADDR_T_RACK_ID_MASK 0x7ULL
+#define ADDRESS_RACK_ADDR_T_RACK_BLOCK_ID_SHIFT 18
+#define ADDRESS_RACK_ADDR_T_RACK_BLOCK_ID_MASK 0x3ULL
+#define ADDRESS_RACK_ADDR_T_RACK_BLOCK_INST_ID_SHIFT 15
+#define ADDRESS_RACK_ADDR_T_RACK_BLOCK_INST_ID_MASK 0x7ULL
+#define ADDRESS_RACK_ADDR_T_OFFSET_SHIFT 0
+#define ADDRESS_RACK_ADDR_T_OFFSET_MASK 0x7fffULL
+static inline uint64_t address_rack_addr_t(uint64_t rack_id, uint64_t rack_block_id, uint64_t rack_block_inst_id, uint64_t offset) {
+    return ((rack_id & ADDRESS_RACK_ADDR_T_RACK_ID_MASK) << ADDRESS_RACK_ADDR_T_RACK_ID_SHIFT) |
+           ((rack_block_id & ADDRESS_RACK_ADDR_T_RACK_BLOCK_ID_MASK) << ADDRESS_RACK_ADDR_T_RACK_BLOCK_ID_SHIFT) |
+           ((rack_block_inst_id & ADDRESS_RACK_ADDR_T_RACK_BLOCK_INST_ID_MASK) << ADDRESS_RACK_ADDR_T_RACK_BLOCK_INST_ID_SHIFT) |
+           ((offset & ADDRESS_RACK_ADDR_T_OFFSET_MASK) << ADDRESS_RACK_ADDR_T_OFFSET_SHIFT);
+}
+
+
+#endif // __TEST_PKG_C_YIS_H__
\ No newline at end of file
@@ -0,0 +1,458 @@
+# Autogenerated from tests/golden_inputs/test_pkg_c.yis by yis (https://github.com/Lightelligence/yis)
+#
+# Do Not Edit
+#
+"""Decode and encode the structs, unions and xactions of test_pkg_c with NumPy.
+
+Each one has a Codec (listed in CODECS). Its decode() takes an array of records and returns an array per leaf
+field, named by its path (e.g. "cmd.addr" or "data[1].lo"), and encode() takes them back to records. A record is one
+or more 64 bit words, least significant word first. A record of an xaction is its cycles, in order, each cycle
+starting a new word. Any array holding whole records can be decoded, the words of a record one after the other.
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+# Enum -> value -> name, enums of other pkgs are named pkg::ENUM
+ENUMS = {
+    'RACK_ZAP_ID_E': {
+        0: 'ZAP0',
+        1: 'ZAP1',
+        2: 'ZAP2',
+        3: 'ZAP3',
+        4: 'ZAP4',
+        5: 'ZAP5',
+        6: 'ZAP6',
+        7: 'ZAP7',
+    },
+    'ADDR_TYPE_E': {
+        0: 'MEM',
+        1: 'CSR',
+    },
+    'IS_ZAP_E': {
+        0: 'NON_ZAP',
+        1: 'ZAP',
+    },
+    'NON_ZAP_BLOCK_ID_E': {
+        0: 'LEG_ID',
+        1: 'TAX_ID',
+        2: 'EGO_ID',
+        4: 'ASH_ID',
+        5: 'SIN_ID',
+        6: 'RACK_ID',
+        7: 'FOX_ID',
+    },
+    'ZAP_BLOCK_ID_E': {
+        1: 'TRY',
+        2: 'HORN',
+        3: 'EYE',
+        4: 'PIE_SLICE0',
+        5: 'PIE_SLICE1',
+        6: 'PIE_SLICE2',
+        7: 'PIE_SLICE3',
+        8: 'KID',
+        9: 'JOB',
+        10: 'TIP',
+        11: 'GET',
+        12: 'GRE',
+    },
+    'RACK_BLOCK_ID_E': {
+        0: 'ICE',
+        1: 'CRY',
+        2: 'CUP',
+    },
+    'CUP_ID_E': {
+        0: 'CUP0',
+        1: 'CUP1',
+        2: 'CUP2',
+        3: 'CUP3',
+        4: 'CUP4',
+        5: 'CUP5',
+        6: 'CUP6',
+        7: 'CUP7',
+    },
+    'CRY_ID_E': {
+        0: 'CRY0',
+        1: 'CRY1',
+        2: 'CRY2',
+        3: 'CRY3',
+        4: 'CRY4',
+        5: 'CRY5',
+        6: 'CRY6',
+        7: 'CRY7',
+        8: 'CRY8',
+        9: 'CRY9',
+        10: 'CRY10',
+        11: 'CRY11',
+        12: 'CRY12',
+        13: 'CRY13',
+        14: 'CRY14',
+        15: 'CRY15',
+        16: 'CRY16',
+        17: 'CRY17',
+        18: 'CRY18',
+        19: 'CRY19',
+        20: 'CRY20',
+        21: 'CRY21',
+        22: 'CRY22',
+        23: 'CRY23',
+        24: 'CRY24',
+        25: 'CRY25',
+        26: 'CRY26',
+        27: 'CRY27',
+        28: 'CRY28',
+        29: 'CRY29',
+        30: 'CRY30',
+        31: 'CRY31',
+        32: 'CRY32',
+        33: 'CRY33',
+        34: 'CRY34',
+        35: 'CRY35',
+        36: 'CRY36',
+        37: 'CRY37',
+        38: 'CRY38',
+        39: 'CRY39',
+        40: 'CRY40',
+        41: 'CRY41',
+        42: 'CRY42',
+        43: 'CRY43',
+        44: 'CRY44',
+        45: 'CRY45',
+        46: 'CRY46',
+        47: 'CRY47',
+        48: 'CRY48',
+        49: 'CRY49',
+        50: 'CRY50',
+        51: 'CRY51',
+        52: 'CRY52',
+        53: 'CRY53',
+        54: 'CRY54',
+        55: 'CRY55',
+        56: 'CRY56',
+        57: 'CRY57',
+        58: 'CRY58',
+        59: 'CRY59',
+        60: 'CRY60',
+        61: 'CRY61',
+        62: 'CRY62',
+        63: 'CRY63',
+        64: 'CRY64',
+        65: 'CRY65',
+        66: 'CRY66',
+        67: 'CRY67',
+        68: 'CRY68',
+        69: 'CRY69',
+        70: 'CRY70',
+        71: 'CRY71',
+        72: 'CRY72',
+        73: 'CRY73',
+        74: 'CRY74',
+        75: 'CRY75',
+        76: 'CRY76',
+        77: 'CRY77',
+        78: 'CRY78',
+        79: 'CRY79',
+        80: 'CRY80',
+        81: 'CRY81',
+        82: 'CRY82',
+        83: 'CRY83',
+        84: 'CRY84',
+        85: 'CRY85',
+        86: 'CRY86',
+        87: 'CRY87',
+        88: 'CRY88',
+        89: 'CRY89',
+        90: 'CRY90',
+        91: 'CRY91',
+        92: 'CRY92',
+        93: 'CRY93',
+        94: 'CRY94',
+        95: 'CRY95',
+        96: 'CRY96',
+        97: 'CRY97',
+        98: 'CRY98',
+        99: 'CRY99',
+        100: 'CRY100',
+        101: 'CRY101',
+        102: 'CRY102',
+        103: 'CRY103',
+        104: 'CRY104',
+        105: 'CRY105',
+        106: 'CRY106',
+        107: 'CRY107',
+        108: 'CRY108',
+        109: 'CRY109',
+        110: 'CRY110',
+        111: 'CRY111',
+        112: 'CRY112',
+        113: 'CRY113',
+        114: 'CRY114',
+        115: 'CRY115',
+        116: 'CRY116',
+        117: 'CRY117',
+        118: 'CRY118',
+        119: 'CRY119',
+        120: 'CRY120',
+        121: 'CRY121',
+        122: 'CRY122',
+        123: 'CRY123',
+        124: 'CRY124',
+        125: 'CRY125',
+        126: 'CRY126',
+        127: 'CRY127',
+    },
+    'ICE_ID_E': {
+        0: 'ICE0',
+    },
+    'OPC_E': {
+        7: 'OPC',
+    },
+    'SPARE_OPC_E': {
+        5: 'SPARE',
+    },
+}
+
+_UINT_DTYPES = [(8, np.uint8), (16, np.uint16), (32, np.uint32), (64, np.uint64)]
+
+# Enums narrower than this are mapped through a lookup table indexed by value, wider ones by their unique values
+_LOOKUP_TABLE_BITS = 16
+
+
+def _dtype(width):
+    """Return the smallest unsigned dtype that holds width bits, fields wider than a word are arrays of words."""
+    for bits, dtype in _UINT_DTYPES:
+        if width <= bits:
+            return dtype
+    return np.uint64
+
+
+def _get(words, offset, width, dtype=np.uint64):
+    """Return the width (at most WORD_BITS) bits at offset of every record of words, as dtype."""
+    index, shift = divmod(offset, WORD_BITS)
+    value = words[:, index]
+    if shift:
+        value = value >> np.uint64(shift)
+        if shift + width > WORD_BITS:
+            value |= words[:, index + 1] << np.uint64(WORD_BITS - shift)
+    # Narrowed first, the mask has fewer bytes to go through
+    value = value.astype(dtype)
+    if width < value.itemsize * 8:
+        value &= dtype((1 << width) - 1)
+    return value
+
+
+def _put(words, value, offset, width):
+    """Set the width (at most WORD_BITS) bits at offset of every record of words to value, words starts zeroed."""
+    index, shift = divmod(offset, WORD_BITS)
+    value = value.astype(np.uint64)
+    if width < WORD_BITS:
+        value &= np.uint64((1 << width) - 1)
+    words[:, index] |= value << np.uint64(shift)
+    if shift and shift + width > WORD_BITS:
+        words[:, index + 1] |= value >> np.uint64(WORD_BITS - shift)
+
+
+def _names(values, enum, width):
+    """Return an object array of the name of each value of enum, None for the values it doesn't name."""
+    table = ENUMS[enum]
+    if width <= _LOOKUP_TABLE_BITS:
+        lookup = np.array([table.get(value) for value in range(1 << width)], dtype=object)
+        return lookup[values]
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([table.get(int(value)) for value in unique], dtype=object)[inverse.reshape(-1)]
+
+
+def _values(names, enum):
+    """Return the value of each name of enum."""
+    by_name = {name: value for value, name in ENUMS[enum].items()}
+    unique, inverse = np.unique(names, return_inverse=True)
+    try:
+        values = np.array([by_name[name] for name in unique.tolist()], dtype=np.uint64)
+    except KeyError as exc:
+        raise ValueError(f"{exc.args[0]!r} isn't a value of {enum}") from exc
+    return values[inverse.reshape(-1)]
+
+
+class Codec:
+    """Decode and encode the records of a struct, union or xaction.
+
+    fields maps the path of each leaf field to its (offset, width, enum): the bit of the record it starts at, its
+    width and the name of its enum in ENUMS, None if it isn't an enum. The leaves of every field of a union are
+    decoded, they overlap.
+    """
+
+    def __init__(self, name, cycles, cycle_width, fields):
+        self.name = name
+        self.cycles = cycles
+        self.cycle_width = cycle_width
+        self.words = cycles * ((cycle_width + WORD_BITS - 1) // WORD_BITS)
+        self.fields = fields
+
+    def __repr__(self):
+        return f"Codec({self.name!r}, {self.cycles}, {self.cycle_width}, {len(self.fields)} fields)"
+
+    @property
+    def record_shape(self):
+        """Shape of a record as encode() returns it: (cycles, words per cycle) leaving out the ones of size 1."""
+        return tuple(size for size in (self.cycles, self.words // self.cycles) if size > 1)
+
+    def decode(self, records, enum_names=False):
+        """Return a dictionary of an array per leaf field of records.
+
+        Fields up to 64 bits wide come out in the smallest unsigned dtype that holds them, wider ones as an (n, words)
+        array of uint64 words, least significant first. With enum_names, enum fields come out as object arrays of
+        the names of their values instead (None for values the enum doesn't name).
+        """
+        words = np.asarray(records).astype(np.uint64, copy=False).reshape(-1, self.words)
+        decoded = {}
+        for path, (offset, width, enum) in self.fields.items():
+            if width > WORD_BITS:
+                bits = range(offset, offset + width, WORD_BITS)
+                decoded[path] = np.stack([_get(words, bit, min(WORD_BITS, offset + width - bit)) for bit in bits], 1)
+                continue
+            value = _get(words, offset, width, _dtype(width))
+            if enum is not None and enum_names:
+                value = _names(value, enum, width)
+            decoded[path] = value
+        return decoded
+
+    def encode(self, fields):
+        """Return the records of the arrays of fields (shaped like decode() returns them), as an (n, *record_shape)
+        array of uint64.
+
+        Fields left out are 0, values wider than their field are truncated. Enum fields may also be given as arrays of
+        names.
+        """
+        count = len(next(iter(fields.values()))) if fields else 0
+        words = np.zeros((count, self.words), dtype=np.uint64)
+        for path, value in fields.items():
+            try:
+                offset, width, enum = self.fields[path]
+            except KeyError:
+                raise KeyError(f"{self.name} has no field {path}") from None
+            value = np.asarray(value)
+            if len(value) != count:
+                raise ValueError(f"{self.name} field {path} has {len(value)} records, expected {count}")
+            if enum is not None and value.dtype.kind in "OUS":
+                value = _values(value, enum)
+            if width > WORD_BITS:
+                value = value.reshape(count, -1)
+                for word, bit in enumerate(range(offset, offset + width, WORD_BITS)):
+                    _put(words, value[:, word], bit, min(WORD_BITS, offset + width - bit))
+                continue
+            _put(words, value, offset, width)
+        return words.reshape((count, ) + self.record_shape)
+
+
+# yapf would lay out each codec differently depending on how long its name is
+# yapf: disable
+
+# The ID for a given ZAP
+zap_id_t = Codec('zap_id_t', 1, 6, {
+    'rack_id': (3, 3, None),
+    'zap_id': (0, 3, 'RACK_ZAP_ID_E'),
+})
+
+# A generic address
+addr_t = Codec('addr_t', 1, 27, {
+    'is_zap': (26, 1, 'IS_ZAP_E'),
+    'sub_addr.zap_addr.is_csr': (25, 1, 'ADDR_TYPE_E'),
+    'sub_addr.zap_addr.zap_id.rack_id': (22, 3, None),
+    'sub_addr.zap_addr.zap_id.zap_id': (19, 3, 'RACK_ZAP_ID_E'),
+    'sub_addr.zap_addr.sub_addr.job_addr.offset': (0, 19, None),
+    'sub_addr.zap_addr.sub_addr.zap_csr_addr.zap_block_id': (15, 4, 'ZAP_BLOCK_ID_E'),
+    'sub_addr.zap_addr.sub_addr.zap_csr_addr.offset': (0, 15, None),
+    'sub_addr.non_zap_addr.non_zap_block_id': (23, 3, 'NON_ZAP_BLOCK_ID_E'),
+    'sub_addr.non_zap_addr.sub_addr.offset': (0, 23, None),
+    'sub_addr.non_zap_addr.sub_addr.rack_addr.rack_id': (20, 3, None),
+    'sub_addr.non_zap_addr.sub_addr.rack_addr.rack_block_id': (18, 2, 'RACK_BLOCK_ID_E'),
+    'sub_addr.non_zap_addr.sub_addr.rack_addr.rack_block_inst_id': (15, 3, None),
+    'sub_addr.non_zap_addr.sub_addr.rack_addr.offset': (0, 15, None),
+})
+
+# JOB Addr struct
+job_addr_t = Codec('job_addr_t', 1, 19, {
+    'offset': (0, 19, None),
+})
+
+# Zap CSR Addr Struct
+zap_csr_addr_t = Codec('zap_csr_addr_t', 1, 19, {
+    'zap_block_id': (15, 4, 'ZAP_BLOCK_ID_E'),
+    'offset': (0, 15, None),
+})
+
+# A memory address
+zap_addr_t = Codec('zap_addr_t', 1, 26, {
+    'is_csr': (25, 1, 'ADDR_TYPE_E'),
+    'zap_id.rack_id': (22, 3, None),
+    'zap_id.zap_id': (19, 3, 'RACK_ZAP_ID_E'),
+    'sub_addr.job_addr.offset': (0, 19, None),
+    'sub_addr.zap_csr_addr.zap_block_id': (15, 4, 'ZAP_BLOCK_ID_E'),
+    'sub_addr.zap_csr_addr.offset': (0, 15, None),
+})
+
+# Non-Zap Addr Struct
+non_zap_addr_t = Codec('non_zap_addr_t', 1, 26, {
+    'non_zap_block_id': (23, 3, 'NON_ZAP_BLOCK_ID_E'),
+    'sub_addr.offset': (0, 23, None),
+    'sub_addr.rack_addr.rack_id': (20, 3, None),
+    'sub_addr.rack_addr.rack_block_id': (18, 2, 'RACK_BLOCK_ID_E'),
+    'sub_addr.rack_addr.rack_block_inst_id': (15, 3, None),
+    'sub_addr.rack_addr.offset': (0, 15, None),
+})
+
+# Address for blocks within the RACK
+rack_addr_t = Codec('rack_addr_t', 1, 23, {
+    'rack_id': (20, 3, None),
+    'rack_block_id': (18, 2, 'RACK_BLOCK_ID_E'),
+    'rack_block_inst_id': (15, 3, None),
+    'offset': (0, 15, None),
+})
+
+# Union for sub_addr field in addr_t
+non_zap_subaddr_t = Codec('non_zap_subaddr_t', 1, 23, {
+    'offset': (0, 23, None),
+    'rack_addr.rack_id': (20, 3, None),
+    'rack_addr.rack_block_id': (18, 2, 'RACK_BLOCK_ID_E'),
+    'rack_addr.rack_block_inst_id': (15, 3, None),
+    'rack_addr.offset': (0, 15, None),
+})
+
+# Union for sub_addr field in addr_t
+addr_sub_addr_t = Codec('addr_sub_addr_t', 1, 26, {
+    'zap_addr.is_csr': (25, 1, 'ADDR_TYPE_E'),
+    'zap_addr.zap_id.rack_id': (22, 3, None),
+    'zap_addr.zap_id.zap_id': (19, 3, 'RACK_ZAP_ID_E'),
+    'zap_addr.sub_addr.job_addr.offset': (0, 19, None),
+    'zap_addr.sub_addr.zap_csr_addr.zap_block_id': (15, 4, 'ZAP_BLOCK_ID_E'),
+    'zap_addr.sub_addr.zap_csr_addr.offset': (0, 15, None),
+    'non_zap_addr.non_zap_block_id': (23, 3, 'NON_ZAP_BLOCK_ID_E'),
+    'non_zap_addr.sub_addr.offset': (0, 23, None),
+    'non_zap_addr.sub_addr.rack_addr.rack_id': (20, 3, None),
+    'non_zap_addr.sub_addr.rack_addr.rack_block_id': (18, 2, 'RACK_BLOCK_ID_E'),
+    'non_zap_addr.sub_addr.rack_addr.rack_block_inst_id': (15, 3, None),
+    'non_zap_addr.sub_addr.rack_addr.offset': (0, 15, None),
+})
+
+# Union of the sub_addr field in zap_addr_t
+zap_addr_sub_addr_t = Codec('zap_addr_sub_addr_t', 1, 19, {
+    'job_addr.offset': (0, 19, None),
+    'zap_csr_addr.zap_block_id': (15, 4, 'ZAP_BLOCK_ID_E'),
+    'zap_csr_addr.offset': (0, 15, None),
+})
+
+# yapf: enable
+
+CODECS = {
+    'zap_id_t': zap_id_t,
+    'addr_t': addr_t,
+    'job_addr_t': job_addr_t,
+    'zap_csr_addr_t': zap_csr_addr_t,
+    'zap_addr_t': zap_addr_t,
+    'non_zap_addr_t': non_zap_addr_t,
+    'rack_addr_t': rack_addr_t,
+    'non_zap_subaddr_t': non_zap_subaddr_t,
+    'addr_sub_addr_t': addr_sub_addr_t,
+    'zap_addr_sub_addr_t': zap_addr_sub_addr_t,
+}
\ No newline at end of file
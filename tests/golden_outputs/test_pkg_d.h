@@ -0,0 +1,59 @@
+
+// Autogenerated from tests/golden_inputs/test_pkg_d.yis by yis (https://github.com/Lightelligence/yis)
+//
+// Do Not Edit
+//
+#ifndef __TEST_PKG_D_YIS_H__
+#define __TEST_PKG_D_YIS_H__
+
+#include <stdint.h>
+
+
+#define QUEUE_DEPTH 12           // Entries of the queue.
+#define QUEUE_DEPTH_COUNT_WIDTH 4           // Width to count QUEUE_DEPTH items
+#define LAST_ENTRY 11           // Index of the last entry, as wide as [QUEUE_DEPTH_COUNT_WIDTH].
+
+
+// State of a queue entry.
+typedef enum {
+    FREE,                    // The entry holds nothing.
+    USED,                    // The entry holds a request.
+} ENTRY_STATE_E;
+
+
+
+// A queue entry.
+typedef struct _entry_t {
+    uint8_t index;    // 4 bits : Where the entry sits in the queue.
+    ENTRY_STATE_E state;    // 2 bits : State of a queue entry.
+} entry_t;
+
+#define ENTRY_T_WORDS 1
+// index: 4 bits from bit 2
+static inline uint64_t entry_t_get_index(const uint64_t *bits) {
+    return ((bits[0] >> 2) & 0xfULL);
+}
+static inline void entry_t_set_index(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3cULL) | ((value & 0xfULL) << 2);
+}
+// state: 2 bits from bit 0
+static inline uint64_t entry_t_get_state(const uint64_t *bits) {
+    return (bits[0] & 0x3ULL);
+}
+static inline void entry_t_set_state(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3ULL) | (value & 0x3ULL);
+}
+// Pack a entry_t into bits
+static inline void entry_t_pack(const entry_t *s, uint64_t *bits) {
+    bits[0] = (((uint64_t)s->index & 0xfULL) << 2) |
+              ((uint64_t)s->state & 0x3ULL);
+}
+// Unpack bits into a entry_t
+static inline void entry_t_unpack(const uint64_t *bits, entry_t *s) {
+    s->index = (uint8_t)((bits[0] >> 2) & 0xfULL);
+    s->state = (ENTRY_STATE_E)(bits[0] & 0x3ULL);
+}
+
+
+
+#endif // __TEST_PKG_D_YIS_H__
\ No newline at end of file
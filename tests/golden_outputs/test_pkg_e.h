@@ -0,0 +1,77 @@
+
+// Autogenerated from tests/golden_inputs/test_pkg_e.yis by yis (https://github.com/Lightelligence/yis)
+//
+// Do Not Edit
+//
+#ifndef __TEST_PKG_E_YIS_H__
+#define __TEST_PKG_E_YIS_H__
+
+#include <stdint.h>
+
+
+#define QUEUES 2           // Queues, as wide as [test_pkg_d::QUEUE_DEPTH_WIDTH] that test_pkg_d doesn't declare.
+#define QUEUES_WIDTH 1           // Width of QUEUES
+#define QUEUES_COUNT_WIDTH 2           // Width to count QUEUES items
+#define QUEUES_WIDTH_ONE 1           // QUEUES_WIDTH-wide 1 for incrementers and decrementers
+#define QUEUES_COUNT_ONE 1           // QUEUES_COUNT_WIDTH-wide 1 for incrementers and decrementers
+#define LAST_QUEUE_ENTRY 11           // The last entry of a queue, as wide as [test_pkg_d::QUEUE_DEPTH_COUNT_WIDTH] that test_pkg_d declares.
+#define LAST_QUEUE_ENTRY_WIDTH 4           // Width of LAST_QUEUE_ENTRY
+#define LAST_QUEUE_ENTRY_COUNT_WIDTH 4           // Width to count LAST_QUEUE_ENTRY items
+#define LAST_QUEUE_ENTRY_WIDTH_ONE 1           // LAST_QUEUE_ENTRY_WIDTH-wide 1 for incrementers and decrementers
+#define LAST_QUEUE_ENTRY_COUNT_ONE 1           // LAST_QUEUE_ENTRY_COUNT_WIDTH-wide 1 for incrementers and decrementers
+#define QUEUE_ENTRY_T_WIDTH 10           // Width of queue_entry_t
+
+
+
+
+// An entry of one of the queues.
+typedef struct _queue_entry_t {
+    uint8_t queue;    // 2 bits : Which queue the entry is in.
+    uint8_t state;    // 2 bits : Raw state of the entry, as wide as [test_pkg_d::ENTRY_STATE_E_WIDTH].
+    entry_t entry;    // 6 bits : A queue entry.
+} queue_entry_t;
+
+#define QUEUE_ENTRY_T_WORDS 1
+// queue: 2 bits from bit 8
+static inline uint64_t queue_entry_t_get_queue(const uint64_t *bits) {
+    return ((bits[0] >> 8) & 0x3ULL);
+}
+static inline void queue_entry_t_set_queue(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x300ULL) | ((value & 0x3ULL) << 8);
+}
+// state: 2 bits from bit 6
+static inline uint64_t queue_entry_t_get_state(const uint64_t *bits) {
+    return ((bits[0] >> 6) & 0x3ULL);
+}
+static inline void queue_entry_t_set_state(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0xc0ULL) | ((value & 0x3ULL) << 6);
+}
+// entry: 6 bits from bit 0
+static inline uint64_t queue_entry_t_get_entry(const uint64_t *bits) {
+    return (bits[0] & 0x3fULL);
+}
+static inline void queue_entry_t_set_entry(uint64_t *bits, uint64_t value) {
+    bits[0] = (bits[0] & ~0x3fULL) | (value & 0x3fULL);
+}
+// Pack a queue_entry_t into bits
+static inline void queue_entry_t_pack(const queue_entry_t *s, uint64_t *bits) {
+    uint64_t entry_bits[1];
+    entry_t_pack(&s->entry, entry_bits);
+    bits[0] = (((uint64_t)s->queue & 0x3ULL) << 8) |
+              (((uint64_t)s->state & 0x3ULL) << 6) |
+              (entry_bits[0] & 0x3fULL);
+}
+// Unpack bits into a queue_entry_t
+static inline void queue_entry_t_unpack(const uint64_t *bits, queue_entry_t *s) {
+    s->queue = (uint8_t)((bits[0] >> 8) & 0x3ULL);
+    s->state = (uint8_t)((bits[0] >> 6) & 0x3ULL);
+    {
+        uint64_t entry_bits[1];
+        entry_bits[0] = (bits[0] & 0x3fULL);
+        entry_t_unpack(entry_bits, &s->entry);
+    }
+}
+
+
+
+#endif // __TEST_PKG_E_YIS_H__
\ No newline at end of file
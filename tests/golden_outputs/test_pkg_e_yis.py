@@ -0,0 +1,172 @@
+# Autogenerated from tests/golden_inputs/test_pkg_e.yis by yis (https://github.com/Lightelligence/yis)
+#
+# Do Not Edit
+#
+"""Decode and encode the structs, unions and xactions of test_pkg_e with NumPy.
+
+Each one has a Codec (listed in CODECS). Its decode() takes an array of records and returns an array per leaf
+field, named by its path (e.g. "cmd.addr" or "data[1].lo"), and encode() takes them back to records. A record is one
+or more 64 bit words, least significant word first. A record of an xaction is its cycles, in order, each cycle
+starting a new word. Any array holding whole records can be decoded, the words of a record one after the other.
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+# Enum -> value -> name, enums of other pkgs are named pkg::ENUM
+ENUMS = {
+    'test_pkg_d::ENTRY_STATE_E': {
+        0: 'FREE',
+        1: 'USED',
+    },
+}
+
+_UINT_DTYPES = [(8, np.uint8), (16, np.uint16), (32, np.uint32), (64, np.uint64)]
+
+# Enums narrower than this are mapped through a lookup table indexed by value, wider ones by their unique values
+_LOOKUP_TABLE_BITS = 16
+
+
+def _dtype(width):
+    """Return the smallest unsigned dtype that holds width bits, fields wider than a word are arrays of words."""
+    for bits, dtype in _UINT_DTYPES:
+        if width <= bits:
+            return dtype
+    return np.uint64
+
+
+def _get(words, offset, width, dtype=np.uint64):
+    """Return the width (at most WORD_BITS) bits at offset of every record of words, as dtype."""
+    index, shift = divmod(offset, WORD_BITS)
+    value = words[:, index]
+    if shift:
+        value = value >> np.uint64(shift)
+        if shift + width > WORD_BITS:
+            value |= words[:, index + 1] << np.uint64(WORD_BITS - shift)
+    # Narrowed first, the mask has fewer bytes to go through
+    value = value.astype(dtype)
+    if width < value.itemsize * 8:
+        value &= dtype((1 << width) - 1)
+    return value
+
+
+def _put(words, value, offset, width):
+    """Set the width (at most WORD_BITS) bits at offset of every record of words to value, words starts zeroed."""
+    index, shift = divmod(offset, WORD_BITS)
+    value = value.astype(np.uint64)
+    if width < WORD_BITS:
+        value &= np.uint64((1 << width) - 1)
+    words[:, index] |= value << np.uint64(shift)
+    if shift and shift + width > WORD_BITS:
+        words[:, index + 1] |= value >> np.uint64(WORD_BITS - shift)
+
+
+def _names(values, enum, width):
+    """Return an object array of the name of each value of enum, None for the values it doesn't name."""
+    table = ENUMS[enum]
+    if width <= _LOOKUP_TABLE_BITS:
+        lookup = np.array([table.get(value) for value in range(1 << width)], dtype=object)
+        return lookup[values]
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([table.get(int(value)) for value in unique], dtype=object)[inverse.reshape(-1)]
+
+
+def _values(names, enum):
+    """Return the value of each name of enum."""
+    by_name = {name: value for value, name in ENUMS[enum].items()}
+    unique, inverse = np.unique(names, return_inverse=True)
+    try:
+        values = np.array([by_name[name] for name in unique.tolist()], dtype=np.uint64)
+    except KeyError as exc:
+        raise ValueError(f"{exc.args[0]!r} isn't a value of {enum}") from exc
+    return values[inverse.reshape(-1)]
+
+
+class Codec:
+    """Decode and encode the records of a struct, union or xaction.
+
+    fields maps the path of each leaf field to its (offset, width, enum): the bit of the record it starts at, its
+    width and the name of its enum in ENUMS, None if it isn't an enum. The leaves of every field of a union are
+    decoded, they overlap.
+    """
+
+    def __init__(self, name, cycles, cycle_width, fields):
+        self.name = name
+        self.cycles = cycles
+        self.cycle_width = cycle_width
+        self.words = cycles * ((cycle_width + WORD_BITS - 1) // WORD_BITS)
+        self.fields = fields
+
+    def __repr__(self):
+        return f"Codec({self.name!r}, {self.cycles}, {self.cycle_width}, {len(self.fields)} fields)"
+
+    @property
+    def record_shape(self):
+        """Shape of a record as encode() returns it: (cycles, words per cycle) leaving out the ones of size 1."""
+        return tuple(size for size in (self.cycles, self.words // self.cycles) if size > 1)
+
+    def decode(self, records, enum_names=False):
+        """Return a dictionary of an array per leaf field of records.
+
+        Fields up to 64 bits wide come out in the smallest unsigned dtype that holds them, wider ones as an (n, words)
+        array of uint64 words, least significant first. With enum_names, enum fields come out as object arrays of
+        the names of their values instead (None for values the enum doesn't name).
+        """
+        words = np.asarray(records).astype(np.uint64, copy=False).reshape(-1, self.words)
+        decoded = {}
+        for path, (offset, width, enum) in self.fields.items():
+            if width > WORD_BITS:
+                bits = range(offset, offset + width, WORD_BITS)
+                decoded[path] = np.stack([_get(words, bit, min(WORD_BITS, offset + width - bit)) for bit in bits], 1)
+                continue
+            value = _get(words, offset, width, _dtype(width))
+            if enum is not None and enum_names:
+                value = _names(value, enum, width)
+            decoded[path] = value
+        return decoded
+
+    def encode(self, fields):
+        """Return the records of the arrays of fields (shaped like decode() returns them), as an (n, *record_shape)
+        array of uint64.
+
+        Fields left out are 0, values wider than their field are truncated. Enum fields may also be given as arrays of
+        names.
+        """
+        count = len(next(iter(fields.values()))) if fields else 0
+        words = np.zeros((count, self.words), dtype=np.uint64)
+        for path, value in fields.items():
+            try:
+                offset, width, enum = self.fields[path]
+            except KeyError:
+                raise KeyError(f"{self.name} has no field {path}") from None
+            value = np.asarray(value)
+            if len(value) != count:
+                raise ValueError(f"{self.name} field {path} has {len(value)} records, expected {count}")
+            if enum is not None and value.dtype.kind in "OUS":
+                value = _values(value, enum)
+            if width > WORD_BITS:
+                value = value.reshape(count, -1)
+                for word, bit in enumerate(range(offset, offset + width, WORD_BITS)):
+                    _put(words, value[:, word], bit, min(WORD_BITS, offset + width - bit))
+                continue
+            _put(words, value, offset, width)
+        return words.reshape((count, ) + self.record_shape)
+
+
+# yapf would lay out each codec differently depending on how long its name is
+# yapf: disable
+
+# An entry of one of the queues.
+queue_entry_t = Codec('queue_entry_t', 1, 10, {
+    'queue': (8, 2, None),
+    'state': (6, 2, None),
+    'entry.index': (2, 4, None),
+    'entry.state': (0, 2, 'test_pkg_d::ENTRY_STATE_E'),
+})
+
+# yapf: enable
+
+CODECS = {
+    'queue_entry_t': queue_entry_t,
+}
\ No newline at end of file
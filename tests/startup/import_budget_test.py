@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Keep yis_gen's startup cheap, short actions are mostly interpreter startup and imports.
+
+Uses python -X importtime to check which modules get imported and how long importing yis_gen takes. Run from the
+repo root (or through bazel). The budget can be overridden with YIS_IMPORT_BUDGET_MS for slow machines.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Cumulative import time of yis_gen, including everything it imports, with bytecode already cached. Without it
+# compiling yis_gen alone takes about a third more.
+IMPORT_BUDGET_MS = float(os.environ.get("YIS_IMPORT_BUDGET_MS", 100))
+
+# Only imported by the phases that need them
+DEFERRED_MODULES = ["jinja2", "yaml", "yamale", "astor"]
+
+IMPORTTIME_REGEXP = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime(args, pycache_prefix):
+    """Run python -X importtime, caching bytecode under pycache_prefix, return {module: cumulative microseconds} for
+    everything imported."""
+    # The source tree may not be writable (the bazel sandbox), the bytecode is cached where it can always be written
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONPYCACHEPREFIX=pycache_prefix)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args,
+                            cwd=ROOT,
+                            env=env,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=False)
+    if result.returncode:
+        raise AssertionError(f"{args} failed:\n{result.stderr}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_REGEXP.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules
+
+
+class ImportBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        pycache = tempfile.TemporaryDirectory()
+        self.addCleanup(pycache.cleanup)
+        self.pycache_prefix = pycache.name
+
+    def test_deferred_imports(self):
+        """Importing yis_gen doesn't pull in the template, YAML or HTML machinery."""
+        modules = importtime(["-c", "import yis_gen"], self.pycache_prefix)
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_rtl_doesnt_import_html_machinery(self):
+        """astor is only needed to render equations to HTML."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = os.path.join(tmpdir, "test_pkg_a_rypkg.svh")
+            modules = importtime(
+                ["yis_gen_main.py", "--pkgs", "tests/golden_inputs/test_pkg_a.yis", "--gen", f"rtl={output_file}"],
+                self.pycache_prefix)
+        self.assertIn("jinja2", modules)
+        self.assertNotIn("astor", modules)
+
+    def test_import_budget(self):
+        """Best of a few runs, the first one also makes sure bytecode is cached."""
+        best = min(importtime(["-c", "import yis_gen"], self.pycache_prefix)["yis_gen"] for _ in range(5)) / 1000
+        self.assertLessEqual(best, IMPORT_BUDGET_MS,
+                             f"Importing yis_gen took {best:.1f}ms, over the {IMPORT_BUDGET_MS}ms budget")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Drive the --watch model through its rebuild cycles in process, without a long running yis_gen.py --watch.
+
+A copy of the golden inputs is watched, one upstream pkg is edited, and only it and the files depending on it must be
+rebuilt and have their outputs written again.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+import cmn_logging # pylint: disable=wrong-import-position
+import yis_gen # pylint: disable=wrong-import-position
+
+GOLDEN_INPUTS = os.path.join(ROOT, "tests", "golden_inputs")
+
+# The pkg edited, and it with the files depending on it, directly or not
+EDITED = "test_pkg_a"
+REBUILT = {"test_pkg_a", "test_pkg_b", "test_intf_a"}
+
+
+def output_files(output_dir):
+    """Return every output written under output_dir."""
+    return set(
+        os.path.join(dirpath, filename) for dirpath, _, filenames in os.walk(output_dir) for filename in filenames)
+
+
+class WatchTest(unittest.TestCase):
+
+    def setUp(self):
+        # yis_gen finds its schemas and templates relative to the working directory
+        self._cwd = os.getcwd()
+        os.chdir(ROOT)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.watch_dir = os.path.join(tmpdir.name, "src")
+        self.output_dir = os.path.join(tmpdir.name, "out")
+        shutil.copytree(GOLDEN_INPUTS, self.watch_dir, ignore=shutil.ignore_patterns("BUILD", "*.bzl"))
+        log = cmn_logging.build_logger("yis", level=cmn_logging.WARNING)
+        options = yis_gen.parse_args(["--watch", self.watch_dir, "--watch-output-dir", self.output_dir])
+        self.yis = yis_gen.WatchedYis(self.watch_dir, self.output_dir, log, options)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+
+    def test_rebuild_dependents(self):
+        """Editing an upstream pkg rebuilds and renders only it and the files depending on it."""
+        names = set(os.path.splitext(filename)[0] for filename in os.listdir(self.watch_dir))
+        self.assertEqual(set(self.yis.update()), names)
+        self.assertIsNone(self.yis.update())
+        outputs = output_files(self.output_dir)
+        for path in outputs:
+            os.utime(path, ns=(0, 0)) # Any output written again gets a later mtime
+
+        edited = os.path.join(self.watch_dir, f"{EDITED}.yis")
+        with open(edited) as yfile:
+            text = yfile.read()
+        with open(edited, "w") as yfile:
+            # A different size, so the change is seen however coarse the file system's mtimes are
+            yfile.write(text.replace("could look like.", "could look like, edited.", 1))
+        self.assertEqual(set(self.yis.update()), REBUILT)
+
+        self.assertEqual(output_files(self.output_dir), outputs)
+        rewritten = set(path for path in outputs if os.stat(path).st_mtime_ns)
+        self.assertEqual(rewritten, set(path for path in outputs if os.path.basename(path).startswith(tuple(REBUILT))))
+        with open(os.path.join(self.output_dir, f"{EDITED}_rypkg.svh")) as ofile:
+            self.assertIn("could look like, edited.", ofile.read())
+        self.assertIsNone(self.yis.update())
+
+
+if __name__ == "__main__":
+    unittest.main()
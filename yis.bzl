@@ -22,15 +22,189 @@ def yis_pkg_deps(name, pkg_deps, pkg):
         srcs = deps + [pkg] + html_deps,
     )
 
+def _yis_gen_impl(ctx):
+    args = ctx.actions.args()
+
+    # Upstream pkgs arrive either as compiled artifacts or as sources, anything else is only an input
+    args.add_all("--compiled-deps", [f for f in ctx.files.srcs if f.extension == "yisc"])
+    args.add_all("--pkgs", [f for f in ctx.files.srcs if f.extension == "yis"])
+    if ctx.attr.block_interface:
+        args.add("--block-interface")
+    if ctx.attr.addr_macro_style != "full":
+        args.add("--addr-macro-style", ctx.attr.addr_macro_style)
+    if ctx.attr.addr_macro_limit:
+        args.add("--addr-macro-limit", str(ctx.attr.addr_macro_limit))
+    for generator, out in zip(ctx.attr.generators, ctx.outputs.outs):
+        args.add("--gen", "{}={}".format(generator, out.path))
+    outputs = list(ctx.outputs.outs)
+    if ctx.outputs.compiled:
+        args.add("--emit-compiled", ctx.outputs.compiled)
+        outputs.append(ctx.outputs.compiled)
+
+    # Workers require all arguments to come in through a flagfile
+    args.use_param_file("@%s", use_always = True)
+    args.set_param_file_format("multiline")
+
+    ctx.actions.run(
+        executable = ctx.executable._yis_gen,
+        arguments = [args],
+        inputs = ctx.files.srcs + ctx.files.data,
+        outputs = outputs,
+        mnemonic = "YisGen",
+        progress_message = "Generating yis outputs for %{label}",
+        execution_requirements = {
+            "supports-workers": "1",
+            "requires-worker-protocol": "json",
+        },
+    )
+    return [DefaultInfo(files = depset(outputs))]
+
+_yis_gen_rule = rule(
+    doc = "Run yis_gen once over srcs, as a persistent worker when the strategy allows it.",
+    implementation = _yis_gen_impl,
+    attrs = {
+        "srcs": attr.label_list(allow_files = True, doc = ".yis and .yisc files, in dependency order"),
+        "data": attr.label_list(allow_files = True, doc = "Additional inputs, e.g. upstream html"),
+        "generators": attr.string_list(doc = "Generator for each entry of outs"),
+        "outs": attr.output_list(),
+        "compiled": attr.output(doc = "Optional .yisc file to write the elaborated pkg to"),
+        "block_interface": attr.bool(default = False),
+        "addr_macro_style": attr.string(
+            default = "full",
+            values = ["full", "compact"],
+            doc = "How the C header renders addr_macro structs, see yis_gen.py --addr-macro-style",
+        ),
+        "addr_macro_limit": attr.int(
+            default = 0,
+            doc = "Full address macros an addr_macro struct may expand to, see yis_gen.py --addr-macro-limit. " +
+                  "0 keeps yis_gen's default",
+        ),
+        "_yis_gen": attr.label(
+            default = Label("@yis//:yis_gen"),
+            executable = True,
+            cfg = "exec",
+        ),
+    },
+)
+
+def _yis_gen(
+        name,
+        srcs,
+        outputs,
+        block_interface = False,
+        compiled = None,
+        tools = [],
+        addr_macro_style = "full",
+        addr_macro_limit = 0,
+        **kwargs):
+    """Run yis_gen once over srcs, rendering every output from a single parse.
+
+    outputs is a list of (generator, target name, output file) tuples. Each output stays addressable
+    under its own target name so consumers don't need to know how many outputs share an action.
+    compiled optionally names a .yisc file to write the elaborated pkg to.
+    """
+    if len(outputs) == 1 and not compiled:
+        name = outputs[0][1]
+    _yis_gen_rule(
+        name = name,
+        srcs = srcs,
+        data = tools,
+        generators = [generator for generator, _, _ in outputs],
+        outs = [out for _, _, out in outputs],
+        compiled = compiled,
+        block_interface = block_interface,
+        addr_macro_style = addr_macro_style,
+        addr_macro_limit = addr_macro_limit,
+        **kwargs
+    )
+    if name == outputs[0][1]:
+        return
+    for _, target, out in outputs:
+        native.filegroup(
+            name = target,
+            srcs = [out],
+            **kwargs
+        )
+
+def _yis_upstream_yisc(name, pkg_deps):
+    """Collect the compiled artifacts of all (transitive) pkg_deps, in dependency order."""
+    native.filegroup(
+        name = "{}_upstream_yisc".format(name),
+        srcs = [pkg_dep[:-4] + "_yisc_deps" for pkg_dep in pkg_deps],
+    )
+
+def _check_html_name(name, src):
+    expected_name = src.rsplit(":")[1][:-4]
+    if name != expected_name:
+        fail("Expect yis target name to be: {}, not {}".format(expected_name, name))
+
+def yis_pkg_gen(
+        name,
+        pkg_deps,
+        pkg,
+        gen_rtl = True,
+        gen_rdl = True,
+        gen_html = True,
+        gen_c_hdr = False,
+        gen_py = False,
+        addr_macro_style = "full",
+        addr_macro_limit = 0):
+    """Render all requested collateral for a single pkg from one yis_gen action."""
+    outputs = []
+    if gen_rtl:
+        outputs.append(("rtl", "{}_rypkg_svh".format(name), "{}_rypkg.svh".format(name)))
+    if gen_rdl:
+        outputs.append(("rdl", "{}_yis_rdl".format(name), "{}_yis.rdl".format(name)))
+    if gen_html:
+        _check_html_name(name, pkg)
+        outputs.append(("html", "{}_rypkg_html".format(name), "{}_rypkg.html".format(name)))
+    if gen_c_hdr:
+        outputs.append(("c-hdr", "{}_h".format(name), "{}.h".format(name)))
+    if gen_py:
+        outputs.append(("py", "{}_yis_py".format(name), "{}_yis.py".format(name)))
+    if not outputs:
+        fail("yis_pkg_gen {} doesn't request any outputs".format(name))
+
+    _yis_upstream_yisc(name, pkg_deps)
+    _yis_gen(
+        name = "{}_yis_gen".format(name),
+        srcs = [":{}_upstream_yisc".format(name), pkg],
+        outputs = outputs,
+        compiled = "{}.yisc".format(name),
+        # html needs the upstream html to exist for cross-package links
+        tools = [pkg_dep[:-4] + "_rypkg_html" for pkg_dep in pkg_deps] if gen_html else [],
+        addr_macro_style = addr_macro_style,
+        addr_macro_limit = addr_macro_limit,
+        visibility = ["//visibility:public"],
+    )
+
+    # This pkg's artifact plus everything it was compiled against, for dependents to load
+    native.filegroup(
+        name = "{}_yisc_deps".format(name),
+        srcs = [":{}_upstream_yisc".format(name), ":{}.yisc".format(name)],
+        visibility = ["//visibility:public"],
+    )
+
+    if gen_rtl:
+        verilog_rtl_pkg(
+            name = "{}_rypkg".format(name),
+            direct = [":{}_rypkg_svh".format(name)],
+            deps = [pkg_dep[:-4] + "_rypkg" for pkg_dep in pkg_deps],
+        )
+    if gen_html:
+        yis_rst_html_wrapper(
+            name = "{}_rypkg_rst".format(name),
+            title = "{} YIS".format(name.upper()),
+            html_file = "{}_rypkg.html".format(name),
+            tags = ["doc_export"],
+        )
+
 def yis_rtl_pkg(name, pkg_deps, pkg):
     """Create a single yis-generate RTL pkg."""
-    native.genrule(
+    _yis_gen(
         name = "{}_rypkg_svh".format(name),
         srcs = ["{}_deps".format(name)],
-        outs = ["{}_rypkg.svh".format(name)],
-        cmd = "$(location @yis//:yis_gen) --pkgs $(SRCS) --output-file $@ --gen-rtl",
-        output_to_bindir = True,
-        tools = ["@yis//:yis_gen"],
+        outputs = [("rtl", "{}_rypkg_svh".format(name), "{}_rypkg.svh".format(name))],
     )
     verilog_rtl_pkg(
         name = "{}_rypkg".format(name),
@@ -38,39 +212,41 @@ def yis_rtl_pkg(name, pkg_deps, pkg):
         deps = [pkg_dep[:-4] + "_rypkg" for pkg_dep in pkg_deps],
     )
 
-def yis_c_hdr(name, pkg_deps, pkg):
+def yis_c_hdr(name, pkg_deps, pkg, addr_macro_style = "full", addr_macro_limit = 0):
     """Create a single yis-generate C header file."""
-    native.genrule(
+    _yis_gen(
         name = "{}_h".format(name),
         srcs = pkg_deps + [pkg],
-        outs = ["{}.h".format(name)],
-        cmd = "$(location @yis//:yis_gen) --pkgs $(SRCS) --output-file $@ --gen-c-hdr",
-        output_to_bindir = True,
-        tools = ["@yis//:yis_gen"],
+        outputs = [("c-hdr", "{}_h".format(name), "{}.h".format(name))],
+        addr_macro_style = addr_macro_style,
+        addr_macro_limit = addr_macro_limit,
+    )
+
+def yis_py(name, pkg_deps, pkg):
+    """Create a single yis-generate python codec module, it needs NumPy."""
+    _yis_gen(
+        name = "{}_yis_py".format(name),
+        srcs = pkg_deps + [pkg],
+        outputs = [("py", "{}_yis_py".format(name), "{}_yis.py".format(name))],
     )
 
 def yis_rdl_pkg(name, pkg_deps, pkg):
     """Create a single yis-generate RDL pkg."""
-    native.genrule(
+    _yis_gen(
         name = "{}_yis_rdl".format(name),
         srcs = ["{}_deps".format(name)],
-        outs = ["{}_yis.rdl".format(name)],
-        cmd = "$(location @yis//:yis_gen) --pkgs $(SRCS) --output-file $@ --gen-rdl",
-        output_to_bindir = True,
-        tools = ["@yis//:yis_gen"],
+        outputs = [("rdl", "{}_yis_rdl".format(name), "{}_yis.rdl".format(name))],
         visibility = ["//visibility:public"],
     )
 
 def yis_dv_intf(name, pkg_deps, pkg):
     """Create a single yis-generate DV interface pkg."""
-    native.genrule(
+    _yis_gen(
         name = "{}_dv_intf_svh".format(name),
         srcs = ["{}_deps".format(name)],
-        outs = ["{}_intf.svh".format(name)],
-        cmd = "$(location @yis//:yis_gen) --pkgs $(SRCS) --output-file $@ --block-interface --gen-dv",
-        output_to_bindir = True,
+        outputs = [("dv", "{}_dv_intf_svh".format(name), "{}_intf.svh".format(name))],
+        block_interface = True,
         visibility = ["//visibility:public"],
-        tools = ["@yis//:yis_gen"],
     )
     verilog_dv_library(
         name = "{}_dv_intf".format(name),
@@ -81,16 +257,12 @@ def yis_dv_intf(name, pkg_deps, pkg):
     )
 
 def yis_html_pkg(name, pkg_deps, pkg):
-    expected_name = pkg.rsplit(":")[1][:-4]
-    if name != expected_name:
-        fail("Expect yis target name to be: {}, not {}".format(expected_name, name))
-    native.genrule(
+    _check_html_name(name, pkg)
+    _yis_gen(
         name = "{}_rypkg_html".format(name),
         srcs = ["{}_html_deps".format(name)],
-        outs = ["{}_rypkg.html".format(name)],
-        cmd = "$(location @yis//:yis_gen) --pkgs $(SRCS) --output-file $@ --gen-html",
-        output_to_bindir = True,
-        tools = ["@yis//:yis_gen"] + [pkg_dep[:-4] + "_rypkg_html" for pkg_dep in pkg_deps],
+        outputs = [("html", "{}_rypkg_html".format(name), "{}_rypkg.html".format(name))],
+        tools = [pkg_dep[:-4] + "_rypkg_html" for pkg_dep in pkg_deps],
         visibility = ["//visibility:public"],
         tags = ["doc_export"],
     )
@@ -102,17 +274,15 @@ def yis_html_pkg(name, pkg_deps, pkg):
     )
 
 def yis_html_intf(name, pkg_deps, intf):
-    expected_name = intf.rsplit(":")[1][:-4]
-    if name != expected_name:
-        fail("Expect yis target name to be: {}".format(expected_name))
-
-    native.genrule(
+    """Create the HTML for an intf, pkg_deps must be yis_pkg targets so their compiled artifacts exist."""
+    _check_html_name(name, intf)
+    _yis_upstream_yisc(name, pkg_deps)
+    _yis_gen(
         name = "{}_rtl_intf_html".format(name),
-        srcs = ["{}_html_deps".format(name)],
-        outs = ["{}_rtl_intf.html".format(name)],
-        cmd = "$(location @yis//:yis_gen) --pkgs $(SRCS) --output-file $@ --block-interface --gen-html",
-        output_to_bindir = True,
-        tools = ["@yis//:yis_gen"],
+        srcs = [":{}_upstream_yisc".format(name), intf],
+        outputs = [("html", "{}_rtl_intf_html".format(name), "{}_rtl_intf.html".format(name))],
+        tools = [pkg_dep[:-4] + "_rypkg_html" for pkg_dep in pkg_deps],
+        block_interface = True,
         visibility = ["//visibility:public"],
         tags = ["doc_export"],
     )
@@ -123,14 +293,21 @@ def yis_html_intf(name, pkg_deps, intf):
         tags = ["doc_export"],
     )
 
-def yis_pkg(name, pkg_deps, pkg):
+def yis_pkg(name, pkg_deps, pkg, gen_c_hdr = False, gen_py = False, addr_macro_style = "full", addr_macro_limit = 0):
     if not name.endswith("_yis"):
         fail("yis_pkg rule names must end with '_yis': {}".format(name))
     yis_pkg_deps(name[:-4], pkg_deps, pkg)
 
-    yis_rtl_pkg(name[:-4], pkg_deps, pkg)
-    yis_rdl_pkg(name[:-4], pkg_deps, pkg)
-    yis_html_pkg(name[:-4], pkg_deps, pkg)
+    # RTL, RDL, HTML (and optionally the C header and the python codec) all come out of a single parse of the pkg
+    yis_pkg_gen(
+        name[:-4],
+        pkg_deps,
+        pkg,
+        gen_c_hdr = gen_c_hdr,
+        gen_py = gen_py,
+        addr_macro_style = addr_macro_style,
+        addr_macro_limit = addr_macro_limit,
+    )
 
 def yis_intf(name, pkg_deps, intf):
     if not name.endswith("_intf_yis"):
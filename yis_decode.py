@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Decode dumps of packed records of a YIS struct, union or xaction into field-level CSV or JSON lines.
+
+The pkgs are parsed and elaborated once, the input is memory-mapped and split into chunks that a pool of worker
+processes decodes with NumPy, the rows are written out in input order while only a bounded number of chunks is in
+flight, so dumps of any size stream through in constant memory.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+import cmn_logging
+import yis_gen
+
+WORD_BITS = 64
+
+# Fields narrower than this are formatted through a table of the cell of every value, indexed by value
+LOOKUP_TABLE_BITS = 16
+
+DEFAULT_CHUNK_BYTES = 8 << 20
+
+# Chunks in flight per worker: one being decoded, one waiting, the rest being written
+CHUNKS_PER_JOB = 2
+
+# The RecordDecoder forked worker processes inherit, see _decode_chunk
+_DECODE_JOB = None
+
+
+def _get_bits(words, offset, width):
+    """Return the width (at most WORD_BITS) bits at offset of every record of words as uint64."""
+    index, shift = divmod(offset, WORD_BITS)
+    value = words[:, index]
+    if shift:
+        value = value >> np.uint64(shift)
+        if shift + width > WORD_BITS:
+            value |= words[:, index + 1] << np.uint64(WORD_BITS - shift)
+    if width < WORD_BITS:
+        value = value & np.uint64((1 << width) - 1)
+    return value
+
+
+class RecordDecoder:
+    """Decode the records of one struct, union or xaction of an elaborated model into formatted rows.
+
+    A record is the packed form of the python codec and the C header (see BitLayout.record_offsets): 64 bit words,
+    least significant first, an xaction's cycles each starting a new word. Binary input is records of little endian
+    words back to back. Hex input is whitespace separated hex values (a line each, usually), one per cycle, most
+    significant digit first the way simulators print them.
+
+    Every leaf field (BitLayout.codec_fields) becomes a column, named by its path. Enum fields are rendered by the
+    name of their value, or the number when the enum doesn't name it. Everything the workers need is taken out of the
+    model up front, they never touch it.
+    """
+
+    def __init__(self, item, output_format="csv", radix="dec"):
+        cycles = item.record_cycles()
+        layout = item.bit_layout
+        self.name = f"{item.parent.name}::{item.name}"
+        self.cycles = cycles
+        self.words = layout.record_words(cycles)
+        self.cycle_words = self.words // cycles if cycles else 0
+        self.output_format = output_format
+        self.radix = radix
+        self.fields = []
+        self._cell_tables = {}
+        for path, offset, width, enum in layout.codec_fields(cycles):
+            names = None
+            if enum is not None:
+                names = {value: row.name for row, value in enum.numbered_values()}
+            self.fields.append((path, offset, width, names))
+        if output_format == "csv":
+            self.header = ",".join(path for path, _, _, _ in self.fields) + "\n"
+            self._prefixes = [""] * len(self.fields)
+            self._separator, self._row_start, self._row_end = ",", "", ""
+        else:
+            # The cells of a JSON line are the members of its object, key included
+            self.header = ""
+            self._prefixes = [json.dumps(path) + ": " for path, _, _, _ in self.fields]
+            self._separator, self._row_start, self._row_end = ", ", "{", "}"
+
+    @property
+    def record_bytes(self):
+        """Bytes of a record of binary input."""
+        return self.words * (WORD_BITS // 8)
+
+    def _format_number(self, value):
+        if self.radix == "hex":
+            text = f"0x{value:x}"
+            return json.dumps(text) if self.output_format == "jsonl" else text
+        return str(value)
+
+    def _format_value(self, value, names):
+        if names is None or value not in names:
+            return self._format_number(value)
+        return json.dumps(names[value]) if self.output_format == "jsonl" else names[value]
+
+    def _cell_table(self, index):
+        """Return an object array of the cell of every value of field index, built once per process."""
+        table = self._cell_tables.get(index)
+        if table is None:
+            _, _, width, names = self.fields[index]
+            prefix = self._prefixes[index]
+            table = np.empty(1 << width, dtype=object)
+            table[:] = [prefix + self._format_value(value, names) for value in range(1 << width)]
+            self._cell_tables[index] = table
+        return table
+
+    def _column(self, words, index):
+        """Return the cells of field index of every record of words."""
+        _, offset, width, names = self.fields[index]
+        if width > WORD_BITS:
+            chunks = [
+                _get_bits(words, bit, min(WORD_BITS, offset + width - bit))
+                for bit in range(offset, offset + width, WORD_BITS)
+            ]
+            raw = np.stack(chunks, 1).astype("<u8").tobytes()
+            size = len(chunks) * (WORD_BITS // 8)
+            values = [int.from_bytes(raw[start:start + size], "little") for start in range(0, len(raw), size)]
+        else:
+            values = _get_bits(words, offset, width)
+            if width <= LOOKUP_TABLE_BITS:
+                return self._cell_table(index)[values].tolist()
+            values = values.tolist()
+        if names is None and self.radix == "dec":
+            cells = list(map(str, values))
+        else:
+            cells = [self._format_value(value, names) for value in values]
+        prefix = self._prefixes[index]
+        return [prefix + cell for cell in cells] if prefix else cells
+
+    def format_records(self, words):
+        """Return the text of the rows of words, an (n, self.words) array of uint64."""
+        if not len(words):
+            return ""
+        columns = [self._column(words, index) for index in range(len(self.fields))]
+        rows = map(self._separator.join, zip(*columns))
+        return self._row_start + f"{self._row_end}\n{self._row_start}".join(rows) + self._row_end + "\n"
+
+    def parse_hex(self, text):
+        """Return the records of text, hex values of a cycle each, as an (n, self.words) array of uint64.
+
+        Values left over after the last whole record are dropped, the chunks are split so that only the last one of
+        the input can have any.
+        """
+        tokens = text.split()
+        count = len(tokens) // self.cycles * self.cycles
+        try:
+            values = [int(token, 16) for token in tokens[:count]]
+        except ValueError as exc:
+            raise ValueError(f"{self.name}: the hex input has a value that isn't a hex number ({exc})") from None
+        if values and min(values) < 0:
+            raise ValueError(f"{self.name}: the hex input has a negative value")
+        if values and max(values).bit_length() > self.cycle_words * WORD_BITS:
+            raise ValueError(f"{self.name}: the hex input has a value wider than a cycle ({self.cycle_words} words)")
+        if self.cycle_words == 1:
+            words = np.array(values, dtype=np.uint64)
+        else:
+            mask = (1 << WORD_BITS) - 1
+            words = np.empty((len(values), self.cycle_words), dtype=np.uint64)
+            for word in range(self.cycle_words):
+                words[:, word] = [(value >> (word * WORD_BITS)) & mask for value in values]
+        return words.reshape(-1, self.words)
+
+
+def _decode_chunk(task):
+    """Decode one chunk of the input of the inherited _DECODE_JOB, returns (records, text)."""
+    decoder, data, input_format = _DECODE_JOB
+    start, end = task
+    if input_format == "binary":
+        words = np.frombuffer(data, dtype="<u8", count=(end - start) // 8, offset=start)
+        words = words.astype(np.uint64, copy=False).reshape(-1, decoder.words)
+    else:
+        words = decoder.parse_hex(data[start:end].decode("ascii", errors="replace"))
+    return len(words), decoder.format_records(words)
+
+
+def _binary_chunks(decoder, size, chunk_bytes, log):
+    """Return the (start, end) byte ranges of whole records binary input of size bytes is decoded in."""
+    record_bytes = decoder.record_bytes
+    leftover = size % record_bytes
+    if leftover:
+        log.warning("The input ends with %d bytes of a partial %s record (%d bytes), they're left out", leftover,
+                    decoder.name, record_bytes)
+    step = max(1, chunk_bytes // record_bytes) * record_bytes
+    end = size - leftover
+    return [(start, min(start + step, end)) for start in range(0, end, step)]
+
+
+def _hex_chunks(decoder, data, size, chunk_bytes, log):
+    """Return the (start, end) byte ranges hex input is decoded in.
+
+    Chunks end at the end of a line, holding a whole number of records: an xaction's cycles are counted so its
+    records don't straddle two chunks.
+    """
+    chunks = []
+    start = 0
+    values = 0
+    while start < size:
+        end = _line_end(data, min(start + chunk_bytes, size), size)
+        if decoder.cycles > 1:
+            values = len(data[start:end].split())
+            while values % decoder.cycles and end < size:
+                next_end = _line_end(data, end + 1, size)
+                values += len(data[end:next_end].split())
+                end = next_end
+        chunks.append((start, end))
+        start = end
+    leftover = values % decoder.cycles
+    if leftover:
+        log.warning("The input ends with %d cycles of a partial %s record (%d cycles), they're left out", leftover,
+                    decoder.name, decoder.cycles)
+    return chunks
+
+
+def _line_end(data, position, size):
+    """Return the position just after the end of the line position is in."""
+    if position >= size:
+        return size
+    newline = data.find(b"\n", position - 1)
+    return size if newline < 0 else newline + 1
+
+
+def decode(decoder, input_file, input_format, output, jobs, chunk_bytes, log):
+    """Write the rows of every record of input_file to output, decoding chunks of it over jobs processes.
+
+    Returns the number of records decoded.
+    """
+    global _DECODE_JOB # pylint: disable=global-statement
+    output.write(decoder.header)
+    size = os.path.getsize(input_file)
+    if not size:
+        return 0
+    with open(input_file, "rb") as fileh, mmap.mmap(fileh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if input_format == "binary":
+            chunks = _binary_chunks(decoder, size, chunk_bytes, log)
+        else:
+            chunks = _hex_chunks(decoder, data, size, chunk_bytes, log)
+        records = 0
+        _DECODE_JOB = (decoder, data, input_format)
+        try:
+            import multiprocessing # pylint: disable=import-outside-toplevel
+            if jobs > 1 and len(chunks) > 1 and "fork" in multiprocessing.get_all_start_methods():
+                from concurrent.futures import ProcessPoolExecutor # pylint: disable=import-outside-toplevel
+                with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)),
+                                         mp_context=multiprocessing.get_context("fork")) as pool:
+                    pending = deque()
+                    for chunk in chunks:
+                        pending.append(pool.submit(_decode_chunk, chunk))
+                        if len(pending) >= CHUNKS_PER_JOB * jobs:
+                            records += _write_chunk(pending.popleft().result(), output)
+                    while pending:
+                        records += _write_chunk(pending.popleft().result(), output)
+            else:
+                for chunk in chunks:
+                    records += _write_chunk(_decode_chunk(chunk), output)
+        finally:
+            _DECODE_JOB = None
+    return records
+
+
+def _write_chunk(result, output):
+    count, text = result
+    output.write(text)
+    return count
+
+
+def parse_args(argv):
+    """Parse script arguments."""
+    parser = argparse.ArgumentParser(description=__doc__ + "\nArguments may also be read from a file with @FILE.",
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     fromfile_prefix_chars='@')
+
+    parser.add_argument('input', help="Dump of records to decode")
+
+    parser.add_argument('--pkgs',
+                        nargs='*',
+                        default=[],
+                        help="YAML files defining the pkg of --type and the pkgs it depends on, in dependency order")
+
+    parser.add_argument(
+        '--compiled-deps',
+        nargs='*',
+        default=[],
+        help="Compiled pkgs (see yis_gen.py --emit-compiled) to load instead of parsing their sources.\n"
+        "Must be in dependency order and are loaded before any --pkgs.")
+
+    parser.add_argument('--type',
+                        required=True,
+                        metavar='PKG::NAME',
+                        help="The struct, union or xaction the records are, e.g. test_pkg_b::write_cmd_t")
+
+    parser.add_argument('--input-format',
+                        choices=['binary', 'hex'],
+                        default='binary',
+                        help="binary: records of little endian 64 bit words back to back, least significant first\n"
+                        "(the default). hex: a hex value per cycle, whitespace separated, usually one per line.")
+
+    parser.add_argument('--output-format',
+                        choices=['csv', 'jsonl'],
+                        default='csv',
+                        help="csv: a header naming the leaf fields by their path, then a line per record (the\n"
+                        "default). jsonl: a JSON object per record.")
+
+    parser.add_argument('--output', metavar='OUTPUT_FILE', help="Where to write the records (default: standard output)")
+
+    parser.add_argument('--radix',
+                        choices=['dec', 'hex'],
+                        default='dec',
+                        help="How field values that aren't enum names are written (default: dec)")
+
+    parser.add_argument('--jobs',
+                        type=int,
+                        default=os.cpu_count() or 1,
+                        help="Number of processes decoding chunks of the input (default: one per CPU)")
+
+    parser.add_argument('--chunk-bytes',
+                        type=int,
+                        default=DEFAULT_CHUNK_BYTES,
+                        help=f"Bytes of input each process decodes at a time (default: {DEFAULT_CHUNK_BYTES})")
+
+    options = parser.parse_args(argv)
+    if "::" not in options.type:
+        parser.error("--type must name the pkg of the type, PKG::NAME")
+    if not options.pkgs and not options.compiled_deps:
+        parser.error("Must specify at least one .yis with --pkgs or --compiled-deps")
+    if options.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if options.chunk_bytes < 1:
+        parser.error("--chunk-bytes must be at least 1")
+    return options
+
+
+def find_type(yis, type_name, log):
+    """Return the struct, union or xaction named PKG::NAME in the elaborated yis."""
+    pkg_name, name = type_name.split("::", 1)
+    item = yis.find_symbol(pkg_name, name, [yis_gen.Pkg.STRUCTS, yis_gen.Pkg.UNIONS, yis_gen.Pkg.XACTIONS])
+    if item is None:
+        log.critical("%s isn't a struct, union or xaction of the pkgs given", type_name)
+    if not item.computed_width:
+        log.critical("%s has no bits to decode", type_name)
+    return item
+
+
+def main(options, log):
+    """Main execution."""
+    start = time.perf_counter()
+    gen_args = ["--pkgs"] + options.pkgs
+    if options.compiled_deps:
+        gen_args += ["--compiled-deps"] + options.compiled_deps
+    gen_options = yis_gen.parse_args(gen_args)
+    yis = yis_gen.Yis(gen_options.pkgs, log, options=gen_options)
+    decoder = RecordDecoder(find_type(yis, options.type, log), options.output_format, options.radix)
+    elaborated = time.perf_counter()
+
+    if options.output:
+        with open(options.output, "w") as output:
+            records = decode(decoder, options.input, options.input_format, output, options.jobs, options.chunk_bytes,
+                             log)
+    else:
+        records = decode(decoder, options.input, options.input_format, sys.stdout, options.jobs, options.chunk_bytes,
+                         log)
+    log.info("Decoded %d %s records of %s: elaborated in %.2fs, decoded in %.2fs with %d jobs", records, decoder.name,
+             options.input, elaborated - start,
+             time.perf_counter() - elaborated, options.jobs)
+
+
+def setup_context():
+    """Set up options, log, and other context for main to run."""
+    options = parse_args(sys.argv[1:])
+    log = cmn_logging.build_logger("yis", level=cmn_logging.INFO)
+    try:
+        main(options, log)
+    except BrokenPipeError:
+        # The reader went away (yis_decode.py ... | head), python would fail again flushing stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except ValueError as exc:
+        log.critical("%s", exc)
+    log.exit_if_warnings_or_errors("Encountered previous errors")
+
+
+if __name__ == "__main__":
+    setup_context()
@@ -2,46 +2,95 @@
 # pylint: disable=too-many-lines
 ################################################################################
 # stdlib
+# Keep the top-level imports to what every run needs, anything else is imported by the phase using it. Short
+# actions are mostly startup, see tests/startup/import_budget_test.py
 import argparse
+import array
+import contextlib
+import copy
+import io
+import itertools
+import logging
 import math
+import pickle
 import sys
+import traceback
 import os
 import re
 import textwrap
+import types
 from collections import OrderedDict
 from datetime import date
 
 import ast
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape, Template
-
-import astor
-
-import yaml
-try:
-    from yaml import CLoader as Loader
-except ImportError:
-    from yaml import Loader as Loader # pylint: disable=useless-import-alias
-import yamale
-
 ################################################################################
 import cmn_logging
 
 ################################################################################
 # Constants
 PKG_SCOPE_REGEXP = re.compile("(.*)::(.*)")
+DOC_LINK_REGEXP = re.compile(r"\[([a-zA-Z0-9_:]+)\]")
+PKG_REFERENCE_REGEXP = re.compile(r"([a-zA-Z_][a-zA-Z0-9_]*)::")
 LIST_OF_RESERVED_WORDS = [
     "logic", "wire", "enum", "struct", "bit", "real", "input", "output", "interface", "typedef", "union", "type",
     "class"
 ]
 RESERVED_WORDS_REGEXP = re.compile("^({})$".format("|".join(LIST_OF_RESERVED_WORDS)))
 
-FILE_HEADER_TEMPLATE = Template("""
-// DO NOT EDIT!
-// This file was automatically generated by {{ script_name }}
-//
-//
-""")
+# Compiled pkg artifacts start with a magic string and a format version.
+# Bump the version any time the pickled model changes shape.
+YISC_MAGIC = b"YISC"
+YISC_VERSION = 8
+
+# Generator name -> template directory
+GENERATORS = OrderedDict([
+    ("rtl", "rtl"),
+    ("rdl", "rdl"),
+    ("html", "html"),
+    ("dv", "dv"),
+    ("c-hdr", "hdr"),
+    ("py", "py"),
+])
+
+# Templates precompiled into python modules at build time (see compile_templates). When this zip sits next to
+# yis_gen.py, templates are loaded from it instead of being lexed and compiled by jinja on every run.
+COMPILED_TEMPLATES = "templates_compiled.zip"
+
+# Process-wide caches. A single run only fills them once, but a persistent worker (see run_persistent_worker)
+# keeps them warm across requests.
+_TEMPLATE_ENVS = {}
+_COMPILED_SCHEMAS = {}
+
+# Number of elaborated pkgs a persistent worker keeps around
+WORKER_PKG_CACHE_SIZE = 256
+
+# Outputs rendered for each file by --watch, named the way the yis_pkg and yis_intf bazel rules name them
+WATCH_OUTPUTS = {
+    "pkg": [("rtl", "{}_rypkg.svh"), ("rdl", "{}_yis.rdl"), ("html", "{}_rypkg.html")],
+    "intf": [("html", "{}_rtl_intf.html")],
+}
+# Address macros generated for an addr_macro struct, by default, before giving up, see --addr-macro-limit
+ADDR_MACRO_LIMIT = 4096
+
+# Which of the localparams generated for every item (<NAME>_WIDTH, ...) a pkg declares, see Pkg.add_implicit_localparam
+IMPLICIT_LOCALPARAMS_POLICIES = ["all", "referenced"]
+
+# Options that change the elaborated model, a cached pkg is only reused with the same values (see Yis._cache_key)
+MODEL_OPTIONS = ["implicit_localparams"]
+
+# Buffer size of the files outputs are streamed into, see atomic_output
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+# Seconds between checks of the watched directory for changes
+WATCH_POLL_INTERVAL = 0.2
+
+# Categories of trace messages that can be enabled with --trace, see CmnLogger.trace
+TRACE_CATEGORIES = ["load", "link", "equation", "render", "write"]
+
+# Span categories recorded by --profile, in the order a run goes through them, see CmnLogger.span. Rendered outputs
+# are written as they're rendered, so only --emit-compiled has write spans.
+PROFILE_PHASES = ["load", "validate", "construct", "link", "equation", "render", "write"]
 
 
 ################################################################################
@@ -58,85 +107,210 @@ def clog2(value):
     return int(math.ceil(math.log2(value)))
 
 
-def only_run_once(function):
-    """A cheap decorator to only allow a method to be invoked once.
+def parse_range(text):
+    """Return the range of an enum value like "range(8)" or "range(0, 10, 2)", None if text isn't one.
+
+    Only int literals are accepted as arguments, the text is never evaluated.
+    """
+    try:
+        call = ast.parse(text.strip(), mode="eval").body
+        if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == "range"
+                and not call.keywords and 1 <= len(call.args) <= 3):
+            return None
+        args = [ast.literal_eval(arg) for arg in call.args]
+        if not all(isinstance(arg, int) and not isinstance(arg, bool) for arg in args):
+            return None
+        return range(*args)
+    except (SyntaxError, ValueError):
+        return None
 
-    This is helpful when trying walk a dependency graph with possible circular
-    links to make sure that a particular node only invokes a 'setup' function
-    once.
 
+@contextlib.contextmanager
+def atomic_output(output_file, mode='w'):
+    """Open a temporary file next to output_file for the block to write, then rename it over output_file.
+
+    Readers (and a failed or interrupted run) never leave a partially written output behind, the temporary file is
+    removed if the block raises. A symlinked output_file is resolved so the file it points to is replaced, not the
+    link, and an output_file that is not a regular file (e.g. /dev/stdout or a FIFO) is written directly.
     """
+    output_file = os.path.realpath(output_file)
+    if os.path.exists(output_file) and not os.path.isfile(output_file):
+        with open(output_file, mode, buffering=OUTPUT_BUFFER_SIZE) as fileh:
+            yield fileh
+        return
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, mode, buffering=OUTPUT_BUFFER_SIZE) as fileh:
+            yield fileh
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+        raise
 
-    def wrapper(self):
-        run_once_dict = getattr(self, "_only_run_once", {})
-        if function not in run_once_dict:
-            run_once_dict[function] = True
-            setattr(self, "_only_run_once", run_once_dict)
-            return function(self)
-        return None
 
-    return wrapper
+class ElaborationError(Exception):
+    """A computed attribute was read before its node was elaborated."""
+
+
+class computed_property: # pylint: disable=invalid-name,too-few-public-methods
+    """An attribute computed once per node during elaboration, then frozen into a plain instance attribute.
+
+    This is a non-data descriptor, so once the value is stored in the instance __dict__ reads never come back here
+    and cost the same as any other attribute (YisLeafNode subclasses store it in a slot instead, see _LeafNodeType).
+    Reading it before the node has been elaborated raises ElaborationError instead of silently computing from
+    unresolved links.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.name = function.__name__
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if instance.elaboration_state != YisNode.FREEZING:
+            raise ElaborationError(f"{instance.get_full_name()}.{self.name} read before {instance.name} was "
+                                   f"elaborated ({instance.elaboration_state})")
+        # Computed attributes of the same node may depend on each other, compute them in whatever order they're read
+        value = self.function(instance)
+        setattr(instance, self.name, value)
+        return value
+
 
+class EquationError(Exception):
+    """Any error raised by the Equation class"""
+    pass # pylint: disable=unnecessary-pass
 
-def memoize_property(function):
-    """Memoize a class method. Intentionally only works on functions without args for now.
 
-    If arguments added, need to make hash inputs to make unique key instead of
-    just using function name.
+class CompiledEquation:
+    """The parsed form of one equation text, shared by every Equation with that text.
 
+    Symbol references (SYM.width, pkg::SYM.value) are replaced by plain names so the expression compiles to a
+    code object once. The references themselves are resolved per Equation, since the same text can refer to
+    different symbols depending on the pkg it's in.
     """
+    _cache = {}
 
-    @property
-    def wrapper(self):
-        memoize_properties = getattr(self, "_memoize_properties", {})
+    def __init__(self, text):
+        # Change package refereces to . scoping to make python compiler happy
+        self.source = text.replace("::", ".")
+        self.refs = []
+        tree = self._LinkTransformer(self.refs).visit(ast.parse(self.source, mode="eval"))
+        self.code = compile(ast.fix_missing_locations(tree), "<equation>", "eval")
+        self._html = {}
+
+    @classmethod
+    def get(cls, text):
+        """Return the (cached) compiled form of text."""
         try:
-            return memoize_properties[function]
+            return cls._cache[text]
         except KeyError:
-            result = function(self)
-            memoize_properties[function] = result
-            setattr(self, "_memoize_properties", memoize_properties)
-            return result
+            compiled = cls._cache[text] = cls(text)
+            return compiled
+
+    class _LinkTransformer(ast.NodeTransformer):
+        """Replace symbol references with names, recording (pkg, symbol, attribute) in source order."""
+
+        def __init__(self, refs, placeholder=None):
+            super().__init__()
+            self.refs = refs
+            self.placeholder = placeholder
+
+        def visit_Attribute(self, node): # pylint: disable=invalid-name
+            """Find names and convert them to link placeholders, pkg is None for the local package."""
+            ref = CompiledEquation.parse_ref(node)
+            if ref is None:
+                return self.generic_visit(node)
+            self.refs.append(ref)
+            index = len(self.refs) - 1
+            if self.placeholder:
+                return self.placeholder(index)
+            return ast.copy_location(ast.Name(id=CompiledEquation.ref_name(index), ctx=ast.Load()), node)
+
+    @staticmethod
+    def parse_ref(node):
+        """Return (pkg, symbol, attribute) for a symbol reference, None for math.* attributes."""
+        if isinstance(node.value, ast.Name):
+            # Local package
+            symbol = node.value.id
+            pkg = None
+        elif isinstance(node.value, ast.Attribute) and isinstance(node.value.value, ast.Name):
+            symbol = node.value.attr
+            pkg = node.value.value.id
+        else:
+            import astor # pylint: disable=import-outside-toplevel
+            raise EquationError(f"Couldn't parse symbol in equation: {astor.to_source(node)}")
+        if "math" in [symbol, pkg]:
+            return None
+        return (pkg, symbol, node.attr)
 
-    return wrapper
+    @staticmethod
+    def ref_name(index):
+        """Name standing in for the index'th reference."""
+        return f"_yis_link_{index}"
 
+    def evaluate(self, values):
+        """Evaluate with the referenced values, in the order of refs."""
+        local_values = {self.ref_name(i): value for i, value in enumerate(values)}
+        return eval(self.code, globals(), local_values) # pylint: disable=eval-used
 
-class EquationError(Exception):
-    """Any error raised by the Equation class"""
-    pass # pylint: disable=unnecessary-pass
+    def render_html(self, html_links):
+        """Regenerate the source with the references replaced by html_links, in the order of refs.
 
+        astor is only run the first time an equation renders with a particular set of links.
+        """
+        html_links = tuple(html_links)
+        try:
+            return self._html[html_links]
+        except KeyError:
+            tree = ast.parse(self.source).body[0]
+            tree = self._LinkTransformer([], placeholder=lambda index: self.HtmlLinkNode(html_links[index])).visit(tree)
+            html = self._html[html_links] = self._to_html_source(tree)
+            return html
 
-class Equation(ast.NodeTransformer):
-    """Allow some math to happen (referring to other nodes)"""
+    class HtmlLinkNode(ast.Num): # pylint: disable=too-few-public-methods
+        """Stands in for a reference when regenerating the source"""
 
-    class LinkNode(ast.Num): # pylint: disable=too-few-public-methods
-        """Custom node to store information to another YisNode"""
+        def __init__(self, html_link):
+            self.html_link = html_link
+            super().__init__(0)
 
-        def __init__(self, value, link, attribute):
-            self.link = link
-            self.attribute = attribute
-            super().__init__(value)
+    _html_source_generator = None
 
-    # This is a hack to allow custom source generators in astor
-    astor.op_util.precedence_data[LinkNode] = astor.op_util.precedence_data[ast.Num]
+    @classmethod
+    def _to_html_source(cls, tree):
+        """Regenerate tree with astor, which is only imported once an equation is rendered to HTML."""
+        import astor # pylint: disable=import-outside-toplevel
+        if cls._html_source_generator is None:
+            # This is a hack to allow custom source generators in astor
+            astor.op_util.precedence_data[cls.HtmlLinkNode] = astor.op_util.precedence_data[ast.Num]
 
-    class TextSourceGenerator(astor.SourceGenerator): # pylint: disable=too-few-public-methods
-        """Support of LinkNode rendering"""
+            class HtmlSourceGenerator(astor.SourceGenerator): # pylint: disable=too-few-public-methods
+                """Support of HtmlLinkNode rendering"""
 
-        def visit_LinkNode(self, node):
-            """For text generation, just give the computed numerical value."""
-            self.visit_Num(node)
+                def visit_HtmlLinkNode(self, node): # pylint: disable=invalid-name
+                    """Return the precalculated link."""
+                    self.write(node.html_link)
 
-    class HtmlSourceGenerator(astor.SourceGenerator): # pylint: disable=too-few-public-methods
-        """Rerender the equation, but replace node references with html links to the objects."""
-        link_map = {}
+            cls._html_source_generator = HtmlSourceGenerator
+        return astor.to_source(tree, source_generator_class=cls._html_source_generator)
 
-        def visit_LinkNode(self, node):
-            """Return the precalculated link."""
-            html_link = self.link_map[node]
-            self.write(html_link)
+
+class EquationLink: # pylint: disable=too-few-public-methods
+    """A symbol an equation refers to."""
+
+    def __init__(self, link, attribute, value):
+        self.link = link
+        self.attribute = attribute
+        self.value = value
+
+
+class Equation:
+    """Allow some math to happen (referring to other nodes)"""
 
     def __init__(self, yisnode, equation):
-        super().__init__()
         self.yisnode = yisnode
         self.equation = equation
         self.simple_eq = False
@@ -148,28 +322,48 @@ class Equation(ast.NodeTransformer):
 
         self.linked_nodes = []
 
-        # Change package refereces to . scoping to make python compiler happy
         try:
-            equation = equation.replace("::", ".")
-        except AttributeError as exc:
+            compiled = CompiledEquation.get(equation)
+        except (AttributeError, TypeError) as exc:
             self.yisnode.log.critical("%s %s", self.yisnode.get_full_name(), exc)
-        self.tree_root = ast.parse(equation)
-        # Transform the equation
-        self.visit(self.tree_root)
-        # Regenerate the equation with subsituted values
-        new_eq = astor.to_source(self.tree_root, source_generator_class=self.TextSourceGenerator)
+
+        if yisnode.log.profiling:
+            with yisnode.log.span("equation", compiled.source, node=yisnode.get_full_name()):
+                self._evaluate(compiled)
+        else:
+            self._evaluate(compiled)
+
+    def _evaluate(self, compiled):
+        """Link the symbols compiled refers to and compute the result."""
+        for pkg, symbol, attribute in compiled.refs:
+            if pkg is None:
+                pkg = self.yisnode.get_nonyis_root().name
+            link = self.yisnode.resolve_link_from_str(
+                f"{pkg}::{symbol}", allowed_symbols=[Pkg.LOCALPARAMS, Pkg.ENUMS, Pkg.TYPEDEFS, Pkg.STRUCTS])
+
+            if link is None:
+                raise EquationError
+
+            link.elaborate()
+            if not hasattr(link, f"computed_{attribute}"):
+                raise EquationError(f"Succesful link to {link.name}, but no attribute {attribute}")
+
+            self.linked_nodes.append(EquationLink(link, attribute, getattr(link, f"computed_{attribute}")))
 
         try:
-            self._result = eval(new_eq) # pylint: disable=eval-used
+            self._result = compiled.evaluate([linked.value for linked in self.linked_nodes])
         except NameError as exc:
             name = re.search("name '(.*)' is not defined", exc.args[0]).group(1)
             raise EquationError(f"Can't find '.width' or '.value' on the end of '{name}' referenced symbols")
 
+        if "equation" in self.yisnode.log.traced:
+            self.yisnode.log.trace("equation", "%s: '%s' = %s", self.yisnode.get_full_name(), compiled.source,
+                                   self._result)
         if self._result < 0:
             self.yisnode.log.error(
                 "Equation for %s evaluated to a negative number (%s).\n"
                 "Only non-negative evaluations allowed.\n"
-                "Original equation: '%s'", yisnode.name, self._result, equation)
+                "Original equation: '%s'", self.yisnode.name, self._result, compiled.source)
 
     @property
     def computed_value(self):
@@ -192,60 +386,13 @@ class Equation(ast.NodeTransformer):
             raise EquationError("May not use doc linking unless attribute has exactly one link.")
         return self.linked_nodes[0].link
 
-    def visit_Attribute(self, node): # pylint: disable=invalid-name
-        """Override of ast.NodeTransformer function to find names and convert them to yisnode links."""
-        if isinstance(node.value, ast.Name):
-            # Local package
-            symbol = node.value.id
-            pkg = self.yisnode.get_nonyis_root().name
-        elif isinstance(node.value, ast.Attribute):
-            symbol = node.value.attr
-            pkg = node.value.value.id
-        else:
-            raise EquationError(f"Couldn't parse symbol in equation: {astor.to_source(node)}")
-
-        if "math" in [symbol, pkg]:
-            return super().generic_visit(node)
-
-        attribute = node.attr
-
-        link_name = f"{pkg}::{symbol}"
-        link = self.yisnode.resolve_link_from_str(
-            link_name, allowed_symbols=[Pkg.LOCALPARAMS, Pkg.ENUMS, Pkg.TYPEDEFS, Pkg.STRUCTS])
-
-        if link is None:
-            raise EquationError
-
-        if not hasattr(link, f"computed_{attribute}"):
-            raise EquationError(f"Succesful link to {link.name}, but no attribute {attribute}")
-
-        value = getattr(link, f"computed_{attribute}")
-
-        replacement_node = self.LinkNode(value, link, attribute)
-        self.linked_nodes.append(replacement_node)
-        return replacement_node
-
-    def visit_Expr(self, node): # pylint: disable=invalid-name
-        """Override of ast.NodeTransformer to find the top expression which makes eval easier."""
-        if not isinstance(self.tree_root, ast.Expr):
-            self.tree_root = node
-        return super().generic_visit(node)
-
     def render_html(self, reference_yisnode):
-        """Walk the AST and generate links for all the yis nodes."""
+        """Rerender the equation, but replace node references with html links to the objects."""
         if self.simple_eq:
             return self.equation
-        html_map = {}
-        for node in self.linked_nodes:
-            html_map[node] = reference_yisnode.html_link_attribute_from_link(node.link, extra_text=f".{node.attribute}")
-
-        class LocalHtmlSourceGenerator(self.HtmlSourceGenerator): # pylint: disable=too-few-public-methods
-            """A derived class to have access to set link_map.
-            Would prefer to pass this in, but not easy due to astor invoking by class, not instance.
-            """
-            link_map = html_map
-
-        return astor.to_source(self.tree_root, source_generator_class=LocalHtmlSourceGenerator)
+        return CompiledEquation.get(self.equation).render_html(
+            reference_yisnode.html_link_attribute_from_link(linked.link, extra_text=f".{linked.attribute}")
+            for linked in self.linked_nodes)
 
     def render_rtl(self, gen_width=False):
         """Render the value of the eqaution for generated rtl.
@@ -275,32 +422,81 @@ class YisFileFilterAction(argparse.Action): # pylint: disable=too-few-public-met
     It's easier (and hackier) to solve this by just adding these deps to the genrule srcs,
     but we want to ignore those files because they aren't really consumed here.
     """
+    extension = ".yis"
 
     def __call__(self, parser, namespace, values, option_string=None):
         setattr(namespace, self.dest, [])
         for value in values:
-            if os.path.splitext(value)[1] == ".yis":
+            if os.path.splitext(value)[1] == self.extension:
                 getattr(namespace, self.dest).append(value)
 
 
+class YiscFileFilterAction(YisFileFilterAction): # pylint: disable=too-few-public-methods
+    """Same as YisFileFilterAction, but keep compiled pkgs instead of sources."""
+    extension = ".yisc"
+
+
+def generator_output(value):
+    """Split a --gen GENERATOR=OUTPUT_FILE argument."""
+    generator, sep, output_file = value.partition("=")
+    if not sep or not output_file:
+        raise argparse.ArgumentTypeError(f"Expected GENERATOR=OUTPUT_FILE, got '{value}'")
+    if generator not in GENERATORS:
+        raise argparse.ArgumentTypeError(f"Unknown generator '{generator}', must be one of: {', '.join(GENERATORS)}")
+    return generator, output_file
+
+
+def profile_phase_output(value):
+    """Split a --profile-cprofile PHASE=OUTPUT_FILE argument."""
+    phase, sep, output_file = value.partition("=")
+    if not sep or not output_file:
+        raise argparse.ArgumentTypeError(f"Expected PHASE=OUTPUT_FILE, got '{value}'")
+    if phase not in PROFILE_PHASES:
+        raise argparse.ArgumentTypeError(f"Unknown phase '{phase}', must be one of: {', '.join(PROFILE_PHASES)}")
+    return phase, output_file
+
+
 def parse_args(argv):
     """Parse script arguments."""
-    parser = argparse.ArgumentParser(description="Parse an interface spec and generate the associated collateral.",
-                                     formatter_class=argparse.RawTextHelpFormatter)
+    parser = argparse.ArgumentParser(description="Parse an interface spec and generate the associated collateral.\n"
+                                     "Arguments may also be read from a file with @FILE, one per line.",
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     fromfile_prefix_chars='@')
 
     parser.add_argument('--pkgs',
                         nargs='*',
                         action=YisFileFilterAction,
                         help="YAML files defining pkgs needed for block interfaces")
 
+    parser.add_argument('--compiled-deps',
+                        nargs='*',
+                        default=[],
+                        action=YiscFileFilterAction,
+                        help="Compiled pkgs (see --emit-compiled) to load instead of parsing their sources.\n"
+                        "Must be in dependency order and are loaded before any --pkgs.")
+
     parser.add_argument('--block-interface',
                         default=False,
                         action='store_true',
                         help="Indicates if the last .yis file passed in is an intf definition")
 
+    parser.add_argument('--emit-compiled',
+                        metavar='OUTPUT_FILE',
+                        help="Write the elaborated target pkg to OUTPUT_FILE so dependents can load it with "
+                        "--compiled-deps.")
+
+    parser.add_argument(
+        '--gen',
+        dest='outputs',
+        default=[],
+        action='append',
+        type=generator_output,
+        metavar='GENERATOR=OUTPUT_FILE',
+        help="Render GENERATOR to OUTPUT_FILE. May be repeated to render several outputs from a single\n"
+        f"parse of the inputs. GENERATOR is one of: {', '.join(GENERATORS)}")
+
     parser.add_argument('--output-file',
-                        required=True,
-                        help="Path to the output file, which might either be a package or a block interface.")
+                        help="Path to the output file for the single generator selected by one of the --gen-* flags.")
 
     parser.add_argument('--gen-html', default=False, action='store_true', help="Use the html generator for output.")
 
@@ -313,16 +509,120 @@ def parse_args(argv):
 
     parser.add_argument('--gen-rdl', default=False, action='store_true', help="Use the rdl generator for output.")
 
+    parser.add_argument('--gen-py',
+                        default=False,
+                        action='store_true',
+                        help="Use the python generator for output, a NumPy codec for the structs, unions and xactions.")
+
     parser.add_argument('--gen-dv', default=False, action='store_true', help="Use the dv generator for output.")
 
     parser.add_argument('--gen-deps', default=False, action='store_true', help="generate dependencies")
 
+    parser.add_argument('--addr-macro-style',
+                        choices=['full', 'compact'],
+                        default='full',
+                        help="How the C header generator renders addr_macro structs: a macro for every combination\n"
+                        "of selector values (full, the default), or shift/mask tables and an inline composer function\n"
+                        "for each struct in the address (compact), which stays small however the unions nest.")
+
+    parser.add_argument('--addr-macro-limit',
+                        type=int,
+                        default=ADDR_MACRO_LIMIT,
+                        help="Fail when an addr_macro struct expands to more than this many full address macros\n"
+                        f"(default: {ADDR_MACRO_LIMIT})")
+
+    parser.add_argument('--implicit-localparams',
+                        choices=IMPLICIT_LOCALPARAMS_POLICIES,
+                        default='all',
+                        help="Which of the localparams generated for every item (<NAME>_WIDTH, ...) pkgs declare:\n"
+                        "all of them (the default), or only the ones something in the pkg references.\n"
+                        "A pkg's own implicit_localparams setting overrides this.")
+
     parser.add_argument('--tool-debug',
                         default=False,
                         action='store_true',
-                        help='Set the verbosity of this tool to debug level.')
+                        help='Set the verbosity of this tool to debug level, this also enables every --trace category.')
+
+    parser.add_argument('--trace',
+                        nargs='+',
+                        action='extend',
+                        default=[],
+                        choices=TRACE_CATEGORIES + ["all"],
+                        metavar='CATEGORY',
+                        help="Log what yis_gen does in these categories, or all of them. CATEGORY is one of:\n"
+                        f"{', '.join(TRACE_CATEGORIES)}")
+
+    parser.add_argument('--compile-templates',
+                        metavar='OUTPUT_FILE',
+                        help=f"Precompile the templates into OUTPUT_FILE and exit. yis_gen loads them from\n"
+                        f"{COMPILED_TEMPLATES} next to yis_gen.py when it exists and is at least as new as the\n"
+                        "templates.")
+
+    parser.add_argument('--watch',
+                        metavar='DIR',
+                        help="Build every .yis file under DIR, then keep the model resident and rebuild only the\n"
+                        "changed files and their dependents whenever files change, until interrupted.\n"
+                        "Any --pkgs and --compiled-deps are loaded once as dependencies that aren't watched.")
+
+    parser.add_argument('--watch-output-dir',
+                        metavar='DIR',
+                        default='.',
+                        help="Where --watch writes the outputs of each file, mirroring the layout of the watched\n"
+                        "directory (default: current directory)")
+
+    parser.add_argument('--batch',
+                        metavar='MANIFEST',
+                        help="Build every target listed in the JSON MANIFEST in one run, parsing and elaborating each\n"
+                        "file once and rendering the targets in parallel. See BatchYis for the format.")
+
+    parser.add_argument('--jobs',
+                        type=int,
+                        default=os.cpu_count() or 1,
+                        help="Number of processes --batch renders with (default: one per CPU)")
+
+    parser.add_argument('--profile',
+                        metavar='OUTPUT_FILE',
+                        help="Write timed spans of every phase (load, validate, construct, link, equation, render,\n"
+                        "write), named after the files, pkgs and items they work on, to OUTPUT_FILE as Chrome trace\n"
+                        "event JSON (open it in chrome://tracing or https://ui.perfetto.dev). render includes writing\n"
+                        "the rendered outputs, write only covers --emit-compiled. Renders done by --batch worker\n"
+                        "processes aren't recorded, use --jobs 1 to see them.")
+
+    parser.add_argument('--profile-cprofile',
+                        type=profile_phase_output,
+                        metavar='PHASE=OUTPUT_FILE',
+                        help="With --profile, also run cProfile inside the spans of PHASE only and dump its stats to\n"
+                        f"OUTPUT_FILE (read them with pstats). PHASE is one of: {', '.join(PROFILE_PHASES)}")
 
     options = parser.parse_args(argv)
+
+    # The --gen-* flags are the original single-output interface, fold them into the list of outputs
+    legacy_generators = [
+        generator for generator in GENERATORS if getattr(options, f"gen_{generator.replace('-', '_')}")
+    ]
+    if len(legacy_generators) > 1:
+        parser.error("Only one --gen-* flag may be used, use --gen GENERATOR=OUTPUT_FILE to render several outputs")
+    if legacy_generators:
+        if not options.output_file:
+            parser.error(f"--gen-{legacy_generators[0]} requires --output-file")
+        options.outputs.append((legacy_generators[0], options.output_file))
+    elif options.output_file:
+        parser.error("--output-file requires one of the --gen-* flags")
+    if options.emit_compiled and options.block_interface:
+        parser.error("--emit-compiled is only supported for pkgs, intfs can't be referenced by other files")
+    for mode in ("watch", "batch"):
+        if getattr(options, mode) and (options.outputs or options.emit_compiled or options.block_interface):
+            parser.error(f"--{mode} picks the outputs for each file, it can't be combined with --gen, --emit-compiled "
+                         "or --block-interface")
+    if options.watch and options.batch:
+        parser.error("Only one of --watch and --batch may be used")
+    if options.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if options.profile_cprofile and not options.profile:
+        parser.error("--profile-cprofile requires --profile")
+    if options.tool_debug or "all" in options.trace:
+        options.trace = list(TRACE_CATEGORIES)
+
     return options
 
 
@@ -330,17 +630,406 @@ def parse_args(argv):
 # Classes
 
 
+def _data_path_str(path):
+    """Format a path tuple the way yamale's DataPath does."""
+    return '.'.join(map(str, path))
+
+
+class CompiledSchema:
+    """A yamale schema compiled into closures that check an already loaded document.
+
+    Checks and error messages are the same as yamale.validate(schema, data, strict=True), without yamale's
+    per-node DataPath and result objects, paths are only formatted when something fails. This relies on the
+    internals of the pinned yamale version.
+    """
+
+    def __init__(self, schema_file):
+        # Only validation needs yamale, imported once here for the methods below
+        # pylint: disable=import-outside-toplevel
+        import yamale
+        from yamale import util as yamale_util
+        from yamale import validators as yamale_validators
+        from yamale.schema.validationresults import ValidationResult
+        self._util = yamale_util
+        self._validators = yamale_validators
+        self._validation_result = ValidationResult
+        self.schema_file = schema_file
+        self._schema = yamale.make_schema(schema_file)
+        self._includes = {}
+        self._check = self._compile(self._schema._schema, strict=True) # pylint: disable=protected-access
+
+    def validate(self, data, data_file):
+        """Return the yamale error message for data, or None if it is valid."""
+        # yamale treats an empty document as an empty map
+        errors = self._check({} if data is None else data, ())
+        if not errors:
+            return None
+        return str(self._validation_result(data_file, self.schema_file, errors))
+
+    def _compile(self, validator, strict):
+        """Return check(data, path) -> list of errors for validator, mirrors yamale's Schema._validate."""
+        yamale_util = self._util
+        yamale_validators = self._validators
+        if yamale_util.is_list(validator) or yamale_util.is_map(validator):
+            return self._compile_static(validator, strict)
+
+        none_ok = validator.is_optional and validator.can_be_none
+        validate = self._compile_primitive(validator)
+        if isinstance(validator, yamale_validators.Include):
+            check_sub = self._compile_include(validator, strict)
+        elif isinstance(validator, (yamale_validators.Map, yamale_validators.List)):
+            check_sub = self._compile_map_list(validator, strict)
+        elif isinstance(validator, yamale_validators.Any):
+            check_sub = self._compile_any(validator, strict)
+        elif isinstance(validator, yamale_validators.Subset):
+            check_sub = self._compile_subset(validator, strict)
+        else:
+            check_sub = None
+
+        def check(data, path):
+            if data is None and none_ok:
+                return []
+            errors = validate(data)
+            if errors:
+                prefix = F"{_data_path_str(path)}: "
+                return [prefix + error for error in errors]
+            if check_sub is None:
+                return []
+            return check_sub(data, path)
+
+        return check
+
+    @staticmethod
+    def _compile_primitive(validator):
+        """Skip the constraint loop for validators that don't set any constraints."""
+        # pylint: disable=protected-access
+        if any(constraint.is_active for constraint in validator._constraints_inst):
+            return validator.validate
+        is_valid = validator._is_valid
+        fail = validator.fail
+
+        def validate(data):
+            if is_valid(data):
+                return []
+            return [fail(data)]
+
+        return validate
+
+    def _compile_item(self, validator, strict):
+        """Return check(data, path, key) for the element key of data."""
+        optional = isinstance(validator, self._validators.Validator) and validator.is_optional
+        check = self._compile(validator, strict)
+
+        def check_item(data, path, key):
+            try:
+                data_item = data[key]
+            except (KeyError, IndexError):
+                if optional:
+                    return []
+                return [F"{_data_path_str(path + (key,))}: Required field missing"]
+            return check(data_item, path + (key, ))
+
+        return check_item
+
+    def _compile_static(self, validator, strict):
+        yamale_util = self._util
+        is_map = yamale_util.is_map(validator)
+        validator_keys = set(yamale_util.get_keys(validator))
+        items = [(key, self._compile_item(sub_validator, strict))
+                 for key, sub_validator in yamale_util.get_iter(validator)]
+
+        def check_static(data, path):
+            if is_map and not yamale_util.is_map(data):
+                return ["%s : '%s' is not a map" % (_data_path_str(path), data)]
+            if not is_map and not yamale_util.is_list(data):
+                return ["%s : '%s' is not a list" % (_data_path_str(path), data)]
+            errors = []
+            if strict:
+                for key in set(yamale_util.get_keys(data)) - validator_keys:
+                    errors.append(F"{_data_path_str(path + (key,))}: Unexpected element")
+            for key, check_item in items:
+                errors += check_item(data, path, key)
+            return errors
+
+        return check_static
+
+    def _compile_include(self, validator, strict):
+        include_name = validator.include_name
+        strict = strict if validator.strict is None else validator.strict
+        include_key = (include_name, strict)
+
+        # Compiled on first use, includes may refer to themselves
+        def check_include(data, path):
+            try:
+                check = self._includes[include_key]
+            except KeyError:
+                include_schema = self._schema.includes.get(include_name)
+                if not include_schema:
+                    return [F"Include '{include_name}' has not been defined."]
+                check = self._compile(include_schema._schema, strict) # pylint: disable=protected-access
+                self._includes[include_key] = check
+            return check(data, path)
+
+        return check_include
+
+    def _compile_map_list(self, validator, strict):
+        yamale_util = self._util
+        checks = [self._compile_item(sub_validator, strict) for sub_validator in validator.validators]
+        if not checks:
+            return None
+
+        def check_map_list(data, path):
+            errors = []
+            for key in yamale_util.get_keys(data):
+                sub_errors = []
+                for check_item in checks:
+                    err = check_item(data, path, key)
+                    if not err:
+                        break
+                    sub_errors += err
+                else:
+                    # All validators failed
+                    errors += sub_errors
+            return errors
+
+        return check_map_list
+
+    def _compile_any(self, validator, strict):
+        checks = [self._compile(sub_validator, strict) for sub_validator in validator.validators]
+        if not checks:
+            return None
+
+        def check_any(data, path):
+            errors = []
+            for check in checks:
+                err = check(data, path)
+                if not err:
+                    return []
+                errors += err
+            return errors
+
+        return check_any
+
+    def _compile_subset(self, validator, strict):
+        yamale_util = self._util
+        checks = [self._compile(sub_validator, strict) for sub_validator in validator.validators]
+
+        def check_one(data, path):
+            errors = []
+            for check in checks:
+                err = check(data, path)
+                if not err:
+                    return []
+                errors += err
+            return errors
+
+        def check_subset(data, path):
+            if yamale_util.is_map(data):
+                return [err for key, value in data.items() for err in check_one({key: value}, path)]
+            if yamale_util.is_list(data):
+                return [err for item in data for err in check_one(item, path)]
+            return check_one(data, path)
+
+        return check_subset
+
+
 class LinkError(Exception):
     """Error raised when a link or a cross-link can't resolve."""
     pass # pylint: disable=unnecessary-pass
 
 
+class PkgCache:
+    """LRU of elaborated pkgs for reuse across persistent worker requests.
+
+    A pkg is only valid to reuse if everything it was linked against is identical, so the key is a digest chain
+    over the MODEL_OPTIONS, the pkg's own file and every file loaded before it (see Yis._cache_key).
+    """
+
+    def __init__(self, max_size):
+        import hashlib # pylint: disable=import-outside-toplevel
+        self._sha256 = hashlib.sha256
+        self.max_size = max_size
+        self.input_digests = {}
+        self._pkgs = OrderedDict()
+
+    def file_digest(self, fname):
+        """Return a digest of fname, preferring the one bazel sent along with the work request."""
+        digest = self.input_digests.get(fname)
+        if digest:
+            return digest.encode()
+        with open(fname, 'rb') as fileh:
+            return self._sha256(fileh.read()).digest()
+
+    def chain_digest(self, chain, fname):
+        """Return the digest of chain extended with fname."""
+        return self._sha256(chain + self.file_digest(fname)).digest()
+
+    def get(self, key):
+        """Return the cached pkg for key, or None."""
+        pkg = self._pkgs.get(key)
+        if pkg is not None:
+            self._pkgs.move_to_end(key)
+        return pkg
+
+    def put(self, key, pkg):
+        """Add a pkg, evicting the least recently used one if necessary."""
+        self._pkgs[key] = pkg
+        self._pkgs.move_to_end(key)
+        while len(self._pkgs) > self.max_size:
+            self._pkgs.popitem(last=False)
+
+
+class CompiledPkgPickler(pickle.Pickler):
+    """Pickle a single elaborated Pkg.
+
+    Anything the pkg references outside of itself - the Yis root, the logger and nodes belonging to other pkgs -
+    is stored by reference and rebound by CompiledPkgUnpickler to whatever the loading Yis instance has, so each
+    compiled pkg only contains its own nodes.
+    """
+
+    def __init__(self, fileh, pkg):
+        super().__init__(fileh, protocol=pickle.HIGHEST_PROTOCOL)
+        self.pkg = pkg
+
+    def persistent_id(self, obj): # pylint: disable=too-many-return-statements
+        if isinstance(obj, YisNode):
+            root = obj.get_nonyis_root()
+            if root is self.pkg:
+                return None
+            path = []
+            node = obj
+            while node is not root:
+                path.append(node.name)
+                node = node.parent
+            return ("node", root.name, tuple(reversed(path)))
+        if isinstance(obj, Yis):
+            return ("yis", )
+        if isinstance(obj, logging.Logger):
+            return ("log", )
+        return None
+
+
+class CompiledPkgUnpickler(pickle.Unpickler):
+    """Load a pkg written by CompiledPkgPickler into a Yis instance."""
+
+    def __init__(self, fileh, yis):
+        super().__init__(fileh)
+        self.yis = yis
+
+    def find_class(self, module, name):
+        # The pickling process may have run this file as __main__ or imported it, always resolve to this module
+        if module in ("__main__", "yis_gen"):
+            obj = sys.modules[__name__]
+            for part in name.split("."):
+                obj = getattr(obj, part)
+            return obj
+        return super().find_class(module, name)
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "yis":
+            return self.yis
+        if kind == "log":
+            return self.yis.log
+        if kind == "node":
+            _, pkg_name, path = pid
+            try:
+                node = self.yis._pkgs[pkg_name] # pylint: disable=protected-access
+                for name in path:
+                    child = node.children.get(name)
+                    if child is None and isinstance(node, Pkg):
+                        # An implicit localparam of the pkg that only its dependents reference
+                        child = node.implicit_localparam(name)
+                    if child is None:
+                        raise KeyError(name)
+                    node = child
+            except KeyError:
+                raise LinkError(f"{pkg_name}::{'.'.join(path)}")
+            return node
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid}")
+
+
+def _get_template_dir():
+    template_dir = 'templates'
+    if not os.path.exists(template_dir):
+        # Hacky way to get around dependency failure when used as an external
+        template_dir = "external/yis/templates"
+    return template_dir
+
+
+def _newest_mtime(directory):
+    """Return the modification time of the newest file under directory, 0 if there are none."""
+    newest = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            newest = max(newest, os.path.getmtime(os.path.join(dirpath, filename)))
+    return newest
+
+
+def _is_c_style_template(template_path):
+    """C header and python templates (in templates/hdr and templates/py) are rendered with different whitespace
+    handling."""
+    return template_path.split("/")[0] in ("hdr", "py")
+
+
+def _create_template_env(c_style, loader):
+    """Return a jinja Environment with the settings for the C header templates or for all other templates.
+
+    Precompiled templates must be compiled by an Environment with the same settings they're rendered with.
+    """
+    from jinja2 import Environment, select_autoescape # pylint: disable=import-outside-toplevel
+    env = Environment(loader=loader,
+                      autoescape=select_autoescape(
+                          enabled_extensions=('html'),
+                          default_for_string=True,
+                      ))
+    if c_style:
+        env.lstrip_blocks = True # Avoid a lot of chomping (and other nashing of teeth)
+        env.trim_blocks = True # in the C templates.
+
+        # Add some tests that no one else seems to need
+        env.tests["struct"] = lambda obj: isinstance(obj, PkgStruct)
+        env.tests["union"] = lambda obj: isinstance(obj, PkgUnion)
+    return env
+
+
+def compile_templates(output_file):
+    """Precompile every template into a zip of python modules for Yis to load with a jinja ModuleLoader.
+
+    Besides the generated source, each module gets a hash checked .pyc so importing it doesn't even need a python
+    compile. Entries are sorted, timestamped at the zip epoch and refer to their sources by relative path, so the
+    zip is reproducible.
+    """
+    import importlib.util # pylint: disable=import-outside-toplevel
+    import marshal # pylint: disable=import-outside-toplevel
+    import zipfile # pylint: disable=import-outside-toplevel
+    from jinja2 import FileSystemLoader, ModuleLoader # pylint: disable=import-outside-toplevel
+    loader = FileSystemLoader(_get_template_dir())
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zfile:
+        for c_style in [False, True]:
+            env = _create_template_env(c_style, loader)
+            for name in env.list_templates(filter_func=lambda name: _is_c_style_template(name) == c_style): # pylint: disable=cell-var-from-loop
+                source, filename, _ = loader.get_source(env, name)
+                module_source = env.compile(source, name, filename, raw=True, defer_init=True).encode()
+                module_name = ModuleLoader.get_module_filename(name)
+                # PEP 552 pyc: magic, flags (hash based, checked against the source), source hash, code
+                code = compile(module_source, module_name, "exec", dont_inherit=True)
+                pyc = (importlib.util.MAGIC_NUMBER + (0b11).to_bytes(4, "little") +
+                       importlib.util.source_hash(module_source) + marshal.dumps(code))
+                for entry_name, data in [(module_name, module_source), (module_name + "c", pyc)]:
+                    zfile.writestr(zipfile.ZipInfo(entry_name), data, compress_type=zipfile.ZIP_DEFLATED)
+
+
 class Yis: # pylint: disable=too-many-instance-attributes
     """Yaml Interface Spec parser and generator class."""
 
-    def __init__(self, pkgs, log, options):
+    def __init__(self, pkgs, log, options, pkg_cache=None):
         self.log = log
         self.options = options
+        self._pkg_cache = pkg_cache
+        # The options the model depends on start the digest chain, see _cache_key
+        self._cache_chain = repr([getattr(options, option, None) for option in MODEL_OPTIONS]).encode()
+        self._uncached_pkgs = []
         self.parent = None # Should never be set, but recursive walking easier
         self._suppress_output = False
 
@@ -352,13 +1041,39 @@ class Yis: # pylint: disable=too-many-instance-attributes
             self._yamale_schemas_dir = os.path.join("external/yis", self._yamale_schemas_dir)
 
         self._pkgs = OrderedDict()
+        # (pkg name, symbol name) -> (symbol type, node) for every item in every pkg, see resolve_symbol
+        self._symbols = {}
         self._block_interface = None
         self._parse_files(pkgs)
-        self.log.debug("Finished parsing all files")
+        self.log.trace("load", "Finished parsing all files")
         self._elaborate()
+        if self._pkg_cache is not None:
+            for key, pkg in self._uncached_pkgs:
+                self._pkg_cache.put(key, pkg)
+
+    def _cache_key(self, fname):
+        """Extend the digest chain with fname, return the key for the pkg in fname (None without a cache)."""
+        if self._pkg_cache is None:
+            return None
+        self._cache_chain = self._pkg_cache.chain_digest(self._cache_chain, fname)
+        return self._cache_chain
+
+    def _get_cached_pkg(self, key):
+        """Reuse a previously elaborated pkg from the cache, returns True if one was found."""
+        if key is None:
+            return False
+        pkg = self._pkg_cache.get(key)
+        if pkg is None:
+            return False
+        self.log.trace("load", "Reusing cached pkg %s", pkg.name)
+        pkg.parent = self
+        self._add_pkg(pkg)
+        return True
 
     def _parse_files(self, pkgs):
         """Determine which files to parse as a Pkg or as an Intf."""
+        for fname in getattr(self.options, "compiled_deps", None) or []:
+            self._load_compiled_pkg(fname)
         pkgs_to_parse = pkgs
         if self.options.block_interface:
             special_parse = pkgs_to_parse.pop()
@@ -372,148 +1087,749 @@ class Yis: # pylint: disable=too-many-instance-attributes
         for fname in pkgs_to_parse:
             self._parse_one_pkg(fname)
 
-    def _yamale_validate(self, schema_file, data_file):
+    def _load_and_validate(self, schema_name, data_file):
+        """Load data_file once and validate it against the compiled schema_name, returns the loaded data."""
+        with self.log.span("load", os.path.basename(data_file), file=data_file):
+            data = self._load_yaml(data_file)
+        self._validate(schema_name, data, data_file)
+        return data
+
+    @staticmethod
+    def _load_yaml(data_file):
+        """Load data_file, without validating it."""
+        import yaml # pylint: disable=import-outside-toplevel
         try:
-            schema = yamale.make_schema(schema_file)
-        except IOError:
-            self.log.critical("Couldn't open {}".format(schema_file))
-        data = yamale.make_data(data_file)
+            from yaml import CLoader as Loader # pylint: disable=import-outside-toplevel
+        except ImportError:
+            from yaml import Loader # pylint: disable=import-outside-toplevel
+        with open(data_file) as yfile:
+            return yaml.load(yfile, Loader)
+
+    def _validate(self, schema_name, data, data_file):
+        """Validate data loaded from data_file against the compiled schema_name, errors are logged."""
+        schema_file = os.path.join(self._yamale_schemas_dir, schema_name)
         try:
-            yamale.validate(schema, data, strict=True)
-        except ValueError as exc:
-            self.log.error(F"Error validating input file {data_file}\n{str(exc)}")
+            schema = _COMPILED_SCHEMAS[schema_file]
+        except KeyError:
+            try:
+                schema = CompiledSchema(schema_file)
+            except IOError:
+                self.log.critical("Couldn't open {}".format(schema_file))
+            _COMPILED_SCHEMAS[schema_file] = schema
+        with self.log.span("validate", os.path.basename(data_file), file=data_file, schema=schema_name):
+            error = schema.validate(data, data_file)
+        if error:
+            self.log.error(F"Error validating input file {data_file}\n{error}")
 
     def _parse_one_pkg(self, fname):
+        key = self._cache_key(fname)
+        if self._get_cached_pkg(key):
+            return
         try:
-            self.log.debug(F"Parsing pkg {fname}")
-            self._yamale_validate(os.path.join(self._yamale_schemas_dir, 'rtl_pkg.yaml'), fname)
+            self.log.trace("load", "Parsing pkg %s", fname)
+            data = self._load_and_validate('rtl_pkg.yaml', fname)
             self.log.exit_if_warnings_or_errors("Previous errors doing initial YAML parse")
-            with open(fname) as yfile:
-                data = yaml.load(yfile, Loader)
-                pkg_name = os.path.splitext(os.path.basename(fname))[0]
+            pkg_name = os.path.splitext(os.path.basename(fname))[0]
+            with self.log.span("construct", pkg_name, pkg=pkg_name):
                 new_pkg = Pkg(log=self.log, name=pkg_name, parent=self, source_file=fname, **data)
-                self._pkgs[pkg_name] = new_pkg
-                self.log.exit_if_warnings_or_errors(F"Found errors parsing {pkg_name}")
+            self._add_pkg(new_pkg)
+            if key is not None:
+                self._uncached_pkgs.append((key, new_pkg))
+            self.log.exit_if_warnings_or_errors(F"Found errors parsing {pkg_name}")
+        except IOError:
+            self.log.critical("Couldn't open {}".format(fname))
+        self.log.trace("load", "Finished parsing %s", fname)
+
+    def _load_compiled_pkg(self, fname):
+        """Load a pkg previously written by write_compiled_pkg, its dependencies must already be loaded."""
+        key = self._cache_key(fname)
+        if self._get_cached_pkg(key):
+            return
+        self.log.trace("load", "Loading compiled pkg %s", fname)
+        try:
+            with open(fname, 'rb') as fileh, self.log.span("load", os.path.basename(fname), file=fname):
+                magic = fileh.read(len(YISC_MAGIC))
+                version = fileh.read(1)
+                if magic != YISC_MAGIC:
+                    self.log.critical("%s is not a compiled yis pkg", fname)
+                if version != bytes([YISC_VERSION]):
+                    self.log.critical("%s was compiled by an incompatible version of yis, rebuild it", fname)
+                try:
+                    pkg = CompiledPkgUnpickler(fileh, self).load()
+                except LinkError as exc:
+                    self.log.critical(
+                        "%s references %s, which isn't loaded. Compiled pkgs must be passed in "
+                        "dependency order.", fname, exc)
         except IOError:
             self.log.critical("Couldn't open {}".format(fname))
-        self.log.debug(F"Finished parsing {fname}")
+
+        existing = self._pkgs.get(pkg.name)
+        if existing is not None:
+            if existing.source_file != pkg.source_file:
+                self.log.critical("%s defines pkg %s, which was already loaded from %s", fname, pkg.name,
+                                  existing.source_file)
+            # The same pkg showing up through several dependency paths is fine, keep the first one
+            return
+        self._add_pkg(pkg)
+        if key is not None:
+            self._uncached_pkgs.append((key, pkg))
+
+    def _add_pkg(self, pkg):
+        """Add a parsed, loaded or cached pkg (or the block interface), and index the symbols it defines."""
+        self._pkgs[pkg.name] = pkg
+        if isinstance(pkg, Pkg):
+            for symbol_type in pkg.offspring:
+                for name, node in getattr(pkg, symbol_type).items():
+                    self._symbols[(pkg.name, name)] = (symbol_type, node)
+
+    def _remove_pkg(self, name):
+        """Remove a pkg (or intf) added by _add_pkg, along with the symbols it defines."""
+        pkg = self._pkgs.pop(name)
+        if isinstance(pkg, Pkg):
+            for symbol_type in pkg.offspring:
+                for symbol in getattr(pkg, symbol_type):
+                    del self._symbols[(name, symbol)]
+
+    def write_compiled_pkg(self, output_file, target=None):
+        """Write the target pkg (the last pkg parsed by default), fully elaborated, for dependents to load with
+        --compiled-deps."""
+        target_pkg = target or next(reversed(self._pkgs.values()))
+        with self.log.span("write", os.path.basename(output_file), pkg=target_pkg.name, file=output_file):
+            with atomic_output(output_file, 'wb') as fileh:
+                self.log.trace("write", "Writing %s", output_file)
+                fileh.write(YISC_MAGIC)
+                fileh.write(bytes([YISC_VERSION]))
+                CompiledPkgPickler(fileh, target_pkg).dump(target_pkg)
 
     def _parse_block_interface(self, intf_to_parse):
         """Parse a block interface file, deserialize into relevant objects."""
         try:
-            self.log.debug(F"Parsing intf {intf_to_parse}")
-            self._yamale_validate(os.path.join(self._yamale_schemas_dir, 'rtl_intf.yaml'), intf_to_parse)
+            self.log.trace("load", "Parsing intf %s", intf_to_parse)
+            data = self._load_and_validate('rtl_intf.yaml', intf_to_parse)
             self.log.exit_if_warnings_or_errors("Previous errors doing initial YAML parse")
-            with open(intf_to_parse) as yfile:
-                data = yaml.load(yfile, Loader)
-                interface_name = os.path.splitext(os.path.basename(intf_to_parse))[0]
+            interface_name = os.path.splitext(os.path.basename(intf_to_parse))[0]
+            with self.log.span("construct", interface_name, intf=interface_name):
                 self._block_interface = Intf(log=self.log,
                                              name=interface_name,
                                              parent=self,
                                              source_file=intf_to_parse,
                                              **data)
-                self._pkgs[interface_name] = self._block_interface
-                self.log.exit_if_warnings_or_errors(F"Found errors parsing {interface_name}")
+            self._add_pkg(self._block_interface)
+            self.log.exit_if_warnings_or_errors(F"Found errors parsing {interface_name}")
         except IOError:
             self.log.critical("Couldn't open {}".format(intf_to_parse))
 
     def _elaborate(self):
-        """Walk all children, link the appropriate types, fields, etc."""
-        # Only do a link first. Skip computing widths until after link is finished
+        """Walk all children, link the appropriate types, fields, etc. and freeze their computed attributes."""
         for pkg in self._pkgs.values():
-            self.log.debug(F"Resolving links in {pkg.name}")
-            pkg.resolve_links()
+            self.log.trace("link", "Elaborating %s", pkg.name)
+            pkg.elaborate()
         if self._block_interface:
-            self._block_interface.resolve_links()
+            self._block_interface.elaborate()
         self.log.exit_if_warnings_or_errors("Found errors linking pkgs")
 
+    def find_symbol(self, link_pkg, link_symbol, symbol_types):
+        """Return the node of a symbol of one of symbol_types in a linked pkg, None if there's none.
+
+        Logs nothing, unless the symbol is an implicit localparam that has to be created first.
+        """
+        try:
+            symbol_type, node = self._symbols[(link_pkg, link_symbol)]
+        except KeyError:
+            pkg = self._pkgs.get(link_pkg)
+            if Pkg.LOCALPARAMS not in symbol_types or not isinstance(pkg, Pkg) or not pkg.finished_link:
+                return None
+            node = pkg.implicit_localparam(link_symbol)
+            if node is not None and pkg.localparams.get(link_symbol) is node:
+                self._symbols[(link_pkg, link_symbol)] = (Pkg.LOCALPARAMS, node)
+            return node
+        if symbol_type in symbol_types and node.parent.finished_link:
+            return node
+        return None
+
     def resolve_symbol(self, link_pkg, link_symbol, symbol_types):
         """Attempt to find a symbol in the specified pkg, raise a LinkError if it can't be found."""
-        self.log.debug("Attempting to link %s::%s", link_pkg, link_symbol)
+        node = self.find_symbol(link_pkg, link_symbol, symbol_types)
+        if node is not None:
+            return node
+        # Not a valid link, let the pkg explain why
+        if "link" in self.log.traced:
+            self.log.trace("link", "Attempting to link %s::%s", link_pkg, link_symbol)
         try:
-            return self._pkgs[link_pkg].resolve_inbound_symbol(link_symbol, symbol_types)
+            pkg = self._pkgs[link_pkg]
         except KeyError:
             self.log.error("%s not a defined pkg", link_pkg)
             raise LinkError
+        return pkg.resolve_inbound_symbol(link_symbol, symbol_types)
 
-    def render_output(self, output_file):
-        """Render the appropriate output file, either a pkg or an intf."""
-        if self._suppress_output:
-            return
-        template_dir = 'templates'
-        if not os.path.exists(template_dir):
-            # Hacky way to get around dependency failure when used as an external
-            template_dir = "external/yis/templates"
-        env = Environment(loader=FileSystemLoader(template_dir),
-                          autoescape=select_autoescape(
-                              enabled_extensions=('html'),
-                              default_for_string=True,
-                          ))
-        year = date.today().year
-
-        target_pkg = next(reversed(self._pkgs.values()))
-        orderedElements = []
-        addrMacros = []
-        if self.options.gen_rtl:
-            template_directory = "rtl"
-        elif self.options.gen_rdl:
-            template_directory = "rdl"
-        elif self.options.gen_html:
-            template_directory = "html"
-        elif self.options.gen_dv:
-            template_directory = "dv"
-        elif self.options.gen_c_hdr:
-            template_directory = "hdr"
-            env.lstrip_blocks = True # Avoid a lot of chomping (and other nashing of teeth)
-            env.trim_blocks = True # in the C templates.
-
-            # Add some tests that no one else seems to need
-            env.tests["struct"] = lambda obj: isinstance(obj, PkgStruct)
-            env.tests["union"] = lambda obj: isinstance(obj, PkgUnion)
-
-            # C header file is sensitive to definition ordering.  The .yis file could (probably)
-            #  be constructed to ensure ordering, but it is pretty far removed from the end user
-            #  (diagnostics or drivers) so better to ensure proper ordering here.
-            orderedElements = target_pkg.post_order_traversal_for_rtl_render()
-            orderedElements = [
-                obj for obj in orderedElements if isinstance(obj, PkgStruct) or isinstance(obj, PkgUnion)
-            ]
+    def _get_template_env(self, template_directory):
+        """Return the jinja Environment for a template directory, creating it on first use.
 
-            # C header files also can get address macros.
-            # If a struct has a field "addr_macro", we need to traverse the tree to figure
-            # out which bits go in which positions.
-            for obj in target_pkg.structs:
-                myStruct = target_pkg.structs[obj]
-                if myStruct.addr_macro != None:
-                    addrMacros.append(myStruct.render_addr_macro())
-            addrMacros = [item for macro in addrMacros for item in macro]
+        The C header and python templates need different whitespace handling, so they get their own Environment.
+        """
+        c_style = _is_c_style_template(template_directory)
+        try:
+            return _TEMPLATE_ENVS[c_style]
+        except KeyError:
+            pass
+        compiled_templates = os.path.join(os.path.dirname(os.path.abspath(__file__)), COMPILED_TEMPLATES)
+        template_dir = _get_template_dir()
+        use_compiled = os.path.exists(compiled_templates)
+        if use_compiled and os.path.getmtime(compiled_templates) < _newest_mtime(template_dir):
+            self.log.warning("Ignoring %s, it's older than the templates in %s. Rebuild it or remove it",
+                             compiled_templates, template_dir)
+            use_compiled = False
+        if use_compiled:
+            from jinja2 import ModuleLoader # pylint: disable=import-outside-toplevel
+            self.log.trace("render", "Loading precompiled templates from %s", compiled_templates)
+            loader = ModuleLoader(compiled_templates)
         else:
+            from jinja2 import FileSystemLoader # pylint: disable=import-outside-toplevel
+            loader = FileSystemLoader(template_dir)
+        env = _create_template_env(c_style, loader)
+        _TEMPLATE_ENVS[c_style] = env
+        return env
+
+    def _c_hdr_context(self, target_pkg):
+        """Extra template context for the C header generator."""
+        # C header file is sensitive to definition ordering.  The .yis file could (probably)
+        #  be constructed to ensure ordering, but it is pretty far removed from the end user
+        #  (diagnostics or drivers) so better to ensure proper ordering here.
+        orderedElements = target_pkg.post_order_traversal_for_rtl_render()
+        orderedElements = [obj for obj in orderedElements if isinstance(obj, PkgStruct) or isinstance(obj, PkgUnion)]
+
+        # C header files also can get address macros.
+        # If a struct has a field "addr_macro", we need to traverse the tree to figure
+        # out which bits go in which positions.
+        # With --addr-macro-style compact they get shift/mask tables and composer functions instead.
+        addrMacros = []
+        for obj in target_pkg.structs:
+            myStruct = target_pkg.structs[obj]
+            if myStruct.addr_macro != None:
+                try:
+                    if self.options.addr_macro_style == "compact":
+                        addrMacros.append(myStruct.render_addr_tables())
+                    else:
+                        addrMacros.append(myStruct.render_addr_macro(self.options.addr_macro_limit))
+                except AddrError as exc:
+                    self.log.critical("Can't generate the address macros of %s::%s: %s", target_pkg.name, myStruct.name,
+                                      exc)
+        addrMacros = [item for macro in addrMacros for item in macro]
+        return {"orderedElements": orderedElements, "addressMacros": addrMacros}
+
+    def _py_context(self, target_pkg):
+        """Extra template context for the python codec generator.
+
+        The codecs of the structs, unions and xactions, each a dictionary of the item, its number of cycles and
+        their width, and its codec_fields with each enum named the way the pkg refers to it. The enums are the pkg's
+        own and the ones of other pkgs its codecs use, by that name.
+        """
+        enums = OrderedDict((enum.name, enum) for enum in target_pkg.enums.values())
+        codecs = []
+        for item in target_pkg.children.values():
+            if not isinstance(item, (PkgStruct, PkgUnion)) or not item.computed_width:
+                continue
+            cycles = item.record_cycles()
+            fields = []
+            for path, offset, width, enum in item.bit_layout.codec_fields(cycles):
+                enum_name = None
+                if enum is not None:
+                    enum_name = enum.name if enum.parent is target_pkg else f"{enum.parent.name}::{enum.name}"
+                    enums.setdefault(enum_name, enum)
+                fields.append((path, offset, width, enum_name))
+            codecs.append({
+                "item": item,
+                "cycles": cycles,
+                "cycle_width": item.computed_width // cycles,
+                "fields": fields
+            })
+        return {"codecs": codecs, "enums": enums}
+
+    def render_output(self, outputs, target=None):
+        """Render each (generator, output_file) in outputs from the already elaborated model.
+
+        The target defaults to the last pkg parsed, which is the block interface when there is one.
+        """
+        if self._suppress_output:
+            return
+        if not outputs:
             self.log.critical("No generator specified.")
 
+        year = date.today().year
+        target_pkg = target or next(reversed(self._pkgs.values()))
+
         template_name = "pkg"
-        if self._block_interface:
+        interface = None
+        if isinstance(target_pkg, Intf):
             template_name = "intf"
-
-        template_name = os.path.join(template_directory, template_name)
-
-        self.log.debug("Rendering from template %s", template_name)
-        template = env.get_template(template_name)
-
-        output_content = template.render(year=year,
-                                         interface=self._block_interface,
-                                         pkgs=self._pkgs,
-                                         orderedElements=orderedElements,
-                                         addressMacros=addrMacros,
-                                         target_pkg=target_pkg)
-        with open(output_file, 'w') as fileh:
-            self.log.debug(F"Writing {os.path.abspath(output_file)}")
-            fileh.write(output_content)
+            interface = target_pkg
+
+        for generator, output_file in outputs:
+            template_directory = GENERATORS[generator]
+            env = self._get_template_env(template_directory)
+            context = {"orderedElements": [], "addressMacros": []}
+            if generator == "c-hdr":
+                with self.log.span("render", f"address macros {target_pkg.name}", pkg=target_pkg.name):
+                    context = self._c_hdr_context(target_pkg)
+            elif generator == "py" and isinstance(target_pkg, Pkg):
+                context = self._py_context(target_pkg)
+
+            template_path = os.path.join(template_directory, template_name)
+            self.log.trace("render", "Rendering from template %s", template_path)
+            # The output is streamed to the file as it's rendered, so the whole document never sits in memory,
+            # this span includes writing it
+            with self.log.span("render", f"{generator} {target_pkg.name}", generator=generator, pkg=target_pkg.name):
+                template = env.get_template(template_path)
+                with atomic_output(output_file) as fileh:
+                    self.log.trace("write", "Writing %s", output_file)
+                    fileh.writelines(
+                        template.generate(year=year,
+                                          interface=interface,
+                                          pkgs=self._pkgs,
+                                          target_pkg=target_pkg,
+                                          **context))
 
     def add_child(self, child):
         """Dummy add_child function to make the class inheritance for YisNode work."""
         pass # pylint: disable=unnecessary-pass
 
 
+def _find_pkg_references(data, found=None):
+    """Return the set of pkg names referenced as pkg::symbol anywhere in loaded YAML data."""
+    found = set() if found is None else found
+    if isinstance(data, str):
+        found.update(PKG_REFERENCE_REGEXP.findall(data))
+    elif isinstance(data, dict):
+        for value in data.values():
+            _find_pkg_references(value, found)
+    elif isinstance(data, list):
+        for value in data:
+            _find_pkg_references(value, found)
+    return found
+
+
+class SourceFile: # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """A .yis file built on its own by a FileSetYis, with the data loaded from it and what to render from it."""
+
+    def __init__(self, name, path, signature=None):
+        self.name = name
+        self.path = path
+        self.signature = signature
+        self.kind = "pkg"
+        self.data = None # None when the file couldn't be loaded
+        self.deps = set()
+        self.outputs = []
+        self.compiled_output = None
+        self.errors = [] # Error messages logged while loading, building or rendering it
+
+
+class _ErrorCollector(logging.Handler):
+    """Append the message of every error logged to a list."""
+
+    def __init__(self, messages):
+        super().__init__(level=logging.ERROR)
+        self.messages = messages
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class FileSetYis(Yis):
+    """A model built from a set of .yis files one file at a time, in dependency order.
+
+    Errors in a file only leave it and the files depending on it out of the model, they're recorded on its
+    SourceFile instead of ending the run. Subclasses decide which files make up the set and when they're built.
+    """
+
+    def __init__(self, log, options):
+        self._files = OrderedDict()
+        # Any --pkgs and --compiled-deps are loaded once up front, as dependencies from outside the set
+        super().__init__(options.pkgs or [], log, options)
+        self._fixed_pkgs = set(self._pkgs)
+
+    @contextlib.contextmanager
+    def _collect_errors(self, sfile):
+        """Start sfile with fresh error counts, and record the errors logged in the block on it."""
+        self.log.warn_count = 0
+        self.log.error_count = 0
+        handler = _ErrorCollector(sfile.errors)
+        self.log.addHandler(handler)
+        try:
+            yield
+        finally:
+            self.log.removeHandler(handler)
+
+    def _load_file(self, sfile, kind=None):
+        """Load and validate sfile's data, the kind is detected from its content when not given."""
+        sfile.data = None
+        with self._collect_errors(sfile):
+            try:
+                self.log.trace("load", "Loading %s", sfile.path)
+                with self.log.span("load", os.path.basename(sfile.path), file=sfile.path):
+                    data = self._load_yaml(sfile.path)
+                if kind is None:
+                    kind = "intf" if isinstance(data, dict) and "components" in data else "pkg"
+                sfile.kind = kind
+                self._validate(f"rtl_{kind}.yaml", data, sfile.path)
+                self.log.exit_if_warnings_or_errors("Previous errors doing initial YAML parse")
+            except cmn_logging.CriticalError:
+                return
+            except Exception as exc: # pylint: disable=broad-except
+                self.log.error("Couldn't load %s: %s", sfile.path, exc)
+                return
+        sfile.data = data
+
+    def _dependency_order(self, names):
+        """Return names in dependency order, and the set of those that are part of a dependency cycle."""
+        order = []
+        cycles = set()
+        done = set()
+        for root in [name for name in self._files if name in names]:
+            if root in done:
+                continue
+            visiting = [root]
+            stack = [(root, iter(sorted(self._files[root].deps)))]
+            while stack:
+                name, deps = stack[-1]
+                for dep in deps:
+                    if dep not in names or dep in done:
+                        continue
+                    if dep in visiting:
+                        cycles.update(visiting[visiting.index(dep):])
+                        continue
+                    visiting.append(dep)
+                    stack.append((dep, iter(sorted(self._files[dep].deps))))
+                    break
+                else:
+                    stack.pop()
+                    visiting.pop()
+                    done.add(name)
+                    order.append(name)
+        return order, cycles
+
+    def _build(self, sfile):
+        """Build and elaborate the pkg or intf from an already loaded file, returns True if it succeeded."""
+        node_class = Intf if sfile.kind == "intf" else Pkg
+        try:
+            with self.log.span("construct", sfile.name, **{sfile.kind: sfile.name}):
+                node = node_class(log=self.log,
+                                  name=sfile.name,
+                                  parent=self,
+                                  source_file=sfile.path,
+                                  **copy.deepcopy(sfile.data))
+            self._add_pkg(node)
+            self.log.exit_if_warnings_or_errors(F"Found errors parsing {sfile.name}")
+            self._elaborate()
+            return True
+        except cmn_logging.CriticalError:
+            pass
+        except Exception: # pylint: disable=broad-except
+            self.log.error(F"Failed to build {sfile.name}\n{traceback.format_exc()}")
+        if sfile.name in self._pkgs:
+            self._remove_pkg(sfile.name)
+        return False
+
+    def _build_files(self, names):
+        """Build the already loaded files in names, in dependency order, returns the SourceFiles built."""
+        order, cycles = self._dependency_order(names)
+        built = []
+        for name in order:
+            sfile = self._files[name]
+            with self._collect_errors(sfile):
+                # Dependencies are built first, any one from the set missing from the model is broken
+                missing = sorted(dep for dep in sfile.deps if dep in self._files and dep not in self._pkgs)
+                if name in cycles:
+                    self.log.error("%s is part of a dependency cycle", sfile.path)
+                elif sfile.data is None:
+                    pass # Already reported when loading it
+                elif missing:
+                    self.log.error("Not building %s, it depends on %s", sfile.path, ", ".join(missing))
+                elif self._build(sfile):
+                    built.append(sfile)
+        return built
+
+    def _render(self, sfile):
+        """Render the outputs of one built file, returns True if they were all written."""
+        with self._collect_errors(sfile):
+            try:
+                target = self._pkgs[sfile.name]
+                for _, output_file in sfile.outputs:
+                    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+                if sfile.outputs:
+                    self.render_output(sfile.outputs, target=target)
+                if sfile.compiled_output:
+                    self.write_compiled_pkg(sfile.compiled_output, target=target)
+                return True
+            except cmn_logging.CriticalError:
+                pass
+            except Exception: # pylint: disable=broad-except
+                self.log.error(F"Failed to render {sfile.name}\n{traceback.format_exc()}")
+        return False
+
+
+class WatchedYis(FileSetYis):
+    """Keep the model for every pkg and intf under a directory resident, rebuilding only what changes (see --watch).
+
+    When files change only they are loaded again. They and the files depending on them, found from the pkg::symbol
+    references in each file, are rebuilt from the loaded data in dependency order and only their outputs are
+    rendered again. A file with errors is left out of the model until it's fixed, without ending the session.
+    """
+
+    def __init__(self, watch_dir, output_dir, log, options):
+        if not os.path.isdir(watch_dir):
+            log.critical("%s is not a directory", watch_dir)
+        self.watch_dir = watch_dir
+        self.output_dir = output_dir
+        self._duplicates = set() # Files already reported as redefining a pkg
+        super().__init__(log, options)
+
+    def _scan(self):
+        """Return {name: (path, signature)} for every .yis file under the watched directory."""
+        found = OrderedDict()
+        duplicates = set()
+        for dirpath, dirnames, filenames in os.walk(self.watch_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                name, extension = os.path.splitext(filename)
+                if extension != YisFileFilterAction.extension:
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue # Deleted since it was listed
+                if name in found or name in self._fixed_pkgs:
+                    if path not in self._duplicates:
+                        self.log.error("%s defines %s, which is already defined by %s", path, name,
+                                       found[name][0] if name in found else self._pkgs[name].source_file)
+                    duplicates.add(path)
+                    continue
+                found[name] = (path, (stat.st_mtime_ns, stat.st_size))
+        self._duplicates = duplicates
+        return found
+
+    def _load_changed_file(self, name, path, signature):
+        """Load a new or changed file, returns its SourceFile."""
+        sfile = SourceFile(name, path, signature)
+        self._load_file(sfile)
+        if sfile.data is not None:
+            sfile.deps = _find_pkg_references(sfile.data) - {name}
+        # Mirror the source tree, like bazel-bin does, the HTML links between files depend on it
+        output_dir = os.path.join(self.output_dir, os.path.relpath(os.path.dirname(path), self.watch_dir))
+        sfile.outputs = [(generator, os.path.join(output_dir, pattern.format(name)))
+                         for generator, pattern in WATCH_OUTPUTS[sfile.kind]]
+        return sfile
+
+    def _dependents(self, names):
+        """Return names and every watched file depending on them, directly or not."""
+        dependents = {}
+        for sfile in self._files.values():
+            for dep in sfile.deps:
+                dependents.setdefault(dep, []).append(sfile.name)
+        affected = set(names)
+        stack = list(names)
+        while stack:
+            for dependent in dependents.get(stack.pop(), []):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    stack.append(dependent)
+        return affected
+
+    def update(self):
+        """Rebuild whatever changed since the last update, returns the names rebuilt or None if nothing changed."""
+        import time # pylint: disable=import-outside-toplevel
+        start = time.perf_counter()
+        self.log.warn_count = 0
+        self.log.error_count = 0
+        found = self._scan()
+        changed = [
+            name for name, (_, signature) in found.items()
+            if name not in self._files or self._files[name].signature != signature
+        ]
+        deleted = [name for name in self._files if name not in found]
+        if not changed and not deleted:
+            return None
+
+        for name in changed:
+            self._files[name] = self._load_changed_file(name, *found[name])
+        affected = self._dependents(changed + deleted)
+        for name in affected:
+            if name in self._pkgs:
+                self._remove_pkg(name)
+        for name in deleted:
+            del self._files[name]
+        affected.difference_update(deleted)
+
+        built = self._build_files(affected)
+        written = sum(len(sfile.outputs) for sfile in built if self._render(sfile))
+
+        elapsed = (time.perf_counter() - start) * 1000
+        changes = changed + deleted
+        changes = ", ".join(changes) if len(changes) <= 5 else f"{len(changes)} files"
+        self.log.info("%s changed: rebuilt %d of %d files, wrote %d outputs in %.0fms", changes, len(built),
+                      len(self._files), written, elapsed)
+        if len(built) < len(affected):
+            self.log.warning("Left out until fixed: %s",
+                             ", ".join(sorted(affected - set(sfile.name for sfile in built))))
+        self.log.warn_count = 0
+        self.log.error_count = 0
+        return [sfile.name for sfile in built]
+
+
+def run_watch(options, log):
+    """Build everything under the watched directory, then keep rebuilding what changes until interrupted."""
+    import time # pylint: disable=import-outside-toplevel
+    yis = WatchedYis(options.watch, options.watch_output_dir, log, options)
+    log.info("Watching %s, writing outputs to %s", options.watch, options.watch_output_dir)
+    try:
+        while True:
+            yis.update()
+            time.sleep(WATCH_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+
+
+# The BatchYis being rendered, inherited by the forked render processes
+_BATCH_YIS = None
+
+
+def _render_batch_file(name):
+    """Render one file of the BatchYis inherited from the parent process, returns (name, success, errors)."""
+    return _BATCH_YIS.render_file(name)
+
+
+class BatchYis(FileSetYis):
+    """Build every target of a --batch manifest in one process.
+
+    The manifest is JSON, a list of targets, each with the .yis file to build (src), its kind (pkg, the default, or
+    intf), the .yis files of its dependencies (deps), the outputs to render ({GENERATOR: OUTPUT_FILE}) and optionally
+    where to write its compiled pkg (emit_compiled):
+
+        {"targets": [{"src": "foo.yis", "deps": ["common.yis"], "outputs": {"rtl": "foo_rypkg.svh"}}]}
+
+    Every file, whether a target or only a dependency, is parsed and elaborated once, in dependency order, then the
+    targets are rendered by a pool of processes forked from the elaborated model.
+    """
+
+    MANIFEST_KEYS = {"src", "kind", "deps", "outputs", "emit_compiled"}
+
+    def __init__(self, manifest, log, options):
+        super().__init__(log, options)
+        self._targets = []
+        self._kinds = {}
+        self._read_manifest(manifest)
+
+    def _add_file(self, path):
+        """Return the SourceFile for path, adding it to the set the first time it's seen."""
+        name = os.path.splitext(os.path.basename(path))[0]
+        sfile = self._files.get(name)
+        if sfile is not None and os.path.normpath(sfile.path) == os.path.normpath(path):
+            return sfile
+        if sfile is not None or name in self._fixed_pkgs:
+            self.log.critical("%s defines %s, which is already defined by %s", path, name,
+                              sfile.path if sfile is not None else self._pkgs[name].source_file)
+        sfile = SourceFile(name, path)
+        self._files[name] = sfile
+        return sfile
+
+    def _read_manifest(self, manifest):
+        """Add the files of every target in the manifest to the set."""
+        import json # pylint: disable=import-outside-toplevel
+        try:
+            with open(manifest) as fileh:
+                targets = json.load(fileh)["targets"]
+        except (IOError, ValueError, KeyError, TypeError) as exc:
+            self.log.critical("Couldn't read the targets from %s: %s", manifest, exc)
+        for index, target in enumerate(targets):
+            if not isinstance(target, dict) or "src" not in target or set(target) - self.MANIFEST_KEYS:
+                self.log.critical("Target %d of %s must have a src and may only have %s", index, manifest,
+                                  ", ".join(sorted(self.MANIFEST_KEYS)))
+            sfile = self._add_file(target["src"])
+            if sfile in self._targets:
+                self.log.critical("%s is a target more than once in %s", sfile.path, manifest)
+            kind = target.get("kind", "pkg")
+            if kind not in WATCH_OUTPUTS:
+                self.log.critical("%s has an unknown kind %s, expected one of %s", sfile.path, kind,
+                                  ", ".join(WATCH_OUTPUTS))
+            self._kinds[sfile.name] = kind
+            sfile.deps.update(self._add_file(dep).name for dep in target.get("deps", []))
+            for generator, output_file in target.get("outputs", {}).items():
+                if generator not in GENERATORS:
+                    self.log.critical("%s has an unknown generator %s, expected one of %s", sfile.path, generator,
+                                      ", ".join(GENERATORS))
+                sfile.outputs.append((generator, output_file))
+            sfile.compiled_output = target.get("emit_compiled")
+            if sfile.compiled_output and kind == "intf":
+                self.log.critical("%s can't emit_compiled, intfs can't be referenced by other files", sfile.path)
+            self._targets.append(sfile)
+
+    def render_file(self, name):
+        """Render one built file, returns (name, success, errors)."""
+        sfile = self._files[name]
+        return name, self._render(sfile), sfile.errors
+
+    def _preload_templates(self, sfiles):
+        """Load every template the files will need, so the forked render processes all start with them."""
+        for sfile in sfiles:
+            for generator, _ in sfile.outputs:
+                template_directory = GENERATORS[generator]
+                template_name = "intf" if sfile.kind == "intf" else "pkg"
+                self._get_template_env(template_directory).get_template(os.path.join(template_directory, template_name))
+
+    def _render_files(self, sfiles, jobs):
+        """Render sfiles over jobs processes, returns the set of names rendered successfully."""
+        global _BATCH_YIS # pylint: disable=global-statement
+        import multiprocessing # pylint: disable=import-outside-toplevel
+        names = [sfile.name for sfile in sfiles]
+        if jobs > 1 and len(names) > 1 and "fork" in multiprocessing.get_all_start_methods():
+            from concurrent.futures import ProcessPoolExecutor # pylint: disable=import-outside-toplevel
+            self._preload_templates(sfiles)
+            _BATCH_YIS = self
+            try:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(names)),
+                                         mp_context=multiprocessing.get_context("fork")) as pool:
+                    results = list(pool.map(_render_batch_file, names))
+            finally:
+                _BATCH_YIS = None
+        else:
+            results = [self.render_file(name) for name in names]
+        rendered = set()
+        for name, success, errors in results:
+            self._files[name].errors = errors
+            if success:
+                rendered.add(name)
+        return rendered
+
+    def build(self, jobs):
+        """Build and render every target, returns the list of targets that failed."""
+        import time # pylint: disable=import-outside-toplevel
+        start = time.perf_counter()
+        for sfile in self._files.values():
+            self._load_file(sfile, kind=self._kinds.get(sfile.name))
+            if sfile.data is not None:
+                # Order by the pkgs actually referenced too, files that are only dependencies don't list theirs
+                sfile.deps.update(_find_pkg_references(sfile.data) & set(self._files))
+                sfile.deps.discard(sfile.name)
+        built = set(sfile.name for sfile in self._build_files(set(self._files)))
+        elaborated = time.perf_counter()
+        rendered = self._render_files([sfile for sfile in self._targets if sfile.name in built], jobs)
+
+        self.log.warn_count = 0
+        self.log.error_count = 0
+        failed = [sfile for sfile in self._targets if sfile.name not in rendered]
+        self.log.info("Built %d of %d targets from %d files: elaborated in %.2fs, rendered in %.2fs with %d jobs",
+                      len(self._targets) - len(failed), len(self._targets), len(self._files), elaborated - start,
+                      time.perf_counter() - elaborated, jobs)
+        for sfile in failed:
+            self.log.error("%s failed: %s", sfile.path, sfile.errors[0] if sfile.errors else "unknown error")
+        return failed
+
+
+def run_batch(options, log):
+    """Build every target of the --batch manifest, failed targets are reported without stopping the others."""
+    BatchYis(options.batch, log, options).build(options.jobs)
+
+
 # move along, nothing to see here.
 class AddrError(Exception):
     pass
@@ -537,7 +1853,8 @@ class AddrField:
     def __init__(self, **kwargs):
         yisObj = kwargs.pop('obj')
         self.name = yisObj.name
-        self.bitCount = yisObj.computed_width
+        # Where the field is in the address, from the BitLayout of the addr_macro struct
+        self.lsb = kwargs.pop('lsb', 0)
         self.selects = yisObj.selectors
         self.selectedBy = None
         self.next = None
@@ -567,8 +1884,8 @@ class AddrField:
     def isTerminal(self) -> bool:
         return self.next == None
 
-    def flatten(self, currentName, currentArgs, currentPath, remainingBits, macros):
-        # This is a bit fiddly.
+    def flatten(self, macroName, limit=None):
+        # Return a macro for every path through the tree, that is every combination of union selections.
         #
         # We traverse the tree, accumulating bits along the way.
         #
@@ -578,79 +1895,254 @@ class AddrField:
         # "blah" becomes an argument.
         #
         # When we come across an enum which is used to select from a union (which
-        # we don't see til later), we put a placeholder "SELECTOR" in the RHS.
-        # when we eventually reach the union, we resolve the placeholder with
-        # the proper enum value.  At that point, we update the macro name to
-        # indicate which enum is baked into the resulting address and recursively
-        # descend all of the paths created by the union.
+        # we don't see til later), we leave a placeholder in the RHS. When we
+        # eventually reach the union, we resolve the placeholder with the proper
+        # enum value, update the macro name to indicate which enum is baked into
+        # the resulting address and descend all of the paths created by the union.
         #
-        # Finally, when we reach a leaf node, we form the final macro and add it
-        #  to the array of macros we've been building.
-        macroVal = "((" + self.name + ")"
-
-        if self.selects != None:
-            macroVal = "((SELECTOR)" # fill in the details when we find the union...
-
-        if self.selects == None and not self.hasChildren():
-            if currentArgs == "":
-                currentArgs = self.name
+        # Finally, when we reach a leaf node, we form the final macro.
+        #
+        # The walk uses an explicit stack instead of recursion. Only the parts of the
+        # RHS from the first unresolved placeholder on are kept apart (a placeholder
+        # value being None), everything before is already one string, so nothing is
+        # searched and replaced. The number of macros is still the product of the
+        # union fan-outs, so at most limit are generated, see render_addr_tables for
+        # the compact alternative.
+        macros = []
+        stack = [(self, macroName, "", "", ())]
+        while stack:
+            node, name, args, path, pending = stack.pop()
+            isUnion = node.next != None and len(node.next) > 1
+
+            if node.selects == None and not isUnion:
+                args = args + ", " + node.name if args else node.name
+
+            # Don't add placeholders (these happen when we hit a union - only the
+            # children end up actually generating bits in the address.)
+            if not isUnion:
+                if node.selects != None:
+                    pending += ((None, " << {})".format(node.lsb)), )
+                elif pending:
+                    pending += (("(({}) << {})".format(node.name, node.lsb), None), )
+                else:
+                    macroVal = "(({}) << {})".format(node.name, node.lsb)
+                    path = path + " | " + macroVal if path else macroVal
+
+            # If there is more than one child, this was a union.
+            #  It better have a selectedBy field of the same
+            #  dimension...
+            if isUnion and node.selectedBy == None:
+                raise AddrError(
+                    "Unselected union ({}) in address structure, please add a selector enum to the structure".format(
+                        node.name))
+
+            branches = []
+            if node.selectedBy != None:
+                if len(node.selectedBy) != len(node.next):
+                    raise AddrError("Union ({}) without defined selector found in address structure".format(node.name))
+                # The selector can actually be an array...
+                for i in range(len(node.next)):
+                    selVals = node.selectedBy[i] if isinstance(node.selectedBy[i], list) else [node.selectedBy[i]]
+                    for sel in selVals:
+                        # Append the evaluated name of the selector to the macro name
+                        branches.append((node.next[i], name + "_" + sel.upper(), args,
+                                         self._resolve_placeholders(path, pending, sel), ()))
+            elif node.next == None:
+                if limit is not None and len(macros) == limit:
+                    raise AddrError("{} expands to more than {} address macros".format(macroName, limit))
+                value = self._resolve_placeholders(path, pending, "SELECTOR")
+                macros.append("#define " + name + "(" + args + ")    (" + value + ")")
             else:
-                currentArgs = currentArgs + ", " + self.name
+                branches = [(n, name, args, path, pending) for n in node.next]
+            # Reversed so branches come off the stack, and their macros out, in order
+            stack.extend(reversed(branches))
 
-        macroVal = macroVal + " << {})".format(remainingBits - self.bitCount)
-        remainingBits = remainingBits - self.bitCount
+        return macros
 
-        # Don't add placeholders (these happen when we hit a union - only the
-        # children end up actually generating bits in the address.)
-        if not self.hasChildren():
-            if currentPath == "":
-                currentPath = macroVal
-            else:
-                currentPath = currentPath + " | " + macroVal
-
-        currentPathStart = currentPath
-        currentNameStart = currentName
-
-        # If there is more than one child, this was a union.
-        #  It better have a selectedBy field of the same
-        #  dimension...
-        if self.hasChildren() and self.selectedBy == None:
-            raise AddrError(
-                "Unselected union ({}) in address structure, please add a selector enum to the structure".format(
-                    self.name))
-
-        if self.selectedBy != None:
-            if len(self.selectedBy) != len(self.next):
-                raise AddrError("Union ({}) without defined selector found in address structure".format(self.name))
-            # replace the SELECTOR token with an actual value, this is complicated by the fact
-            #  that the SELECTOR can actually be an array...
-            for i in range(len(self.next)):
-                selVals = []
-                if isinstance(self.selectedBy[i], list):
-                    selVals = self.selectedBy[i]
-                else:
-                    selVals.append(self.selectedBy[i])
-
-                for sel in selVals:
-                    currentPath = re.sub("SELECTOR", sel, currentPathStart)
-                    # Append the evaluated name of the selector to the macro name
-                    currentName = currentNameStart + "_" + sel.upper()
-                    self.next[i].flatten(currentName, currentArgs, currentPath, remainingBits, macros)
-        elif self.isTerminal():
-            macros.append("#define " + currentName + "(" + currentArgs + ")    (" + currentPath + ")")
+    @staticmethod
+    def _resolve_placeholders(path, pending, selected):
+        """Append the pending parts of a macro's RHS to path, with selected for the placeholders."""
+        parts = [path] if path else []
+        for macroVal, shift in pending:
+            parts.append(macroVal if shift is None else "((" + selected + ")" + shift)
+        return " | ".join(parts)
+
+
+def _c_mask(width):
+    """Return the C literal of a mask of width (at most 64) bits."""
+    return "0x{:x}ULL".format((1 << width) - 1)
+
+
+def _c_chunks(offset, width, value):
+    """Split the width bits at offset into (offset, width, value) chunks of at most 64 bits, value is the C
+    expression of the whole field or, when it's wider than 64 bits, of a uint64_t array of it."""
+    if width <= 64:
+        return [(offset, width, value)]
+    return [(bit, min(64, offset + width - bit), f"{value}[{word}]")
+            for word, bit in enumerate(range(offset, offset + width, 64))]
+
+
+def _c_get_bits(offset, width):
+    """Return the C expression of the width (at most 64) bits at offset of the words of bits."""
+    index, shift = divmod(offset, 64)
+    expression = f"bits[{index}]"
+    if shift:
+        expression = f"(bits[{index}] >> {shift})"
+        if shift + width > 64:
+            expression = f"({expression} | (bits[{index + 1}] << {64 - shift}))"
+    if width < 64:
+        expression = f"({expression} & {_c_mask(width)})"
+    return expression
+
+
+def _c_word_terms(offset, width, value):
+    """Return (word, term) for each word of bits the width (at most 64) bits of value at offset go into."""
+    index, shift = divmod(offset, 64)
+    if width < 64:
+        value = f"({value} & {_c_mask(width)})"
+    terms = [(index, f"({value} << {shift})" if shift else value)]
+    if shift + width > 64:
+        terms.append((index + 1, f"({value} >> {64 - shift})"))
+    return terms
+
+
+def _c_set_bits(offset, width, value):
+    """Return the C statements setting the width (at most 64) bits at offset of the words of bits to value."""
+    statements = []
+    shift = offset % 64
+    masks = [((1 << width) - 1) << shift & ((1 << 64) - 1), ((1 << width) - 1) >> (64 - shift)]
+    for (word, term), mask in zip(_c_word_terms(offset, width, value), masks):
+        if mask == (1 << 64) - 1:
+            statements.append(f"bits[{word}] = {term};")
         else:
-            for n in self.next:
-                n.flatten(currentName, currentArgs, currentPath, remainingBits, macros)
+            statements.append(f"bits[{word}] = (bits[{word}] & ~0x{mask:x}ULL) | {term};")
+    return statements
+
+
+def _c_function(signature, statements):
+    """Render a static inline C function."""
+    return "\n".join([f"static inline {signature} {{"] + [f"    {statement}" for statement in statements] + ["}"])
 
-        return
+
+def _c_pack_function(item, words, fields, suffix, description):
+    """Render the pack and unpack functions converting fields ((field, offset) pairs) of the C struct or union of
+    item to and from its packed bits.
+
+    Fields of a struct are packed by its own pack function, the ones a C member can't hold are left out with a
+    comment pointing at their getter and setter.
+    """
+    var = "u" if isinstance(item, PkgUnion) else "s"
+    terms = [[] for _ in range(words)]
+    pack = []
+    unpack = []
+    for field, offset in fields:
+        member = f"{var}->{field.name}"
+        width = field.computed_width
+        sv_type = field.sv_type
+        array = not is_verilog_primitive(sv_type) and width != sv_type.computed_width
+        if isinstance(sv_type, PkgUnion) and not array:
+            comment = (f"// {field.name} is a union, pack one of its fields with {sv_type.name}_pack_<field>() "
+                       "and use the setter")
+            pack.append(comment)
+            unpack.append(comment)
+        elif array or isinstance(sv_type, (PkgUnion, PkgXaction)) or width > 64 and not isinstance(sv_type, PkgStruct):
+            comment = f"// {field.name} ({width} bits) doesn't fit its C member, use the getter and setter"
+            pack.append(comment)
+            unpack.append(comment)
+        elif isinstance(sv_type, PkgStruct):
+            field_words = sv_type.bit_layout.record_words()
+            temp = f"{field.name}_bits"
+            pack.extend([f"uint64_t {temp}[{field_words}];", f"{sv_type.name}_pack(&{member}, {temp});"])
+            for chunk in _c_chunks(offset, width, temp if width > 64 else f"{temp}[0]"):
+                for word, term in _c_word_terms(*chunk):
+                    terms[word].append(term)
+            unpack.append("{")
+            unpack.append(f"    uint64_t {temp}[{field_words}];")
+            for word, (bit, chunk_width, _) in enumerate(_c_chunks(offset, width, temp)):
+                unpack.append(f"    {temp}[{word}] = {_c_get_bits(bit, chunk_width)};")
+            unpack.extend([f"    {sv_type.name}_unpack({temp}, &{member});", "}"])
+        else:
+            for word, term in _c_word_terms(offset, width, f"(uint64_t){member}"):
+                terms[word].append(term)
+            unpack.append(f"{member} = ({field.render_native_c_type()}){_c_get_bits(offset, width)};")
+    for word, word_terms in enumerate(terms):
+        pack.append(f"bits[{word}] = " + (" |\n              ".join(word_terms) if word_terms else "0") + ";")
+    c_type = f"{item.name} *{var}"
+    return [
+        f"// Pack {description} into bits",
+        _c_function(f"void {item.name}_pack{suffix}(const {c_type}, uint64_t *bits)", pack),
+        f"// Unpack bits into {description}",
+        _c_function(f"void {item.name}_unpack{suffix}(const uint64_t *bits, {c_type})", unpack),
+    ]
+
+
+def _c_accessors(item, field, offset):
+    """Render the getter and setter of the bits of field of item, at offset of its packed bits."""
+    width = field.computed_width
+    prefix = f"{item.name}_{{}}_{field.name}"
+    if width <= 64:
+        return [
+            f"// {field.name}: {width} bits from bit {offset}",
+            _c_function(f"uint64_t {prefix.format('get')}(const uint64_t *bits)",
+                        [f"return {_c_get_bits(offset, width)};"]),
+            _c_function(f"void {prefix.format('set')}(uint64_t *bits, uint64_t value)",
+                        _c_set_bits(offset, width, "value")),
+        ]
+    chunks = _c_chunks(offset, width, "value")
+    return [
+        f"// {field.name}: {width} bits from bit {offset}, in {len(chunks)} words least significant first",
+        _c_function(f"void {prefix.format('get')}(const uint64_t *bits, uint64_t *value)",
+                    [f"{value} = {_c_get_bits(bit, chunk_width)};" for bit, chunk_width, value in chunks]),
+        _c_function(f"void {prefix.format('set')}(uint64_t *bits, const uint64_t *value)",
+                    [statement for chunk in chunks for statement in _c_set_bits(*chunk)]),
+    ]
+
+
+def render_c_pack_functions(item):
+    """Render the C header functions converting a struct, union or xaction between its C type and its packed bits.
+
+    The packed bits are an array of <NAME>_WORDS uint64_t words, a record like the python codec's (see
+    BitLayout.record_offsets). Every field gets a getter and a setter of its bits. A struct also gets pack() and
+    unpack() functions converting all of its fields, a union a pair for each of its fields, since they share the
+    memory of the C union. Everything uses constant shifts and masks.
+    """
+    layout = item.bit_layout
+    cycles = item.record_cycles()
+    words = layout.record_words(cycles)
+    offsets = layout.record_offsets(cycles)
+    fields = [(layout.nodes[row], offsets[row]) for row in layout.top_level_rows() if layout.nodes[row].computed_width]
+    lines = [f"#define {item.name.upper()}_WORDS {words}"]
+    for field, offset in fields:
+        lines.extend(_c_accessors(item, field, offset))
+    if isinstance(item, PkgUnion):
+        for field, offset in fields:
+            lines.extend(
+                _c_pack_function(item, words, [(field, offset)], f"_{field.name}",
+                                 f"the {field.name} of a {item.name}"))
+    else:
+        lines.extend(_c_pack_function(item, words, fields, "", f"a {item.name}"))
+    return "\n".join(lines)
 
 
 class YisNode: # pylint: disable=too-few-public-methods
     """Base class for any type of specification."""
 
+    # Subclasses get a __dict__ unless they're a YisLeafNode
+    __slots__ = ()
+
     TYPE_NAME_SUFFIX = ""
     INSTANCE_NAME_SUFFIX = ""
 
+    # Elaboration states, see elaborate()
+    NOT_ELABORATED = "not elaborated"
+    LINKING = "linking"
+    FREEZING = "freezing"
+    ELABORATED = "elaborated"
+
+    elaboration_state = NOT_ELABORATED
+
+    _computed_property_names = {}
+
     def __init__(self, **kwargs):
         self.log = kwargs.pop('log')
         self.name = kwargs.pop('name')
@@ -659,18 +2151,13 @@ class YisNode: # pylint: disable=too-few-public-methods
         self.regwidth = kwargs.pop('regwidth', 16)
         self.parent = kwargs.pop('parent')
         self.parent.add_child(self)
-        self.children = OrderedDict()
+        self.elaboration_state = self.NOT_ELABORATED
+        if not isinstance(self, YisLeafNode):
+            self.children = OrderedDict()
         self._check_naming_conventions()
-        self.local_links = [] # Simplifies post-order-traversal algorithm
+        self.local_links = () # Simplifies post-order-traversal algorithm
         # (basically just moving some smarts to
-        # constructors)
-
-    def __getattribute__(self, attr):
-        """Override the default behaviour to make sure links are resolved before
-        accessing any computed functions."""
-        if attr.startswith("computed_"):
-            self.resolve_links()
-        return super().__getattribute__(attr)
+        # constructors). A tuple, so nodes that never link share the empty one
 
     def _check_naming_conventions(self):
         self._check_reserved_word_name()
@@ -756,8 +2243,12 @@ class YisNode: # pylint: disable=too-few-public-methods
                 return "uint32_t"
             return "uint64_t"
 
-    def resolve_link_from_str(self, link_name, allowed_symbols=[]): # pylint: disable=dangerous-default-value
-        """Given a string, attempt to likn to a matching YisNode."""
+    def resolve_link_from_str(self, link_name, allowed_symbols=[], record_link=True): # pylint: disable=dangerous-default-value
+        """Given a string, attempt to likn to a matching YisNode.
+
+        Links made while rendering (e.g. doc cross references) must pass record_link=False so that rendering one
+        output doesn't change the dependency order seen by the next output rendered from the same model.
+        """
         if not isinstance(link_name, str):
             self.log.error("Attempting to resolve link from %s. Expected str, but got %s %s", self.name, link_name,
                            type(link_name))
@@ -768,7 +2259,8 @@ class YisNode: # pylint: disable=too-few-public-methods
         while root.parent:
             root = root.parent
 
-        self.log.debug("Attempting to resolve link to %s::%s", link_pkg, link_symbol)
+        if "link" in self.log.traced:
+            self.log.trace("link", "Attempting to resolve link to %s::%s", link_pkg, link_symbol)
         try:
             link = root.resolve_symbol(link_pkg, link_symbol, allowed_symbols)
         except LinkError:
@@ -776,8 +2268,8 @@ class YisNode: # pylint: disable=too-few-public-methods
                 "Couldn't resolve a link from %s::%s to %s. Check to make sure you're using .width or .value correctly for the definition of %s",
                 self.parent.name, self.name, link_symbol, self.name)
             return None
-        else:
-            self.local_links.append(link)
+        if record_link:
+            self.local_links += (link, )
         return link
 
     def _resolve_link(self, attr_name, allowed_symbols=[]): # pylint: disable=dangerous-default-value
@@ -788,21 +2280,75 @@ class YisNode: # pylint: disable=too-few-public-methods
             return # Not a link
 
         link = self.resolve_link_from_str(attr, allowed_symbols=allowed_symbols)
+        if link is not None:
+            link.elaborate()
         setattr(self, attr_name, link)
 
-    @only_run_once
+    def elaborate(self):
+        """Resolve links, then freeze computed attributes into plain attributes and run checks that need them.
+
+        Nodes are elaborated depth first: children before their parent, and any node linked to before the node
+        linking to it (see _resolve_link and Equation), so the model is elaborated in topological order. A node
+        reached again while it's still being elaborated is a circular reference.
+        """
+        if self.elaboration_state == self.ELABORATED:
+            return
+        if self.elaboration_state != self.NOT_ELABORATED:
+            self.log.critical("Circular reference, %s depends on itself", self.get_full_name())
+        if self.log.profiling and isinstance(self.parent, (Yis, Pkg, Intf)):
+            # Pkgs, intfs and their items get a span each, anything below is accounted to the item it's in
+            if isinstance(self.parent, Yis):
+                span = self.log.span("link", self.name, pkg=self.name)
+            else:
+                span = self.log.span("link", self.get_full_name(), pkg=self.parent.name, item=self.name)
+            with span:
+                self._link_and_freeze()
+        else:
+            self._link_and_freeze()
+
+    def _link_and_freeze(self):
+        """The body of elaborate."""
+        self.elaboration_state = self.LINKING
+        self.resolve_links()
+        # Computed attributes can't be trusted with broken links
+        self.log.exit_if_warnings_or_errors("Errors linking %s", self.name)
+        self.elaboration_state = self.FREEZING
+        for name in self._get_computed_property_names():
+            getattr(self, name)
+        self.elaboration_state = self.ELABORATED
+        self.check_elaborated()
+        self.log.exit_if_warnings_or_errors("Errors linking %s", self.name)
+
+    @classmethod
+    def _get_computed_property_names(cls):
+        """Return the names of all computed_property attributes of this class, including inherited ones."""
+        try:
+            return cls._computed_property_names[cls]
+        except KeyError:
+            names = []
+            for klass in reversed(cls.__mro__):
+                for name, attr in vars(klass).items():
+                    if isinstance(attr, computed_property) and name not in names:
+                        names.append(name)
+            cls._computed_property_names[cls] = names
+            return names
+
     def resolve_links(self):
         """Resolve links in all children."""
         for child in self.children.values():
-            child.resolve_links()
-            self.log.exit_if_warnings_or_errors("Errors linking %s", child.name)
+            child.elaborate()
         self.resolve_doc_links()
 
+    def check_elaborated(self):
+        """Hook to allow subclasses to run checks that need computed attributes."""
+        pass # pylint: disable=unnecessary-pass
+
     def resolve_doc_links(self):
         """Resolve basic doc_* links from *.doc_* to the original definition."""
         attr_name_map = {'width': 'width', 'type': 'sv_type'}
         for doc_type in ['doc_summary', 'doc_verbose']:
-            self.log.debug(F"Looking for {doc_type} on {self.name}")
+            if "link" in self.log.traced:
+                self.log.trace("link", "Looking for %s on %s", doc_type, self.name)
             doc_attr = getattr(self, doc_type)
             for human_name, yis_internal_name in attr_name_map.items():
                 if doc_attr == F"{human_name}.{doc_type}":
@@ -817,7 +2363,8 @@ class YisNode: # pylint: disable=too-few-public-methods
                     linked_attr = linked_attr.get_doc_link()
                 try:
                     setattr(self, doc_type, getattr(linked_attr, doc_type))
-                    self.log.debug("Linked up doc for %s", linked_attr.name)
+                    if "link" in self.log.traced:
+                        self.log.trace("link", "Linked up doc for %s", linked_attr.name)
                 except AttributeError:
                     self.log.error(F"{self.get_parent_pkg().name}::{self.parent.name}.{self.name} "
                                    F"can't use a \"{human_name}.{doc_type}\" "
@@ -865,33 +2412,14 @@ class YisNode: # pylint: disable=too-few-public-methods
 
     def html_link_attribute_from_link(self, link, extra_text=""):
         """Pass a reference to another yisnode to create a relative HTML link from this object to that object."""
-        my_root = self.get_nonyis_root()
-        ref_root = link.get_nonyis_root()
-        relpath = os.path.relpath(os.path.dirname(ref_root.source_file), os.path.dirname(my_root.source_file))
-
-        pkg_prefix = ""
-        if ref_root is not my_root:
-            pkg_prefix = f"{ref_root.name}_rypkg::"
-
-        href_target = os.path.join(relpath, f"{ref_root.name}_rypkg.html#{link.html_anchor()}")
-        return f'<a href="{href_target}">{pkg_prefix}{link.name}{extra_text}</a>'
+        return self.get_nonyis_root().html_links.link_html(link, extra_text)
 
     def html_render_doc(self, attr_name):
         """Add cross references in documentation."""
         assert attr_name in ["doc_summary", "doc_verbose"]
 
-        doc_link_re = re.compile(r"\[([a-zA-Z0-9_:]+)\]")
-
-        attr = getattr(self, attr_name)
-
-        def repl(match):
-            name = match.group(1)
-            link = self.resolve_link_from_str(
-                name, allowed_symbols=[Pkg.LOCALPARAMS, Pkg.ENUMS, Pkg.TYPEDEFS, Pkg.STRUCTS, Pkg.UNIONS])
-            return self.html_link_attribute_from_link(link)
-
-        attr = doc_link_re.sub(repl, attr)
-        return attr
+        links = self.get_nonyis_root().html_links
+        return DOC_LINK_REGEXP.sub(lambda match: links.doc_link_html(self, match.group(1)), getattr(self, attr_name))
 
     def get_full_name(self):
         """Return a hierarchal name for this node. Intended use is for debug only, not for code generation."""
@@ -905,6 +2433,61 @@ class YisNode: # pylint: disable=too-few-public-methods
         return ".".join(names)
 
 
+# The children of every YisLeafNode
+EMPTY_CHILDREN = types.MappingProxyType(OrderedDict())
+
+
+class _LeafNodeType(type):
+    """Metaclass of YisLeafNode, adding a slot for every computed_property a subclass defines.
+
+    A class can't have a slot and a class attribute with the same name, so the computed_property objects are moved
+    out of the class into _leaf_computed_properties, where YisLeafNode.__getattr__ finds them when their slot is read
+    before it's set. Once frozen, reading them is a plain slot read.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        computed = {key: value for key, value in namespace.items() if isinstance(value, computed_property)}
+        for key in computed:
+            del namespace[key]
+        namespace["__slots__"] = tuple(namespace.get("__slots__", ())) + tuple(computed)
+        inherited = {}
+        for base in reversed(bases):
+            inherited.update(getattr(base, "_leaf_computed_properties", {}))
+        namespace["_leaf_computed_properties"] = dict(inherited, **computed)
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class YisLeafNode(YisNode, metaclass=_LeafNodeType):
+    """Base class for the nodes that never have children: enum values, struct and union fields and intf ports.
+
+    They're most of the nodes of a model, so they keep their attributes in slots instead of a __dict__, share one empty
+    children mapping and only get their own local_links once they link to something. Subclasses must list every
+    attribute they set in __slots__, apart from their computed_property attributes.
+    """
+
+    __slots__ = ("log", "name", "doc_summary", "doc_verbose", "regwidth", "parent", "elaboration_state", "local_links")
+
+    children = EMPTY_CHILDREN
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, for a computed_property that's the first read of its empty slot
+        try:
+            prop = self._leaf_computed_properties[name]
+        except KeyError:
+            # A property (or slot) of the class that raised AttributeError itself, read it again so its own error
+            # propagates instead of a generic one
+            for cls in type(self).__mro__:
+                attr = cls.__dict__.get(name)
+                if hasattr(attr, "__get__"):
+                    return attr.__get__(self, type(self))
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        return prop.__get__(self, type(self))
+
+    @classmethod
+    def _get_computed_property_names(cls):
+        return list(cls._leaf_computed_properties)
+
+
 class Pkg(YisNode):
     """Class to hold a set of PkgItemBase objects, representing the whole pkg."""
     REGWIDTH = 'regwidth'
@@ -914,6 +2497,9 @@ class Pkg(YisNode):
     STRUCTS = 'structs'
     TYPEDEFS = 'typedefs'
     UNIONS = 'unions'
+
+    _html_links = None
+
     offspring = OrderedDict([
         (LOCALPARAMS, 'PkgLocalparam'),
         (ENUMS, 'PkgEnum'),
@@ -927,6 +2513,14 @@ class Pkg(YisNode):
         super().__init__(**kwargs)
 
         self.finished_link = False
+        # See add_implicit_localparam, the pkg's own setting wins over the command line's
+        self.implicit_localparams = kwargs.get('implicit_localparams')
+        if self.implicit_localparams is None:
+            self.implicit_localparams = getattr(self.parent.options, 'implicit_localparams', 'all')
+        self._implicit_specs = OrderedDict() # Name -> arguments of the implicit localparams not created up front
+        self._late_implicits = {} # Implicit localparams created after the pkg was elaborated, see add_child
+        self._implicits_final = False
+        self._declaration_index = {} # Name -> position in the pkg file, to keep outputs in that order
 
         def initialize(offspring):
             setattr(self, offspring, OrderedDict())
@@ -946,10 +2540,36 @@ class Pkg(YisNode):
         for offspring in self.offspring.keys():
             _fn(offspring, *args, **kwargs)
 
+    def _link_and_freeze(self):
+        super()._link_and_freeze()
+        self._finish_implicit_localparams()
+
+    @property
+    def html_links(self):
+        """The HtmlLinkTable of the pkg, built the first time its HTML is rendered."""
+        if self._html_links is None:
+            self._html_links = HtmlLinkTable(self)
+        return self._html_links
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # They belong to whichever dependent created them, a loaded pkg creates them again when they're referenced
+        state['_late_implicits'] = {}
+        # Links into the pkgs it was elaborated with, a loaded pkg builds its own when its HTML is rendered
+        state.pop('_html_links', None)
+        return state
+
     def add_child(self, child):
         """Override super add_child to add in differentiation between
         localparams, enums, structs, typedefs, and unions.
         """
+        if self._implicits_final and child.implicit:
+            # Only a dependent references it. Its outputs were decided when the pkg was elaborated, leave it out
+            self._late_implicits[child.name] = child
+            return
+        if child.name in self._implicit_specs and not child.implicit:
+            self.log.error(F"{child.name} already exists in {self.name} as a PkgLocalparam")
+        self._declaration_index.setdefault(child.name, len(self._declaration_index))
         super().add_child(child)
 
         for offspring, offspring_type in self.offspring.items():
@@ -961,25 +2581,77 @@ class Pkg(YisNode):
             raise ValueError(F"Can't add {child.name} to pkg {self.name} because it is a {type(child)}. "
                              "Can only add localparams, enums, structs, typedefs, and unions.")
 
-    @only_run_once
     def resolve_links(self):
         """Find and resolve links between types starting at
         localparms, then enums, then structs, then unions, then typdefs.
         """
-        self.log.debug("Attempting to resolve links in %s", self.name)
+        self.log.trace("link", "Attempting to resolve links in %s", self.name)
         self.finished_link = True
-        super().resolve_links()
+        # Linking creates the implicit localparams it references, which are elaborated as they're created
+        for child in list(self.children.values()):
+            child.elaborate()
+        self.resolve_doc_links()
+
+    def add_implicit_localparam(self, **kwargs):
+        """Add one of the localparams generated for the items of the pkg, e.g. <NAME>_WIDTH.
+
+        With the "referenced" implicit_localparams policy only its arguments are kept. The localparam is created by
+        implicit_localparam when something links to it, unreferenced ones are never created or rendered.
+        """
+        if self.implicit_localparams == "all":
+            PkgLocalparam(parent=self, log=self.log, implicit=True, **kwargs)
+            return
+        name = kwargs['name']
+        if name in self.children or name in self._implicit_specs:
+            existing = type(self.children[name]).__name__ if name in self.children else "PkgLocalparam"
+            self.log.error(F"{name} already exists in {self.name} as a {existing}")
+        self._declaration_index.setdefault(name, len(self._declaration_index))
+        self._implicit_specs[name] = kwargs
+
+    def implicit_localparam(self, name):
+        """Return the implicit localparam called name, creating and elaborating it on first use.
+
+        Returns None if the pkg has no such implicit localparam.
+        """
+        node = self.localparams.get(name) or self._late_implicits.get(name)
+        if node is not None or name not in self._implicit_specs:
+            return node
+        if "link" in self.log.traced:
+            self.log.trace("link", "Creating implicit localparam %s::%s", self.name, name)
+        node = PkgLocalparam(parent=self, log=self.log, implicit=True, **self._implicit_specs[name])
+        node.elaborate()
+        return node
+
+    def declares(self, node):
+        """Whether node is rendered in the outputs of the pkg, implicit localparams only its dependents reference
+        aren't."""
+        return not getattr(node, 'implicit', False) or self._late_implicits.get(node.name) is not node
+
+    def _finish_implicit_localparams(self):
+        """Fix the implicit localparams the pkg declares, in the order of the pkg file."""
+        self._implicits_final = True
+        if not self._implicit_specs:
+            return # They were all created up front, in order
+
+        def position(item):
+            return self._declaration_index[item[0]]
+
+        self.localparams = OrderedDict(sorted(self.localparams.items(), key=position))
+        self.children = OrderedDict(sorted(self.children.items(), key=position))
 
     def resolve_inbound_symbol(self, link_symbol, symbol_types):
         """Resolve a link from another pkg attempting to reference a symbol in this pkg."""
-        self.log.debug("Attempting to resolve an inbound link %s::%s of types %s", self.name, link_symbol, symbol_types)
+        if "link" in self.log.traced:
+            self.log.trace("link", "Attempting to resolve an inbound link %s::%s of types %s", self.name, link_symbol,
+                           symbol_types)
         if not self.finished_link:
             self.log.error(F"Can't resolve {link_symbol} into {self.name}, it hasn't been compiled yet")
             raise LinkError
 
         for symbol_type in symbol_types:
             try:
-                self.log.debug("Looking for a(n) %s link to %s::%s", symbol_type, self.name, link_symbol)
+                if "link" in self.log.traced:
+                    self.log.trace("link", "Looking for a(n) %s link to %s::%s", symbol_type, self.name, link_symbol)
                 return getattr(self, symbol_type)[link_symbol]
             except KeyError:
                 pass
@@ -1011,25 +2683,289 @@ class Pkg(YisNode):
         Generated compile won't compile if dependent types are previously
         declared.
 
+        Iterative depth first search over every item's local links and children (see get_dependencies), starting from
+        the items in offspring order. Each node is visited once, so this is linear in the size of the link graph.
         """
-        done = {}
+        top_level = set()
+        for offspring in self.offspring:
+            top_level.update(getattr(self, offspring).values())
+
+        done = set()
+        visiting = set()
         ordered = [] # This could be a yield, just annoying to debug in jinja
         for offspring in self.offspring:
             for item in getattr(self, offspring).values():
-                for potll in item.post_order_traversal_local_links():
-                    if potll in done:
-                        continue
-                    done[potll] = True
-                    # children apparently have this function as well
-                    # if hasattr(potll, 'render_rtl_sv_pkg'):
-                    for offspring_inner in self.offspring:
-                        if potll in getattr(self, offspring_inner).values():
-                            ordered.append(potll)
+                if item in done:
+                    continue
+                visiting.add(item)
+                stack = [(item, item.get_dependencies())]
+                while stack:
+                    node, dependencies = stack[-1]
+                    for dependency in dependencies:
+                        if dependency in done:
+                            continue
+                        if dependency in visiting:
+                            self.log.critical("Circular dependency between %s and %s while ordering %s for render",
+                                              node.get_full_name(), dependency.get_full_name(), self.name)
+                        visiting.add(dependency)
+                        stack.append((dependency, dependency.get_dependencies()))
+                        break
+                    else:
+                        # All dependencies are done, so this node is next in post order
+                        stack.pop()
+                        visiting.remove(node)
+                        done.add(node)
+                        if node in top_level:
+                            ordered.append(node)
         return ordered
 
 
+class HtmlLinkTable:
+    """The HTML cross references of a pkg or intf, resolved once before its HTML is rendered so rendering only looks
+    them up.
+
+    targets maps every node its HTML links to (the links of its nodes and the symbols their docs reference in square
+    braces) to the relative href and the text of the link, doc_links maps each symbol referenced in the docs, as
+    written, to its rendered link. References that can't be resolved yet, or at all, are left out and resolved when
+    they're rendered, reporting the same errors as before.
+    """
+
+    DOC_SYMBOL_TYPES = [Pkg.LOCALPARAMS, Pkg.ENUMS, Pkg.TYPEDEFS, Pkg.STRUCTS, Pkg.UNIONS]
+
+    def __init__(self, root):
+        self.root = root
+        self.targets = {}
+        self.doc_links = {}
+        # Intf docs must scope every symbol to its pkg
+        default_pkg = root.name if isinstance(root, Pkg) else None
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            for link in node.local_links:
+                if link not in self.targets:
+                    self.targets[link] = self._target(link)
+            for doc in (node.doc_summary, node.doc_verbose):
+                if not doc or "[" not in doc:
+                    continue
+                for symbol in DOC_LINK_REGEXP.findall(doc):
+                    if symbol in self.doc_links:
+                        continue
+                    match = PKG_SCOPE_REGEXP.match(symbol)
+                    link_pkg, link_symbol = match.groups() if match else (default_pkg, symbol)
+                    link = root.parent.find_symbol(link_pkg, link_symbol, self.DOC_SYMBOL_TYPES)
+                    if link is not None:
+                        self.targets.setdefault(link, self._target(link))
+                        self.doc_links[symbol] = self.link_html(link)
+
+    def _target(self, link):
+        """Return the href and text of a link to a node, the href is None if the node has no anchor to link to."""
+        ref_root = link.get_nonyis_root()
+        pkg_prefix = ""
+        if ref_root is not self.root:
+            pkg_prefix = f"{ref_root.name}_rypkg::"
+        if isinstance(ref_root, Pkg) and not ref_root.declares(link):
+            # An implicit localparam only dependents of its pkg reference isn't in the pkg's HTML
+            return None, f"{pkg_prefix}{link.name}"
+        relpath = os.path.relpath(
+            os.path.dirname(ref_root.source_file) or ".",
+            os.path.dirname(self.root.source_file) or ".")
+        return os.path.join(relpath, f"{ref_root.name}_rypkg.html#{link.html_anchor()}"), f"{pkg_prefix}{link.name}"
+
+    def link_html(self, link, extra_text=""):
+        """Return the HTML link to a node."""
+        target = self.targets.get(link)
+        if target is None:
+            target = self._target(link)
+        href, text = target
+        if href is None:
+            return f"{text}{extra_text}"
+        return f'<a href="{href}">{text}{extra_text}</a>'
+
+    def doc_link_html(self, node, symbol):
+        """Return the HTML link for a symbol referenced in the docs of node."""
+        html = self.doc_links.get(symbol)
+        if html is None:
+            link = node.resolve_link_from_str(symbol, allowed_symbols=self.DOC_SYMBOL_TYPES, record_link=False)
+            html = self.link_html(link)
+        return html
+
+
+class BitLayout:
+    """Where every field of a packed type sits: a row for each field, nested ones included, with its absolute MSB and
+    LSB in the type.
+
+    Rows are in declaration order, each field followed by the rows of its own type, so the top level fields of a
+    struct (and the cycles of an xaction) come MSB first. Every field of a union starts at its LSB. A typedef of a
+    struct, union, enum or typedef has a row per element, named [i], MSB first, and so has a field that is an array
+    of one. Other fields of logic or an enum, and typedefs of logic, are leaves.
+
+    A type's layout is built once from the layouts of the types of its fields, by copying their rows shifted to where
+    the field sits, so it takes time linear in the number of rows. The columns are kept in compact arrays, names
+    hold each row's own name, see path() for the full one.
+    """
+
+    __slots__ = ("width", "names", "nodes", "depths", "msbs", "lsbs")
+
+    def __init__(self, width):
+        self.width = width
+        self.names = []
+        self.nodes = [] # The field, or for an element of a typedef the typedef's base type
+        self.depths = array.array("H")
+        self.msbs = array.array("l")
+        self.lsbs = array.array("l")
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, node, lsb, width, layout=None):
+        """Add a row for a field of width bits at lsb, followed by the rows of layout (its type's) shifted there."""
+        self.names.append(name)
+        self.nodes.append(node)
+        self.depths.append(0)
+        self.lsbs.append(lsb)
+        self.msbs.append(lsb + width - 1)
+        if layout:
+            self.names.extend(layout.names)
+            self.nodes.extend(layout.nodes)
+            self.depths.extend(depth + 1 for depth in layout.depths)
+            self.lsbs.extend(bit + lsb for bit in layout.lsbs)
+            self.msbs.extend(bit + lsb for bit in layout.msbs)
+
+    @classmethod
+    def of_fields(cls, width, fields, packing):
+        """Return the layout of the fields of a struct ("struct", MSB first) or a union ("union", all at bit 0)."""
+        layout = cls(width)
+        fields = list(fields)
+        lsb = sum(field.computed_width for field in fields) if packing == "struct" else 0
+        for field in fields:
+            if packing == "struct":
+                lsb -= field.computed_width
+            layout.add(field.name, field, lsb, field.computed_width, cls.of_field_type(field))
+        return layout
+
+    @classmethod
+    def of_elements(cls, element_type, width):
+        """Return the layout of an array of width bits of element_type, a row per element, MSB first."""
+        layout = cls(width)
+        element_width = element_type.computed_width
+        if not element_width:
+            return layout
+        element_layout = cls.of_type(element_type)
+        for index in reversed(range(width // element_width)):
+            layout.add(f"[{index}]", element_type, index * element_width, element_width, element_layout)
+        return layout
+
+    @classmethod
+    def of_field_type(cls, field):
+        """Return the layout of the type of a field, the elements of it for a field that is an array of it."""
+        if is_verilog_primitive(field.sv_type):
+            return None
+        if field.computed_width != field.sv_type.computed_width:
+            return cls.of_elements(field.sv_type, field.computed_width)
+        return cls.of_type(field.sv_type)
+
+    @staticmethod
+    def of_type(sv_type):
+        """Return the layout of a type, None for logic and enums."""
+        if isinstance(sv_type, (PkgStruct, PkgUnion, PkgTypedef)):
+            return sv_type.bit_layout
+        return None
+
+    def top_level_rows(self):
+        """Return the indices of the rows of the top level fields."""
+        return [row for row, depth in enumerate(self.depths) if depth == 0]
+
+    def is_leaf(self, row):
+        """Return True if nothing is nested in the field of row."""
+        return row + 1 == len(self.depths) or self.depths[row + 1] <= self.depths[row]
+
+    def record_words(self, cycles=1):
+        """Return the number of 64 bit words of a record, see record_offsets."""
+        return cycles * ((self.width // cycles + 63) // 64) if cycles else 0
+
+    def record_offsets(self, cycles=1):
+        """Return the bit of a record each row starts at, the packed form the python codec and the C header use.
+
+        A record is a row of 64 bit words, word 0 holding the least significant bits. The top level fields of an
+        xaction (cycles > 1) are its cycles, each one starts a new word, in order.
+        """
+        if cycles <= 1:
+            return list(self.lsbs)
+        cycle_bits = self.record_words(cycles) // cycles * 64
+        base = 0
+        cycle = -1
+        offsets = []
+        for row, lsb in enumerate(self.lsbs):
+            if not self.depths[row]:
+                cycle += 1
+                base = cycle * cycle_bits - lsb
+            offsets.append(base + lsb)
+        return offsets
+
+    def codec_fields(self, cycles=1):
+        """Return the (path, offset, width, enum) of every leaf field, for the python codec.
+
+        offset is the bit of the record the field starts at, see record_offsets. enum is the PkgEnum of fields of
+        an enum, None for the others.
+        """
+        offsets = self.record_offsets(cycles)
+        fields = []
+        for row in range(len(self)):
+            width = self.msbs[row] - self.lsbs[row] + 1
+            if width <= 0 or not self.is_leaf(row):
+                continue
+            node = self.nodes[row]
+            enum = node if isinstance(node, PkgEnum) else getattr(node, "sv_type", None)
+            fields.append((self.path(row), offsets[row], width, enum if isinstance(enum, PkgEnum) else None))
+        return fields
+
+    def path(self, row):
+        """Return the full name of the field of row, e.g. cmd.num_cycles or dat[1].lo."""
+        parts = [self.names[row]]
+        depth = self.depths[row]
+        while depth:
+            row -= 1
+            if self.depths[row] < depth:
+                parts.append(self.names[row])
+                depth = self.depths[row]
+        path = parts.pop()
+        for part in reversed(parts):
+            path += part if part.startswith("[") else "." + part
+        return path
+
+    def html_canvas_data(self, label=""):
+        """Return the struct-canvas data of the top level fields."""
+        rows = self.top_level_rows()
+        data = {
+            "field_names": [self.names[row] for row in rows],
+            "msbs": [self.msbs[row] for row in rows],
+            "lsbs": [self.lsbs[row] for row in rows],
+        }
+        if label:
+            data["label"] = label
+        return data
+
+    def html_canvas_data_per_field(self):
+        """Return a struct-canvas for each top level field, starting at bit 0, as unions and xactions draw them."""
+        all_data = []
+        for row in self.top_level_rows():
+            field = self.nodes[row]
+            if isinstance(field.sv_type, PkgStruct):
+                all_data.append(field.sv_type.bit_layout.html_canvas_data(label=field.name))
+                continue
+            all_data.append({
+                "field_names": [field.name],
+                "msbs": [self.msbs[row] - self.lsbs[row]],
+                "lsbs": [0],
+                "label": field.name
+            })
+        return all_data
+
+
 class PkgItemBase(YisNode):
     """Base class for all objects contained in a pkg."""
+    __slots__ = ()
     allowed_symbols_for_linking = []
 
     def __init__(self, **kwargs):
@@ -1052,15 +2988,9 @@ class PkgItemBase(YisNode):
             link_symbol = link_name
         return link_pkg, link_symbol
 
-    def post_order_traversal_local_links(self):
-        """Post order traversal of this objects dependencies."""
-        for local_l in self.local_links:
-            for ll_potll in local_l.post_order_traversal_local_links():
-                yield ll_potll
-        for child in self.children.values():
-            for cpotll in child.post_order_traversal_local_links():
-                yield cpotll
-        yield self
+    def get_dependencies(self):
+        """Return an iterator over the nodes that must be declared before this one: its links, then its children."""
+        return itertools.chain(self.local_links, self.children.values())
 
     def _get_parent_localparams(self):
         parent = self.parent
@@ -1093,25 +3023,24 @@ class PkgItemBase(YisNode):
 
     def _gen_width_param(self, width, doc_verb=""):
         """Generate localparam for WIDTH of PkgItems """
-        PkgLocalparam(parent=self.parent,
-                      log=self.log,
-                      name=(F"{self.name.upper()}_WIDTH"),
-                      value=width,
-                      doc_summary=(F"Width of {self.name}"),
-                      doc_verbose=doc_verb,
-                      implicit=True)
-
-    def get_addr_node(self):
+        self.parent.add_implicit_localparam(name=(F"{self.name.upper()}_WIDTH"),
+                                            value=width,
+                                            doc_summary=(F"Width of {self.name}"),
+                                            doc_verbose=doc_verb)
+
+    def get_addr_node(self, lsb=0):
         """
         This is a linked list of stuff ends up in the C macros for addresses.
 
         For terminal nodes, next is an empty array, value is the field name (for now)
 
         structs and unions override this because they do strange things to the tree
+        Args:
+            lsb: Where this is in the address.
         Returns:
             A fresh, shiny new node for the address tree.
         """
-        return AddrField(obj=self)
+        return AddrField(obj=self, lsb=lsb)
 
 
 class PkgLocalparam(PkgItemBase):
@@ -1143,33 +3072,24 @@ class PkgLocalparam(PkgItemBase):
 
         super()._gen_width_param(width)
 
-        PkgLocalparam(parent=self.parent,
-                      log=self.log,
-                      name=(F"{self.name}_COUNT_WIDTH"),
-                      value=F"clog2({self.name}.value + 1)",
-                      doc_summary=(F"Width to count {self.name} items"),
-                      doc_verbose="",
-                      implicit=True)
-
-        PkgLocalparam(parent=self.parent,
-                      log=self.log,
-                      name=(F"{self.name}_WIDTH_ONE"),
-                      value=1,
-                      width=width,
-                      doc_summary=(F"{self.name}_WIDTH-wide 1 for incrementers and decrementers"),
-                      doc_verbose="",
-                      implicit=True)
-
-        PkgLocalparam(parent=self.parent,
-                      log=self.log,
-                      name=(F"{self.name}_COUNT_ONE"),
-                      value=1,
-                      width=F"clog2({self.name}.value + 1)",
-                      doc_summary=(F"{self.name}_COUNT_WIDTH-wide 1 for incrementers and decrementers"),
-                      doc_verbose="",
-                      implicit=True)
-
-    @only_run_once
+        self.parent.add_implicit_localparam(name=(F"{self.name}_COUNT_WIDTH"),
+                                            value=F"clog2({self.name}.value + 1)",
+                                            doc_summary=(F"Width to count {self.name} items"),
+                                            doc_verbose="")
+
+        self.parent.add_implicit_localparam(name=(F"{self.name}_WIDTH_ONE"),
+                                            value=1,
+                                            width=width,
+                                            doc_summary=(F"{self.name}_WIDTH-wide 1 for incrementers and decrementers"),
+                                            doc_verbose="")
+
+        self.parent.add_implicit_localparam(
+            name=(F"{self.name}_COUNT_ONE"),
+            value=1,
+            width=F"clog2({self.name}.value + 1)",
+            doc_summary=(F"{self.name}_COUNT_WIDTH-wide 1 for incrementers and decrementers"),
+            doc_verbose="")
+
     def resolve_links(self):
         """Call superclass to resolve width links, then resolve type links."""
         super().resolve_links()
@@ -1183,16 +3103,17 @@ class PkgLocalparam(PkgItemBase):
             self.log.error(str(exc))
             self.log.critical(F"Previous errors parsing {self.name}")
 
+    def check_elaborated(self):
         self._width_check()
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Recurse if necessary"""
         if isinstance(self.width, int):
             return self.width
         return self.width.computed_width
 
-    @memoize_property
+    @computed_property
     def computed_value(self):
         """Recurse if necessary"""
         if isinstance(self.value, int):
@@ -1260,39 +3181,24 @@ class PkgEnum(PkgItemBase):
         super().__init__(**kwargs)
         self.width = kwargs.pop('width')
         self.prefix = kwargs.pop('prefix', F'{self.name[:-len(self.TYPE_NAME_SUFFIX)]}_')
-        values = kwargs.pop('values')
-        expandedValues = []
-
-        for val in values:
-            # if the value is "range(n)", replace the original with n sequential copies.
-            if "value" in val and isinstance(val["value"], str):
-                original = val
-                try:
-                    indices = eval(val["value"])
-                except:
-                    self.log.critical(F"Errors parsing {val['value']}")
-                for i in indices:
-                    # modify the name and value, copy the docs
-                    newVal = {
-                        'name': "{}{}".format(original['name'], i),
-                        'value': i,
-                        'doc_summary': original['doc_summary'],
-                    }
-                    # copy any other fields.
-                    for k in set(list(original.keys())).difference(['name', 'doc_summary', 'value']):
-                        newVal[k] = original[k]
-                    expandedValues.append(newVal)
+        self._ranges = []
+        for row in kwargs.pop('values'):
+            # A "range(n)" value stands for n values, kept as a single row until they're iterated
+            if isinstance(row.get("value"), str):
+                indices = parse_range(row["value"])
+                if indices is None:
+                    self.log.critical(F"Errors parsing {row['value']}")
+                if not indices:
+                    continue # An empty range stands for no values at all
+                row = {key: value for key, value in row.items() if key != "value"}
+                PkgEnumRange(parent=self, log=self.log, indices=indices, **row)
             else:
-                expandedValues.append(val)
-
-        for row in expandedValues:
-            PkgEnumValue(parent=self, log=self.log, **row)
+                PkgEnumValue(parent=self, log=self.log, **row)
         if not self.implicit:
             self._gen_width_param(F"{self.name}.width")
 
         self._explicit_values = False
 
-    @only_run_once
     def resolve_links(self):
         """Call superclass to resolve width links, then resolve type links."""
         super().resolve_links()
@@ -1304,50 +3210,110 @@ class PkgEnum(PkgItemBase):
 
         # Need to wait to do this here because self.width might be linked
         self._check_enum_value_consistency()
+
+    def check_elaborated(self):
         self._width_check()
 
     def __repr__(self):
-        values = "\n    -".join([str(child) for child in self.children.values()])
+        values = "\n    -".join([str(child) for child in self.iter_values()])
         return F"{id(self)} {self.name}, width {self.width}, values:\n    -{values}"
 
+    def add_child(self, child):
+        """Add a value or a range() row, reporting each of its values named like one already in the enum."""
+        clashes = {} # Position of the value in child -> its name
+        if isinstance(child, PkgEnumRange):
+            for row in self.children.values():
+                if isinstance(row, PkgEnumValue):
+                    number = child.value_number(row.name)
+                    if number is not None:
+                        clashes[child.indices.index(number)] = row.name
+                elif row.base_name.startswith(child.base_name) or child.base_name.startswith(row.base_name):
+                    # Two ranges can only share names if one's name is a prefix of the other's
+                    for position, number in enumerate(child.indices):
+                        if row.value_number(child.value_name(number)) is not None:
+                            clashes[position] = child.value_name(number)
+            self._ranges.append(child)
+        elif child.name in self.children or any(row.value_number(child.name) is not None for row in self._ranges):
+            clashes[0] = child.name
+        for _, name in sorted(clashes.items()):
+            self.log.error(F"{name} already exists in {self.name} as a PkgEnumValue")
+        self.children[child.name] = child
+
+    def iter_values(self):
+        """Iterate over the values of this enum, creating those of range() rows as they're reached."""
+        for child in self.children.values():
+            if isinstance(child, PkgEnumRange):
+                yield from child.iter_values()
+            else:
+                yield child
+
+    def num_values(self):
+        """Return the number of values of this enum, without creating those of range() rows."""
+        return sum(len(child.indices) if isinstance(child, PkgEnumRange) else 1 for child in self.children.values())
+
     def _check_enum_value_consistency(self):
-        # I had a list comprehension that was way cooler, but it was hard to read
+        # Range rows are checked arithmetically against the values before them rather than value by value
         explicit_values = []
         implicit_values = []
         reverse_value_lookups = {}
+        ranges = []
 
         for child in self.children.values():
-            value_attr = getattr(child, 'sv_value', None)
-            if value_attr is None:
+            if isinstance(child, PkgEnumRange):
+                self._explicit_values = True
+                duplicates = {}
+                for value, name in reverse_value_lookups.items():
+                    if value in child.indices:
+                        duplicates[value] = name
+                for other in ranges:
+                    for value in child.overlap(other):
+                        duplicates.setdefault(value, other.value_name(value))
+                for value in sorted(duplicates, key=child.indices.index):
+                    self.log.error(F"Enum {self.name} {child.value_name(value)} has the same defined value as "
+                                   F"{duplicates[value]}")
+                ranges.append(child)
+                explicit_values.append(child)
+            elif child.sv_value is None:
                 implicit_values.append(child.name)
             else:
                 self._explicit_values = True
-                if child.sv_value in reverse_value_lookups:
-                    self.log.error(F"Enum {self.name} {child.name} has the same defined value as "
-                                   F"{reverse_value_lookups[child.sv_value]}")
+                duplicate = reverse_value_lookups.get(child.sv_value)
+                for other in ranges:
+                    if duplicate is None and child.sv_value in other.indices:
+                        duplicate = other.value_name(child.sv_value)
+                if duplicate is not None:
+                    self.log.error(F"Enum {self.name} {child.name} has the same defined value as {duplicate}")
                 else:
                     reverse_value_lookups[child.sv_value] = child.name
 
-                explicit_values.append(child.name)
+                explicit_values.append(child)
 
         if explicit_values and implicit_values:
+            explicit_values = [
+                value.name for child in explicit_values
+                for value in (child.iter_values() if isinstance(child, PkgEnumRange) else [child])
+            ]
             self.log.error(F"Enum {self.name} is using a mix of explicit and implicit values\n"
                            F"Implicit values: {implicit_values}\n"
                            F"Explicit values: {explicit_values}")
 
     def _width_check(self):
-        if len(self.children) > (1 << self.computed_width):
+        if self.num_values() > (1 << self.computed_width):
             self.log.error(F"Enum {self.name} has more defined values than fit in its width "
                            "({self.width.computed_value})")
 
         max_value = (1 << self.computed_width) - 1
         if self._explicit_values:
             for child in self.children.values():
-                if child.sv_value > max_value:
-                    self.log.error(F"{child.name} value of {child.sv_value} exceeds maximum value {max_value} "
+                if isinstance(child, PkgEnumRange):
+                    too_large = [(child.value_name(value), value) for value in child.values_above(max_value)]
+                else:
+                    too_large = [(child.name, child.sv_value)] if child.sv_value > max_value else []
+                for name, value in too_large:
+                    self.log.error(F"{name} value of {value} exceeds maximum value {max_value} "
                                    F"allowed by width {self.computed_width}")
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute the raw width of this enum."""
         if isinstance(self.width, int):
@@ -1378,7 +3344,7 @@ class PkgEnum(PkgItemBase):
 
         # Render each enum_value, note they are 2 indented farther
         enum_value_arr = []
-        for row in self.children.values():
+        for row in self.iter_values():
             enum_value_arr.extend(row.render_rtl_sv_pkg())
 
         # Add leading spaces to make all children line up
@@ -1409,14 +3375,9 @@ class PkgEnum(PkgItemBase):
         ret_arr.append(F"enum {self.name} {{")
 
         # Render each enum_value, note they are 2 indented farther
-        doc_summary_addon = []
         enum_value_arr = []
-        for idx, row in enumerate(self.children.values()):
-            if row.sv_value is None:
-                row.sv_value = idx
-            doc_summary_addon.append(f"{row.name} - {row.sv_value}")
-            enum_value_arr.extend(row.render_rdl_pkg())
-        self.doc_summary_addon = "; ".join(doc_summary_addon)
+        for row, sv_value in self.numbered_values():
+            enum_value_arr.extend(row.render_rdl_pkg(sv_value))
 
         # Add leading spaces to make all children line up
         enum_value_arr[0] = F"  {enum_value_arr[0]}"
@@ -1425,9 +3386,26 @@ class PkgEnum(PkgItemBase):
         ret_arr.append(f"}}; // {self.doc_summary}")
         return "\n  ".join(ret_arr)
 
+    def numbered_values(self):
+        """Iterate over each value and its number. RDL and the python codec need explicit numbers, so fall back to
+        the enumeration index for implicit ones.
+        Don't write the index back to the children, other generators rendering from the same model need to see
+        the values as they were specified.
+        """
+        for idx, row in enumerate(self.iter_values()):
+            sv_value = row.sv_value
+            if sv_value is None:
+                sv_value = idx
+            yield row, sv_value
+
+    def rdl_doc_summary_addon(self):
+        """Summarize the name and value of each enum value for struct fields that encode this enum in RDL."""
+        return "; ".join(f"{row.name} - {sv_value}" for row, sv_value in self.numbered_values())
+
 
-class PkgEnumValue(PkgItemBase):
+class PkgEnumValue(PkgItemBase, YisLeafNode):
     """Definition for a single item value."""
+    __slots__ = ("implicit", "selectors", "sv_value")
 
     TYPE_NAME_SUFFIX = ""
     INSTANCE_NAME_SUFFIX = ""
@@ -1439,6 +3417,23 @@ class PkgEnumValue(PkgItemBase):
             self.log.error(F"Error parsing {self.name}. Enum values can only be raw ints. "
                            "Equations and linked types are not allowed")
 
+    @classmethod
+    def from_range(cls, row, value):
+        """Return the value of a PkgEnumRange row for value, it isn't added to the enum's children."""
+        node = cls.__new__(cls)
+        node.log = row.log
+        node.name = F"{row.base_name}{value}"
+        node.doc_summary = row.doc_summary
+        node.doc_verbose = row.doc_verbose
+        node.regwidth = row.regwidth
+        node.parent = row.parent
+        node.elaboration_state = row.elaboration_state
+        node.local_links = row.local_links
+        node.implicit = row.implicit
+        node.selectors = row.selectors
+        node.sv_value = value
+        return node
+
     def _naming_convention_callback(self):
         self._check_dunder_name()
 
@@ -1463,7 +3458,7 @@ class PkgEnumValue(PkgItemBase):
         ret_arr.append(F"{self.parent.prefix}{self.name}{exp_sv_value}, // {self.doc_summary}")
         return ret_arr
 
-    def render_rdl_pkg(self):
+    def render_rdl_pkg(self, sv_value):
         """Render for RDL Pkg."""
         ret_arr = []
         # If there is no doc_verbose, don't append to ret_array to avoid extra newlines
@@ -1471,8 +3466,8 @@ class PkgEnumValue(PkgItemBase):
 
         # Strip _E from the rendered RTL name
         exp_sv_value = ""
-        if self.sv_value is not None:
-            exp_sv_value = F" = {self.sv_value}"
+        if sv_value is not None:
+            exp_sv_value = F" = {sv_value}"
         ret_arr.append(F"{self.parent.prefix}{self.name}{exp_sv_value}; // {self.doc_summary}")
         if doc_verbose:
             ret_arr.append(doc_verbose)
@@ -1485,6 +3480,65 @@ class PkgEnumValue(PkgItemBase):
         return self.sv_value
 
 
+class PkgEnumRange(PkgItemBase, YisLeafNode):
+    """An enum value given as "range(...)", standing for a value per number of the range.
+
+    The values are named after the row with the number appended and share its docs. Rather than being children of
+    the enum, they're created as PkgEnumValue nodes when PkgEnum.iter_values() reaches the row, so wide opcode and
+    ID enums don't cost a node per value. The row takes the name of its first value, for the naming checks (digits
+    can't break any of them) and so that it clashes with an explicit value of that name.
+    """
+    __slots__ = ("implicit", "selectors", "base_name", "indices")
+
+    def __init__(self, **kwargs):
+        self.base_name = kwargs['name']
+        self.indices = kwargs.pop('indices')
+        if self.indices:
+            kwargs['name'] = self.value_name(self.indices[0])
+        super().__init__(**kwargs)
+
+    def _naming_convention_callback(self):
+        self._check_dunder_name()
+
+    def __repr__(self):
+        return F"{id(self)} {self.base_name} {self.indices}"
+
+    def value_name(self, value):
+        """Return the name of the value for a number of the range."""
+        return F"{self.base_name}{value}"
+
+    def iter_values(self):
+        """Iterate over the values of the range, in order."""
+        for value in self.indices:
+            yield PkgEnumValue.from_range(self, value)
+
+    def overlap(self, other):
+        """Iterate over the numbers of this range that are also in other's, in the order of the smaller range."""
+        smaller, larger = sorted([self.indices, other.indices], key=len)
+        return (value for value in smaller if value in larger)
+
+    def value_number(self, name):
+        """Return the number of the value called name, None if the range has no value called that."""
+        if not name.startswith(self.base_name):
+            return None
+        digits = name[len(self.base_name):]
+        try:
+            number = int(digits)
+        except ValueError:
+            return None
+        if str(number) != digits or number not in self.indices:
+            return None
+        return number
+
+    def values_above(self, limit):
+        """Return the numbers of the range above limit, as a range in the order of the range."""
+        ascending = self.indices if self.indices.step > 0 else self.indices[::-1]
+        if not ascending or ascending[-1] <= limit:
+            return range(0)
+        above = ascending[max(0, (limit - ascending.start) // ascending.step + 1):]
+        return above if self.indices.step > 0 else above[::-1]
+
+
 class PkgTypedef(PkgItemBase):
     """Definition for a typedef inside a pkg."""
 
@@ -1510,7 +3564,6 @@ class PkgTypedef(PkgItemBase):
             render_type = self.base_sv_type.name
         return render_type
 
-    @only_run_once
     def resolve_links(self):
         if not is_verilog_primitive(self.base_sv_type):
             self._resolve_link("base_sv_type", allowed_symbols=[Pkg.TYPEDEFS, Pkg.ENUMS, Pkg.STRUCTS, Pkg.UNIONS])
@@ -1522,7 +3575,7 @@ class PkgTypedef(PkgItemBase):
 
         super().resolve_links()
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Computing width for a typedef requires two parts - width of the base_sv_type and *value* of the width."""
         # Default sv_type_width to 1 for logic/wire types
@@ -1544,6 +3597,13 @@ class PkgTypedef(PkgItemBase):
 
         return base_sv_type_width * width_value
 
+    @computed_property
+    def bit_layout(self):
+        """The elements of a typedef of anything but logic, see BitLayout."""
+        if is_verilog_primitive(self.base_sv_type):
+            return BitLayout(self.computed_width)
+        return BitLayout.of_elements(self.base_sv_type, self.computed_width)
+
     def render_rtl_sv_pkg(self):
         """Render RTL for an sv pkg.
 
@@ -1603,7 +3663,8 @@ class PkgStruct(PkgItemBase):
             except:
                 _children = self.get_dependent_pkg(pkg).children[symbol].children
                 for name, item in _children.items():
-                    if not is_verilog_primitive(item.sv_type):
+                    # Base types loaded from a compiled pkg are already linked
+                    if isinstance(item.sv_type, str) and not is_verilog_primitive(item.sv_type):
                         item.sv_type = "::".join([pkg, item.sv_type])
                         _children.update({name: item})
                 children.update(_children)
@@ -1627,11 +3688,25 @@ class PkgStruct(PkgItemBase):
         fields = "\n    -".join([str(child) for child in self.children.values()])
         return F"{id(self)} {self.name}, fields:\n    -{fields}"
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute the width of a struct by computing width of all fields."""
         return sum([c.computed_width for c in self.children.values()])
 
+    @computed_property
+    def bit_layout(self):
+        """Where each field is, see BitLayout."""
+        return BitLayout.of_fields(self.computed_width, self.children.values(), "struct")
+
+    def record_cycles(self):
+        """Return the number of cycles of a record of this struct, see BitLayout.record_offsets."""
+        return 1
+
+    def render_c_pack(self):
+        """Render the pack and unpack functions and the field getters and setters of the C header, see
+        render_c_pack_functions."""
+        return render_c_pack_functions(self)
+
     def render_rtl_sv_pkg(self):
         """Render the SV for this struct.
 
@@ -1674,17 +3749,7 @@ class PkgStruct(PkgItemBase):
 
     def html_canvas_data(self, label=""):
         """Return a dictionary of data to render the struct-canvas in html."""
-        data = {"field_names": [], "msbs": [], "lsbs": []}
-        if label:
-            data["label"] = label
-        current_bit = 0
-        for child in reversed(self.children.values()):
-            data["field_names"].insert(0, child.name)
-            data["lsbs"].insert(0, current_bit)
-            current_bit += child.computed_width - 1
-            data["msbs"].insert(0, current_bit)
-            current_bit += 1
-        return data
+        return self.bit_layout.html_canvas_data(label)
 
     def render_rdl_pkg(self):
         """Render for RDL generation.
@@ -1704,24 +3769,18 @@ class PkgStruct(PkgItemBase):
         # ret_arr.append("  default reset = 0;")
 
         child_ret_arr = []
-        start_idx = self.computed_width - 1
-        end_idx = self.computed_width - 1
         for child in self.children.values():
             encode = ""
             doc_summary = child.doc_summary
             if child._get_render_type().endswith("_E"): # should use type check again enum
-                child.sv_type.render_rdl_pkg()
                 sv_type = child._get_render_type().split("::")
                 if len(sv_type) < 2:
                     sv_type.insert(0, self.parent.name + "_rypkg")
-                doc_summary += ": " + child.sv_type.doc_summary_addon
+                doc_summary += ": " + child.sv_type.rdl_doc_summary_addon()
                 encode = F'encode={sv_type[1]}; render_encode_pkg="{sv_type[0]}"; '
-            start_idx -= child.computed_width - 1
-            # child_ret_arr.append(F"  field {{{encode}desc = \"{child.doc_summary}\";}} {child.name}[{end_idx}:{start_idx}];")
+            # RDL places the fields LSB first by their width
             child_ret_arr.append(
                 F"  field {{{encode}desc = \"{doc_summary}\";{child.rdl}}} {child.name}[{child.computed_width}];")
-            end_idx -= child.computed_width
-            start_idx = end_idx
 
         child_ret_arr.reverse()
         ret_arr.extend(child_ret_arr)
@@ -1729,7 +3788,7 @@ class PkgStruct(PkgItemBase):
         ret_arr.append("};")
         return "\n".join(ret_arr)
 
-    def get_addr_node(self):
+    def get_addr_node(self, lsb=0):
         # This is a struct, so add a node per element
         head = None
 
@@ -1739,15 +3798,16 @@ class PkgStruct(PkgItemBase):
 
         selectorsInFlight = []
 
-        keys = list(self.children.keys())
-        for kidName in keys:
-            obj = self.children[kidName]
+        layout = self.bit_layout
+        for row in layout.top_level_rows():
+            obj = layout.nodes[row]
+            fieldLsb = lsb + layout.lsbs[row]
             if isinstance(obj.sv_type, str):
                 # this is the leaf node
-                newNode = AddrField(obj=obj)
+                newNode = AddrField(obj=obj, lsb=fieldLsb)
                 newNode.name = obj.name
             else:
-                newNode = obj.sv_type.get_addr_node()
+                newNode = obj.sv_type.get_addr_node(fieldLsb)
                 newNode.selects = obj.selectors
                 if obj.selectors != None:
                     selectorsInFlight.append(obj.selectors)
@@ -1772,7 +3832,7 @@ class PkgStruct(PkgItemBase):
                 head = newNode
         return head
 
-    def render_addr_macro(self):
+    def render_addr_macro(self, limit=ADDR_MACRO_LIMIT):
         """
         Produce "C" macros for structures decorated with an addr_map field.
         Processing walks the fields in order, top to bottom.  When a selector
@@ -1781,20 +3841,80 @@ class PkgStruct(PkgItemBase):
         address generator, which will in turn, have the enum mnemonic appended
         to its base name.
 
+        Raises an AddrError if there would be more than limit macros.
+
         Returns:
             An array of strings which can be dumped directly into the C header file.
         """
-        macros = []
         addrTree = self.get_addr_node()
 
         # now walk the tree nodes and accumulate bits...
-        addrTree.flatten(self.addr_macro, "", "", self.computed_width, macros)
+        return addrTree.flatten(self.addr_macro, limit)
 
-        return macros
+    def render_addr_tables(self):
+        """
+        Produce the compact alternative to render_addr_macro for structures decorated
+        with an addr_map field. Instead of a macro per combination of selector values,
+        this struct and every struct reachable through its fields and unions get a
+        table of the shift and mask of each of their fields, and an inline function
+        composing their fields into an address (or the part of one they make up).
 
+        A union field takes whatever one of its branches composes to, and a selector
+        field takes the enum value picking that branch. The output grows with the
+        number of structs, not with the product of the union fan-outs.
 
-class PkgStructField(PkgItemBase):
+        Returns:
+            An array of strings which can be dumped directly into the C header file.
+        """
+        if self.computed_width > 64:
+            raise AddrError("{} is {} bits wide, compact address tables are limited to 64 bits".format(
+                self.name, self.computed_width))
+        prefix = self.addr_macro
+        tables = []
+        seen = set()
+        structs = [self]
+        while structs:
+            struct = structs.pop(0)
+            if struct.name in seen:
+                continue
+            seen.add(struct.name)
+            typePrefix = "{}_{}".format(prefix, struct.name.upper())
+            lines = ["// {} {}: {} bits".format(prefix, struct.name, struct.computed_width)]
+            args = []
+            terms = []
+            layout = struct.bit_layout
+            for row in layout.top_level_rows():
+                field = layout.nodes[row]
+                shift = layout.lsbs[row]
+                fieldPrefix = "{}_{}".format(typePrefix, field.name.upper())
+                lines.append("#define {}_SHIFT {}".format(fieldPrefix, shift))
+                lines.append("#define {}_MASK 0x{:x}ULL".format(fieldPrefix, (1 << field.computed_width) - 1))
+                if field.selectors != None:
+                    lines.append("// {} selects {}".format(field.name, field.selectors[0]["name"]))
+                if isinstance(field.sv_type, PkgStruct):
+                    structs.append(field.sv_type)
+                    lines.append("// {} is composed by {}_{}()".format(field.name, prefix.lower(), field.sv_type.name))
+                elif isinstance(field.sv_type, PkgUnion):
+                    branches = []
+                    for branch in field.sv_type.children.values():
+                        if isinstance(branch.sv_type, PkgStruct):
+                            structs.append(branch.sv_type)
+                            branches.append("{}_{}()".format(prefix.lower(), branch.sv_type.name))
+                        else:
+                            branches.append(branch.name)
+                    lines.append("// {} is one of: {}".format(field.name, ", ".join(branches)))
+                args.append("uint64_t {}".format(field.name))
+                terms.append("(({} & {}_MASK) << {}_SHIFT)".format(field.name, fieldPrefix, fieldPrefix))
+            lines.append("static inline uint64_t {}_{}({}) {{".format(prefix.lower(), struct.name, ", ".join(args)))
+            lines.append("    return " + " |\n           ".join(terms) + ";")
+            lines.append("}")
+            tables.append("\n".join(lines) + "\n")
+        return tables
+
+
+class PkgStructField(PkgItemBase, YisLeafNode):
     """Definition for a single field inside a struct."""
+    __slots__ = ("implicit", "selectors", "sv_type", "rdl", "width")
     TYPE_NAME_SUFFIX = ""
     INSTANCE_NAME_SUFFIX = ""
 
@@ -1835,7 +3955,6 @@ class PkgStructField(PkgItemBase):
             return F"{self.sv_type.parent.name}_rypkg::{self.sv_type.name}"
         return F"{self.sv_type.name}"
 
-    @only_run_once
     def resolve_links(self):
         if self.width is None:
             self.width = 1
@@ -1853,6 +3972,8 @@ class PkgStructField(PkgItemBase):
             self._resolve_link("sv_type", allowed_symbols=[Pkg.TYPEDEFS, Pkg.ENUMS, Pkg.STRUCTS, Pkg.UNIONS])
             self._check_link_instance_naming("sv_type")
         super().resolve_links()
+
+    def check_elaborated(self):
         self.check_type_width_conflicts()
 
     def check_type_width_conflicts(self):
@@ -1864,11 +3985,12 @@ class PkgStructField(PkgItemBase):
             self.log.error("Struct field %s.%s has computed width of %d. It cannot be represented in verilog",
                            self.parent.name, self.name, self.computed_width)
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute width by looking at width and type."""
-        self.log.debug("Computing width for %s %s - width is %s, type is %s", self.parent.name, self.name, self.width,
-                       self.sv_type)
+        if "equation" in self.log.traced:
+            self.log.trace("equation", "Computing width for %s %s - width is %s, type is %s", self.parent.name,
+                           self.name, self.width, self.sv_type)
         # if is_verilog_primitive(self.sv_type) and isinstance(self.width, int):
         #     return self.width
         if is_verilog_primitive(self.sv_type):
@@ -1908,12 +4030,7 @@ class PkgXaction(PkgStruct):
         """ Override the super-class method for generating a width localparam. not needed for xactions. """
         pass
 
-    @only_run_once
-    def resolve_links(self):
-        super().resolve_links()
-        _ = self.computed_width
-
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Xactions must have equal width cycles, but the total width is aggregrate across all cycles."""
         width = 0
@@ -1930,22 +4047,13 @@ class PkgXaction(PkgStruct):
 
         return width * len(self.children)
 
+    def record_cycles(self):
+        """Each cycle of an xaction starts a new word of its records."""
+        return len(self.children)
+
     def html_canvas_data(self):
         """Return a dictionary of data to render the struct-canvas in html."""
-        all_data = []
-        for child in self.children.values():
-            if isinstance(child.sv_type, PkgStruct):
-                all_data.append(child.sv_type.html_canvas_data(label=child.name))
-                continue
-            data = {"field_names": [], "msbs": [], "lsbs": [], "label": child.name}
-            current_bit = 0
-            data["field_names"].insert(0, child.name)
-            data["lsbs"].insert(0, current_bit)
-            current_bit += child.computed_width - 1
-            data["msbs"].insert(0, current_bit)
-            current_bit += 1
-            all_data.append(data)
-        return all_data
+        return self.bit_layout.html_canvas_data_per_field()
 
 
 class PkgUnion(PkgItemBase):
@@ -1962,16 +4070,11 @@ class PkgUnion(PkgItemBase):
     def _naming_convention_callback(self):
         self._check_dunder_name()
 
-    @only_run_once
-    def resolve_links(self):
-        super().resolve_links()
-        _ = self.computed_width
-
     def __repr__(self):
         fields = "\n    -".join([str(child) for child in self.children.values()])
         return F"{id(self)} {self.name}, fields:\n    -{fields}"
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Unions have a simple implemention. They must all be the same width for now (padding implemented by user)"""
         width = 0
@@ -1987,6 +4090,20 @@ class PkgUnion(PkgItemBase):
                                    child.name, width, child.computed_width)
         return width
 
+    @computed_property
+    def bit_layout(self):
+        """Where each field is, see BitLayout."""
+        return BitLayout.of_fields(self.computed_width, self.children.values(), "union")
+
+    def record_cycles(self):
+        """Return the number of cycles of a record of this union, see BitLayout.record_offsets."""
+        return 1
+
+    def render_c_pack(self):
+        """Render the pack and unpack functions and the field getters and setters of the C header, see
+        render_c_pack_functions."""
+        return render_c_pack_functions(self)
+
     def render_rtl_sv_pkg(self):
         """Render the SV for this union.
 
@@ -2018,42 +4135,29 @@ class PkgUnion(PkgItemBase):
 
     def html_canvas_data(self):
         """Return a dictionary of data to render the struct-canvas in html."""
-        all_data = []
-        for child in self.children.values():
-            if isinstance(child.sv_type, PkgStruct):
-                all_data.append(child.sv_type.html_canvas_data(label=child.name))
-                continue
-            data = {"field_names": [], "msbs": [], "lsbs": [], "label": child.name}
-            current_bit = 0
-            data["field_names"].insert(0, child.name)
-            data["lsbs"].insert(0, current_bit)
-            current_bit += child.computed_width - 1
-            data["msbs"].insert(0, current_bit)
-            current_bit += 1
-            all_data.append(data)
-        return all_data
+        return self.bit_layout.html_canvas_data_per_field()
 
-    def get_addr_node(self):
+    def get_addr_node(self, lsb=0):
         #
         # Each element of a union needs to become a "next"
         # Give the union a nice obvious name so it is easier
         # to see in the debugger when pulling one's hair out.
         #
-        retVal = AddrField(obj=self)
-        # For address map purposes, keep a union's bitCount as 0. Its children have a non-zero bitCount
-        retVal.bitCount = 0
+        # All of them start where the union does.
+        retVal = AddrField(obj=self, lsb=lsb)
         for fieldName in self.children:
             obj = self.children[fieldName]
             if isinstance(obj.sv_type, str):
-                retVal.addChild(AddrField(obj=obj))
+                retVal.addChild(AddrField(obj=obj, lsb=lsb))
             else:
-                downStream = obj.sv_type.get_addr_node()
+                downStream = obj.sv_type.get_addr_node(lsb)
                 retVal.addChild(downStream)
         return retVal
 
 
-class PkgUnionField(PkgItemBase):
+class PkgUnionField(PkgItemBase, YisLeafNode):
     """Definition for a single field inside a union."""
+    __slots__ = ("implicit", "selectors", "sv_type", "width")
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -2071,7 +4175,6 @@ class PkgUnionField(PkgItemBase):
             return F"{self.sv_type.parent.name}_rypkg::{self.sv_type.name}"
         return F"{self.sv_type.name}"
 
-    @only_run_once
     def resolve_links(self):
         if is_verilog_primitive(self.sv_type):
             try:
@@ -2092,10 +4195,12 @@ class PkgUnionField(PkgItemBase):
             self.log.error(F"Union field {self.parent.name}.{self.name} has width specified for "
                            "a non-logic/wire type. Only logic/wire can have a width")
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute width by looking at width and type."""
-        self.log.debug("Computing width for %s - width is %s, type is %s", self.name, self.width, self.sv_type)
+        if "equation" in self.log.traced:
+            self.log.trace("equation", "Computing width for %s - width is %s, type is %s", self.name, self.width,
+                           self.sv_type)
         if is_verilog_primitive(self.sv_type) and isinstance(self.width, int):
             return self.width
         if is_verilog_primitive(self.sv_type):
@@ -2122,6 +4227,8 @@ class PkgUnionField(PkgItemBase):
 class Intf(YisNode):
     """Class to hold IntfItemBase objects, representing a whole intf."""
 
+    _html_links = None
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.source_file = kwargs['source_file']
@@ -2129,6 +4236,13 @@ class Intf(YisNode):
         for component in kwargs.pop('components', []):
             IntfComp(parent=self, log=self.log, **component)
 
+    @property
+    def html_links(self):
+        """The HtmlLinkTable of the intf, built the first time its HTML is rendered."""
+        if self._html_links is None:
+            self._html_links = HtmlLinkTable(self)
+        return self._html_links
+
     def src_dst_extract(self, name):
         """Extract the source and dst out of name."""
         try:
@@ -2149,7 +4263,7 @@ class Intf(YisNode):
                 "Components:\n  -{components}\n".format(
                     components="\n  -".join([repr(component) for component in self.children.values()])))
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute width of the each child object, then accumulate all widths to form master width."""
         return sum([c.computed_width for c in self.children.values()])
@@ -2157,6 +4271,7 @@ class Intf(YisNode):
 
 class IntfItemBase(YisNode):
     """Base class for anything contained in an Intf."""
+    __slots__ = ()
 
     def _extract_link_pieces(self, link_name):
         match = PKG_SCOPE_REGEXP.match(link_name)
@@ -2188,19 +4303,20 @@ class IntfComp(IntfItemBase):
         return (F"Component name: {self.name}\n"
                 "Ports:\n  -{ports}\n".format(ports="\n  -".join([repr(port) for port in self.children.values()])))
 
-    @memoize_property
+    @computed_property
     def computed_port_width(self):
         """Compute width for this Component by iterating through all children."""
         return sum([c.computed_width for c in self.children.values()])
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute width for this Component by iterating through all children."""
         return self.computed_port_width * len(self.connections)
 
 
-class IntfCompPort(IntfItemBase):
+class IntfCompPort(IntfItemBase, YisLeafNode):
     """Definition for a Port in a Comp(onent)."""
+    __slots__ = ("sv_type", "width", "direction", "_render_type", "_render_width")
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -2227,7 +4343,6 @@ class IntfCompPort(IntfItemBase):
             self.log.error(F"{self.name} has a {self.sv_type} type with a raw int greater than 1 as the width. "
                            "The port width must be specified in a pkg and referenced by the connection.")
 
-    @only_run_once
     def resolve_links(self):
         """Resolve links from IntfCompConn to a package.
 
@@ -2253,9 +4368,11 @@ class IntfCompPort(IntfItemBase):
             self.log.error(F"Interface connection {self.parent.name}.{self.name} has width specified for a "
                            "non-logic/wire type. Only logic/wire can have a width")
 
-    @memoize_property
+    @computed_property
     def computed_width(self):
         """Compute width by looking at width and type."""
+        if is_verilog_primitive(self.sv_type) and self.width is None:
+            return 1
         if is_verilog_primitive(self.sv_type) and isinstance(self.width, int):
             return self.width
         if is_verilog_primitive(self.sv_type):
@@ -2298,20 +4415,105 @@ class IntfCompPort(IntfItemBase):
         return ret_arr
 
 
-def main(options, log):
+def main(options, log, pkg_cache=None):
     """Main execution."""
+    log.set_trace_categories(options.trace)
+    if not options.profile:
+        _run(options, log, pkg_cache)
+        return
+    log.start_profiling(cprofile_category=options.profile_cprofile and options.profile_cprofile[0])
+    try:
+        _run(options, log, pkg_cache)
+    finally:
+        # Also written when the run fails, it's often the pathological specs that need looking into
+        log.stop_profiling(options.profile, options.profile_cprofile and options.profile_cprofile[1])
+
+
+def _run(options, log, pkg_cache):
+    if options.compile_templates:
+        compile_templates(options.compile_templates)
+        return
+    if options.watch:
+        run_watch(options, log)
+        return
+    if options.batch:
+        run_batch(options, log)
+        return
     if not options.pkgs:
         log.critical("Didn't find anything to render via cmd line. Must specify at least .yis")
 
-    yis = Yis(options.pkgs, log, options=options)
-    yis.render_output(options.output_file)
+    yis = Yis(options.pkgs, log, options=options, pkg_cache=pkg_cache)
+    if options.emit_compiled:
+        yis.write_compiled_pkg(options.emit_compiled)
+        if not options.outputs:
+            return
+    yis.render_output(options.outputs)
+
+
+def _log_level(options):
+    """The level to log at, trace messages need to get through when any category is enabled."""
+    if options.tool_debug:
+        return cmn_logging.DEBUG
+    if options.trace:
+        return cmn_logging.TRACE
+    return cmn_logging.INFO
+
+
+def _set_log_level(log, level):
+    log.setLevel(level)
+    for handler in log.handlers:
+        handler.setLevel(level)
+
+
+def run_persistent_worker(log):
+    """Serve bazel JSON work requests from stdin until bazel closes it.
+
+    Each request is a regular yis_gen command line. The interpreter, imports, template environments, yamale
+    schemas and a cache of elaborated pkgs stay warm between requests. Everything a request writes goes into
+    the response's output, stdout is reserved for the protocol.
+    """
+    import json # pylint: disable=import-outside-toplevel
+    protocol_out = sys.stdout
+    pkg_cache = PkgCache(WORKER_PKG_CACHE_SIZE)
+    output = io.StringIO()
+    for handler in log.handlers:
+        handler.setStream(output)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        output.seek(0)
+        output.truncate()
+        log.warn_count = 0
+        log.error_count = 0
+        pkg_cache.input_digests = {inp["path"]: inp.get("digest") for inp in request.get("inputs", [])}
+
+        exit_code = 0
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                options = parse_args(request.get("arguments", []))
+                _set_log_level(log, _log_level(options))
+                main(options, log, pkg_cache=pkg_cache)
+                log.exit_if_warnings_or_errors("Encountered previous errors")
+            except SystemExit as exc:
+                exit_code = exc.code if isinstance(exc.code, int) else 1
+            except Exception: # pylint: disable=broad-except
+                output.write(traceback.format_exc())
+                exit_code = 1
+
+        response = {"exitCode": exit_code, "output": output.getvalue(), "requestId": request.get("requestId", 0)}
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
 
 
 def setup_context():
     """Set up options, log, and other context for main to run."""
+    if "--persistent_worker" in sys.argv[1:]:
+        run_persistent_worker(cmn_logging.build_logger("yis", level=cmn_logging.INFO))
+        return
     options = parse_args(sys.argv[1:])
-    verbosity = cmn_logging.DEBUG if options.tool_debug else cmn_logging.INFO
-    log = cmn_logging.build_logger("yis", level=verbosity)
+    log = cmn_logging.build_logger("yis", level=_log_level(options))
     main(options, log)
     log.exit_if_warnings_or_errors("Encountered previous errors")
 
@@ -0,0 +1,9 @@
+"""Entry point for the yis_gen binary.
+
+Python never caches the bytecode of the script it's started with, so running yis_gen.py directly recompiles all
+of it on every action. Importing it from here lets its bytecode be cached like any other module.
+"""
+import yis_gen
+
+if __name__ == "__main__":
+    yis_gen.setup_context()